@@ -0,0 +1,255 @@
+"""
+Lazy router registry for ``create_app``.
+
+The trading routers are included eagerly, but the Jarvis / brief / agent /
+governance / GitHub / admin routers pull in Bedrock, Notion, Google and boto3
+chains that a restart does not need before ``/health`` answers. Each of those is
+described by a ``LazyRouterSpec`` and imported the first time a request hits one
+of its path prefixes (``LazyRouterMiddleware``), or never when its feature flag
+is off for this process (flags are read once, in ``create_app``).
+
+Routes of a lazily loaded router are inserted where the eager include used to
+put them: ``create_app`` marks each slot between its eager includes
+(``mark_position``), and routers load into their slot in registry order, so
+route matching is the same whichever router happens to load first. The import
+runs in a worker thread; the route list is only changed on the event loop,
+where requests are routed. ``/openapi.json`` and ``/docs`` load everything so
+the schema stays complete.
+
+Set ATP_EAGER_ROUTERS=1 to import all enabled routers inside ``create_app``
+(e.g. to fail fast on an import error in CI).
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import anyio.to_thread
+from fastapi import FastAPI
+
+from app.core.environment import is_atp_trading_only, is_jarvis_control_enabled
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+def eager_routers_requested() -> bool:
+    v = (os.getenv("ATP_EAGER_ROUTERS") or "").strip().lower()
+    return v in ("1", "true", "yes", "on")
+
+
+def _always() -> bool:
+    return True
+
+
+def _not_trading_only() -> bool:
+    return not is_atp_trading_only()
+
+
+@dataclass(frozen=True)
+class LazyRouterSpec:
+    """Where a router lives, which paths it serves, and how to include it."""
+
+    name: str
+    module: str
+    path_prefixes: Tuple[str, ...]
+    include_kwargs: Dict[str, Any] = field(default_factory=dict)
+    attr: str = "router"
+    enabled: Callable[[], bool] = _always
+    # ImportError leaves the router out (404) instead of failing the request.
+    optional: bool = False
+
+    def matches(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in self.path_prefixes)
+
+
+# Same order as the eager includes these replaced.
+DEFAULT_LAZY_ROUTERS: Tuple[LazyRouterSpec, ...] = (
+    LazyRouterSpec(
+        "admin",
+        "app.api.routes_admin",
+        ("/api/admin", "/api/integrations/google", "/api/upload"),
+        {"prefix": "/api", "tags": ["admin"]},
+        optional=True,
+    ),
+    LazyRouterSpec("ai", "app.api.routes_ai", ("/api/ai",), enabled=_not_trading_only),
+    LazyRouterSpec(
+        "agent", "app.api.routes_agent", ("/api/agent",), {"prefix": "/api", "tags": ["agent"]}, enabled=_not_trading_only
+    ),
+    LazyRouterSpec(
+        "governance",
+        "app.api.routes_governance",
+        ("/api/governance",),
+        {"prefix": "/api", "tags": ["governance"]},
+        enabled=_not_trading_only,
+    ),
+    LazyRouterSpec(
+        "github_webhook",
+        "app.api.routes_github_webhook",
+        ("/api/github",),
+        {"prefix": "/api", "tags": ["github"]},
+        enabled=_not_trading_only,
+    ),
+    LazyRouterSpec(
+        "jarvis_control",
+        "app.api.routes_jarvis_control",
+        ("/api/jarvis/control",),
+        {"prefix": "/api/jarvis/control", "tags": ["jarvis-control"]},
+        enabled=is_jarvis_control_enabled,
+    ),
+    LazyRouterSpec("jarvis", "app.api.routes_jarvis", ("/api/jarvis", "/jarvis")),
+    LazyRouterSpec("brief", "app.brief.router", ("/api/brief",)),
+)
+
+
+class LazyRouterRegistry:
+    """Tracks which lazy routers are pending / loaded / failed for one app."""
+
+    def __init__(self, app: FastAPI, specs: Tuple[LazyRouterSpec, ...] = DEFAULT_LAZY_ROUTERS):
+        self.app = app
+        self.specs = [s for s in specs if s.enabled()]
+        self.disabled = [s.name for s in specs if s not in self.specs]
+        # Slot of each router in the route list, not counting lazily loaded routes.
+        self._anchors: Dict[str, int] = {}
+        self._routers: Dict[str, Any] = {}
+        self._route_counts: Dict[str, int] = {}
+        self._failed: Dict[str, str] = {}
+        self._load_ms: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_position(self, *names: str) -> None:
+        """Anchor routers ``names`` (or every unanchored one) at the current end of the route list.
+
+        Call in registry order, where the eager includes of those routers used to be.
+        """
+        anchor = len(self.app.router.routes) - sum(self._route_counts.values())
+        targets = names or [s.name for s in self.specs if s.name not in self._anchors]
+        for spec in self.specs:
+            if spec.name in targets:
+                self._anchors[spec.name] = anchor
+
+    def _insert_position(self, spec: LazyRouterSpec) -> int:
+        # Routers ahead of ``spec`` in registry order sit at or before its anchor.
+        pos = self._anchors.get(spec.name, len(self.app.router.routes))
+        for other in self.specs:
+            if other is spec:
+                break
+            pos += self._route_counts.get(other.name, 0)
+        return pos
+
+    def import_router(self, spec: LazyRouterSpec) -> Optional[Any]:
+        """Import ``spec``'s router once (blocking; safe from worker threads). None if unavailable."""
+        with self._lock:
+            if spec.name in self._routers:
+                return self._routers[spec.name]
+            if spec.name in self._failed:
+                return None
+            started = time.perf_counter()
+            try:
+                router = getattr(importlib.import_module(spec.module), spec.attr)
+            except ImportError as e:
+                if not spec.optional:
+                    raise
+                self._failed[spec.name] = str(e)
+                logger.warning("[ROUTERS] Optional router %s unavailable: %s", spec.name, e)
+                return None
+            self._routers[spec.name] = router
+            self._load_ms[spec.name] = round((time.perf_counter() - started) * 1000, 1)
+            return router
+
+    def include(self, spec: LazyRouterSpec, router: Any) -> None:
+        """Insert an imported router's routes into its slot.
+
+        Mutates ``app.router.routes``: call from the event loop (or before the
+        app serves), never from a worker thread while requests are routed.
+        """
+        if spec.name in self._route_counts:
+            return
+        routes = self.app.router.routes
+        before = len(routes)
+        self.app.include_router(router, **spec.include_kwargs)
+        added = routes[before:]
+        del routes[before:]
+        pos = self._insert_position(spec)
+        routes[pos:pos] = added
+        self._route_counts[spec.name] = len(added)
+        self.app.openapi_schema = None
+        logger.info("[ROUTERS] Loaded %s (%d routes) in %.1fms", spec.name, len(added), self._load_ms[spec.name])
+
+    def load(self, spec: LazyRouterSpec) -> bool:
+        """Import and include ``spec`` once; False if it could not be loaded."""
+        router = self.import_router(spec)
+        if router is None:
+            return False
+        self.include(spec, router)
+        return True
+
+    def pending_for_path(self, path: str) -> List[LazyRouterSpec]:
+        if path in _SCHEMA_PATHS:
+            return [s for s in self.specs if s.name not in self._route_counts and s.name not in self._failed]
+        return [
+            s for s in self.specs if s.name not in self._route_counts and s.name not in self._failed and s.matches(path)
+        ]
+
+    def import_pending(self, specs: List[LazyRouterSpec]) -> List[Tuple[LazyRouterSpec, Any]]:
+        imported = [(s, self.import_router(s)) for s in specs]
+        return [(s, router) for s, router in imported if router is not None]
+
+    def load_for_path(self, path: str) -> List[str]:
+        return [s.name for s in self.pending_for_path(path) if self.load(s)]
+
+    def load_all(self) -> List[str]:
+        return [s.name for s in self.specs if self.load(s)]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded": dict(self._load_ms),
+            "pending": [s.name for s in self.specs if s.name not in self._route_counts and s.name not in self._failed],
+            "failed": dict(self._failed),
+            "disabled": list(self.disabled),
+        }
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that loads pending routers for the request path before routing."""
+
+    def __init__(self, app: Any, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope.get("type") in ("http", "websocket"):
+            path = scope.get("path") or ""
+            pending = self.registry.pending_for_path(path)
+            if pending:
+                # Imports can take seconds; keep them off the event loop. The route
+                # list is changed back on the loop, where no request is mid-routing.
+                imported = await anyio.to_thread.run_sync(self.registry.import_pending, pending)
+                for spec, router in imported:
+                    self.registry.include(spec, router)
+        await self.app(scope, receive, send)
+
+
+def install_lazy_routers(
+    app: FastAPI,
+    specs: Optional[Tuple[LazyRouterSpec, ...]] = None,
+    registry: Optional[LazyRouterRegistry] = None,
+) -> LazyRouterRegistry:
+    """
+    Register lazy routers on ``app``; call after the last eager include. Routers
+    not anchored earlier with ``registry.mark_position`` go here.
+    """
+    if registry is None:
+        registry = LazyRouterRegistry(app, specs if specs is not None else DEFAULT_LAZY_ROUTERS)
+    registry.mark_position()
+    app.state.lazy_routers = registry
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    if eager_routers_requested():
+        registry.load_all()
+    return registry
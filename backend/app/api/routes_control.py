@@ -11,6 +11,7 @@ from pydantic import BaseModel
 from app.core.config import Settings
 from app.database import get_db
 from app.services.exchange_sync import exchange_sync_service
+from app.services.order_history_watermarks import get_order_history_sync_stats
 from app.services.signal_monitor import signal_monitor_service
 from app.services.scheduler import trading_scheduler
 from app.models.trading_settings import TradingSettings
@@ -171,7 +172,8 @@ def get_services_status():
         "exchange_sync_running": exchange_sync_service.is_running,
         "signal_monitor_running": signal_monitor_service.is_running,
         "trading_scheduler_running": trading_scheduler.running,
-        "last_sync": exchange_sync_service.last_sync.isoformat() if exchange_sync_service.last_sync else None
+        "last_sync": exchange_sync_service.last_sync.isoformat() if exchange_sync_service.last_sync else None,
+        "order_history_sync": get_order_history_sync_stats(),
     }
 
 
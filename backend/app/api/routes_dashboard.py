@@ -1,6 +1,8 @@
 """Dashboard state endpoint - returns portfolio, balances, and dashboard data"""
 
 from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.database import get_db, table_has_column, engine as db_engine
@@ -25,6 +27,14 @@ from app.services.open_orders import (
     calculate_portfolio_order_metrics,
     serialize_unified_order,
 )
+from app.services.dashboard_delta import (
+    DashboardVersions,
+    build_delta,
+    content_etag,
+    if_none_match,
+    snapshot_versions,
+    state_versions,
+)
 from app.services.portfolio_cache import get_portfolio_summary
 from app.services.portfolio_reconciliation import reconcile_portfolio_balances
 from app.utils.live_trading import get_live_trading_status
@@ -594,8 +604,42 @@ def _apply_watchlist_updates(item: WatchlistItem, data: Dict[str, Any]) -> None:
             continue
         setattr(item, field, value)
 
+def _versioned_dashboard_response(
+    request: Request,
+    versions: DashboardVersions,
+    data: dict,
+    etag: str,
+    since: Optional[int],
+    envelope: Optional[dict] = None,
+):
+    """
+    Serve a polled dashboard payload (``data``, wrapped in ``envelope`` when
+    given) with its ETag and monotonic version: 304 when ``If-None-Match``
+    matches, a delta when ``since`` is still in the version history (see
+    services.dashboard_delta), otherwise the full payload.
+    """
+    version = versions.observe(etag, data)
+    headers = {"ETag": f'"{etag}"', "X-Dashboard-Version": str(version), "Cache-Control": "no-cache"}
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    meta = {k: v for k, v in (envelope or {}).items() if k != "data"}
+    if since is not None:
+        previous = data if since == version else versions.get(since)
+        if previous is not None:
+            body = {**meta, "version": version, "delta": True, "since": since, **build_delta(previous, data)}
+            return JSONResponse(content=jsonable_encoder(body), headers=headers)
+    body = {**meta, "data": data} if envelope is not None else dict(data)
+    body["version"] = version
+    if since is not None:
+        body["delta"] = False
+    return JSONResponse(content=jsonable_encoder(body), headers=headers)
+
+
 @router.get("/dashboard/snapshot")
 def get_dashboard_snapshot_endpoint(
+    request: Request,
+    since: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -605,13 +649,16 @@ def get_dashboard_snapshot_endpoint(
     It does NOT trigger a full recomputation - that happens in background.
     
     This is a lightweight read-only operation that only queries the database cache.
+    Responses carry an ETag (304 on ``If-None-Match``) and a monotonic
+    ``version``; ``?since=<version>`` returns only what changed since then.
     
     Returns:
         {
             "data": { ... full dashboard payload ... },
             "last_updated_at": "2025-11-18T12:34:56Z",
             "stale_seconds": 17,
-            "stale": false
+            "stale": false,
+            "version": 1792180000123
         }
     """
     try:
@@ -646,7 +693,15 @@ def get_dashboard_snapshot_endpoint(
                 "stale": True,
                 "empty": True
             }
-        return snapshot
+        content_hash = snapshot.pop("content_hash", None)
+        flags = {"stale": snapshot.get("stale"), "empty": snapshot.get("empty")}
+        if content_hash:
+            etag = content_etag({"content_hash": content_hash, **flags})
+        else:
+            etag = content_etag({"data": snapshot.get("data"), **flags})
+        return _versioned_dashboard_response(
+            request, snapshot_versions, snapshot.get("data") or {}, etag, since, envelope=snapshot
+        )
     except Exception as e:
         log.error(f"Error getting dashboard snapshot: {e}", exc_info=True)
         # Return error response instead of raising exception to prevent frontend crashes
@@ -676,196 +731,91 @@ def get_dashboard_snapshot_endpoint(
         }
 
 
-async def _compute_dashboard_state(db: Session, request_context: Optional[dict] = None) -> dict:
+async def _load_dashboard_portfolio(db: Session, request_context: dict) -> dict:
     """
-    Core function to compute dashboard state.
-    This can be called directly without FastAPI dependencies.
-    
-    Args:
-        db: Database session (required)
-        request_context: Optional request context dict with headers and debug flags
-    
-    Returns:
-        dict: Dashboard state
+    Balances and totals for the dashboard: a fresh portfolio snapshot, else the
+    portfolio cache, else a one-off live fetch.
     """
-    start_time = time.time()
-    log.info("Starting dashboard state fetch")
-    
-    # Default request_context if not provided
-    if request_context is None:
-        request_context = {}
-    
+    # Try to get fresh portfolio snapshot first (if available and fresh)
+    portfolio_start = time.time()
+    portfolio_snapshot = None
     try:
-        # Try to get fresh portfolio snapshot first (if available and fresh)
-        portfolio_start = time.time()
-        portfolio_snapshot = None
-        try:
-            from app.services.portfolio_snapshot import get_latest_portfolio_snapshot
-            portfolio_snapshot = await asyncio.to_thread(get_latest_portfolio_snapshot, db, max_age_minutes=5)
-            if portfolio_snapshot:
-                log.info(f"Using fresh portfolio snapshot: {len(portfolio_snapshot.get('assets', []))} assets, source={portfolio_snapshot.get('portfolio_value_source')}")
-        except Exception as snapshot_err:
-            log.debug(f"Could not get portfolio snapshot: {snapshot_err}")
-        
-        # Load portfolio data from cache (v4.0 behavior) - fallback if no snapshot
-        # Execute in thread pool to prevent blocking the worker
-        if not portfolio_snapshot:
-            # Portfolio data is sourced from PortfolioBalance rows populated by portfolio_cache.update_portfolio_cache().
-            # get_portfolio_summary normalizes currencies and deduplicates balances per symbol so the frontend sees canonical assets.
-            portfolio_summary = await asyncio.to_thread(get_portfolio_summary, db, request_context)
-            portfolio_elapsed = time.time() - portfolio_start
-            log.info(f"Portfolio summary loaded in {portfolio_elapsed:.3f}s")
-        else:
-            portfolio_summary = None
-            portfolio_elapsed = time.time() - portfolio_start
-            log.info(f"Portfolio snapshot loaded in {portfolio_elapsed:.3f}s")
-        
-        # Use portfolio snapshot if available, otherwise fall back to portfolio_summary
-        portfolio_reconcile_data = None
+        from app.services.portfolio_snapshot import get_latest_portfolio_snapshot
+        portfolio_snapshot = await asyncio.to_thread(get_latest_portfolio_snapshot, db, max_age_minutes=5)
         if portfolio_snapshot:
-            # Use snapshot data. Normalize assets so frontend gets coin/currency (it filters on those).
-            raw_snapshot_assets = portfolio_snapshot.get("assets", [])
-            portfolio_assets = []
-            for asset in raw_snapshot_assets:
-                symbol = asset.get("symbol") or asset.get("coin") or asset.get("currency") or ""
-                if not symbol:
-                    continue
-                balance = float(asset.get("balance") or asset.get("total") or asset.get("free", 0) or 0)
-                value_usd = float(asset.get("value_usd") or asset.get("usd_value", 0) or 0)
-                portfolio_assets.append({
-                    "symbol": symbol,
-                    "coin": symbol,
-                    "currency": symbol,
-                    "balance": balance,
-                    "total": balance,
-                    "free": asset.get("free", 0),
-                    "locked": asset.get("locked", 0),
-                    "value_usd": value_usd,
-                    "usd_value": value_usd,
-                    "price_usd": asset.get("price_usd"),
-                })
-            balances_list = [
-                {
-                    "currency": asset.get("symbol") or asset.get("coin") or asset.get("currency"),
-                    "balance": asset.get("balance") or asset.get("total", 0),
-                    "usd_value": asset.get("value_usd") or asset.get("usd_value", 0)
-                }
-                for asset in portfolio_assets
-            ]
-            total_assets_usd = portfolio_snapshot.get("total_assets_usd", 0.0)
-            total_collateral_usd = portfolio_snapshot.get("total_collateral_usd", 0.0)
-            total_borrowed_usd = portfolio_snapshot.get("total_borrowed_usd", 0.0)
-            total_usd_value = portfolio_snapshot.get("total_value_usd", 0.0)
-            portfolio_value_source = portfolio_snapshot.get("portfolio_value_source", "crypto_com_live")
-            # Capture reconcile data from snapshot if present
-            portfolio_reconcile_data = portfolio_snapshot.get("reconcile")
-            # Parse as_of timestamp
-            as_of_str = portfolio_snapshot.get("as_of")
-            if as_of_str:
-                try:
-                    last_updated = datetime.fromisoformat(as_of_str.replace("Z", "+00:00")).timestamp()
-                except:
-                    last_updated = time.time()
-            else:
+            log.info(f"Using fresh portfolio snapshot: {len(portfolio_snapshot.get('assets', []))} assets, source={portfolio_snapshot.get('portfolio_value_source')}")
+    except Exception as snapshot_err:
+        log.debug(f"Could not get portfolio snapshot: {snapshot_err}")
+    
+    # Load portfolio data from cache (v4.0 behavior) - fallback if no snapshot
+    # Execute in thread pool to prevent blocking the worker
+    if not portfolio_snapshot:
+        # Portfolio data is sourced from PortfolioBalance rows populated by portfolio_cache.update_portfolio_cache().
+        # get_portfolio_summary normalizes currencies and deduplicates balances per symbol so the frontend sees canonical assets.
+        portfolio_summary = await asyncio.to_thread(get_portfolio_summary, db, request_context)
+        portfolio_elapsed = time.time() - portfolio_start
+        log.info(f"Portfolio summary loaded in {portfolio_elapsed:.3f}s")
+    else:
+        portfolio_summary = None
+        portfolio_elapsed = time.time() - portfolio_start
+        log.info(f"Portfolio snapshot loaded in {portfolio_elapsed:.3f}s")
+    
+    # Use portfolio snapshot if available, otherwise fall back to portfolio_summary
+    portfolio_reconcile_data = None
+    if portfolio_snapshot:
+        # Use snapshot data. Normalize assets so frontend gets coin/currency (it filters on those).
+        raw_snapshot_assets = portfolio_snapshot.get("assets", [])
+        portfolio_assets = []
+        for asset in raw_snapshot_assets:
+            symbol = asset.get("symbol") or asset.get("coin") or asset.get("currency") or ""
+            if not symbol:
+                continue
+            balance = float(asset.get("balance") or asset.get("total") or asset.get("free", 0) or 0)
+            value_usd = float(asset.get("value_usd") or asset.get("usd_value", 0) or 0)
+            portfolio_assets.append({
+                "symbol": symbol,
+                "coin": symbol,
+                "currency": symbol,
+                "balance": balance,
+                "total": balance,
+                "free": asset.get("free", 0),
+                "locked": asset.get("locked", 0),
+                "value_usd": value_usd,
+                "usd_value": value_usd,
+                "price_usd": asset.get("price_usd"),
+            })
+        balances_list = [
+            {
+                "currency": asset.get("symbol") or asset.get("coin") or asset.get("currency"),
+                "balance": asset.get("balance") or asset.get("total", 0),
+                "usd_value": asset.get("value_usd") or asset.get("usd_value", 0)
+            }
+            for asset in portfolio_assets
+        ]
+        total_assets_usd = portfolio_snapshot.get("total_assets_usd", 0.0)
+        total_collateral_usd = portfolio_snapshot.get("total_collateral_usd", 0.0)
+        total_borrowed_usd = portfolio_snapshot.get("total_borrowed_usd", 0.0)
+        total_usd_value = portfolio_snapshot.get("total_value_usd", 0.0)
+        portfolio_value_source = portfolio_snapshot.get("portfolio_value_source", "crypto_com_live")
+        # Capture reconcile data from snapshot if present
+        portfolio_reconcile_data = portfolio_snapshot.get("reconcile")
+        # Parse as_of timestamp
+        as_of_str = portfolio_snapshot.get("as_of")
+        if as_of_str:
+            try:
+                last_updated = datetime.fromisoformat(as_of_str.replace("Z", "+00:00")).timestamp()
+            except:
                 last_updated = time.time()
         else:
-            # Extract balances from portfolio summary (fallback). Guard: portfolio_summary may be None.
-            if portfolio_summary is None:
-                # No snapshot and no cache: try a one-off live fetch so Portfolio tab can show data
-                live_snapshot = None
-                try:
-                    from app.services.portfolio_snapshot import fetch_live_portfolio_snapshot, store_portfolio_snapshot
-                    log.info("[DASHBOARD_STATE] No snapshot or cache; attempting live portfolio fetch")
-                    live_snapshot = await asyncio.to_thread(fetch_live_portfolio_snapshot, db)
-                    if live_snapshot and live_snapshot.get("assets"):
-                        try:
-                            store_portfolio_snapshot(db, live_snapshot)
-                        except Exception as store_err:
-                            log.debug("Could not store live snapshot: %s", store_err)
-                except (ValueError, RuntimeError) as e:
-                    log.debug("[DASHBOARD_STATE] Live portfolio fetch skipped or failed: %s", e)
-                except Exception as e:
-                    log.debug("[DASHBOARD_STATE] Live portfolio fetch error: %s", e)
-                if live_snapshot and live_snapshot.get("assets"):
-                    raw_snapshot_assets = live_snapshot.get("assets", [])
-                    portfolio_assets = []
-                    for asset in raw_snapshot_assets:
-                        symbol = asset.get("symbol") or asset.get("coin") or asset.get("currency") or ""
-                        if not symbol:
-                            continue
-                        balance = float(asset.get("balance") or asset.get("total") or asset.get("free", 0) or 0)
-                        value_usd = float(asset.get("value_usd") or asset.get("usd_value", 0) or 0)
-                        portfolio_assets.append({
-                            "symbol": symbol,
-                            "coin": symbol,
-                            "currency": symbol,
-                            "balance": balance,
-                            "total": balance,
-                            "free": asset.get("free", 0),
-                            "locked": asset.get("locked", 0),
-                            "value_usd": value_usd,
-                            "usd_value": value_usd,
-                            "price_usd": asset.get("price_usd"),
-                        })
-                    balances_list = [
-                        {"currency": a.get("currency"), "balance": a.get("balance", 0), "usd_value": a.get("value_usd", 0)}
-                        for a in portfolio_assets
-                    ]
-                    total_assets_usd = float(live_snapshot.get("total_assets_usd", 0) or 0)
-                    total_collateral_usd = float(live_snapshot.get("total_collateral_usd", 0) or 0)
-                    total_borrowed_usd = float(live_snapshot.get("total_borrowed_usd", 0) or 0)
-                    total_usd_value = float(live_snapshot.get("total_value_usd", 0) or 0)
-                    portfolio_value_source = live_snapshot.get("portfolio_value_source", "crypto_com_live")
-                    portfolio_reconcile_data = live_snapshot.get("reconcile")
-                    as_of_str = live_snapshot.get("as_of")
-                    if as_of_str:
-                        try:
-                            last_updated = datetime.fromisoformat(as_of_str.replace("Z", "+00:00")).timestamp()
-                        except Exception:
-                            last_updated = time.time()
-                    else:
-                        last_updated = time.time()
-                    log.info("[DASHBOARD_STATE] Using live portfolio fetch: %s assets", len(portfolio_assets))
-                else:
-                    log.warning("[DASHBOARD_STATE] portfolio_summary=None; returning empty portfolio payload")
-                    balances_list = []
-                    total_assets_usd = 0.0
-                    total_collateral_usd = 0.0
-                    total_borrowed_usd = 0.0
-                    total_usd_value = 0.0
-                    portfolio_value_source = "derived:collateral_minus_borrowed"
-                    last_updated = None
-                    portfolio_reconcile_data = None
-                    portfolio_assets = []
-            else:
-                balances_list = portfolio_summary.get("balances", [])
-                # CRITICAL: Crypto.com Margin "Wallet Balance" = NET Wallet Balance (collateral - borrowed)
-                total_assets_usd = portfolio_summary.get("total_assets_usd", 0.0)
-                total_collateral_usd = portfolio_summary.get("total_collateral_usd", 0.0)
-                total_borrowed_usd = portfolio_summary.get("total_borrowed_usd", 0.0)
-                total_usd_value = portfolio_summary.get("total_usd", 0.0)
-                portfolio_value_source = portfolio_summary.get("portfolio_value_source", "derived:collateral_minus_borrowed")
-                last_updated = portfolio_summary.get("last_updated")
-                portfolio_reconcile_data = portfolio_summary.get("reconcile")
-                portfolio_assets = [
-                    {
-                        "coin": bal.get("currency", ""),
-                        "currency": bal.get("currency", ""),
-                        "symbol": bal.get("currency", ""),
-                        "balance": float(bal.get("balance", 0) or 0),
-                        "value_usd": float(bal.get("usd_value", 0) or 0),
-                        "usd_value": float(bal.get("usd_value", 0) or 0),
-                    }
-                    for bal in balances_list
-                    if bal.get("currency") and (float(bal.get("usd_value", 0) or 0) != 0 or float(bal.get("balance", 0) or 0) != 0)
-                ]
-        
-        # If cache/snapshot returned zero assets, try one-off live fetch so Portfolio tab can show data
-        if not portfolio_assets:
+            last_updated = time.time()
+    else:
+        # Extract balances from portfolio summary (fallback). Guard: portfolio_summary may be None.
+        if portfolio_summary is None:
+            # No snapshot and no cache: try a one-off live fetch so Portfolio tab can show data
             live_snapshot = None
             try:
                 from app.services.portfolio_snapshot import fetch_live_portfolio_snapshot, store_portfolio_snapshot
-                log.info("[DASHBOARD_STATE] No assets in cache/snapshot; attempting live portfolio fetch")
+                log.info("[DASHBOARD_STATE] No snapshot or cache; attempting live portfolio fetch")
                 live_snapshot = await asyncio.to_thread(fetch_live_portfolio_snapshot, db)
                 if live_snapshot and live_snapshot.get("assets"):
                     try:
@@ -915,359 +865,528 @@ async def _compute_dashboard_state(db: Session, request_context: Optional[dict]
                         last_updated = time.time()
                 else:
                     last_updated = time.time()
-                log.info("[DASHBOARD_STATE] Using live portfolio fetch (empty cache): %s assets", len(portfolio_assets))
-        
-        # Log raw data for debugging
-        log.debug(f"Portfolio data: assets={len(portfolio_assets)}, balances={len(balances_list)}, total_usd={total_usd_value}, source={portfolio_value_source}, last_updated={last_updated}")
-        
-        # Get unified open orders — cache first, database fallback when stale/empty
-        unified_orders_start = time.time()
-        from app.services.open_orders_resolver import resolve_open_orders
+                log.info("[DASHBOARD_STATE] Using live portfolio fetch: %s assets", len(portfolio_assets))
+            else:
+                log.warning("[DASHBOARD_STATE] portfolio_summary=None; returning empty portfolio payload")
+                balances_list = []
+                total_assets_usd = 0.0
+                total_collateral_usd = 0.0
+                total_borrowed_usd = 0.0
+                total_usd_value = 0.0
+                portfolio_value_source = "derived:collateral_minus_borrowed"
+                last_updated = None
+                portfolio_reconcile_data = None
+                portfolio_assets = []
+        else:
+            balances_list = portfolio_summary.get("balances", [])
+            # CRITICAL: Crypto.com Margin "Wallet Balance" = NET Wallet Balance (collateral - borrowed)
+            total_assets_usd = portfolio_summary.get("total_assets_usd", 0.0)
+            total_collateral_usd = portfolio_summary.get("total_collateral_usd", 0.0)
+            total_borrowed_usd = portfolio_summary.get("total_borrowed_usd", 0.0)
+            total_usd_value = portfolio_summary.get("total_usd", 0.0)
+            portfolio_value_source = portfolio_summary.get("portfolio_value_source", "derived:collateral_minus_borrowed")
+            last_updated = portfolio_summary.get("last_updated")
+            portfolio_reconcile_data = portfolio_summary.get("reconcile")
+            portfolio_assets = [
+                {
+                    "coin": bal.get("currency", ""),
+                    "currency": bal.get("currency", ""),
+                    "symbol": bal.get("currency", ""),
+                    "balance": float(bal.get("balance", 0) or 0),
+                    "value_usd": float(bal.get("usd_value", 0) or 0),
+                    "usd_value": float(bal.get("usd_value", 0) or 0),
+                }
+                for bal in balances_list
+                if bal.get("currency") and (float(bal.get("usd_value", 0) or 0) != 0 or float(bal.get("balance", 0) or 0) != 0)
+            ]
+    
+    # If cache/snapshot returned zero assets, try one-off live fetch so Portfolio tab can show data
+    if not portfolio_assets:
+        live_snapshot = None
+        try:
+            from app.services.portfolio_snapshot import fetch_live_portfolio_snapshot, store_portfolio_snapshot
+            log.info("[DASHBOARD_STATE] No assets in cache/snapshot; attempting live portfolio fetch")
+            live_snapshot = await asyncio.to_thread(fetch_live_portfolio_snapshot, db)
+            if live_snapshot and live_snapshot.get("assets"):
+                try:
+                    store_portfolio_snapshot(db, live_snapshot)
+                except Exception as store_err:
+                    log.debug("Could not store live snapshot: %s", store_err)
+        except (ValueError, RuntimeError) as e:
+            log.debug("[DASHBOARD_STATE] Live portfolio fetch skipped or failed: %s", e)
+        except Exception as e:
+            log.debug("[DASHBOARD_STATE] Live portfolio fetch error: %s", e)
+        if live_snapshot and live_snapshot.get("assets"):
+            raw_snapshot_assets = live_snapshot.get("assets", [])
+            portfolio_assets = []
+            for asset in raw_snapshot_assets:
+                symbol = asset.get("symbol") or asset.get("coin") or asset.get("currency") or ""
+                if not symbol:
+                    continue
+                balance = float(asset.get("balance") or asset.get("total") or asset.get("free", 0) or 0)
+                value_usd = float(asset.get("value_usd") or asset.get("usd_value", 0) or 0)
+                portfolio_assets.append({
+                    "symbol": symbol,
+                    "coin": symbol,
+                    "currency": symbol,
+                    "balance": balance,
+                    "total": balance,
+                    "free": asset.get("free", 0),
+                    "locked": asset.get("locked", 0),
+                    "value_usd": value_usd,
+                    "usd_value": value_usd,
+                    "price_usd": asset.get("price_usd"),
+                })
+            balances_list = [
+                {"currency": a.get("currency"), "balance": a.get("balance", 0), "usd_value": a.get("value_usd", 0)}
+                for a in portfolio_assets
+            ]
+            total_assets_usd = float(live_snapshot.get("total_assets_usd", 0) or 0)
+            total_collateral_usd = float(live_snapshot.get("total_collateral_usd", 0) or 0)
+            total_borrowed_usd = float(live_snapshot.get("total_borrowed_usd", 0) or 0)
+            total_usd_value = float(live_snapshot.get("total_value_usd", 0) or 0)
+            portfolio_value_source = live_snapshot.get("portfolio_value_source", "crypto_com_live")
+            portfolio_reconcile_data = live_snapshot.get("reconcile")
+            as_of_str = live_snapshot.get("as_of")
+            if as_of_str:
+                try:
+                    last_updated = datetime.fromisoformat(as_of_str.replace("Z", "+00:00")).timestamp()
+                except Exception:
+                    last_updated = time.time()
+            else:
+                last_updated = time.time()
+            log.info("[DASHBOARD_STATE] Using live portfolio fetch (empty cache): %s assets", len(portfolio_assets))
+    
+    # Log raw data for debugging
+    log.debug(f"Portfolio data: assets={len(portfolio_assets)}, balances={len(balances_list)}, total_usd={total_usd_value}, source={portfolio_value_source}, last_updated={last_updated}")
+    return {
+        "portfolio_summary": portfolio_summary,
+        "balances_list": balances_list,
+        "total_assets_usd": total_assets_usd,
+        "total_collateral_usd": total_collateral_usd,
+        "total_borrowed_usd": total_borrowed_usd,
+        "total_usd_value": total_usd_value,
+        "portfolio_value_source": portfolio_value_source,
+        "last_updated": last_updated,
+        "portfolio_reconcile_data": portfolio_reconcile_data,
+    }
+
+
+def _resolve_dashboard_open_orders(db: Session) -> Tuple[list, dict]:
+    """Unified open orders (cache first, database fallback when stale/empty) and their summary."""
+    unified_orders_start = time.time()
+    from app.services.open_orders_resolver import resolve_open_orders
+
+    resolved_open_orders = resolve_open_orders(db)
+    unified_open_orders = resolved_open_orders.orders
+
+    cached_order_ids = {order.order_id for order in unified_open_orders}
+    cached_symbols = {order.symbol for order in unified_open_orders}
+    log.info(
+        "[OPEN_ORDERS] Resolved %s open orders (source=%s, sync_status=%s). Order IDs: %s... Symbols: %s",
+        len(unified_open_orders),
+        resolved_open_orders.source,
+        resolved_open_orders.sync_status,
+        sorted(cached_order_ids)[:10],
+        sorted(cached_symbols),
+    )
 
-        resolved_open_orders = resolve_open_orders(db)
-        unified_open_orders = resolved_open_orders.orders
+    if resolved_open_orders.source == "crypto_com_api":
+        try:
+            from app.models.exchange_order import ExchangeOrder, OrderStatusEnum
+            from sqlalchemy import func
+            from datetime import timezone as tz
+
+            open_statuses = [OrderStatusEnum.NEW, OrderStatusEnum.ACTIVE, OrderStatusEnum.PARTIALLY_FILLED]
+
+            from sqlalchemy import or_
+
+            db_orders = db.query(ExchangeOrder).filter(
+                or_(
+                    ExchangeOrder.status.in_(open_statuses),
+                    ExchangeOrder.order_role.in_(['STOP_LOSS', 'TAKE_PROFIT']),  # type: ignore[reportGeneralTypeIssues]
+                    ExchangeOrder.order_type.in_(['STOP_LIMIT', 'TAKE_PROFIT_LIMIT', 'STOP_LOSS', 'TAKE_PROFIT'])
+                )
+            ).order_by(
+                func.coalesce(ExchangeOrder.exchange_create_time, ExchangeOrder.created_at).desc()
+            ).limit(500).all()
+
+            db_order_ids = {str(order.exchange_order_id) for order in db_orders}
+            db_symbols = {str(getattr(o, "symbol", "") or "") for o in db_orders if getattr(o, "symbol", None)}
+            log.info(f"[OPEN_ORDERS] Database has {len(db_orders)} orders with open status. Order IDs: {sorted(db_order_ids)[:10]}... Symbols: {sorted(db_symbols)}")
+
+            ghost_orders = []
+            for db_order in db_orders:
+                order_id_str = str(db_order.exchange_order_id)
+                if order_id_str not in cached_order_ids:
+                    ghost_orders.append({
+                        "order_id": order_id_str,
+                        "symbol": db_order.symbol,
+                        "status": db_order.status.value if hasattr(db_order.status, 'value') else str(db_order.status),
+                        "side": db_order.side.value if hasattr(db_order.side, 'value') else str(db_order.side),
+                    })
 
-        cached_order_ids = {order.order_id for order in unified_open_orders}
-        cached_symbols = {order.symbol for order in unified_open_orders}
+            if ghost_orders:
+                log.warning(f"[GHOST_ORDERS] Detected {len(ghost_orders)} ghost orders in database that don't exist in Crypto.com: {ghost_orders[:5]}")
+                for ghost in ghost_orders[:10]:
+                    log.warning(f"[GHOST_ORDER] Dropping ghost order: {ghost['order_id']} ({ghost['symbol']}) - status={ghost['status']}, side={ghost['side']} - NOT in Crypto.com API response")
+
+        except Exception as db_err:
+            log.warning(f"Error checking database for ghost orders: {db_err}")
+    elif resolved_open_orders.source == "database_fallback":
         log.info(
-            "[OPEN_ORDERS] Resolved %s open orders (source=%s, sync_status=%s). Order IDs: %s... Symbols: %s",
+            "[OPEN_ORDERS] Dashboard using database fallback (%s orders, sync_status=%s)",
             len(unified_open_orders),
-            resolved_open_orders.source,
             resolved_open_orders.sync_status,
-            sorted(cached_order_ids)[:10],
-            sorted(cached_symbols),
         )
 
-        if resolved_open_orders.source == "crypto_com_api":
-            try:
-                from app.models.exchange_order import ExchangeOrder, OrderStatusEnum
-                from sqlalchemy import func
-                from datetime import timezone as tz
+    open_orders_list = [serialize_unified_order(order) for order in unified_open_orders]
+    unified_orders_elapsed = time.time() - unified_orders_start
+    log.info(f"[PERF] resolve_open_orders took {unified_orders_elapsed:.3f} seconds, total orders: {len(open_orders_list)}")
 
-                open_statuses = [OrderStatusEnum.NEW, OrderStatusEnum.ACTIVE, OrderStatusEnum.PARTIALLY_FILLED]
+    open_orders_summary = {
+        "orders": open_orders_list,
+        "last_updated": resolved_open_orders.last_updated,
+        **resolved_open_orders.to_sync_meta(),
+    }
+    return unified_open_orders, open_orders_summary
 
-                from sqlalchemy import or_
 
-                db_orders = db.query(ExchangeOrder).filter(
-                    or_(
-                        ExchangeOrder.status.in_(open_statuses),
-                        ExchangeOrder.order_role.in_(['STOP_LOSS', 'TAKE_PROFIT']),  # type: ignore[reportGeneralTypeIssues]
-                        ExchangeOrder.order_type.in_(['STOP_LIMIT', 'TAKE_PROFIT_LIMIT', 'STOP_LOSS', 'TAKE_PROFIT'])
-                    )
-                ).order_by(
-                    func.coalesce(ExchangeOrder.exchange_create_time, ExchangeOrder.created_at).desc()
-                ).limit(500).all()
-
-                db_order_ids = {str(order.exchange_order_id) for order in db_orders}
-                db_symbols = {str(getattr(o, "symbol", "") or "") for o in db_orders if getattr(o, "symbol", None)}
-                log.info(f"[OPEN_ORDERS] Database has {len(db_orders)} orders with open status. Order IDs: {sorted(db_order_ids)[:10]}... Symbols: {sorted(db_symbols)}")
-
-                ghost_orders = []
-                for db_order in db_orders:
-                    order_id_str = str(db_order.exchange_order_id)
-                    if order_id_str not in cached_order_ids:
-                        ghost_orders.append({
-                            "order_id": order_id_str,
-                            "symbol": db_order.symbol,
-                            "status": db_order.status.value if hasattr(db_order.status, 'value') else str(db_order.status),
-                            "side": db_order.side.value if hasattr(db_order.side, 'value') else str(db_order.side),
-                        })
-
-                if ghost_orders:
-                    log.warning(f"[GHOST_ORDERS] Detected {len(ghost_orders)} ghost orders in database that don't exist in Crypto.com: {ghost_orders[:5]}")
-                    for ghost in ghost_orders[:10]:
-                        log.warning(f"[GHOST_ORDER] Dropping ghost order: {ghost['order_id']} ({ghost['symbol']}) - status={ghost['status']}, side={ghost['side']} - NOT in Crypto.com API response")
-
-            except Exception as db_err:
-                log.warning(f"Error checking database for ghost orders: {db_err}")
-        elif resolved_open_orders.source == "database_fallback":
-            log.info(
-                "[OPEN_ORDERS] Dashboard using database fallback (%s orders, sync_status=%s)",
-                len(unified_open_orders),
-                resolved_open_orders.sync_status,
-            )
+def _dashboard_open_orders_payload(open_orders_summary: dict) -> dict:
+    """Open-orders keys of the dashboard state."""
+    open_orders_list = open_orders_summary.get("orders") or []
+    return {
+        "open_orders": open_orders_list,
+        "exchange_open_orders_count": len(open_orders_list),
+        "open_orders_summary": open_orders_summary,
+        "open_orders_sync_status": open_orders_summary.get("sync_status"),
+        "open_orders_data_verified": open_orders_summary.get("data_verified"),
+    }
 
-        open_orders_list = [serialize_unified_order(order) for order in unified_open_orders]
-        unified_orders_elapsed = time.time() - unified_orders_start
-        log.info(f"[PERF] resolve_open_orders took {unified_orders_elapsed:.3f} seconds, total orders: {len(open_orders_list)}")
 
-        open_orders_summary = {
-            "orders": open_orders_list,
-            "last_updated": resolved_open_orders.last_updated,
-            **resolved_open_orders.to_sync_meta(),
-        }
-        
-        # Calculate portfolio order metrics
-        metrics_start = time.time()
-        order_metrics = calculate_portfolio_order_metrics(unified_open_orders)
-        metrics_elapsed = time.time() - metrics_start
-        log.info(f"[PERF] calculate_portfolio_order_metrics took {metrics_elapsed:.3f} seconds")
-        
-        # Per-coin N/limit must match Signal Monitor / trading guardrails:
-        # bot entry exposure slots — NOT pending TP/SL legs (those inflated BTC to 14/3).
-        from app.services.dashboard_position_counts import (
-            collect_bases_for_position_counts,
-            compute_open_position_counts,
-            compute_protection_leg_stats,
-        )
+async def _build_dashboard_portfolio(
+    db: Session,
+    request_context: dict,
+    loaded: dict,
+    unified_open_orders: list,
+) -> dict:
+    """
+    Portfolio keys of the dashboard state: ``loaded`` balances (see
+    ``_load_dashboard_portfolio``) enriched with per-coin position counts,
+    TP/SL legs from the open orders and unrealized P&L.
+    """
+    portfolio_summary = loaded["portfolio_summary"]
+    balances_list = loaded["balances_list"]
+    total_assets_usd = loaded["total_assets_usd"]
+    total_collateral_usd = loaded["total_collateral_usd"]
+    total_borrowed_usd = loaded["total_borrowed_usd"]
+    total_usd_value = loaded["total_usd_value"]
+    portfolio_value_source = loaded["portfolio_value_source"]
+    last_updated = loaded["last_updated"]
+    portfolio_reconcile_data = loaded["portfolio_reconcile_data"]
+
+    # Calculate portfolio order metrics
+    metrics_start = time.time()
+    order_metrics = calculate_portfolio_order_metrics(unified_open_orders)
+    metrics_elapsed = time.time() - metrics_start
+    log.info(f"[PERF] calculate_portfolio_order_metrics took {metrics_elapsed:.3f} seconds")
+    
+    # Per-coin N/limit must match Signal Monitor / trading guardrails:
+    # bot entry exposure slots — NOT pending TP/SL legs (those inflated BTC to 14/3).
+    from app.services.dashboard_position_counts import (
+        collect_bases_for_position_counts,
+        compute_open_position_counts,
+        compute_protection_leg_stats,
+    )
 
-        bases_for_counts = collect_bases_for_position_counts(balances_list, unified_open_orders)
-        open_position_counts = compute_open_position_counts(
-            db, bases_for_counts, balances=balances_list
-        )
-        open_tp_counts, open_protective_counts, ghost_protection_alerts = compute_protection_leg_stats(
-            unified_open_orders, balances_list
+    bases_for_counts = collect_bases_for_position_counts(balances_list, unified_open_orders)
+    open_position_counts = compute_open_position_counts(
+        db, bases_for_counts, balances=balances_list
+    )
+    open_tp_counts, open_protective_counts, ghost_protection_alerts = compute_protection_leg_stats(
+        unified_open_orders, balances_list
+    )
+    if ghost_protection_alerts:
+        log.warning(
+            "[PORTFOLIO] %s ghost/orphan protection leg(s) vs wallet (showing up to 5): %s",
+            len(ghost_protection_alerts),
+            ghost_protection_alerts[:5],
         )
-        if ghost_protection_alerts:
-            log.warning(
-                "[PORTFOLIO] %s ghost/orphan protection leg(s) vs wallet (showing up to 5): %s",
-                len(ghost_protection_alerts),
-                ghost_protection_alerts[:5],
-            )
-        
-        # Format portfolio assets (v4.0 format)
-        # Filter: include non-zero balances/usd (margin shorts are negative)
-        portfolio_assets = []
-        market_prices: Dict[str, float] = {}
-        for balance in balances_list:
-            balance_amount = balance.get("balance", 0.0)
-            usd_value = balance.get("usd_value", 0.0)
+    
+    # Format portfolio assets (v4.0 format)
+    # Filter: include non-zero balances/usd (margin shorts are negative)
+    portfolio_assets = []
+    market_prices: Dict[str, float] = {}
+    for balance in balances_list:
+        balance_amount = balance.get("balance", 0.0)
+        usd_value = balance.get("usd_value", 0.0)
+        
+        # Include longs and shorts: non-zero balance OR non-zero usd_value
+        if balance_amount != 0 or usd_value != 0:
+            currency = balance.get("currency", balance.get("asset", "")).upper()
+            # Extract base currency (e.g., "AAVE" from "AAVE_USDT" or just "AAVE")
+            base_currency = currency.split("_")[0] if "_" in currency else currency
             
-            # Include longs and shorts: non-zero balance OR non-zero usd_value
-            if balance_amount != 0 or usd_value != 0:
-                currency = balance.get("currency", balance.get("asset", "")).upper()
-                # Extract base currency (e.g., "AAVE" from "AAVE_USDT" or just "AAVE")
-                base_currency = currency.split("_")[0] if "_" in currency else currency
-                
-                # Search for metrics using multiple strategies to handle symbol variants
-                # This ensures we find metrics whether they're indexed by base_symbol or full symbol
-                # Example: Balance "AAVE" needs to match orders "AAVE_USDT" or "AAVE_USD"
-                metrics = {}
-                
-                # Strategy 1: Try base_currency (metrics are typically indexed by base_symbol)
-                # This handles cases where orders are "AAVE_USDT" but metrics indexed by "AAVE"
-                if base_currency in order_metrics:
-                    metrics = order_metrics[base_currency]
-                
-                # Strategy 2: Try full currency name if it differs from base
-                # This handles cases where metrics might be indexed by full symbol
-                if not metrics and currency != base_currency and currency in order_metrics:
-                    metrics = order_metrics[currency]
-                
-                # Strategy 3: Try common variants (USDT/USD) for all coins
-                # This handles cases where balance is "AAVE" but orders are "AAVE_USDT" or "AAVE_USD"
-                if not metrics:
-                    for variant in [f"{base_currency}_USDT", f"{base_currency}_USD"]:
-                        if variant in order_metrics:
-                            metrics = order_metrics[variant]
-                            log.debug(f"Found metrics for {currency} using variant {variant}")
-                            break
-                
-                # Bot entry/exposure count (same as Watchlist N/limit + Signal Monitor)
-                open_orders_count = int(open_position_counts.get(base_currency, 0) or 0)
-                tp_leg_count = int(open_tp_counts.get(base_currency, 0) or 0)
-                protective_leg_count = int(open_protective_counts.get(base_currency, 0) or 0)
-
-                tp_price = metrics.get("tp")
-                sl_price = metrics.get("sl")
-
-                # Ensure all numeric values are JSON-serializable (float, not Decimal)
-                currency = balance.get("currency", "")
-                # Frontend expects 'asset' field (DashboardBalance interface)
-                # Also include currency/coin for backward compatibility
-                portfolio_assets.append({
-                    "asset": currency,  # Frontend DashboardBalance expects 'asset' field
-                    "currency": currency,
-                    "coin": currency,  # Add coin field for frontend compatibility
-                    "balance": float(balance_amount) if balance_amount is not None else 0.0,
-                    "total": float(balance_amount) if balance_amount is not None else 0.0,  # Frontend expects 'total'
-                    "free": float(balance.get("available", balance_amount)) if balance_amount is not None else 0.0,  # Frontend expects 'free'
-                    "locked": float(balance.get("reserved", 0)) if balance_amount is not None else 0.0,  # Frontend expects 'locked'
-                    "usd_value": float(usd_value) if usd_value is not None else 0.0,
-                    "market_value": float(usd_value) if usd_value is not None else 0.0,  # Also include market_value for compatibility
-                    "open_orders_count": open_orders_count,
-                    "tp_leg_count": tp_leg_count,
-                    "protective_leg_count": protective_leg_count,
-                    "tp": float(tp_price) if tp_price is not None else None,
-                    "sl": float(sl_price) if sl_price is not None else None,
-                })
-                
-                if open_orders_count or tp_leg_count or tp_price or sl_price:
-                    log.info(
-                        "[PORTFOLIO] %s: positions=%s tp_legs=%s protective=%s tp=%s sl=%s",
-                        base_currency,
-                        open_orders_count,
-                        tp_leg_count,
-                        protective_leg_count,
-                        f"{float(tp_price):.2f}" if tp_price else None,
-                        f"{float(sl_price):.2f}" if sl_price else None,
-                    )
-        
-        # Enrich each asset with per-coin unrealized P&L vs its cost basis.
-        # Reuses the expected_take_profit cost-basis source of truth so the
-        # Portfolio tab and the Expected TP modal agree. When no filled BUY
-        # orders are tracked for a coin, cost_basis_unknown=True and pnl fields
-        # stay None so the frontend renders "—" (we never fabricate a number).
-        def _enrich_portfolio_pnl():
-            from app.services.expected_take_profit import compute_average_buy_price
-
-            fiat_bases = {"USD", "USDT", "USDC", "EUR", "DAI"}
-            for asset in portfolio_assets:
-                asset["avg_buy_price"] = None
-                asset["pnl_pct"] = None
-                asset["net_profit_usd"] = None
-                asset["cost_basis_unknown"] = True
-
-                coin = (asset.get("coin") or asset.get("currency") or asset.get("asset") or "").upper()
-                base = coin.split("_")[0] if "_" in coin else coin
-                if not base or base in fiat_bases:
-                    continue
+            # Search for metrics using multiple strategies to handle symbol variants
+            # This ensures we find metrics whether they're indexed by base_symbol or full symbol
+            # Example: Balance "AAVE" needs to match orders "AAVE_USDT" or "AAVE_USD"
+            metrics = {}
+            
+            # Strategy 1: Try base_currency (metrics are typically indexed by base_symbol)
+            # This handles cases where orders are "AAVE_USDT" but metrics indexed by "AAVE"
+            if base_currency in order_metrics:
+                metrics = order_metrics[base_currency]
+            
+            # Strategy 2: Try full currency name if it differs from base
+            # This handles cases where metrics might be indexed by full symbol
+            if not metrics and currency != base_currency and currency in order_metrics:
+                metrics = order_metrics[currency]
+            
+            # Strategy 3: Try common variants (USDT/USD) for all coins
+            # This handles cases where balance is "AAVE" but orders are "AAVE_USDT" or "AAVE_USD"
+            if not metrics:
+                for variant in [f"{base_currency}_USDT", f"{base_currency}_USD"]:
+                    if variant in order_metrics:
+                        metrics = order_metrics[variant]
+                        log.debug(f"Found metrics for {currency} using variant {variant}")
+                        break
+            
+            # Bot entry/exposure count (same as Watchlist N/limit + Signal Monitor)
+            open_orders_count = int(open_position_counts.get(base_currency, 0) or 0)
+            tp_leg_count = int(open_tp_counts.get(base_currency, 0) or 0)
+            protective_leg_count = int(open_protective_counts.get(base_currency, 0) or 0)
+
+            tp_price = metrics.get("tp")
+            sl_price = metrics.get("sl")
+
+            # Ensure all numeric values are JSON-serializable (float, not Decimal)
+            currency = balance.get("currency", "")
+            # Frontend expects 'asset' field (DashboardBalance interface)
+            # Also include currency/coin for backward compatibility
+            portfolio_assets.append({
+                "asset": currency,  # Frontend DashboardBalance expects 'asset' field
+                "currency": currency,
+                "coin": currency,  # Add coin field for frontend compatibility
+                "balance": float(balance_amount) if balance_amount is not None else 0.0,
+                "total": float(balance_amount) if balance_amount is not None else 0.0,  # Frontend expects 'total'
+                "free": float(balance.get("available", balance_amount)) if balance_amount is not None else 0.0,  # Frontend expects 'free'
+                "locked": float(balance.get("reserved", 0)) if balance_amount is not None else 0.0,  # Frontend expects 'locked'
+                "usd_value": float(usd_value) if usd_value is not None else 0.0,
+                "market_value": float(usd_value) if usd_value is not None else 0.0,  # Also include market_value for compatibility
+                "open_orders_count": open_orders_count,
+                "tp_leg_count": tp_leg_count,
+                "protective_leg_count": protective_leg_count,
+                "tp": float(tp_price) if tp_price is not None else None,
+                "sl": float(sl_price) if sl_price is not None else None,
+            })
+            
+            if open_orders_count or tp_leg_count or tp_price or sl_price:
+                log.info(
+                    "[PORTFOLIO] %s: positions=%s tp_legs=%s protective=%s tp=%s sl=%s",
+                    base_currency,
+                    open_orders_count,
+                    tp_leg_count,
+                    protective_leg_count,
+                    f"{float(tp_price):.2f}" if tp_price else None,
+                    f"{float(sl_price):.2f}" if sl_price else None,
+                )
+    
+    # Enrich each asset with per-coin unrealized P&L vs its cost basis.
+    # Reuses the expected_take_profit cost-basis source of truth so the
+    # Portfolio tab and the Expected TP modal agree. When no filled BUY
+    # orders are tracked for a coin, cost_basis_unknown=True and pnl fields
+    # stay None so the frontend renders "—" (we never fabricate a number).
+    def _enrich_portfolio_pnl():
+        from app.services.expected_take_profit import compute_average_buy_price
 
-                try:
-                    balance = float(asset.get("balance") or 0)
-                    usd_value = float(asset.get("usd_value") or asset.get("value_usd") or 0)
-                except (TypeError, ValueError):
-                    continue
-                if balance <= 0 or usd_value <= 0:
-                    continue
+        fiat_bases = {"USD", "USDT", "USDC", "EUR", "DAI"}
+        for asset in portfolio_assets:
+            asset["avg_buy_price"] = None
+            asset["pnl_pct"] = None
+            asset["net_profit_usd"] = None
+            asset["cost_basis_unknown"] = True
+
+            coin = (asset.get("coin") or asset.get("currency") or asset.get("asset") or "").upper()
+            base = coin.split("_")[0] if "_" in coin else coin
+            if not base or base in fiat_bases:
+                continue
 
-                try:
-                    avg_price, cost_basis_unknown = compute_average_buy_price(db, coin)
-                except Exception as pnl_err:
-                    log.warning(f"[PORTFOLIO_PNL] cost-basis lookup failed for {coin}: {pnl_err}")
-                    continue
+            try:
+                balance = float(asset.get("balance") or 0)
+                usd_value = float(asset.get("usd_value") or asset.get("value_usd") or 0)
+            except (TypeError, ValueError):
+                continue
+            if balance <= 0 or usd_value <= 0:
+                continue
 
-                if cost_basis_unknown or not avg_price or float(avg_price) <= 0:
-                    continue
+            try:
+                avg_price, cost_basis_unknown = compute_average_buy_price(db, coin)
+            except Exception as pnl_err:
+                log.warning(f"[PORTFOLIO_PNL] cost-basis lookup failed for {coin}: {pnl_err}")
+                continue
 
-                avg = float(avg_price)
-                current_price = usd_value / balance
-                asset["avg_buy_price"] = avg
-                asset["pnl_pct"] = (current_price - avg) / avg * 100.0
-                asset["net_profit_usd"] = usd_value - (balance * avg)
-                asset["cost_basis_unknown"] = False
+            if cost_basis_unknown or not avg_price or float(avg_price) <= 0:
+                continue
 
-        try:
-            await asyncio.to_thread(_enrich_portfolio_pnl)
-        except Exception as enrich_err:
-            log.warning(f"[PORTFOLIO_PNL] P&L enrichment skipped: {enrich_err}")
-
-        # Log portfolio data for debugging
-        log.info(f"Portfolio loaded: {len(portfolio_assets)} assets, total_usd=${total_usd_value:,.2f}")
-        if portfolio_assets:
-            first_10_symbols = [a["currency"] for a in portfolio_assets[:10]]
-            log.info(f"First 10 symbols: {first_10_symbols}")
+            avg = float(avg_price)
+            current_price = usd_value / balance
+            asset["avg_buy_price"] = avg
+            asset["pnl_pct"] = (current_price - avg) / avg * 100.0
+            asset["net_profit_usd"] = usd_value - (balance * avg)
+            asset["cost_basis_unknown"] = False
+
+    try:
+        await asyncio.to_thread(_enrich_portfolio_pnl)
+    except Exception as enrich_err:
+        log.warning(f"[PORTFOLIO_PNL] P&L enrichment skipped: {enrich_err}")
+
+    # Log portfolio data for debugging
+    log.info(f"Portfolio loaded: {len(portfolio_assets)} assets, total_usd=${total_usd_value:,.2f}")
+    if portfolio_assets:
+        first_10_symbols = [a["currency"] for a in portfolio_assets[:10]]
+        log.info(f"First 10 symbols: {first_10_symbols}")
+    else:
+        log.warning("⚠️ No portfolio assets found - portfolio.assets is empty")
+
+    # Log detailed diagnostics if portfolio is empty (never call .keys() on None)
+    if len(portfolio_assets) == 0:
+        log.warning("⚠️ DIAGNOSTIC: Portfolio assets is empty")
+        log.warning(f"   - balances_list length: {len(balances_list)}")
+        if portfolio_summary is not None:
+            log.warning(f"   - portfolio_summary keys: {list(portfolio_summary.keys())}")
         else:
-            log.warning("⚠️ No portfolio assets found - portfolio.assets is empty")
-        
-        log.info(f"Open orders (unified) loaded: {len(open_orders_list)} orders")
-        elapsed = time.time() - start_time
-        log.info(f"✅ Dashboard state returned in {elapsed:.3f}s: {len(portfolio_assets)} assets, {len(open_orders_list)} orders")
-        
-        # Log detailed diagnostics if portfolio is empty (never call .keys() on None)
-        if len(portfolio_assets) == 0:
-            log.warning("⚠️ DIAGNOSTIC: Portfolio assets is empty")
-            log.warning(f"   - balances_list length: {len(balances_list)}")
-            if portfolio_summary is not None:
-                log.warning(f"   - portfolio_summary keys: {list(portfolio_summary.keys())}")
-            else:
-                log.warning("   - [DASHBOARD_STATE] portfolio_summary=None (snapshot path or get_portfolio_summary returned None)")
-            if balances_list:
-                log.warning(f"   - First 3 balances: {balances_list[:3]}")
-            else:
-                log.warning("   - balances_list is empty - checking if portfolio cache needs update")
-                # Check if we should trigger a cache update (only when portfolio_summary was used, not None)
-                try:
-                    if portfolio_summary is None:
-                        log.info("   - portfolio_summary is None; skipping cache update retry")
-                    else:
-                        from app.services.portfolio_cache import update_portfolio_cache
-                        log.info("   - Attempting to update portfolio cache...")
-                        update_result = await asyncio.to_thread(update_portfolio_cache, db)
-                        if update_result.get("success"):
-                            log.info("   - Portfolio cache updated successfully, retrying get_portfolio_summary")
-                            portfolio_summary = await asyncio.to_thread(get_portfolio_summary, db, request_context)
-                            if portfolio_summary is None:
-                                log.warning("   - get_portfolio_summary still returned None after cache update")
-                            else:
-                                balances_list = portfolio_summary.get("balances", [])
-                                total_usd_value = portfolio_summary.get("total_usd", 0.0)
-                                total_assets_usd = portfolio_summary.get("total_assets_usd", 0.0)
-                                total_borrowed_usd = portfolio_summary.get("total_borrowed_usd", 0.0)
-                                last_updated = portfolio_summary.get("last_updated")
-                                portfolio_assets = []
-                                for balance in balances_list:
-                                    balance_amount = balance.get("balance", 0.0)
-                                    usd_value = balance.get("usd_value", 0.0)
-                                    if balance_amount != 0 or usd_value != 0:
-                                        currency = balance.get("currency", "")
-                                        portfolio_assets.append({
-                                            "currency": currency,
-                                            "balance": balance_amount,
-                                            "usd_value": usd_value
-                                        })
-                                        try:
-                                            if currency and balance_amount and usd_value:
-                                                market_prices[currency.upper()] = float(usd_value) / float(balance_amount)
-                                        except (TypeError, ValueError, ZeroDivisionError):
-                                            pass
-                                log.info(f"   - After cache update: {len(portfolio_assets)} assets loaded")
+            log.warning("   - [DASHBOARD_STATE] portfolio_summary=None (snapshot path or get_portfolio_summary returned None)")
+        if balances_list:
+            log.warning(f"   - First 3 balances: {balances_list[:3]}")
+        else:
+            log.warning("   - balances_list is empty - checking if portfolio cache needs update")
+            # Check if we should trigger a cache update (only when portfolio_summary was used, not None)
+            try:
+                if portfolio_summary is None:
+                    log.info("   - portfolio_summary is None; skipping cache update retry")
+                else:
+                    from app.services.portfolio_cache import update_portfolio_cache
+                    log.info("   - Attempting to update portfolio cache...")
+                    update_result = await asyncio.to_thread(update_portfolio_cache, db)
+                    if update_result.get("success"):
+                        log.info("   - Portfolio cache updated successfully, retrying get_portfolio_summary")
+                        portfolio_summary = await asyncio.to_thread(get_portfolio_summary, db, request_context)
+                        if portfolio_summary is None:
+                            log.warning("   - get_portfolio_summary still returned None after cache update")
                         else:
-                            error_msg = update_result.get('error', 'Unknown error')
-                            if update_result.get('auth_error') or '40101' in error_msg or 'Authentication' in error_msg:
-                                log.error(f"   - Portfolio cache update failed: {error_msg}")
-                                log.warning("   - ⚠️ Authentication error detected - will not retry immediately. Check API credentials and IP whitelist.")
-                            else:
-                                log.error(f"   - Portfolio cache update failed: {error_msg}")
-                except Exception as update_err:
-                    error_str = str(update_err)
-                    if '40101' in error_str or 'Authentication' in error_str:
-                        log.error(f"   - Error updating portfolio cache (authentication): {update_err}")
-                        log.warning("   - ⚠️ Authentication error - check API credentials and IP whitelist")
+                            balances_list = portfolio_summary.get("balances", [])
+                            total_usd_value = portfolio_summary.get("total_usd", 0.0)
+                            total_assets_usd = portfolio_summary.get("total_assets_usd", 0.0)
+                            total_borrowed_usd = portfolio_summary.get("total_borrowed_usd", 0.0)
+                            last_updated = portfolio_summary.get("last_updated")
+                            portfolio_assets = []
+                            for balance in balances_list:
+                                balance_amount = balance.get("balance", 0.0)
+                                usd_value = balance.get("usd_value", 0.0)
+                                if balance_amount != 0 or usd_value != 0:
+                                    currency = balance.get("currency", "")
+                                    portfolio_assets.append({
+                                        "currency": currency,
+                                        "balance": balance_amount,
+                                        "usd_value": usd_value
+                                    })
+                                    try:
+                                        if currency and balance_amount and usd_value:
+                                            market_prices[currency.upper()] = float(usd_value) / float(balance_amount)
+                                    except (TypeError, ValueError, ZeroDivisionError):
+                                        pass
+                            log.info(f"   - After cache update: {len(portfolio_assets)} assets loaded")
                     else:
-                        log.error(f"   - Error updating portfolio cache: {update_err}", exc_info=True)
-        
+                        error_msg = update_result.get('error', 'Unknown error')
+                        if update_result.get('auth_error') or '40101' in error_msg or 'Authentication' in error_msg:
+                            log.error(f"   - Portfolio cache update failed: {error_msg}")
+                            log.warning("   - ⚠️ Authentication error detected - will not retry immediately. Check API credentials and IP whitelist.")
+                        else:
+                            log.error(f"   - Portfolio cache update failed: {error_msg}")
+            except Exception as update_err:
+                error_str = str(update_err)
+                if '40101' in error_str or 'Authentication' in error_str:
+                    log.error(f"   - Error updating portfolio cache (authentication): {update_err}")
+                    log.warning("   - ⚠️ Authentication error - check API credentials and IP whitelist")
+                else:
+                    log.error(f"   - Error updating portfolio cache: {update_err}", exc_info=True)
+
+    return {
+        "source": "portfolio_cache",
+        # Invariant: Total Value shown to users must equal Crypto.com Margin "Wallet Balance" (NET).
+        # This is enforced by using total_usd from portfolio_summary, which is calculated as:
+        # total_usd = total_assets_usd - total_borrowed_usd (NET equity)
+        "total_usd_value": total_usd_value,
+        "balances": portfolio_assets,  # For backward compatibility
+        "open_position_counts": open_position_counts,
+        "open_tp_counts": open_tp_counts,
+        "open_protective_counts": open_protective_counts,
+        "ghost_protection_alerts": ghost_protection_alerts,
+        "last_sync": last_updated,
+        "portfolio_last_updated": last_updated,
+        "portfolio": {
+            "assets": portfolio_assets,  # Main portfolio data (v4.0 format)
+            "total_value_usd": total_usd_value,  # NET Wallet Balance - matches Crypto.com "Wallet Balance"
+            "total_assets_usd": total_assets_usd,  # GROSS raw assets (before haircut and borrowed)
+            "total_collateral_usd": total_collateral_usd,  # Collateral after haircuts (informational)
+            "total_borrowed_usd": total_borrowed_usd,  # Borrowed amounts (shown separately)
+            "portfolio_value_source": portfolio_value_source,  # Calculation method: "exchange:{field_path}" | "derived:collateral_minus_borrowed"
+            "exchange": "Crypto.com Exchange",
+            "as_of": datetime.fromtimestamp(last_updated, tz=timezone.utc).isoformat() if last_updated else None,  # Timestamp when snapshot was taken
+            # Include reconcile data if PORTFOLIO_RECONCILE_DEBUG=1 (only in debug mode, safe - no secrets)
+            **({"reconcile": portfolio_reconcile_data} if portfolio_reconcile_data else {}),
+            **({"reconcile": portfolio_summary.get("reconcile")} if not portfolio_reconcile_data and portfolio_summary and portfolio_summary.get("reconcile") else {})
+        },
+    }
+
+
+def _dashboard_bot_status(db: Session) -> dict:
+    live_trading_enabled = get_live_trading_status(db)
+    return {
+        "is_running": True,
+        "status": "running",
+        "reason": None,
+        "live_trading_enabled": live_trading_enabled,
+        "mode": "LIVE" if live_trading_enabled else "DRY_RUN",
+        "kill_switch_on": _get_telegram_kill_switch_status(db),
+    }
+
+
+async def _compute_dashboard_state(db: Session, request_context: Optional[dict] = None) -> dict:
+    """
+    Core function to compute dashboard state.
+    This can be called directly without FastAPI dependencies.
+    
+    Args:
+        db: Database session (required)
+        request_context: Optional request context dict with headers and debug flags
+    
+    Returns:
+        dict: Dashboard state
+    """
+    start_time = time.time()
+    log.info("Starting dashboard state fetch")
+    
+    # Default request_context if not provided
+    if request_context is None:
+        request_context = {}
+    
+    try:
+        loaded = await _load_dashboard_portfolio(db, request_context)
+        unified_open_orders, open_orders_summary = _resolve_dashboard_open_orders(db)
+        portfolio = await _build_dashboard_portfolio(db, request_context, loaded, unified_open_orders)
+        open_orders = _dashboard_open_orders_payload(open_orders_summary)
+
+        log.info(f"Open orders (unified) loaded: {len(open_orders['open_orders'])} orders")
+        elapsed = time.time() - start_time
+        log.info(f"✅ Dashboard state returned in {elapsed:.3f}s: {len(portfolio['balances'])} assets, {len(open_orders['open_orders'])} orders")
+
         return {
-            "source": "portfolio_cache",
-            "total_usd_value": total_usd_value,
-            "balances": portfolio_assets,  # For backward compatibility
+            **portfolio,
             "fast_signals": [],  # Signals are loaded separately by frontend
             "slow_signals": [],
-            "open_orders": open_orders_list,
-            "open_position_counts": open_position_counts,
-            "open_tp_counts": open_tp_counts,
-            "open_protective_counts": open_protective_counts,
-            "ghost_protection_alerts": ghost_protection_alerts,
-            "exchange_open_orders_count": len(open_orders_list),
-            "open_orders_summary": open_orders_summary,
-            "open_orders_sync_status": open_orders_summary.get("sync_status"),
-            "open_orders_data_verified": open_orders_summary.get("data_verified"),
-            "last_sync": last_updated,
-            "portfolio_last_updated": last_updated,
-            "portfolio": {
-                "assets": portfolio_assets,  # Main portfolio data (v4.0 format)
-                "total_value_usd": total_usd_value,  # NET Wallet Balance - matches Crypto.com "Wallet Balance"
-                "total_assets_usd": total_assets_usd,  # GROSS raw assets (before haircut and borrowed)
-                "total_collateral_usd": total_collateral_usd,  # Collateral after haircuts (informational)
-                "total_borrowed_usd": total_borrowed_usd,  # Borrowed amounts (shown separately)
-                "portfolio_value_source": portfolio_value_source,  # Calculation method: "exchange:{field_path}" | "derived:collateral_minus_borrowed"
-                "exchange": "Crypto.com Exchange",
-                "as_of": datetime.fromtimestamp(last_updated, tz=timezone.utc).isoformat() if last_updated else None,  # Timestamp when snapshot was taken
-                # Include reconcile data if PORTFOLIO_RECONCILE_DEBUG=1 (only in debug mode, safe - no secrets)
-                **({"reconcile": portfolio_reconcile_data} if portfolio_reconcile_data else {}),
-                **({"reconcile": portfolio_summary.get("reconcile")} if not portfolio_reconcile_data and portfolio_summary and portfolio_summary.get("reconcile") else {})
-            },
-            # Invariant: Total Value shown to users must equal Crypto.com Margin "Wallet Balance" (NET).
-            # This is enforced by using total_usd from portfolio_summary, which is calculated as:
-            # total_usd = total_assets_usd - total_borrowed_usd (NET equity)
-            "bot_status": {
-                "is_running": True,
-                "status": "running",
-                "reason": None,
-                "live_trading_enabled": get_live_trading_status(db),
-                "mode": "LIVE" if get_live_trading_status(db) else "DRY_RUN",
-                "kill_switch_on": _get_telegram_kill_switch_status(db)
-            },
+            **open_orders,
+            "bot_status": _dashboard_bot_status(db),
             "partial": False,
             "errors": []
         }
@@ -1308,14 +1427,18 @@ async def _compute_dashboard_state(db: Session, request_context: Optional[dict]
 async def get_dashboard_state(
     request: Request,
     db: Session = Depends(get_db),
-    reconcile_debug: Optional[bool] = None
+    reconcile_debug: Optional[bool] = None,
+    since: Optional[int] = None
 ):
     """
     FastAPI route handler for /dashboard/state endpoint.
     Delegates to _compute_dashboard_state to avoid circular dependencies.
+    Like /dashboard/snapshot, answers 304 on a matching ``If-None-Match`` and
+    supports ``?since=<version>`` deltas.
     
     Args:
         reconcile_debug: Optional query parameter to enable reconcile debug (for SSM/local debugging)
+        since: Optional version from a previous response; only changes since then are returned
     """
     log.info("[DASHBOARD_STATE_DEBUG] GET /api/dashboard/state received")
     try:
@@ -1342,7 +1465,7 @@ async def get_dashboard_state(
         portfolio_assets = result.get("portfolio", {}).get("assets", [])
         has_portfolio = bool(portfolio_assets and len(portfolio_assets) > 0)
         log.info(f"[DASHBOARD_STATE_DEBUG] response_status=200 has_portfolio={has_portfolio} assets_count={len(portfolio_assets) if portfolio_assets else 0}")
-        return result
+        return _versioned_dashboard_response(request, state_versions, result, content_etag(result), since)
     except Exception as e:
         log.error(f"[DASHBOARD_STATE_DEBUG] response_status=500 error={str(e)}", exc_info=True)
         # Add detailed debug logging if DEBUG_DASHBOARD is enabled
@@ -1493,31 +1616,35 @@ def list_watchlist_state(db: Session = Depends(get_db)):
     enriched = []
     for item in base_items:
         symbol = (item.get("symbol") or "").upper()
-        state = state_map.get(symbol)
-        signal_side = (getattr(state, "signal_side", None) or "NONE") if state else "NONE"
-        if signal_side.upper() == "WAIT":
-            signal_side = "NONE"
-        _eval = getattr(state, "evaluated_at_utc", None) if state else None
-        _last_alert = getattr(state, "last_alert_at_utc", None) if state else None
-        _last_trade = getattr(state, "last_trade_at_utc", None) if state else None
-        item["signal_state"] = {
-            "strategy_key": getattr(state, "strategy_key", None) if state else None,
-            "signal_side": signal_side,
-            "last_price": getattr(state, "last_price", None) if state else None,
-            "evaluated_at_utc": _eval.isoformat() if isinstance(_eval, datetime) else None,
-            "alert_status": getattr(state, "alert_status", "NONE") if state else "NONE",
-            "alert_block_reason": getattr(state, "alert_block_reason", None) if state else None,
-            "last_alert_at_utc": _last_alert.isoformat() if isinstance(_last_alert, datetime) else None,
-            "trade_status": getattr(state, "trade_status", "NONE") if state else "NONE",
-            "trade_block_reason": getattr(state, "trade_block_reason", None) if state else None,
-            "last_trade_at_utc": _last_trade.isoformat() if isinstance(_last_trade, datetime) else None,
-            "correlation_id": getattr(state, "correlation_id", None) if state else None,
-        }
+        item["signal_state"] = _serialize_signal_state(state_map.get(symbol))
         enriched.append(item)
 
     return enriched
 
 
+def _serialize_signal_state(state: Optional[WatchlistSignalState]) -> Dict[str, Any]:
+    """``signal_state`` payload of a watchlist row (NONE defaults when the symbol has no state yet)."""
+    signal_side = (getattr(state, "signal_side", None) or "NONE") if state else "NONE"
+    if signal_side.upper() == "WAIT":
+        signal_side = "NONE"
+    _eval = getattr(state, "evaluated_at_utc", None) if state else None
+    _last_alert = getattr(state, "last_alert_at_utc", None) if state else None
+    _last_trade = getattr(state, "last_trade_at_utc", None) if state else None
+    return {
+        "strategy_key": getattr(state, "strategy_key", None) if state else None,
+        "signal_side": signal_side,
+        "last_price": getattr(state, "last_price", None) if state else None,
+        "evaluated_at_utc": _eval.isoformat() if isinstance(_eval, datetime) else None,
+        "alert_status": getattr(state, "alert_status", "NONE") if state else "NONE",
+        "alert_block_reason": getattr(state, "alert_block_reason", None) if state else None,
+        "last_alert_at_utc": _last_alert.isoformat() if isinstance(_last_alert, datetime) else None,
+        "trade_status": getattr(state, "trade_status", "NONE") if state else "NONE",
+        "trade_block_reason": getattr(state, "trade_block_reason", None) if state else None,
+        "last_trade_at_utc": _last_trade.isoformat() if isinstance(_last_trade, datetime) else None,
+        "correlation_id": getattr(state, "correlation_id", None) if state else None,
+    }
+
+
 @router.head("/dashboard")
 def list_watchlist_items_head(db: Session = Depends(get_db)):
     """HEAD handler for /api/dashboard - returns same headers as GET but no body"""
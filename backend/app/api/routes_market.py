@@ -1129,7 +1129,7 @@ def get_top_coins_with_prices(
                         # Only fetch for small watchlists to avoid timeouts
                         try:
                             from market_updater import fetch_ohlcv_data
-                            from app.api.routes_signals import calculate_volume_index
+                            from app.utils.volume_index import calculate_volume_index
                             # Use 5-minute data for volume calculation (more responsive)
                             # Fetch ~132 periods = ~11 hours of 5-minute data
                             ohlcv_data = fetch_ohlcv_data(symbol, "5m", limit=132)
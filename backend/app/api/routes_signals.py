@@ -6,6 +6,8 @@ import random
 import os
 import time
 
+from app.utils.volume_index import calculate_volume_index
+
 # Import database session if available
 try:
     from app.database import get_db
@@ -131,119 +133,6 @@ def calculate_ema(prices: List[float], period: int) -> float:
     
     return round(ema, decimals)
 
-def calculate_volume_index(volumes: List[float], period: int = 5) -> dict:
-    """Calculate Volume Index - compares current volume to average of last N periods
-    Uses a shorter period (5 instead of 10) for faster reaction to volume changes.
-    Also uses EMA for the average volume calculation to be more responsive to recent trends.
-    
-    IMPROVED: Also checks if multiple recent periods (last 3-4) are above average to detect
-    sustained volume increases even if the EMA average is "dragged down" by earlier low volumes.
-    
-    FIX: Use volumes[-2] (last completed period) instead of volumes[-1] (potentially incomplete current period)
-    to avoid showing stale high volume ratios when the high volume "already passed some time ago".
-    This ensures we compare completed periods, which should reflect actual volume that has occurred.
-    """
-    # Minimum period reduced to 3 for faster detection
-    min_period = 3
-    if len(volumes) < min_period + 1:
-        return {
-            "current_volume": volumes[-1] if volumes else 0,
-            "average_volume": 0,
-            "volume_ratio": 0,
-            "signal": None
-        }
-    
-    # FIX: Use the second-to-last period as current_volume to avoid using potentially incomplete current period
-    # This ensures we're always using a completed period, which should reflect actual volume that has passed
-    # If the high volume "already passed some time ago", the most recent completed period should have lower volume
-    if len(volumes) >= 2:
-        current_volume = volumes[-2]  # Use last completed period (exclude potentially incomplete current)
-    else:
-        current_volume = volumes[-1]  # Fallback if only one period available
-    
-    # Use EMA (Exponential Moving Average) for more reactive volume average
-    # EMA gives more weight to recent volumes, making it faster to detect changes
-    # FIX: Calculate average excluding the potentially incomplete current period (volumes[-1])
-    if len(volumes) >= period + 2:
-        # Calculate EMA using last N completed periods (excluding potentially incomplete current)
-        recent_volumes = volumes[-(period+2):-1]  # Last N completed periods (exclude volumes[-1])
-        # Use EMA with multiplier 2/(period+1) for faster reaction
-        ema_multiplier = 2 / (period + 1)
-        average_volume = recent_volumes[0]  # Start with oldest value
-        for vol in recent_volumes[1:]:
-            average_volume = (vol * ema_multiplier) + (average_volume * (1 - ema_multiplier))
-    elif len(volumes) >= 2:
-        # Fallback: use all completed periods except the potentially incomplete current one
-        recent_volumes = volumes[-(len(volumes)-1):-1]  # All except potentially incomplete current period
-        average_volume = np.mean(recent_volumes) if recent_volumes else 0
-    else:
-        # Only one period available, use it as fallback
-        average_volume = volumes[0] if volumes else 0
-    
-    # IMPROVED: Also calculate a "baseline average" using a longer period (up to 10)
-    # to detect when multiple recent periods are above the longer-term average
-    # FIX: Calculate baseline using completed periods only (exclude potentially incomplete current)
-    baseline_period = min(10, len(volumes) - 2) if len(volumes) >= 2 else min(10, len(volumes) - 1)
-    if len(volumes) >= baseline_period + 2:
-        baseline_volumes = volumes[-(baseline_period+2):-1]  # Last N completed periods (exclude volumes[-1])
-        baseline_average = np.mean(baseline_volumes) if baseline_volumes else average_volume
-        
-        # Check if last 3-4 completed periods are consistently above baseline
-        recent_count = min(4, len(volumes) - 2) if len(volumes) >= 2 else min(4, len(volumes) - 1)
-        # Use completed periods only (exclude potentially incomplete current)
-        completed_periods_for_check = volumes[-(recent_count+1):-1] if len(volumes) >= 2 else volumes[-recent_count:]
-        recent_above_baseline = sum(1 for v in completed_periods_for_check if v > baseline_average * 1.5)
-        
-        # If 3+ of the last 4 completed periods are 1.5x above baseline, use baseline for ratio
-        # This detects sustained volume increases even if EMA is "dragged down"
-        if recent_above_baseline >= 3 and baseline_average > 0:
-            # Use the higher of EMA average or baseline average to avoid false negatives
-            average_volume = max(average_volume, baseline_average * 0.8)  # Slight discount on baseline
-    
-    # Calculate ratio with safeguards to prevent unrealistic values
-    # FIX: Add minimum threshold for average_volume to prevent division by very small numbers
-    # This prevents unrealistic ratios like 2165.1x when average_volume is near zero
-    MIN_AVERAGE_VOLUME_THRESHOLD = 0.0001  # Minimum average volume to consider valid
-    MAX_VOLUME_RATIO = 100.0  # Maximum realistic volume ratio (cap at 100x)
-    
-    # Handle cases where average_volume is too small (likely due to insufficient data)
-    if average_volume < MIN_AVERAGE_VOLUME_THRESHOLD:
-        # If average volume is too small, it's likely due to insufficient data or data quality issues
-        # Use a fallback: assume average_volume is at least 10% of current_volume to get a reasonable ratio
-        if current_volume > 0:
-            # Fallback: use 10% of current_volume as minimum average
-            average_volume = max(average_volume, current_volume * 0.1)
-            logger.debug(f"⚠️ Volume ratio calculation: average_volume too small, using fallback minimum ({average_volume:.6f})")
-        else:
-            # Both are zero or very small, return zero ratio
-            average_volume = 0.0
-    
-    # Calculate ratio
-    if average_volume > 0:
-        volume_ratio = current_volume / average_volume
-        # Cap the ratio at a maximum realistic value to prevent unrealistic displays
-        if volume_ratio > MAX_VOLUME_RATIO:
-            logger.warning(f"⚠️ Volume ratio {volume_ratio:.2f}x exceeds maximum {MAX_VOLUME_RATIO}x, capping to {MAX_VOLUME_RATIO}x (symbol may have insufficient volume data)")
-            volume_ratio = MAX_VOLUME_RATIO
-    else:
-        volume_ratio = 0.0
-    
-    # Generate signal if volume is more than 2x the average
-    signal = None
-    if volume_ratio > 2.0:
-        # Check price trend to determine buy or sell signal
-        # If price is rising with high volume, it's a buy signal
-        # If price is falling with high volume, it's a sell signal
-        # For now, we'll return the ratio and let the caller determine direction
-        signal = "HIGH_VOLUME"
-    
-    return {
-        "current_volume": round(current_volume, 2),
-        "average_volume": round(average_volume, 2),
-        "volume_ratio": round(volume_ratio, 2),
-        "signal": signal
-    }
-
 def calculate_stop_loss_and_take_profit(current_price: float, atr: float) -> dict:
     """Calculate conservative and aggressive stop loss and take profit levels based on ATR"""
     
@@ -637,17 +526,29 @@ def get_signals(
                                 # This prevents the endpoint from hanging if external APIs are slow
                                 volume_timeout = min(3.0, time_remaining * 0.8)
                                 ohlcv_data = None
-                                
+
+                                # Prefer the local candle store (kept current by market_updater) over a live call
                                 try:
-                                    with ThreadPoolExecutor(max_workers=1) as executor:
-                                        # Use 5-minute data for volume calculation (more responsive)
-                                        # Fetch ~72 periods = 6 hours of 5-minute data
-                                        future = executor.submit(fetch_ohlcv_data, symbol, "5m", 72)
-                                        ohlcv_data = future.result(timeout=volume_timeout)
-                                except FuturesTimeoutError:
-                                    logger.warning(f"⏱️ [SIGNALS] {symbol}: Volume fetch timed out after {volume_timeout:.2f}s, using DB values")
-                                except Exception as thread_err:
-                                    logger.warning(f"🔍 [SIGNALS] {symbol}: Volume fetch error: {thread_err}")
+                                    from app.services.candle_store import load_recent_candles
+                                    ohlcv_data = load_recent_candles(db, symbol, "5m", 72)
+                                except Exception as store_err:
+                                    logger.debug(f"🔍 [SIGNALS] {symbol}: Candle store read failed: {store_err}")
+                                    try:
+                                        db.rollback()
+                                    except Exception:
+                                        pass
+
+                                if not ohlcv_data:
+                                    try:
+                                        with ThreadPoolExecutor(max_workers=1) as executor:
+                                            # Use 5-minute data for volume calculation (more responsive)
+                                            # Fetch ~72 periods = 6 hours of 5-minute data
+                                            future = executor.submit(fetch_ohlcv_data, symbol, "5m", 72)
+                                            ohlcv_data = future.result(timeout=volume_timeout)
+                                    except FuturesTimeoutError:
+                                        logger.warning(f"⏱️ [SIGNALS] {symbol}: Volume fetch timed out after {volume_timeout:.2f}s, using DB values")
+                                    except Exception as thread_err:
+                                        logger.warning(f"🔍 [SIGNALS] {symbol}: Volume fetch error: {thread_err}")
                                 
                                 volume_fetch_elapsed = time_module.time() - volume_fetch_start
                                 logger.debug(f"🔍 [SIGNALS] {symbol}: Volume fetch took {volume_fetch_elapsed:.3f}s")
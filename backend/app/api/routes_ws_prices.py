@@ -1,40 +1,70 @@
 """
 WebSocket endpoint for real-time price stream.
 
-Clients connect to /api/ws/prices and receive:
-- On connect: one snapshot message { "prices": { "BTC": 45000.0, ... }, "ts": ..., "source": "crypto_com" }
-- Then: the same shape pushed at PRICE_STREAM_INTERVAL_S (default 10s)
+Clients connect to /api/ws/prices (optionally ``?symbols=BTC,ETH_USDT``; default all) and receive:
+- On connect: a keyframe { "type": "snapshot", "prices": { "BTC": 45000.0, ... }, "ts": ..., "source": "crypto_com", "seq": 1 }
+- Then: deltas { "type": "delta", "changed": { "BTC": 45010.0 }, "removed": [], "ts": ..., "seq": n }
+  with only the subscribed symbols that changed, and a fresh keyframe every PRICE_STREAM_KEYFRAME_S
+
+Client messages:
+- "ping" -> { "type": "pong" }
+- { "action": "subscribe" | "unsubscribe" | "set", "symbols": ["BTC", ...] | "*" } -> ack + keyframe
+- { "action": "resync" } -> keyframe (e.g. after a gap in "seq")
 
 No auth required for the WebSocket; use only behind a trusted reverse proxy (e.g. dashboard).
 """
 
 import asyncio
+import json
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.services.price_stream import subscribe, unsubscribe
+from app.services.price_stream import request_keyframe, send_control, set_symbols, subscribe, unsubscribe
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_SUBSCRIPTION_MODES = {"subscribe": "add", "unsubscribe": "remove", "set": "replace"}
+
+
+def _handle_message(websocket: WebSocket, data: str) -> None:
+    text = data.strip()
+    if text.lower() == "ping":
+        send_control(websocket, {"type": "pong"})
+        return
+    try:
+        message = json.loads(text)
+    except ValueError:
+        send_control(websocket, {"type": "error", "error": "expected 'ping' or a JSON action"})
+        return
+    action = message.get("action") if isinstance(message, dict) else None
+    if action in _SUBSCRIPTION_MODES:
+        symbols = set_symbols(websocket, message.get("symbols"), mode=_SUBSCRIPTION_MODES[action])
+        send_control(websocket, {"type": "subscribed", "symbols": "*" if symbols is None else sorted(symbols)})
+    elif action == "resync":
+        request_keyframe(websocket)
+    elif action == "ping":
+        send_control(websocket, {"type": "pong"})
+    else:
+        send_control(websocket, {"type": "error", "error": f"unknown action: {action}"})
+
 
 @router.websocket("/ws/prices")
 async def websocket_prices(websocket: WebSocket):
     """Stream live price updates to the dashboard. Same-origin or CORS should restrict access."""
     await websocket.accept()
-    await subscribe(websocket)
+    await subscribe(websocket, websocket.query_params.get("symbols"))
     try:
-        # Keep connection alive; client can optionally send ping or we just wait for disconnect
+        # Keep connection alive; client can optionally send ping/subscriptions or we just wait for disconnect
         while True:
             try:
                 # Wait for any message (e.g. ping or close); timeout to allow periodic health check
                 data = await asyncio.wait_for(websocket.receive_text(), timeout=60.0)
-                if data.strip().lower() == "ping":
-                    await websocket.send_json({"type": "pong"})
+                _handle_message(websocket, data)
             except asyncio.TimeoutError:
                 # Send a keepalive so client knows we're still here
-                await websocket.send_json({"type": "keepalive"})
+                send_control(websocket, {"type": "keepalive"})
             except WebSocketDisconnect:
                 break
     except Exception as e:
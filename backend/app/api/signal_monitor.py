@@ -353,7 +353,7 @@ class SignalMonitorService:
                     # This ensures signal_monitor uses same fresh data as /api/signals endpoint
                     try:
                         from market_updater import fetch_ohlcv_data
-                        from app.api.routes_signals import calculate_volume_index
+                        from app.utils.volume_index import calculate_volume_index
                         
                         # Use 5-minute data for volume calculation (more responsive)
                         # Fetch ~72 periods = 6 hours of 5-minute data
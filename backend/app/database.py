@@ -9,7 +9,8 @@ import os
 import sys
 import logging
 import socket
-from typing import Sequence
+import threading
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
 from urllib.parse import urlparse, urlunparse
 
 logger = logging.getLogger(__name__)
@@ -249,6 +250,42 @@ def table_has_column(db_engine, table_name: str, column_name: str) -> bool:
         return False
 
 
+# Column capabilities per (engine url, table), computed once per process.
+# Schema changes made by this process (ensure_optional_columns) clear it; call
+# invalidate_table_columns_cache() after running migrations any other way.
+_table_columns_lock = threading.Lock()
+_table_columns_cache: Dict[Tuple[str, str], FrozenSet[str]] = {}
+
+
+def get_table_columns_cached(db_engine, table_name: str) -> FrozenSet[str]:
+    """Column names of ``table_name`` (empty if it cannot be inspected; not cached then)."""
+    if db_engine is None or not table_name:
+        return frozenset()
+    key = (str(getattr(db_engine, "url", id(db_engine))), table_name)
+    with _table_columns_lock:
+        cached = _table_columns_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        columns = frozenset(col["name"] for col in inspect(db_engine).get_columns(table_name))
+    except Exception as inspect_err:
+        logger.warning("Unable to inspect columns of %s: %s", table_name, inspect_err)
+        return frozenset()
+    with _table_columns_lock:
+        _table_columns_cache[key] = columns
+    return columns
+
+
+def invalidate_table_columns_cache(table_name: Optional[str] = None) -> None:
+    """Forget cached column capabilities (all tables, or just ``table_name``)."""
+    with _table_columns_lock:
+        if table_name is None:
+            _table_columns_cache.clear()
+            return
+        for key in [k for k in _table_columns_cache if k[1] == table_name]:
+            del _table_columns_cache[key]
+
+
 def ensure_telegram_update_dedup_table(engine_to_use) -> bool:
     """
     Create telegram_update_dedup (+ index on created_at) if missing. Idempotent DDL.
@@ -2288,6 +2325,8 @@ def ensure_optional_columns(db_engine=None):
                     logger.info("Added optional column %s.%s", table_name, column_name)
     except Exception as ensure_err:
         logger.warning(f"Could not ensure optional columns: {ensure_err}", exc_info=True)
+    finally:
+        invalidate_table_columns_cache()
 
 def get_db():
     """Dependency for getting database session - non-blocking with graceful fallback
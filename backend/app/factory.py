@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.environment import is_local, is_aws, is_atp_trading_only, is_jarvis_control_enabled
+from app.core.environment import is_local, is_aws, is_atp_trading_only
 from app.api.routes_account import router as account_router
 from app.api.routes_internal import router as internal_router
 from app.api.routes_orders import router as orders_router
@@ -23,34 +23,12 @@ from app.api.routes_monitoring import router as monitoring_router
 from app.api.routes_agent_activity import router as agent_activity_router
 from app.api.routes_diag import router as diag_router
 from app.api.routes_reports import router as reports_router
-try:
-    from app.api.routes_admin import router as admin_router
-    _admin_router_available = True
-except ImportError:
-    admin_router = None
-    _admin_router_available = False
 from app.api.routes_portfolio import router as portfolio_router
 from app.api.routes_risk_probe import router as risk_probe_router
 from app.api.routes_metrics import router as metrics_router
 from app.api.routes_ws_prices import router as ws_prices_router
-from app.api.routes_jarvis import router as jarvis_router
-from app.brief import router as brief_router
-
-if is_jarvis_control_enabled():
-    from app.api.routes_jarvis_control import router as jarvis_control_router
-else:
-    jarvis_control_router = None  # type: ignore[assignment, misc]
-
-if not is_atp_trading_only():
-    from app.api.routes_ai import router as ai_router
-    from app.api.routes_agent import router as agent_router
-    from app.api.routes_governance import router as governance_router
-    from app.api.routes_github_webhook import router as github_webhook_router
-else:
-    ai_router = None  # type: ignore[assignment, misc]
-    agent_router = None  # type: ignore[assignment, misc]
-    governance_router = None  # type: ignore[assignment, misc]
-    github_webhook_router = None  # type: ignore[assignment, misc]
+# Jarvis, brief, admin, agent, governance and GitHub routers load on first request.
+from app.api.router_registry import LazyRouterRegistry, install_lazy_routers
 try:
     from app.api.routes_settings import router as settings_router
     _settings_router_available = True
@@ -923,6 +901,21 @@ def create_app(role: str = "legacy") -> FastAPI:
         except Exception as e:
             logger.warning("Price stream not started: %s", e)
 
+        # Live ticker/candle feed for watchlist symbols; controlled by ENABLE_MARKET_WS
+        try:
+            from app.services.websocket_manager import start_market_ws_background
+            await start_market_ws_background()
+        except Exception as e:
+            logger.warning("Market WebSocket not started: %s", e)
+
+        # User channel (orders/trades/balance): pushes fill confirmations to the order fill registry
+        if os.getenv("USE_WEBSOCKET", "false").lower() == "true":
+            try:
+                from app.services.websocket_manager import start_websocket_background
+                await start_websocket_background()
+            except Exception as e:
+                logger.warning("User WebSocket not started: %s", e)
+
         t1 = time.perf_counter()
         elapsed_ms = (t1 - t0) * 1000
         logger.info(f"PERF: Startup event completed - server ready for requests - {elapsed_ms:.2f}ms")
@@ -936,11 +929,28 @@ def create_app(role: str = "legacy") -> FastAPI:
             logger.info("WebSocket stopped on shutdown")
         except Exception as e:
             logger.error(f"Error stopping WebSocket: {e}")
+        try:
+            from app.services.websocket_manager import stop_market_ws
+            await stop_market_ws()
+        except Exception as e:
+            logger.warning("Market WebSocket stop: %s", e)
         try:
             from app.services.price_stream import stop_price_stream
             stop_price_stream()
         except Exception as e:
             logger.warning("Price stream stop: %s", e)
+        try:
+            import asyncio
+            from app.services.telegram_outbox import stop_telegram_outbox
+            await asyncio.to_thread(stop_telegram_outbox)
+        except Exception as e:
+            logger.warning("Telegram outbox stop: %s", e)
+        try:
+            from app.utils.http_client import close_async_http_session, close_http_sessions
+            await close_async_http_session()
+            close_http_sessions()
+        except Exception as e:
+            logger.warning("HTTP session pool close: %s", e)
 
     # Define simple endpoints BEFORE routers to ensure they're accessible
     @app.get("/__ping")
@@ -1005,25 +1015,15 @@ def create_app(role: str = "legacy") -> FastAPI:
     app.include_router(debug_router, prefix="/api", tags=["debug"])
     app.include_router(diag_router, prefix="/api", tags=["diagnostics"])
     app.include_router(reports_router, prefix="/api", tags=["reports"])
-    if _admin_router_available and admin_router is not None:
-        app.include_router(admin_router, prefix="/api", tags=["admin"])
-    if ai_router is not None:
-        app.include_router(ai_router)
+    lazy_routers = LazyRouterRegistry(app)
+    lazy_routers.mark_position("admin", "ai")
     app.include_router(risk_probe_router, prefix="/api", tags=["risk"])
     app.include_router(metrics_router, prefix="/api", tags=["metrics"])
     if _settings_router_available and settings_router is not None:
         app.include_router(settings_router, prefix="/api", tags=["settings"])
-    if agent_router is not None:
-        app.include_router(agent_router, prefix="/api", tags=["agent"])
-    if governance_router is not None:
-        app.include_router(governance_router, prefix="/api", tags=["governance"])
-    if github_webhook_router is not None:
-        app.include_router(github_webhook_router, prefix="/api", tags=["github"])
+    lazy_routers.mark_position("agent", "governance", "github_webhook")
     app.include_router(ws_prices_router, prefix="/api", tags=["ws-prices"])
-    if jarvis_control_router is not None:
-        app.include_router(jarvis_control_router, prefix="/api/jarvis/control", tags=["jarvis-control"])
-    app.include_router(jarvis_router)
-    app.include_router(brief_router)
+    install_lazy_routers(app, registry=lazy_routers)  # jarvis_control, jarvis, brief
 
     # Alias health under /api for reverse-proxy setups that expect /api/health
     # Defined AFTER routers so /api/health/system can be matched first
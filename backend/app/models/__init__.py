@@ -6,9 +6,13 @@ from app.models.trade_signal import TradeSignal, PresetEnum, RiskProfileEnum, Si
 from app.models.exchange_balance import ExchangeBalance
 from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusEnum
 from app.models.market_price import MarketPrice, MarketData
+from app.models.ohlcv_candle import OhlcvCandle
+from app.models.open_lot_ledger import OpenLotLedgerEntry, OpenLotLedgerScope
+from app.models.order_history_watermark import OrderHistoryWatermark
 from app.models.trading_settings import TradingSettings
-from app.models.dashboard_cache import DashboardCache
+from app.models.dashboard_cache import DashboardCache, DashboardSection
 from app.models.telegram_message import TelegramMessage
+from app.models.telegram_outbox import TelegramOutboxMessage
 from app.models.signal_throttle import SignalThrottleState
 from app.models.telegram_state import TelegramState
 from app.models.portfolio import PortfolioBalance, PortfolioSnapshot
@@ -48,9 +52,15 @@ __all__ = [
     "OrderStatusEnum",
     "MarketPrice",
     "MarketData",
+    "OhlcvCandle",
+    "OpenLotLedgerEntry",
+    "OpenLotLedgerScope",
+    "OrderHistoryWatermark",
     "TradingSettings",
     "DashboardCache",
+    "DashboardSection",
     "TelegramMessage",
+    "TelegramOutboxMessage",
     "SignalThrottleState",
     "TelegramState",
     "PortfolioBalance",
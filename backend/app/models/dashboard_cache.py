@@ -1,5 +1,5 @@
 """Database model for dashboard snapshot cache"""
-from sqlalchemy import Column, Integer, JSON, DateTime, Text
+from sqlalchemy import Column, Integer, JSON, DateTime, Float, String, Text
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -15,3 +15,21 @@ class DashboardCache(Base):
     def __repr__(self):
         return f"<DashboardCache(id={self.id}, last_updated_at={self.last_updated_at})>"
 
+
+class DashboardSection(Base):
+    """One independently refreshed part of the dashboard state (see services.dashboard_sections)"""
+    __tablename__ = "dashboard_sections"
+
+    name = Column(String(50), primary_key=True)  # portfolio, open_orders, watchlist, signals, expected_tp, bot_status
+    data = Column(JSON, nullable=False)
+    inputs_fingerprint = Column(String(64), nullable=True)  # digest of the inputs the data was computed from
+    data_hash = Column(String(64), nullable=True)
+    version = Column(Integer, nullable=False, default=0)  # bumped only when the data changes
+    compute_ms = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)  # last compute error; data keeps the previous good value
+    computed_at = Column(DateTime(timezone=True), nullable=True)  # last successful compute
+    checked_at = Column(DateTime(timezone=True), nullable=True)  # last time the inputs were verified
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # last time the data changed
+
+    def __repr__(self):
+        return f"<DashboardSection(name={self.name}, version={self.version}, compute_ms={self.compute_ms})>"
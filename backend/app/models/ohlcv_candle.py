@@ -0,0 +1,34 @@
+"""Local OHLCV candle store (one row per symbol/timeframe/candle open time).
+
+market_updater used to download 200 hourly, 75 daily and 288 five-minute
+candles per symbol on every cycle and discard them after computing
+indicators. Candles are immutable once closed, so we keep them here and only
+ask the exchange for the tail newer than the last stored ``ts``.
+
+Retention is bounded per (symbol, timeframe) by ``candle_store`` (a small
+multiple of what the indicators need), so the table stays in the tens of
+thousands of rows.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Float, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class OhlcvCandle(Base):
+    """One OHLCV candle; ``ts`` is the candle open time in epoch milliseconds."""
+
+    __tablename__ = "ohlcv_candles"
+
+    symbol = Column(String(50), primary_key=True)  # e.g. "ETH_USDT" (watchlist symbol)
+    timeframe = Column(String(8), primary_key=True)  # "5m", "1h", "1d"
+    ts = Column(BigInteger, primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<OhlcvCandle(symbol={self.symbol}, tf={self.timeframe}, ts={self.ts}, c={self.close})>"
@@ -0,0 +1,50 @@
+"""Materialized open lots (``open_lot_ledger`` service).
+
+One row per open lot of a ledger scope (the ``symbol`` argument of
+``expected_take_profit.rebuild_open_lots``: a base like ``BTC`` or a pair like
+``BTC_USDT``), plus one state row per scope. ``version`` is bumped by the
+exchange_orders flush hooks whenever a write can change the scope's lots;
+``built_version`` is the version the stored lots reflect, so the scope is
+current while the two are equal. Prices and quantities are kept as exact
+Decimal text so reads match a FIFO replay digit for digit.
+"""
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class OpenLotLedgerEntry(Base):
+    __tablename__ = "open_lot_ledger"
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(50), nullable=False)
+    position = Column(Integer, nullable=False)  # order of rebuild_open_lots output
+    symbol = Column(String(50), nullable=True)
+    entry_order_id = Column(String(100), nullable=True)
+    entry_time = Column(DateTime(timezone=True), nullable=True)
+    entry_price = Column(String(64), nullable=False)
+    lot_qty = Column(String(64), nullable=False)
+    parent_order_id = Column(String(100), nullable=True)
+    oco_group_id = Column(String(100), nullable=True)
+
+    __table_args__ = (
+        Index("ix_open_lot_ledger_scope_position", "scope", "position"),
+    )
+
+    def __repr__(self):
+        return f"<OpenLotLedgerEntry(scope={self.scope}, order={self.entry_order_id}, qty={self.lot_qty})>"
+
+
+class OpenLotLedgerScope(Base):
+    __tablename__ = "open_lot_ledger_scopes"
+
+    scope = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    built_version = Column(Integer, nullable=False, default=-1)
+    lot_count = Column(Integer, nullable=False, default=0)
+    rebuild_ms = Column(Float, nullable=True)
+    rebuilt_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<OpenLotLedgerScope(scope={self.scope}, version={self.version}, lots={self.lot_count})>"
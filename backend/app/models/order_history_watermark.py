@@ -0,0 +1,28 @@
+"""Per-instrument order-history sync position (``order_history_watermarks`` service).
+
+``last_update_time_ms``/``last_order_id`` are the newest order the exchange has
+returned for the instrument; ``synced_through_ms`` is the end of the last
+successfully stored fetch window, where the next incremental fetch resumes.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class OrderHistoryWatermark(Base):
+    __tablename__ = "order_history_watermarks"
+
+    instrument_name = Column(String(50), primary_key=True)
+    last_update_time_ms = Column(BigInteger, nullable=True)
+    last_order_id = Column(String(100), nullable=True)
+    synced_through_ms = Column(BigInteger, nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_deep_sync_at = Column(DateTime(timezone=True), nullable=True)
+    last_mode = Column(String(20), nullable=True)
+    last_orders = Column(Integer, nullable=True)
+    last_fetch_ms = Column(Float, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<OrderHistoryWatermark(instrument={self.instrument_name}, through={self.synced_through_ms})>"
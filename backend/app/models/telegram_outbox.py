@@ -0,0 +1,38 @@
+"""Pending Telegram sends of the outbound queue (``telegram_outbox`` service).
+
+The sender thread writes newly queued messages here (``pending``, claimed by
+its process) before delivering anything else, and marks them sent/failed
+afterwards.
+A process renews its claims while it runs; pending rows whose claim went stale
+(crash, restart) are claimed by another sender and replayed (at-least-once; a
+crash between the HTTP call and the status update can repeat one message).
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class TelegramOutboxMessage(Base):
+    __tablename__ = "telegram_outbox"
+
+    id = Column(Integer, primary_key=True)
+    chat_destination = Column(String(16), nullable=False)  # "trading" | "ops"
+    message = Column(Text, nullable=False)
+    reply_markup = Column(Text, nullable=True)  # JSON
+    origin = Column(String(16), nullable=True)
+    symbol = Column(String(50), nullable=True)
+    status = Column(String(16), nullable=False, default="pending")  # pending | sent | failed | expired
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(500), nullable=True)
+    claimed_by = Column(String(64), nullable=True)  # host:pid:nonce of the sending process
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_telegram_outbox_status_created", "status", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<TelegramOutboxMessage(id={self.id}, dest={self.chat_destination}, status={self.status})>"
@@ -51,9 +51,9 @@ WORKFLOWS: List[Dict[str, Any]] = [
     {
         "id": "dashboard_snapshot",
         "name": "Dashboard Snapshot",
-        "description": "Actualiza el snapshot del dashboard para mejorar rendimiento",
+        "description": "Actualiza el snapshot del dashboard para mejorar rendimiento (por secciones, solo las que cambiaron)",
         "run_endpoint": None,  # Continuous process, no manual trigger
-        "schedule": "Cada 60 segundos",
+        "schedule": "Cada 5 segundos (secciones), 60 segundos sin secciones",
         "automated": True,
     },
     {
@@ -0,0 +1,450 @@
+"""
+Strategy backtesting engine
+
+Replays stored hourly OHLCV candles through the live decision code:
+
+- indicators as ``market_updater.calculate_technical_indicators`` computes
+  them (200 hourly candles per evaluation, the last one treated as forming
+  with its close as the current price, MA10w from daily closes)
+- ``trading_signals.calculate_trading_signals`` (and through it
+  ``should_trigger_buy_signal`` and the Auto ML gate) for the BUY/SELL decision
+- ``signal_throttle.should_emit_signal`` with in-memory last-signal state, so
+  only signals the monitor would have emitted open or close positions
+- TP/SL from the BUY signal (strategy ``sl.atrMult`` / ``tp.rr`` rules), or
+  fixed percentages through ``sl_tp_price_adjust.compute_strategy_sl_tp_prices``
+
+One long position per symbol at a time, fixed ``position_size_usd`` per trade,
+entries at the signal candle's close. Exits are checked from the next candle
+on: SL before TP when both fall inside one candle, at the open when it gaps
+through the level, and at the close on an emitted SELL signal.
+
+Fast path (default): indicator series are computed once per symbol with
+sliding windows over ``indicator_engine.compute_indicators_batch`` (rounded
+like the legacy helpers), and ``calculate_trading_signals`` only runs on
+candles whose RSI can produce a decision at all (below the preset's
+``rsi.buyBelow`` or above the SELL threshold). Every other candle is WAIT by
+construction, so both paths produce the same trades; ``fast=False`` runs the
+per-candle legacy indicator code and every decision, for verification.
+
+Volume uses the hourly candles (the live monitor prefers 5m volume when it
+has it); see scripts/run_backtest.py for the command-line entry point.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services.candle_store import TIMEFRAME_MS
+from app.services.config_loader import get_alert_thresholds, get_strategy_rules
+from app.services.indicator_engine import compute_indicators_batch
+from app.services.signal_throttle import LastSignalSnapshot, SignalThrottleConfig, should_emit_signal
+from app.services.sl_tp_price_adjust import compute_strategy_sl_tp_prices
+from app.services.strategy_profiles import RiskApproach, StrategyType
+from app.services.trading_signals import calculate_trading_signals
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = TIMEFRAME_MS["1d"]
+# market_updater.OHLCV_TIMEFRAMES: 200 hourly and 75 daily candles per evaluation
+INDICATOR_WINDOW = 200
+DAILY_WINDOW = 75
+# Values the signal monitor passes to calculate_trading_signals
+RSI_SELL_THRESHOLD = 70
+DEFAULT_MIN_PRICE_CHANGE_PCT = 1.0
+
+SERIES_KEYS = ("rsi", "ma50", "ma200", "ema10", "ma10w", "atr", "current_volume", "avg_volume")
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    position_size_usd: float = 100.0
+    fee_pct: float = 0.1  # per side
+    # None: resolve like the signal monitor (config_loader.get_alert_thresholds, then 1%)
+    min_price_change_pct: Optional[float] = None
+    # Fixed-percentage exits instead of the BUY signal's TP/SL
+    sl_pct: Optional[float] = None
+    tp_pct: Optional[float] = None
+    exit_on_sell_signal: bool = True
+    timeframe: str = "1h"
+    fast: bool = True
+
+
+@dataclass
+class BacktestTrade:
+    symbol: str
+    entry_ts: int
+    entry_price: float
+    sl: float
+    tp: float
+    exit_ts: Optional[int] = None
+    exit_price: Optional[float] = None
+    exit_reason: Optional[str] = None  # TP | SL | SELL_SIGNAL | END
+    pnl_usd: float = 0.0
+    pnl_pct: float = 0.0
+
+
+@dataclass
+class BacktestResult:
+    symbol: str
+    preset: str
+    risk_approach: str
+    candles: int
+    evaluated: int
+    trades: List[BacktestTrade] = field(default_factory=list)
+    signals: Dict[str, int] = field(default_factory=dict)
+    max_drawdown_usd: float = 0.0
+    max_drawdown_pct: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def closed_trades(self) -> List[BacktestTrade]:
+        return [t for t in self.trades if t.exit_reason not in (None, "END")]
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        closed = self.closed_trades
+        if not closed:
+            return None
+        return sum(1 for t in closed if t.pnl_usd > 0) / len(closed)
+
+    @property
+    def pnl_usd(self) -> float:
+        return sum(t.pnl_usd for t in self.trades)
+
+    def to_dict(self, include_trades: bool = False) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "symbol": self.symbol,
+            "preset": self.preset,
+            "risk_approach": self.risk_approach,
+            "candles": self.candles,
+            "evaluated": self.evaluated,
+            "trades": len(self.trades),
+            "closed_trades": len(self.closed_trades),
+            "hit_rate": round(self.hit_rate, 4) if self.hit_rate is not None else None,
+            "pnl_usd": round(self.pnl_usd, 4),
+            "max_drawdown_usd": round(self.max_drawdown_usd, 4),
+            "max_drawdown_pct": round(self.max_drawdown_pct, 4),
+            "signals": dict(self.signals),
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+        }
+        if include_trades:
+            out["trade_list"] = [asdict(t) for t in self.trades]
+        return out
+
+
+# ---------------------------------------------------------------- indicators
+
+
+def _round_by_value(values: np.ndarray) -> np.ndarray:
+    """calculate_ma / calculate_ema display precision (2, 6 or 10 decimals by magnitude)."""
+    return np.where(
+        values >= 1, np.round(values, 2), np.where(values >= 0.01, np.round(values, 6), np.round(values, 10))
+    )
+
+
+def _round_by_price(values: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    """calculate_atr precision (by current price)."""
+    return np.where(
+        prices >= 100, np.round(values, 2), np.where(prices >= 1, np.round(values, 4), np.round(values, 6))
+    )
+
+
+def _daily_closes(candles: Sequence[Mapping[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(daily closes of each UTC day, index of each candle's day in that array)."""
+    days = np.array([int(c["t"]) // DAY_MS for c in candles], dtype=np.int64)
+    closes = np.array([float(c["c"]) for c in candles])
+    last_of_day = np.flatnonzero(np.append(days[1:] != days[:-1], True))
+    day_index = np.searchsorted(days[last_of_day], days)
+    return closes[last_of_day], day_index
+
+
+def _ma10w_series(closes: np.ndarray, candles: Sequence[Mapping[str, Any]], window: int) -> np.ndarray:
+    """MA10w per candle: last 70 daily closes (current day = current price), hourly fallback below 50 days."""
+    daily, day_index = _daily_closes(candles)
+    csum = np.concatenate([[0.0], np.cumsum(daily)])
+    completed = day_index  # days strictly before each candle's day
+    n_days = np.minimum(completed + 1, DAILY_WINDOW)
+    period = np.minimum(n_days, 70)
+    prior = period - 1
+    prior_sum = csum[completed] - csum[np.maximum(completed - prior, 0)]
+    daily_ma = (prior_sum + closes) / period
+    hourly = np.full(len(closes), np.nan)
+    if len(closes) >= 70:
+        hourly[69:] = sliding_window_view(closes, 70).mean(axis=1)
+    return _round_by_value(np.where(n_days >= 50, daily_ma, hourly))
+
+
+def precompute_indicator_series(
+    candles: Sequence[Mapping[str, Any]], window: int = INDICATOR_WINDOW
+) -> Dict[str, np.ndarray]:
+    """
+    Indicator values the live monitor would see at each candle (NaN until
+    ``window`` candles are available), computed in one vectorized pass.
+    """
+    n = len(candles)
+    out = {key: np.full(n, np.nan) for key in SERIES_KEYS}
+    out["price"] = np.array([float(c["c"]) for c in candles])
+    if n < window:
+        return out
+    arrays = {key: np.array([float(c.get(key, 0.0)) for c in candles]) for key in ("c", "h", "l", "v")}
+    windows = {key: sliding_window_view(arr, window) for key, arr in arrays.items()}
+    batch = compute_indicators_batch(windows["c"], windows["h"], windows["l"], windows["v"])
+    price = out["price"][window - 1:]
+    tail = slice(window - 1, n)
+    out["rsi"][tail] = np.round(batch["rsi_simple"], 2)
+    out["ma50"][tail] = _round_by_value(batch["ma50"])
+    out["ma200"][tail] = _round_by_value(batch["ma200"])
+    out["ema10"][tail] = _round_by_value(batch["ema10"])
+    out["atr"][tail] = _round_by_price(batch["atr"], price)
+    out["current_volume"][tail] = np.round(batch["current_volume"], 2)
+    out["avg_volume"][tail] = np.round(batch["avg_volume"], 2)
+    out["ma10w"][tail] = _ma10w_series(out["price"], candles, window)[tail]
+    return out
+
+
+def reference_indicator_series(
+    candles: Sequence[Mapping[str, Any]], window: int = INDICATOR_WINDOW
+) -> Dict[str, np.ndarray]:
+    """Same series through ``market_updater.calculate_technical_indicators``, one candle at a time."""
+    from market_updater import calculate_technical_indicators
+
+    n = len(candles)
+    out = {key: np.full(n, np.nan) for key in SERIES_KEYS}
+    out["price"] = np.array([float(c["c"]) for c in candles])
+    daily, day_index = _daily_closes(candles)
+    for i in range(window - 1, n):
+        price = float(candles[i]["c"])
+        completed = int(day_index[i])
+        daily_candles = [{"c": float(x)} for x in daily[max(0, completed - DAILY_WINDOW + 1):completed]]
+        daily_candles.append({"c": price})
+        values = calculate_technical_indicators(
+            list(candles[i - window + 1:i + 1]), price, ohlcv_data_daily=daily_candles
+        )
+        for key in SERIES_KEYS:
+            out[key][i] = values[key]
+    return out
+
+
+# ------------------------------------------------------------------- replay
+
+
+@contextmanager
+def _quiet_decision_logs() -> Iterator[None]:
+    """calculate_trading_signals logs every evaluation at INFO; silence it for the replay."""
+    loggers = [logging.getLogger(name) for name in ("app.services.trading_signals", "app.services.auto_entry_model")]
+    levels = [lg.level for lg in loggers]
+    for lg in loggers:
+        lg.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        for lg, level in zip(loggers, levels):
+            lg.setLevel(level)
+
+
+def _opt(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _bar_time(open_ms: int, step_ms: int) -> datetime:
+    return datetime.fromtimestamp((open_ms + step_ms) / 1000, tz=timezone.utc)
+
+
+def _close_trade(trade: BacktestTrade, ts: int, price: float, reason: str, config: BacktestConfig) -> None:
+    qty = config.position_size_usd / trade.entry_price
+    fees = config.fee_pct / 100.0 * (config.position_size_usd + qty * price)
+    trade.exit_ts, trade.exit_price, trade.exit_reason = ts, price, reason
+    trade.pnl_usd = qty * (price - trade.entry_price) - fees
+    trade.pnl_pct = trade.pnl_usd / config.position_size_usd * 100.0
+
+
+def _check_exit(trade: BacktestTrade, candle: Mapping[str, Any]) -> Optional[Tuple[float, str]]:
+    o, h, low = float(candle["o"]), float(candle["h"]), float(candle["l"])
+    if low <= trade.sl:
+        return (min(o, trade.sl), "SL")
+    if h >= trade.tp:
+        return (max(o, trade.tp), "TP")
+    return None
+
+
+def run_symbol_backtest(
+    symbol: str,
+    candles: Sequence[Mapping[str, Any]],
+    strategy_type: StrategyType,
+    risk_approach: RiskApproach,
+    config: BacktestConfig = BacktestConfig(),
+    rules: Optional[Dict[str, Any]] = None,
+    series: Optional[Dict[str, np.ndarray]] = None,
+) -> BacktestResult:
+    """
+    Replay ``candles`` (oldest first, ``{"t","o","h","l","c","v"}``) for one
+    symbol and preset. ``rules`` overrides the preset's strategy rules from
+    trading_config.json; ``series`` reuses precomputed indicators across presets.
+    """
+    started = time.perf_counter()
+    if rules is None:
+        rules = get_strategy_rules(strategy_type.value, risk_approach.value.capitalize())
+    if series is None:
+        series = precompute_indicator_series(candles) if config.fast else reference_indicator_series(candles)
+    min_pct = config.min_price_change_pct
+    if min_pct is None:
+        try:
+            min_pct = get_alert_thresholds(symbol, risk_approach.value)[0]
+        except Exception as e:
+            logger.debug("[BACKTEST] alert thresholds unavailable for %s: %s", symbol, e)
+        if min_pct is None:
+            min_pct = DEFAULT_MIN_PRICE_CHANGE_PCT
+    throttle = SignalThrottleConfig(min_price_change_pct=min_pct, min_interval_minutes=1.0)
+    step_ms = TIMEFRAME_MS.get(config.timeframe, TIMEFRAME_MS["1h"])
+
+    rsi = series["rsi"]
+    ready = ~np.isnan(rsi)
+    if config.fast:
+        buy_below = (rules.get("rsi") or {}).get("buyBelow")
+        candidate = rsi > RSI_SELL_THRESHOLD
+        if buy_below is not None:
+            candidate |= rsi < float(buy_below)
+        candidate &= ready
+    else:
+        candidate = ready
+
+    result = BacktestResult(
+        symbol=symbol,
+        preset=strategy_type.value,
+        risk_approach=risk_approach.value,
+        candles=len(candles),
+        evaluated=0,
+        signals={"buy": 0, "sell": 0, "buy_throttled": 0, "sell_throttled": 0},
+    )
+    last: Dict[str, Optional[LastSignalSnapshot]] = {"BUY": None, "SELL": None}
+    open_trade: Optional[BacktestTrade] = None
+    equity_peak = realized = 0.0
+    max_dd = 0.0
+
+    with _quiet_decision_logs():
+        for i, candle in enumerate(candles):
+            ts = int(candle["t"])
+            close = float(candle["c"])
+            if open_trade is not None and open_trade.entry_ts < ts:
+                hit = _check_exit(open_trade, candle)
+                if hit is not None:
+                    _close_trade(open_trade, ts, hit[0], hit[1], config)
+                    realized += open_trade.pnl_usd
+                    open_trade = None
+
+            if candidate[i]:
+                result.evaluated += 1
+                signals = calculate_trading_signals(
+                    symbol=symbol,
+                    price=close,
+                    rsi=_opt(rsi[i]),
+                    atr14=_opt(series["atr"][i]),
+                    ma50=_opt(series["ma50"][i]),
+                    ma200=_opt(series["ma200"][i]),
+                    ema10=_opt(series["ema10"][i]),
+                    ma10w=_opt(series["ma10w"][i]),
+                    volume=_opt(series["current_volume"][i]),
+                    avg_volume=_opt(series["avg_volume"][i]),
+                    resistance_up=close * 1.02,
+                    last_buy_price=open_trade.entry_price if open_trade else None,
+                    position_size_usd=config.position_size_usd,
+                    rsi_buy_threshold=40,
+                    rsi_sell_threshold=RSI_SELL_THRESHOLD,
+                    strategy_type=strategy_type,
+                    risk_approach=risk_approach,
+                    rules_override=rules,
+                )
+                now = _bar_time(ts, step_ms)
+                for side, flag in (("BUY", "buy_signal"), ("SELL", "sell_signal")):
+                    if not signals.get(flag):
+                        continue
+                    opposite = last["SELL" if side == "BUY" else "BUY"]
+                    allowed, _reason = should_emit_signal(
+                        symbol=symbol,
+                        side=side,
+                        current_price=close,
+                        current_time=now,
+                        config=throttle,
+                        last_same_side=last[side],
+                        last_opposite_side=opposite,
+                    )
+                    if not allowed:
+                        result.signals[f"{side.lower()}_throttled"] += 1
+                        continue
+                    result.signals[side.lower()] += 1
+                    last[side] = LastSignalSnapshot(side=side, price=close, timestamp=now)
+                    if side == "BUY" and open_trade is None:
+                        if config.sl_pct is not None and config.tp_pct is not None:
+                            sl, tp, _meta = compute_strategy_sl_tp_prices(
+                                entry_side="BUY", entry_price=close, sl_pct=config.sl_pct, tp_pct=config.tp_pct
+                            )
+                        else:
+                            sl = signals.get("sl") or close * 0.97
+                            tp = signals.get("tp") or close * 1.03
+                        open_trade = BacktestTrade(symbol, ts, close, float(sl), float(tp))
+                        result.trades.append(open_trade)
+                    elif side == "SELL" and open_trade is not None and config.exit_on_sell_signal:
+                        _close_trade(open_trade, ts, close, "SELL_SIGNAL", config)
+                        realized += open_trade.pnl_usd
+                        open_trade = None
+
+            equity = realized
+            if open_trade is not None:
+                equity += config.position_size_usd / open_trade.entry_price * (close - open_trade.entry_price)
+            equity_peak = max(equity_peak, equity)
+            max_dd = max(max_dd, equity_peak - equity)
+
+    if open_trade is not None and candles:
+        _close_trade(open_trade, int(candles[-1]["t"]), float(candles[-1]["c"]), "END", config)
+    result.max_drawdown_usd = max_dd
+    result.max_drawdown_pct = max_dd / (config.position_size_usd + equity_peak) * 100.0 if max_dd else 0.0
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def run_backtest(
+    candles_by_symbol: Mapping[str, Sequence[Mapping[str, Any]]],
+    presets: Iterable[Tuple[StrategyType, RiskApproach]],
+    config: BacktestConfig = BacktestConfig(),
+    rules_by_preset: Optional[Mapping[Tuple[StrategyType, RiskApproach], Dict[str, Any]]] = None,
+) -> List[BacktestResult]:
+    """Every (symbol, preset, risk approach); indicators are computed once per symbol."""
+    presets = list(presets)
+    results: List[BacktestResult] = []
+    for symbol, candles in candles_by_symbol.items():
+        series = precompute_indicator_series(candles) if config.fast else reference_indicator_series(candles)
+        for strategy_type, risk_approach in presets:
+            rules = (rules_by_preset or {}).get((strategy_type, risk_approach))
+            results.append(
+                run_symbol_backtest(symbol, candles, strategy_type, risk_approach, config, rules=rules, series=series)
+            )
+    return results
+
+
+def summarize_results(results: Iterable[BacktestResult]) -> List[Dict[str, Any]]:
+    """Per (preset, risk approach) totals across symbols, best PnL first."""
+    groups: Dict[Tuple[str, str], List[BacktestResult]] = {}
+    for r in results:
+        groups.setdefault((r.preset, r.risk_approach), []).append(r)
+    summary = []
+    for (preset, risk), items in groups.items():
+        closed = [t for r in items for t in r.closed_trades]
+        wins = sum(1 for t in closed if t.pnl_usd > 0)
+        summary.append({
+            "preset": preset,
+            "risk_approach": risk,
+            "symbols": len(items),
+            "trades": sum(len(r.trades) for r in items),
+            "hit_rate": round(wins / len(closed), 4) if closed else None,
+            "pnl_usd": round(sum(r.pnl_usd for r in items), 4),
+            "worst_drawdown_pct": round(max((r.max_drawdown_pct for r in items), default=0.0), 4),
+        })
+    summary.sort(key=lambda row: row["pnl_usd"], reverse=True)
+    return summary
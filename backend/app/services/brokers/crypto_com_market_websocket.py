@@ -0,0 +1,286 @@
+"""
+Crypto.com Exchange v1 market-data WebSocket client
+Subscribes to ticker.{instrument} and candlestick.{interval}.{instrument} for the
+watched symbols and feeds the in-memory market data cache.
+
+- Reconnects with exponential backoff and resubscribes every channel.
+- Answers public/heartbeat; a connection silent for ``stale_after`` seconds
+  (no data, no heartbeat) is dropped and reconnected.
+- The ticker/candlestick feeds carry no sequence numbers, so gaps are detected
+  from candle open-time continuity (see MarketDataCache.update_candle) and
+  reported to ``on_gap``.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import websockets
+
+from app.services.market_data_cache import MarketDataCache, market_data_cache
+from app.utils.egress_guard import validate_outbound_url
+
+from .crypto_com_constants import WS_MARKET
+
+logger = logging.getLogger(__name__)
+
+# Our timeframe names -> Crypto.com candlestick intervals
+CANDLE_INTERVALS: Dict[str, str] = {
+    "1m": "1m",
+    "5m": "5m",
+    "15m": "15m",
+    "30m": "30m",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D",
+    "1w": "7D",
+}
+_TIMEFRAME_BY_INTERVAL = {v: k for k, v in CANDLE_INTERVALS.items()}
+
+GapHandler = Callable[[str, str, int, int], None]
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CryptoComMarketWebSocketClient:
+    """WebSocket client for the Crypto.com Exchange v1 market channel"""
+
+    def __init__(
+        self,
+        ws_url: str = WS_MARKET,
+        *,
+        cache: Optional[MarketDataCache] = None,
+        timeframes: Iterable[str] = ("1h", "1d", "5m"),
+        connect_delay: float = 1.0,
+        reconnect_interval: float = 1.0,
+        max_reconnect_interval: float = 60.0,
+        stale_after: float = 60.0,
+        channels_per_request: int = 50,
+        on_gap: Optional[GapHandler] = None,
+    ):
+        self.ws_url = ws_url
+        self.cache = cache or market_data_cache
+        self.timeframes = [tf for tf in timeframes if tf in CANDLE_INTERVALS]
+        # Crypto.com asks clients to wait ~1s after connecting before sending requests
+        self.connect_delay = connect_delay
+        self.reconnect_interval = reconnect_interval
+        self.max_reconnect_interval = max_reconnect_interval
+        self.stale_after = stale_after
+        self.channels_per_request = max(1, channels_per_request)
+        self.on_gap = on_gap
+
+        self.ws = None
+        self.connected = False
+        self._symbols: Set[str] = set()
+        self._subscribed: Set[str] = set()
+        self._request_id = 0
+        self._stopped = asyncio.Event()
+        self.stats: Dict[str, float] = {
+            "connects": 0,
+            "reconnects": 0,
+            "messages": 0,
+            "tickers": 0,
+            "candles": 0,
+            "gaps": 0,
+            "heartbeats": 0,
+            "subscribe_errors": 0,
+            "last_message_at": 0.0,
+        }
+
+    # -- subscriptions ----------------------------------------------------
+    def channels_for(self, symbols: Iterable[str]) -> List[str]:
+        channels = []
+        for symbol in sorted(symbols):
+            channels.append(f"ticker.{symbol}")
+            for tf in self.timeframes:
+                channels.append(f"candlestick.{CANDLE_INTERVALS[tf]}.{symbol}")
+        return channels
+
+    def _next_id(self) -> int:
+        self._request_id += 1
+        return self._request_id
+
+    async def _send_channels(self, method: str, channels: List[str]) -> None:
+        for i in range(0, len(channels), self.channels_per_request):
+            chunk = channels[i:i + self.channels_per_request]
+            await self.ws.send(json.dumps({
+                "id": self._next_id(),
+                "method": method,
+                "params": {"channels": chunk},
+                "nonce": int(time.time() * 1000),
+            }))
+
+    async def update_symbols(self, symbols: Iterable[str]) -> None:
+        """Set the watched symbols; on a live connection only the difference is (un)subscribed."""
+        self._symbols = {s for s in symbols if s}
+        if not self.connected or self.ws is None:
+            return
+        wanted = set(self.channels_for(self._symbols))
+        added = sorted(wanted - self._subscribed)
+        removed = sorted(self._subscribed - wanted)
+        try:
+            if removed:
+                await self._send_channels("unsubscribe", removed)
+            if added:
+                await self._send_channels("subscribe", added)
+            self._subscribed = wanted
+        except Exception as e:
+            logger.warning(f"Market WS subscription update failed: {e}")
+
+    # -- messages ---------------------------------------------------------
+    async def handle_message(self, data: dict) -> None:
+        """Handle one decoded message from the market channel"""
+        method = data.get("method", "")
+        if method == "public/heartbeat":
+            self.stats["heartbeats"] += 1
+            await self.ws.send(json.dumps({"id": data.get("id"), "method": "public/respond-heartbeat"}))
+            return
+
+        result = data.get("result")
+        if not isinstance(result, dict) or "channel" not in result:
+            if method in ("subscribe", "unsubscribe") and data.get("code") not in (0, None):
+                self.stats["subscribe_errors"] += 1
+                logger.warning(f"Market WS {method} failed: {data}")
+            return
+
+        channel = result.get("channel")
+        symbol = result.get("instrument_name")
+        if channel == "ticker":
+            for item in result.get("data") or []:
+                ticker = self.cache.update_ticker(
+                    symbol or item.get("i"),
+                    _float(item.get("a")),
+                    bid=_float(item.get("b")),
+                    ask=_float(item.get("k")),
+                    volume_24h=_float(item.get("v")),
+                    exchange_ts_ms=item.get("t"),
+                )
+                if ticker is not None:
+                    self.stats["tickers"] += 1
+        elif channel == "candlestick":
+            timeframe = _TIMEFRAME_BY_INTERVAL.get(result.get("interval", ""))
+            if timeframe is None:
+                return
+            for item in sorted(result.get("data") or [], key=lambda c: c.get("t", 0)):
+                candle = {
+                    "t": int(item["t"]),
+                    "o": _float(item.get("o")),
+                    "h": _float(item.get("h")),
+                    "l": _float(item.get("l")),
+                    "c": _float(item.get("c")),
+                    "v": _float(item.get("v")),
+                }
+                gap = self.cache.update_candle(symbol, timeframe, candle)
+                self.stats["candles"] += 1
+                if gap is not None:
+                    self.stats["gaps"] += 1
+                    logger.info(f"Market WS candle gap {symbol} {timeframe}: {gap[0]} -> {gap[1]}")
+                    if self.on_gap is not None:
+                        try:
+                            self.on_gap(symbol, timeframe, gap[0], gap[1])
+                        except Exception as e:
+                            logger.warning(f"Market WS gap handler failed: {e}")
+
+    async def listen(self) -> None:
+        """Read messages until the connection closes or goes stale"""
+        while not self._stopped.is_set():
+            try:
+                message = await asyncio.wait_for(self.ws.recv(), timeout=self.stale_after)
+            except asyncio.TimeoutError:
+                logger.warning(f"Market WS silent for {self.stale_after}s, reconnecting")
+                return
+            self.stats["messages"] += 1
+            self.stats["last_message_at"] = time.time()
+            try:
+                await self.handle_message(json.loads(message))
+            except json.JSONDecodeError:
+                logger.warning(f"Invalid JSON received on market WS: {message!r:.200}")
+            except websockets.exceptions.ConnectionClosed:
+                raise
+            except Exception as e:
+                logger.error(f"Error handling market WS message: {e}")
+
+    # -- lifecycle --------------------------------------------------------
+    async def connect(self) -> bool:
+        """Open the connection and subscribe every channel for the watched symbols"""
+        try:
+            validate_outbound_url(self.ws_url, calling_module="crypto_com_market_websocket")
+            logger.info(f"Connecting to {self.ws_url}...")
+            self.ws = await websockets.connect(self.ws_url, ping_interval=None, max_size=2**22)
+            if self.connect_delay:
+                await asyncio.sleep(self.connect_delay)
+            channels = self.channels_for(self._symbols)
+            await self._send_channels("subscribe", channels)
+            self._subscribed = set(channels)
+            self.connected = True
+            self.stats["connects"] += 1
+            logger.info(f"Market WS connected, subscribed {len(channels)} channels")
+            return True
+        except Exception as e:
+            logger.error(f"Error connecting to market WebSocket: {e}")
+            await self._close_ws()
+            return False
+
+    async def _close_ws(self) -> None:
+        ws, self.ws = self.ws, None
+        self.connected = False
+        self._subscribed = set()
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    async def start(self) -> None:
+        """Connect, listen, and reconnect with backoff until stop()"""
+        self._stopped.clear()
+        attempt = 0
+        while not self._stopped.is_set():
+            if await self.connect():
+                received_before = self.stats["messages"]
+                try:
+                    await self.listen()
+                except websockets.exceptions.ConnectionClosed as e:
+                    logger.warning(f"Market WS connection closed: {e}")
+                except Exception as e:
+                    logger.error(f"Error in market WS listener: {e}")
+                await self._close_ws()
+                if self.stats["messages"] > received_before:
+                    attempt = 0
+            if self._stopped.is_set():
+                break
+            wait_time = min(self.reconnect_interval * (2 ** attempt), self.max_reconnect_interval)
+            wait_time *= random.uniform(0.8, 1.2)
+            attempt += 1
+            self.stats["reconnects"] += 1
+            logger.info(f"Market WS reconnecting in {wait_time:.1f}s (attempt {attempt})")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=wait_time)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        """Stop the client and close the connection"""
+        self._stopped.set()
+        await self._close_ws()
+        logger.info("Market WebSocket connection closed")
+
+
+# Global market WebSocket client instance
+_market_ws_client: Optional[CryptoComMarketWebSocketClient] = None
+
+
+def get_market_ws_client() -> CryptoComMarketWebSocketClient:
+    """Get or create the market WebSocket client singleton"""
+    global _market_ws_client
+    if _market_ws_client is None:
+        _market_ws_client = CryptoComMarketWebSocketClient()
+    return _market_ws_client
@@ -13,9 +13,11 @@ from urllib.parse import urlparse
 from contextvars import ContextVar
 
 # Use mandatory http_client wrapper for all outbound HTTP requests and exception types
-from app.utils.http_client import http_get, http_post, requests_exceptions
+from app.utils.http_client import http_get as _http_get, http_post as _http_post, requests_exceptions
+from app.services.pipeline_metrics import instrument_stage, observe_exchange_request
 
 from .crypto_com_constants import REST_BASE, CONTENT_TYPE_JSON
+from .sltp_variant_stats import get_sltp_variant_stats, is_format_rejection, variant_stats_key
 from app.core.crypto_com_guardrail import (
     enforce_crypto_com_origin,
     AUTH_40101_MESSAGE,
@@ -39,6 +41,49 @@ from app.services.open_orders import UnifiedOpenOrder, _format_timestamp
 logger = logging.getLogger(__name__)
 trigger_probe_logger = logging.getLogger("app.crypto.trigger_probe")
 
+def _exchange_endpoint(url: str) -> Optional[str]:
+    """``private/...`` / ``public/...`` method of a Crypto.com REST URL (None for other hosts)."""
+    path = urlparse(url).path or ""
+    for marker in ("/private/", "/public/"):
+        idx = path.find(marker)
+        if idx >= 0:
+            return path[idx + 1:]
+    return None
+
+
+def _timed_exchange_call(send, url: str, *args, **kwargs):
+    endpoint = _exchange_endpoint(url)
+    if endpoint is None:
+        return send(url, *args, **kwargs)
+    started = time.perf_counter()
+    try:
+        response = send(url, *args, **kwargs)
+    except Exception:
+        observe_exchange_request(endpoint, time.perf_counter() - started, "exception")
+        raise
+    elapsed = time.perf_counter() - started
+    error_code = None
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int) and status >= 400:
+        # Only failed responses are parsed again, for the exchange code
+        try:
+            error_code = (response.json() or {}).get("code") or status
+        except Exception:
+            error_code = status
+    observe_exchange_request(endpoint, elapsed, error_code)
+    return response
+
+
+def http_get(url: str, *args, **kwargs):
+    """http_client.http_get with per-endpoint latency / error metrics for Crypto.com URLs."""
+    return _timed_exchange_call(_http_get, url, *args, **kwargs)
+
+
+def http_post(url: str, *args, **kwargs):
+    """http_client.http_post with per-endpoint latency / error metrics for Crypto.com URLs."""
+    return _timed_exchange_call(_http_post, url, *args, **kwargs)
+
+
 _USE_CRYPTO_PROXY_OVERRIDE: ContextVar[Optional[bool]] = ContextVar(
     "USE_CRYPTO_PROXY_OVERRIDE",
     default=None,
@@ -207,10 +252,6 @@ class CryptoComTradeClient:
         self._last_trigger_health_check = 0  # Track when we last checked trigger orders health
         self._trigger_health_check_interval = 86400  # 24 hours in seconds
 
-        # Remember discovered working SL/TP variant formats (in-memory, per process).
-        # Keyed by "<instrument_name>|<order_type>|proxy=<0|1>".
-        self._sltp_preferred_variants: Dict[str, dict] = {}
-
         # Security: never log full keys/secrets. Enable limited diagnostics via CRYPTO_AUTH_DIAG=true.
         if self.crypto_auth_diag:
             logger.info("[CRYPTO_AUTH_DIAG] === CREDENTIALS LOADED (SAFE) ===")
@@ -300,6 +341,7 @@ class CryptoComTradeClient:
         """Call Crypto.com API through the proxy"""
         if (method.startswith("private/") or "/private/" in method) and get_execution_context() != "AWS":
             return _skip_payload(method)
+        started = time.perf_counter()
         try:
             response = http_post(
                 f"{self.proxy_url}/proxy/private",
@@ -323,6 +365,12 @@ class CryptoComTradeClient:
                     body = {"raw": body}
             if not isinstance(body, dict):
                 body = {"raw": body}
+            body_code = body.get("code")
+            observe_exchange_request(
+                method,
+                time.perf_counter() - started,
+                body_code if body_code not in (None, 0, "0") else (proxy_status if proxy_status != 200 else None),
+            )
             
             # If proxy returned 401, return the parsed error for failover detection
             if proxy_status == 401:
@@ -334,6 +382,7 @@ class CryptoComTradeClient:
                 logger.error(f"Proxy returned status {proxy_status}: {body}")
                 return body
         except Exception as e:
+            observe_exchange_request(method, time.perf_counter() - started, "exception")
             logger.error(f"Error calling proxy: {e}")
             return {}
     
@@ -2747,22 +2796,12 @@ class CryptoComTradeClient:
             except Exception as exc:
                 return False, None, None, str(exc), resp_obj_local
 
-        preferred_key = f"{instrument_name.upper()}|{order_type}|proxy={1 if self.use_proxy else 0}"
-        preferred_variant_id = None
-        preferred_method = None
-        try:
-            pref = self._sltp_preferred_variants.get(preferred_key) or {}
-            preferred_variant_id = pref.get("variant_id")
-            preferred_method = pref.get("api_method")
-        except Exception:
-            preferred_variant_id = None
-            preferred_method = None
-
-        if preferred_variant_id:
-            variants = sorted(
-                list(variants),
-                key=lambda v: 0 if v.get("variant_id") == preferred_variant_id else 1,
-            )
+        # Learned variants (persisted across restarts): the last accepted one goes first,
+        # the rest by decayed success rate, so the common case is a single request.
+        variant_stats = get_sltp_variant_stats()
+        stats_key = variant_stats_key(instrument_name, order_type, side, self.use_proxy)
+        preferred_variant_id, preferred_method = variant_stats.known_good(stats_key)
+        variants = variant_stats.order_variants(stats_key, variants)
 
         errors: List[dict] = []
         last_response: Any = None
@@ -2891,11 +2930,10 @@ class CryptoComTradeClient:
                         base_variant=v
                     )
                     if ok_list and order_id_list:
-                        self._sltp_preferred_variants[preferred_key] = {
-                            "variant_id": v.get("variant_id"),
-                            "api_method": "private/create-order-list",
-                        }
                         elapsed_ms = int((time.perf_counter() - t0) * 1000)
+                        variant_stats.record_success(
+                            stats_key, str(v.get("variant_id")), "private/create-order-list", elapsed_ms
+                        )
                         record = {
                             "correlation_id": correlation_id,
                             "variant_id": v.get("variant_id"),
@@ -3041,11 +3079,8 @@ class CryptoComTradeClient:
 
                 if is_ok:
                     # Persist preferred variant for future reuse
-                    self._sltp_preferred_variants[preferred_key] = {
-                        "variant_id": v.get("variant_id"),
-                        "api_method": "private/create-order",
-                    }
                     elapsed_ms = int((time.perf_counter() - t0) * 1000)
+                    variant_stats.record_success(stats_key, str(v.get("variant_id")), "private/create-order", elapsed_ms)
                     record = {
                         "correlation_id": correlation_id,
                         "variant_id": v.get("variant_id"),
@@ -3112,10 +3147,9 @@ class CryptoComTradeClient:
                         pass
 
                     if ok_list and order_id_list:
-                        self._sltp_preferred_variants[preferred_key] = {
-                            "variant_id": v.get("variant_id"),
-                            "api_method": "private/create-order-list",
-                        }
+                        variant_stats.record_success(
+                            stats_key, str(v.get("variant_id")), "private/create-order-list", elapsed_ms_list
+                        )
                         return {
                             "ok": True,
                             "order_id": str(order_id_list),
@@ -3163,6 +3197,10 @@ class CryptoComTradeClient:
                 "params_keys": params_keys,
             }
             errors.append(err_rec)
+            # Only format rejections count against the variant; business rejections (balance,
+            # price, quantity), 140001 (API disabled) and transport errors say nothing about it.
+            if exc_str is None and is_format_rejection(resp_code, resp_message):
+                variant_stats.record_failure(stats_key, str(v.get("variant_id")))
 
             if resp_code == 140001:
                 # Stop retry loop once we see API_DISABLED.
@@ -3478,8 +3516,8 @@ class CryptoComTradeClient:
                     return {"data": data}
             
             logger.warning(f"Proxy error or empty response for order history: {result}")
-            # Return empty array if API error
-            return {"data": []}
+            # Return empty array if API error; "error" tells window syncs the range was not read
+            return {"data": [], "error": "proxy_error", "code": result.get("code") if isinstance(result, dict) else None}
         
         # Check if API credentials are configured
         # NOTE: Do NOT return simulated data here; it hides operational issues and can mask missing SL/TP.
@@ -3556,7 +3594,7 @@ class CryptoComTradeClient:
                     except Exception as fallback_err:
                         logger.warning(f"Fallback to TRADE_BOT failed: {fallback_err}")
                 
-                return {"data": []}
+                return {"data": [], "error": "authentication_failed", "code": error_code}
             
             response.raise_for_status()
             result = response.json()
@@ -3771,15 +3809,16 @@ class CryptoComTradeClient:
                     return {"data": data}
             
             logger.warning("Order history unexpected format: result_keys=%s", top_keys)
-            return {"data": []}
+            return {"data": [], "error": "unexpected_format", "code": api_code}
             
         except requests_exceptions.RequestException as e:
             logger.error(f"Network error getting order history: {e}")
-            return {"data": []}
+            return {"data": [], "error": str(e)}
         except Exception as e:
             logger.error(f"Error getting order history: {e}")
-            return {"data": []}
+            return {"data": [], "error": str(e)}
     
+    @instrument_stage("order_placement")
     def place_market_order(
         self, 
         symbol: str, 
@@ -14,6 +14,7 @@ from typing import Dict, Callable, Optional
 import websockets
 from websockets.client import WebSocketClientProtocol
 
+from app.services import order_fill_registry
 from .crypto_com_constants import WS_USER
 
 logger = logging.getLogger(__name__)
@@ -113,6 +114,7 @@ class CryptoComWebSocketClient:
             if data.get("method") == "subscribe" and data.get("code") == 0:
                 logger.info("Successfully subscribed to user channel")
                 self.subscribed = True
+                order_fill_registry.set_stream_live(True)
                 return True
             else:
                 logger.error(f"Subscription failed: {data}")
@@ -130,24 +132,49 @@ class CryptoComWebSocketClient:
         self.callbacks[event_type] = callback
         logger.info(f"Registered callback for event type: {event_type}")
     
+    @staticmethod
+    def _channel_payload(data: dict):
+        """(channel, data) of a push: v1 sends method=subscribe with result.channel, e.g. user.order.BTC_USDT"""
+        result = data.get("result")
+        if data.get("method") == "subscribe" and isinstance(result, dict) and result.get("channel"):
+            channel = str(result["channel"])
+            for prefix in ("user.balance", "user.order", "user.trade"):
+                if channel.startswith(prefix):
+                    return prefix, result.get("data", [])
+            return channel, result.get("data", [])
+        return data.get("method", ""), data.get("data", {})
+
+    @staticmethod
+    def _publish_fills(method: str, payload) -> None:
+        items = payload if isinstance(payload, list) else [payload]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if method == "user.order":
+                order_fill_registry.publish_order_update(item)
+            else:
+                order_fill_registry.publish_trade(item)
+
     def handle_message(self, data: dict):
         """Handle incoming WebSocket messages"""
-        method = data.get("method", "")
+        method, payload = self._channel_payload(data)
         
         if method == "user.balance":
-            self.balance_data = data.get("data", {})
+            self.balance_data = payload
             if "balance" in self.callbacks:
                 self.callbacks["balance"](self.balance_data)
             logger.debug("Balance updated")
             
         elif method == "user.order":
-            order_data = data.get("data", {})
+            order_data = payload
+            self._publish_fills(method, order_data)
             if "order" in self.callbacks:
                 self.callbacks["order"](order_data)
             logger.debug(f"Order update: {order_data}")
             
         elif method == "user.trade":
-            trade_data = data.get("data", {})
+            trade_data = payload
+            self._publish_fills(method, trade_data)
             if "trade" in self.callbacks:
                 self.callbacks["trade"](trade_data)
             logger.debug(f"Trade update: {trade_data}")
@@ -164,6 +191,10 @@ class CryptoComWebSocketClient:
             async for message in self.ws:
                 try:
                     data = json.loads(message)
+                    if data.get("method") == "public/heartbeat":
+                        # Unanswered heartbeats make the exchange close the connection
+                        await self.ws.send(json.dumps({"id": data.get("id"), "method": "public/respond-heartbeat"}))
+                        continue
                     self.handle_message(data)
                 except json.JSONDecodeError:
                     logger.warning(f"Invalid JSON received: {message}")
@@ -178,6 +209,8 @@ class CryptoComWebSocketClient:
             logger.error(f"Error in WebSocket listener: {e}")
             self.connected = False
             self.subscribed = False
+        finally:
+            order_fill_registry.set_stream_live(False)
     
     async def connect(self):
         """Establish WebSocket connection and authenticate"""
@@ -235,6 +268,7 @@ class CryptoComWebSocketClient:
             await self.ws.close()
         self.connected = False
         self.subscribed = False
+        order_fill_registry.set_stream_live(False)
         logger.info("WebSocket connection closed")
 
 
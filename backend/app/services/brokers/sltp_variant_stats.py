@@ -0,0 +1,200 @@
+"""
+Learned SL/TP payload variants for ``CryptoComTradeClient._create_order_try_variants``.
+
+``_build_sltp_variant_grid`` yields up to 220 payload formats per order type and
+the try loop spends one signed request on each until the exchange accepts one.
+This table remembers, per ``<instrument>|<order_type>|<side>|proxy=<0|1>``, which
+variants were accepted or rejected (and through which endpoint), so the next
+placement starts with the known-good variant and walks the rest by success rate:
+
+- counts decay with a half-life (SLTP_VARIANT_STATS_HALF_LIFE_H), so a format the
+  exchange stopped accepting sinks below untried ones after a few rejections
+- a rejection of the known-good variant clears it; the next success sets it again
+- only rejections of the payload format count (``is_format_rejection``); business
+  rejections (insufficient balance, bad price/quantity, trigger out of range) and
+  network errors say nothing about the format
+
+State is a small JSON file (SLTP_VARIANT_STATS_PATH, default on the persistent
+``/data`` volume when mounted) rewritten atomically after each update, so what
+was learned survives restarts.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _default_stats_path() -> str:
+    # /data is the trading-config volume on the AWS backends; /tmp is wiped on restart.
+    if os.path.isdir("/data") and os.access("/data", os.W_OK):
+        return "/data/sltp_variant_stats.json"
+    return "/tmp/sltp_variant_stats.json"
+
+
+_STATS_PATH = os.getenv("SLTP_VARIANT_STATS_PATH") or _default_stats_path()
+_HALF_LIFE_S = float(os.getenv("SLTP_VARIANT_STATS_HALF_LIFE_H", "72")) * 3600.0
+# Variants kept per key (best first); the grid is ~220, most are never tried.
+_MAX_VARIANTS_PER_KEY = int(os.getenv("SLTP_VARIANT_STATS_MAX_PER_KEY", "40"))
+
+# Exchange codes that mean "this payload shape is wrong": BAD_REQUEST, INVALID_REQUEST,
+# MISSING_OR_INVALID_ARGUMENT, INVALID_ORDTYPE, INVALID_EXECINST, INVALID_SIDE,
+# INVALID_TIF, INVALID_TRIGGER_TYPE. Anything else (306 balance, 308 price, 213 qty,
+# 229 ref price, 315 far-away price ...) is about the order, not the format.
+FORMAT_REJECTION_CODES = frozenset({40001, 40003, 40004, 218, 219, 220, 221, 230})
+_FORMAT_REJECTION_MESSAGES = frozenset({
+    "BAD_REQUEST",
+    "INVALID_REQUEST",
+    "MISSING_OR_INVALID_ARGUMENT",
+    "INVALID_ORDTYPE",
+    "INVALID_ORDERTYPE",
+    "INVALID_EXECINST",
+    "INVALID_SIDE",
+    "INVALID_TIF",
+    "INVALID_TRIGGER_TYPE",
+})
+
+
+def is_format_rejection(code: Any, message: Optional[str] = None) -> bool:
+    """True when the exchange rejected the payload format rather than the order itself."""
+    try:
+        if code is not None and int(code) in FORMAT_REJECTION_CODES:
+            return True
+    except (TypeError, ValueError):
+        pass
+    return str(message or "").strip().upper() in _FORMAT_REJECTION_MESSAGES
+
+
+def variant_stats_key(instrument_name: str, order_type: str, side: str, use_proxy: bool) -> str:
+    return f"{(instrument_name or '').upper()}|{(order_type or '').upper()}|{(side or '').upper()}|proxy={1 if use_proxy else 0}"
+
+
+class SltpVariantStats:
+    """Decayed per-variant success/failure counts, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None, half_life_s: float = _HALF_LIFE_S):
+        self.path = Path(path or _STATS_PATH)
+        self.half_life_s = max(1.0, float(half_life_s))
+        self._lock = threading.Lock()
+        self._table: Dict[str, Dict[str, Any]] = self._load()
+
+    # ------------------------------------------------------------ persistence
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if not self.path.exists():
+                return {}
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            logger.warning("[SLTP_VARIANTS] Ignoring unreadable stats file %s: %s", self.path, e)
+            return {}
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self._table, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.debug("[SLTP_VARIANTS] Could not persist stats to %s: %s", self.path, e)
+
+    # ------------------------------------------------------------ scoring
+
+    def _decayed(self, rec: Dict[str, Any], now: float) -> Tuple[float, float]:
+        age = max(0.0, now - float(rec.get("updated") or now))
+        factor = 0.5 ** (age / self.half_life_s)
+        return float(rec.get("ok") or 0.0) * factor, float(rec.get("fail") or 0.0) * factor
+
+    def _score(self, rec: Optional[Dict[str, Any]], now: float) -> float:
+        """Success rate with a uniform prior: untried variants score 0.5."""
+        if not rec:
+            return 0.5
+        ok, fail = self._decayed(rec, now)
+        return (ok + 1.0) / (ok + fail + 2.0)
+
+    def _record(self, key: str, variant_id: str, *, ok: bool, api_method: Optional[str], elapsed_ms: Optional[int]) -> None:
+        now = time.time()
+        with self._lock:
+            entry = self._table.setdefault(key, {"known_good": None, "variants": {}})
+            variants = entry.setdefault("variants", {})
+            rec = variants.get(variant_id) or {}
+            ok_n, fail_n = self._decayed(rec, now)
+            rec.update({"ok": ok_n + (1.0 if ok else 0.0), "fail": fail_n + (0.0 if ok else 1.0), "updated": now})
+            if ok:
+                rec["api_method"] = api_method or rec.get("api_method")
+                if elapsed_ms is not None:
+                    prev = rec.get("latency_ms")
+                    rec["latency_ms"] = int(elapsed_ms if prev is None else 0.7 * prev + 0.3 * elapsed_ms)
+                entry["known_good"] = variant_id
+            elif entry.get("known_good") == variant_id:
+                entry["known_good"] = None
+            variants[variant_id] = rec
+            if len(variants) > _MAX_VARIANTS_PER_KEY:
+                ranked = sorted(variants, key=lambda vid: self._score(variants[vid], now), reverse=True)
+                for vid in ranked[_MAX_VARIANTS_PER_KEY:]:
+                    if vid != entry.get("known_good"):
+                        variants.pop(vid, None)
+            self._save()
+
+    # ------------------------------------------------------------ public API
+
+    def record_success(self, key: str, variant_id: str, api_method: str, elapsed_ms: Optional[int] = None) -> None:
+        self._record(key, variant_id, ok=True, api_method=api_method, elapsed_ms=elapsed_ms)
+
+    def record_failure(self, key: str, variant_id: str) -> None:
+        self._record(key, variant_id, ok=False, api_method=None, elapsed_ms=None)
+
+    def known_good(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """(variant_id, api_method) of the last accepted variant, if not rejected since."""
+        with self._lock:
+            entry = self._table.get(key) or {}
+            vid = entry.get("known_good")
+            if not vid:
+                return None, None
+            return vid, (entry.get("variants", {}).get(vid) or {}).get("api_method")
+
+    def order_variants(self, key: str, variants: List[dict]) -> List[dict]:
+        """
+        Known-good variant first, then by decayed success rate (faster first on
+        ties); untried variants keep their grid order between the two.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._table.get(key) or {}
+            known = entry.get("known_good")
+            stats = dict(entry.get("variants") or {})
+
+        def rank(v: dict) -> Tuple[int, float, float]:
+            vid = v.get("variant_id")
+            rec = stats.get(vid)
+            return (
+                0 if known and vid == known else 1,
+                -self._score(rec, now),
+                float((rec or {}).get("latency_ms") or 0.0),
+            )
+
+        return sorted(list(variants), key=rank)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return json.loads(json.dumps(self._table))
+
+
+_stats: Optional[SltpVariantStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_sltp_variant_stats() -> SltpVariantStats:
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = SltpVariantStats()
+    return _stats
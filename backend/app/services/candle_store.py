@@ -0,0 +1,220 @@
+"""
+Candle Store Service
+
+Persistent OHLCV candles (``ohlcv_candles``) with incremental tail refresh.
+
+``fetch_candles_incremental`` loads what we already have for (symbol,
+timeframe), asks the exchange only for candles at or after the last stored
+open time (the last candle is re-fetched because it may still be forming),
+merges, persists and returns the newest ``limit`` candles in the same
+``{"t","o","h","l","c","v"}`` shape ``market_updater.fetch_ohlcv_data`` returns.
+
+Only a stored series that already holds ``limit`` contiguous candles is
+refreshed tail-only. A cold, short (e.g. left by a partial fetch), gapped or
+stale series falls back to a full fetch, so a restart is warm as soon as the
+DB is reachable and a short series is backfilled on the next cycle.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.ohlcv_candle import OhlcvCandle
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_MS: Dict[str, int] = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+    "1w": 7 * 24 * 60 * 60_000,
+}
+
+# Keep this many times the requested window per (symbol, timeframe)
+RETENTION_MULTIPLIER = 2
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {
+    "full_fetches": 0,
+    "incremental_fetches": 0,
+    "candles_requested": 0,
+    "candles_served": 0,
+}
+
+
+def _bump(**deltas: int) -> None:
+    with _stats_lock:
+        for key, value in deltas.items():
+            _stats[key] = _stats.get(key, 0) + value
+
+
+def get_candle_store_stats() -> Dict[str, int]:
+    """Counters since process start (requested vs. served shows the saved volume)."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _row_to_candle(row: OhlcvCandle) -> Dict[str, Any]:
+    return {
+        "t": int(row.ts),
+        "o": float(row.open),
+        "h": float(row.high),
+        "l": float(row.low),
+        "c": float(row.close),
+        "v": float(row.volume or 0.0),
+    }
+
+
+def load_candles(db: Session, symbol: str, timeframe: str, limit: int) -> List[Dict[str, Any]]:
+    """Newest ``limit`` stored candles for (symbol, timeframe), oldest first."""
+    rows = (
+        db.query(OhlcvCandle)
+        .filter(OhlcvCandle.symbol == symbol, OhlcvCandle.timeframe == timeframe)
+        .order_by(OhlcvCandle.ts.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_row_to_candle(r) for r in reversed(rows)]
+
+
+def load_recent_candles(
+    db: Session,
+    symbol: str,
+    timeframe: str,
+    limit: int,
+    now_ms: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Stored candles only if the series is current (last candle within two periods), else None."""
+    candles = load_candles(db, symbol, timeframe, limit)
+    if not candles:
+        return None
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    tf_ms = TIMEFRAME_MS.get(timeframe, TIMEFRAME_MS["1h"])
+    if now_ms - candles[-1]["t"] > 2 * tf_ms:
+        return None
+    return candles
+
+
+def store_candles(
+    db: Session,
+    symbol: str,
+    timeframe: str,
+    candles: List[Dict[str, Any]],
+    keep: int,
+) -> int:
+    """Replace stored candles from the first new ``t`` onward and prune beyond ``keep``. Caller commits."""
+    if not candles:
+        return 0
+    first_ts = min(int(c["t"]) for c in candles)
+    base = db.query(OhlcvCandle).filter(
+        OhlcvCandle.symbol == symbol, OhlcvCandle.timeframe == timeframe
+    )
+    base.filter(OhlcvCandle.ts >= first_ts).delete(synchronize_session=False)
+    seen = set()
+    for c in candles:
+        ts = int(c["t"])
+        if ts in seen:
+            continue
+        seen.add(ts)
+        db.add(
+            OhlcvCandle(
+                symbol=symbol,
+                timeframe=timeframe,
+                ts=ts,
+                open=float(c.get("o", 0.0)),
+                high=float(c.get("h", 0.0)),
+                low=float(c.get("l", 0.0)),
+                close=float(c.get("c", 0.0)),
+                volume=float(c.get("v", 0.0)),
+            )
+        )
+    db.flush()
+    cutoff = (
+        base.with_entities(OhlcvCandle.ts)
+        .order_by(OhlcvCandle.ts.desc())
+        .offset(keep)
+        .limit(1)
+        .scalar()
+    )
+    if cutoff is not None:
+        base.filter(OhlcvCandle.ts <= cutoff).delete(synchronize_session=False)
+    return len(seen)
+
+
+def candles_to_request(last_ts: Optional[int], timeframe: str, limit: int, now_ms: int) -> int:
+    """How many candles to ask for: the missing tail plus the last (possibly open) candle."""
+    if last_ts is None:
+        return limit
+    tf_ms = TIMEFRAME_MS.get(timeframe, TIMEFRAME_MS["1h"])
+    missing = max(0, (now_ms - int(last_ts)) // tf_ms) + 1
+    return limit if missing >= limit else int(missing)
+
+
+def _covers_window(stored: List[Dict[str, Any]], tf_ms: int, limit: int) -> bool:
+    """True when ``stored`` holds ``limit`` candles with no missing interval between them."""
+    if len(stored) < limit:
+        return False
+    opens = [int(c["t"]) for c in stored[-limit:]]
+    return all(b - a == tf_ms for a, b in zip(opens, opens[1:]))
+
+
+def fetch_candles_incremental(
+    db: Session,
+    symbol: str,
+    timeframe: str,
+    limit: int,
+    fetch_fn: Callable[..., Optional[List[Dict[str, Any]]]],
+    now_ms: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Return the newest ``limit`` candles, fetching only the tail not yet stored.
+
+    ``fetch_fn(symbol, interval=..., limit=...)`` is the remote fetcher
+    (``market_updater.fetch_ohlcv_data``). On any DB error the caller should
+    fall back to calling ``fetch_fn`` directly.
+    """
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    tf_ms = TIMEFRAME_MS.get(timeframe, TIMEFRAME_MS["1h"])
+    stored = load_candles(db, symbol, timeframe, limit)
+    if _covers_window(stored, tf_ms, limit):
+        last_ts = stored[-1]["t"]
+        count = candles_to_request(last_ts, timeframe, limit, now_ms)
+    else:
+        # Short or gapped series: indicators need the whole window, so backfill it
+        last_ts = None
+        count = limit
+    incremental = last_ts is not None and count < limit
+
+    fresh = sorted(fetch_fn(symbol, interval=timeframe, limit=count) or [], key=lambda c: int(c["t"]))
+    if not fresh:
+        # Exchange unavailable: serve what we have rather than nothing
+        return stored or None
+
+    if incremental and int(fresh[0]["t"]) > int(last_ts) + tf_ms:
+        # Tail does not connect to the stored series (exchange gap / source switch): refetch in full
+        logger.debug(f"[CANDLE_STORE] {symbol} {timeframe}: tail gap, full refetch")
+        incremental = False
+        count = limit
+        fresh = sorted(fetch_fn(symbol, interval=timeframe, limit=limit) or [], key=lambda c: int(c["t"]))
+        if not fresh:
+            return stored or None
+
+    if incremental:
+        first_fresh = int(fresh[0]["t"])
+        merged = [c for c in stored if int(c["t"]) < first_fresh] + list(fresh)
+        _bump(incremental_fetches=1)
+    else:
+        merged = list(fresh)
+        _bump(full_fetches=1)
+    merged = merged[-limit:]
+
+    store_candles(db, symbol, timeframe, fresh, keep=limit * RETENTION_MULTIPLIER)
+    db.commit()
+    _bump(candles_requested=count, candles_served=len(merged))
+    return merged
@@ -1,6 +1,7 @@
 import json
 import os
 import logging
+import threading
 from pathlib import Path
 from copy import deepcopy
 from typing import Dict, Any, Optional, Tuple
@@ -554,18 +555,79 @@ def _normalize_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
     return cfg
 
 
-def load_config() -> Dict[str, Any]:
-    logger = logging.getLogger(__name__)
-    config_path = get_config_path()
-    # Keep module-level CONFIG_PATH aligned for callers/tests that import it.
-    global CONFIG_PATH
-    CONFIG_PATH = config_path
+# ---------------------------------------------------------------------------
+# Config snapshot cache
+# ---------------------------------------------------------------------------
+# get_strategy_rules / get_alert_thresholds run for every symbol of every
+# monitor cycle and every /signals request. The normalized config is kept in
+# memory, keyed on the file identity (path, mtime, inode, size): the hot path
+# costs one stat() and never reads or parses the file. save_config (and
+# strategy_profiles.invalidate_config_cache) drop the snapshot explicitly.
+_RISK_KEYS = ("Conservative", "Aggressive")
 
-    # Log config path at first load
-    if not hasattr(load_config, "_path_logged"):
-        logger.info(f"Config file path: {config_path.absolute()}")
-        load_config._path_logged = True
 
+class _ConfigSnapshot:
+    """Normalized config plus rule tables derived from it. Treat as read-only."""
+
+    __slots__ = ("key", "config", "strategy_rules", "alert_thresholds")
+
+    def __init__(self, key: Optional[Tuple], config: Dict[str, Any]) -> None:
+        self.key = key
+        self.config = config
+        # (preset_key, risk_key) -> get_strategy_rules() result
+        self.strategy_rules: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # (symbol, risk_mode) -> get_alert_thresholds() result, filled on demand
+        self.alert_thresholds: Dict[Tuple[str, Optional[str]], Tuple[Optional[float], Optional[float]]] = {}
+        presets = set(config.get("strategy_rules") or {}) | set(config.get("presets") or {})
+        for preset_key in presets:
+            preset_key = str(preset_key).lower()
+            risk_keys = ("Learned",) if preset_key == "auto" else _RISK_KEYS
+            for risk_key in risk_keys:
+                self.strategy_rules[(preset_key, risk_key)] = _build_strategy_rules(
+                    config, preset_key, risk_key
+                )
+
+
+_snapshot_lock = threading.Lock()
+_snapshot: Optional[_ConfigSnapshot] = None
+_snapshot_stats = {"hits": 0, "loads": 0, "invalidations": 0}
+
+
+def _copy_json(value: Any) -> Any:
+    """Copy of JSON-shaped data (dicts, lists, scalars); much cheaper than deepcopy."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+def _file_key(config_path: Path) -> Optional[Tuple]:
+    try:
+        st = config_path.stat()
+    except OSError:
+        return None
+    return (str(config_path), st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+def invalidate_config_snapshot() -> None:
+    """Drop the cached config snapshot; the next read reloads trading_config.json."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_stats["invalidations"] += 1
+
+
+def get_config_snapshot_stats() -> Dict[str, Any]:
+    """Counters for the config snapshot cache (hits, file loads, invalidations)."""
+    with _snapshot_lock:
+        stats = dict(_snapshot_stats)
+        stats["cached_path"] = _snapshot.key[0] if _snapshot and _snapshot.key else None
+    return stats
+
+
+def _read_config_file(config_path: Path) -> Dict[str, Any]:
+    logger = logging.getLogger(__name__)
     if not config_path.exists():
         seeded = _seed_config_file(config_path)
         if not seeded:
@@ -583,7 +645,91 @@ def load_config() -> Dict[str, Any]:
     normalized = _normalize_config(cfg)
     return normalized
 
+
+def _config_snapshot() -> _ConfigSnapshot:
+    """Current snapshot, reloaded only when the config file changed on disk."""
+    global _snapshot, CONFIG_PATH
+    logger = logging.getLogger(__name__)
+    config_path = get_config_path()
+    # Keep module-level CONFIG_PATH aligned for callers/tests that import it.
+    CONFIG_PATH = config_path
+
+    # Log config path at first load
+    if not hasattr(load_config, "_path_logged"):
+        logger.info(f"Config file path: {config_path.absolute()}")
+        load_config._path_logged = True
+
+    key = _file_key(config_path)
+    snap = _snapshot
+    if snap is not None and key is not None and snap.key == key:
+        _snapshot_stats["hits"] += 1
+        return snap
+
+    with _snapshot_lock:
+        snap = _snapshot
+        if snap is not None and key is not None and snap.key == key:
+            _snapshot_stats["hits"] += 1
+            return snap
+        config = _read_config_file(config_path)
+        # Re-stat after reading: a file created/seeded just now gets its real key.
+        snap = _ConfigSnapshot(_file_key(config_path), config)
+        _snapshot = snap
+        _snapshot_stats["loads"] += 1
+        return snap
+
+
+def load_config() -> Dict[str, Any]:
+    """Normalized trading config. Returns a private copy the caller may modify."""
+    return _copy_json(_config_snapshot().config)
+
+# Numeric fields of a strategy_rules entry ("rules" format): dotted path -> (min, max)
+RULE_NUM_FIELDS = {
+    "rsi.buyBelow": (0, 100),
+    "rsi.sellAbove": (0, 100),
+    "volumeMinRatio": (0, None),
+    "minPriceChangePct": (0, None),
+    "alertCooldownMinutes": (0, None),
+    "sl.atrMult": (0, None),
+    "sl.fallbackPct": (0, None),
+    "tp.rr": (0, None),
+    "tp.fallbackPct": (0, None),
+}
+
+
+def _validate_rules(risk_mode: str, rules: Any) -> Tuple[bool, str]:
+    if not isinstance(rules, dict):
+        return False, f"Rules for '{risk_mode}' must be an object"
+    for path, (lo, hi) in RULE_NUM_FIELDS.items():
+        node: Any = rules
+        for part in path.split("."):
+            node = node.get(part) if isinstance(node, dict) else None
+        if node is None:
+            continue  # optional; None disables the gate (e.g. rsi.buyBelow)
+        if isinstance(node, bool) or not isinstance(node, (int, float)):
+            return False, f"Field '{risk_mode}.{path}' must be number"
+        if node < lo or (hi is not None and node > hi):
+            bounds = f"{lo}..{hi}" if hi is not None else f">= {lo}"
+            return False, f"Field '{risk_mode}.{path}' must be {bounds}"
+    for name, flag in (rules.get("maChecks") or {}).items():
+        if not isinstance(flag, bool):
+            return False, f"Field '{risk_mode}.maChecks.{name}' must be boolean"
+    return True, ""
+
+
 def validate_preset(preset: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Validate a preset in either format: legacy flat NUM_FIELDS, or the
+    strategy_rules shape ``{"rules": {"Conservative": {...}, ...}}``.
+    """
+    if "rules" in preset:
+        rules_by_risk = preset["rules"]
+        if not isinstance(rules_by_risk, dict) or not rules_by_risk:
+            return False, "Field 'rules' must be a non-empty object"
+        for risk_mode, rules in rules_by_risk.items():
+            ok, msg = _validate_rules(risk_mode, rules)
+            if not ok:
+                return False, msg
+        return True, ""
     for k in NUM_FIELDS:
         if k not in preset:
             return False, f"Missing field '{k}' in preset"
@@ -643,6 +789,7 @@ def save_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
             config_json = json.dumps(normalized_cfg, indent=2)
             config_path.write_text(config_json)
             logger.debug(f"Config saved to {config_path.absolute()}")
+            invalidate_config_snapshot()
         except (IOError, OSError, PermissionError) as e:
             logger.error(
                 f"Failed to write config file to {get_config_path(for_write=True).absolute()}: {e}",
@@ -661,7 +808,7 @@ def save_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
         raise
 
 def resolve_params(symbol: str, inline_overrides: Optional[Dict[str, Any]]=None) -> Dict[str, Any]:
-    cfg = load_config()
+    cfg = _config_snapshot().config
     out: Dict[str, Any] = {}
     # 1 defaults
     out["TIMEFRAME"] = cfg.get("defaults",{}).get("timeframe","4h")
@@ -690,7 +837,18 @@ def get_alert_thresholds(symbol: str, risk_mode: Optional[str] = None) -> Tuple[
         2. Strategy/preset defaults
         3. Coin overrides (including preset strings like "swing-conservative")
     """
-    cfg = load_config()
+    snap = _config_snapshot()
+    cache_key = (symbol, risk_mode)
+    cached = snap.alert_thresholds.get(cache_key)
+    if cached is None:
+        cached = _resolve_alert_thresholds(snap.config, symbol, risk_mode)
+        snap.alert_thresholds[cache_key] = cached
+    return cached
+
+
+def _resolve_alert_thresholds(
+    cfg: Dict[str, Any], symbol: str, risk_mode: Optional[str]
+) -> Tuple[Optional[float], Optional[float]]:
     defaults = cfg.get("defaults", {})
     default_cooldown = defaults.get("alert_cooldown_minutes")
     default_min_pct = defaults.get("alert_min_price_change_pct")
@@ -773,13 +931,7 @@ def get_strategy_rules(preset_name: str, risk_mode: str = "Conservative") -> Dic
             ...
         }
     """
-    cfg = load_config()
     preset_key = preset_name.lower()  # Normalize to lowercase
-    # SOURCE OF TRUTH: Prefer strategy_rules structure (dashboard source of truth)
-    # This is where frontend saves config when user changes Signal Configuration
-    strategy_rules_cfg = cfg.get("strategy_rules", {})
-    preset_cfg = strategy_rules_cfg.get(preset_key) or cfg.get("presets", {}).get(preset_key, {})
-    
     # Normalize risk_mode
     risk_key = risk_mode.capitalize() if risk_mode else "Conservative"
     if risk_key not in ["Conservative", "Aggressive"]:
@@ -787,7 +939,24 @@ def get_strategy_rules(preset_name: str, risk_mode: str = "Conservative") -> Dic
     # Auto uses a single Learned band (seeded from swing-conservative).
     if preset_key == "auto":
         risk_key = "Learned"
-    
+
+    snap = _config_snapshot()
+    rules = snap.strategy_rules.get((preset_key, risk_key))
+    if rules is None:
+        # Preset not in the config: legacy defaults, memoized like the rest
+        rules = _build_strategy_rules(snap.config, preset_key, risk_key)
+        snap.strategy_rules[(preset_key, risk_key)] = rules
+    # Callers get their own copy; the table is shared by every caller.
+    return _copy_json(rules)
+
+
+def _build_strategy_rules(cfg: Dict[str, Any], preset_key: str, risk_key: str) -> Dict[str, Any]:
+    """Rule table entry for a normalized preset key / risk key (see get_strategy_rules)."""
+    # SOURCE OF TRUTH: Prefer strategy_rules structure (dashboard source of truth)
+    # This is where frontend saves config when user changes Signal Configuration
+    strategy_rules_cfg = cfg.get("strategy_rules", {})
+    preset_cfg = strategy_rules_cfg.get(preset_key) or cfg.get("presets", {}).get(preset_key, {})
+
     # Check if new format (has "rules" structure)
     if "rules" in preset_cfg:
         rules = preset_cfg.get("rules", {}).get(risk_key, {})
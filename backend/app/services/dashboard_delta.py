@@ -0,0 +1,153 @@
+"""
+Conditional and delta responses for the polled dashboard payloads.
+
+``/dashboard/snapshot`` and ``/dashboard/state`` are polled by every open
+dashboard tab and ship several hundred KB each time. Each endpoint keeps a
+``DashboardVersions`` stream:
+
+- the ETag is a content hash of the payload (the section data hashes for an
+  assembled snapshot, otherwise a hash of the serialized payload), so an
+  ``If-None-Match`` hit answers 304 without encoding the body
+- the version increases whenever the ETag changes (``max(last + 1, now_ms)``,
+  so it also keeps increasing across restarts) and the last
+  ``HISTORY_SIZE`` payloads are kept for deltas
+- ``?since=<version>`` returns only the watchlist rows, open orders and
+  portfolio assets that changed or disappeared since that version plus the
+  other top-level keys that changed; an unknown (too old, other process)
+  version gets the full payload with ``"delta": false``
+
+In a delta, ``balances`` mirrors ``portfolio.assets`` and
+``open_orders_summary.orders`` mirrors ``open_orders``; both are omitted and
+rebuilt by the client from the patched lists.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+HISTORY_SIZE = 8
+
+# (delta name, path in the payload, row key candidates)
+COLLECTIONS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("watchlist", ("watchlist",), ("symbol", "id")),
+    ("open_orders", ("open_orders",), ("order_id", "exchange_order_id")),
+    ("portfolio_assets", ("portfolio", "assets"), ("currency", "asset", "coin")),
+)
+# Keys that only mirror a collection above
+_MIRRORS = {"balances": None, "open_orders_summary": "orders"}
+
+
+def content_etag(payload: Any) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class DashboardVersions:
+    """Monotonic versions of one polled payload, with a short history for deltas."""
+
+    def __init__(self, history: int = HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._history_size = history
+        self._history: "OrderedDict[int, Any]" = OrderedDict()
+        self._etag: Optional[str] = None
+        self._version = 0
+
+    def observe(self, etag: str, data: Any) -> int:
+        """Version of the payload with ``etag``, creating a new one when the content changed."""
+        with self._lock:
+            if etag != self._etag:
+                self._version = max(self._version + 1, int(time.time() * 1000))
+                self._etag = etag
+                self._history[self._version] = data
+                while len(self._history) > self._history_size:
+                    self._history.popitem(last=False)
+            return self._version
+
+    def get(self, version: int) -> Optional[Any]:
+        with self._lock:
+            return self._history.get(version)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._history.clear()
+            self._etag = None
+            self._version = 0
+
+
+def _at(data: Any, path: Tuple[str, ...]) -> Any:
+    for part in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _row_key(row: Any, candidates: Tuple[str, ...]) -> str:
+    if isinstance(row, dict):
+        for name in candidates:
+            value = row.get(name)
+            if value not in (None, ""):
+                return str(value)
+    return content_etag(row)
+
+
+def _rows_by_key(rows: Any, candidates: Tuple[str, ...]) -> Dict[str, Any]:
+    return {_row_key(row, candidates): row for row in rows} if isinstance(rows, list) else {}
+
+
+def _scalars(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level keys of ``data`` minus the collections and their mirrors."""
+    out = {}
+    for key, value in data.items():
+        if key in ("watchlist", "open_orders"):
+            continue
+        if key in _MIRRORS:
+            nested = _MIRRORS[key]
+            if nested is None or not isinstance(value, dict):
+                continue
+            value = {k: v for k, v in value.items() if k != nested}
+        elif key == "portfolio" and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k != "assets"}
+        out[key] = value
+    return out
+
+
+def build_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Rows changed/removed per collection and the other top-level keys that changed."""
+    changed: Dict[str, List[Any]] = {}
+    removed: Dict[str, List[str]] = {}
+    for name, path, candidates in COLLECTIONS:
+        old_rows = _rows_by_key(_at(old, path), candidates)
+        new_rows = _rows_by_key(_at(new, path), candidates)
+        changed[name] = [row for key, row in new_rows.items() if old_rows.get(key) != row]
+        removed[name] = [key for key in old_rows if key not in new_rows]
+    old_scalars = _scalars(old)
+    data = {key: value for key, value in _scalars(new).items() if old_scalars.get(key, object()) != value}
+    return {"changed": changed, "removed": removed, "data": data}
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header value matches ``etag`` (weak or strong)."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+snapshot_versions = DashboardVersions()
+state_versions = DashboardVersions()
+
+
+def reset_dashboard_versions_for_tests() -> None:
+    snapshot_versions.reset()
+    state_versions.reset()
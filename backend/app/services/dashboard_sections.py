@@ -0,0 +1,550 @@
+"""
+Dashboard sections
+
+``update_dashboard_snapshot`` used to recompute the whole dashboard state
+(portfolio, open orders, per-coin P&L, ...) and rewrite the ``dashboard_cache``
+blob every minute, even when nothing had changed. The state is now kept as
+independently refreshed rows of ``dashboard_sections``:
+
+- each section (``SECTIONS``) has a compute function, a cheap inputs
+  fingerprint (aggregate queries over the tables it reads, the open-orders
+  cache timestamp, ...), a check interval and a max age
+- ``refresh_dashboard_sections`` checks the sections that are due and
+  recomputes one only when it is dirty: its fingerprint changed, it was
+  marked dirty (committed WatchlistItem / WatchlistSignalState writes mark
+  their sections), its last compute failed or is older than ``max_age``
+- a recompute that yields identical data keeps the section's ``version``;
+  a failed one keeps the previous data and records the error
+- ``assemble_dashboard_snapshot`` builds the ``/dashboard/snapshot`` payload
+  from the stored rows, with per-section versions and compute timings and a
+  content hash derived from the section data hashes (the endpoint's ETag)
+
+The fingerprint is taken before the compute, so a write racing it leaves the
+section dirty for the next check rather than silently stale.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect as pyinspect
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, event, func, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.models.dashboard_cache import DashboardSection
+from app.models.exchange_order import ExchangeOrder
+from app.models.market_price import MarketData, MarketPrice
+from app.models.portfolio import PortfolioBalance, PortfolioSnapshot
+from app.models.watchlist import WatchlistItem
+from app.models.watchlist_signal_state import WatchlistSignalState
+
+logger = logging.getLogger(__name__)
+
+# Shortest section interval; the scheduler runs the pipeline this often
+TICK_SECONDS = 5
+# Same threshold as the legacy dashboard_cache snapshot
+STALE_AFTER_SECONDS = 90
+# Session.info key collecting sections whose inputs were written in the session
+PENDING_KEY = "dashboard_sections_pending"
+
+
+def sections_enabled() -> bool:
+    return (os.getenv("DASHBOARD_SECTIONS_ENABLED", "true") or "true").strip().lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class SectionSpec:
+    name: str
+    compute: Callable[[Session], Any]  # sync (run in a worker thread) or async
+    inputs: Optional[Callable[[Session], Any]]  # None: recompute on every check
+    interval_seconds: float  # minimum time between checks
+    max_age_seconds: float  # recompute even when the inputs look unchanged
+
+
+# ------------------------------------------------------------------ inputs
+
+
+def _safe_row(db: Session, *columns, where=None) -> Tuple[str, ...]:
+    """One aggregate row as strings; ``("unavailable",)`` when the table can't be read."""
+    try:
+        query = db.query(*columns)
+        if where is not None:
+            query = query.filter(where)
+        return tuple(str(v) for v in query.one())
+    except Exception as e:
+        logger.debug("[DASHBOARD_SECTIONS] input query failed: %s", e)
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        return ("unavailable",)
+
+
+def _portfolio_inputs(db: Session) -> Tuple:
+    # Lazy: portfolio_snapshot pulls in the trade client
+    from app.services.portfolio_snapshot import PortfolioSnapshotData
+
+    return (
+        _safe_row(
+            db,
+            func.count(PortfolioBalance.id),
+            func.max(PortfolioBalance.updated_at),
+            func.sum(PortfolioBalance.usd_value),
+        ),
+        _safe_row(db, func.max(PortfolioSnapshot.created_at)),
+        _safe_row(db, func.max(PortfolioSnapshotData.id), func.max(PortfolioSnapshotData.as_of)),
+    )
+
+
+def _exchange_orders_inputs(db: Session) -> Tuple[str, ...]:
+    return _safe_row(
+        db,
+        func.count(ExchangeOrder.id),
+        func.max(ExchangeOrder.id),
+        func.max(ExchangeOrder.updated_at),
+        func.max(ExchangeOrder.exchange_update_time),
+    )
+
+
+def _open_orders_inputs(db: Session) -> Tuple:
+    from app.services.open_orders_cache import get_unified_open_orders
+    from app.services.open_orders_sync_status import sync_status_public_dict
+
+    orders, _ = get_unified_open_orders()
+    sync_meta = sync_status_public_dict()
+    # Order content and sync state only: the cache timestamp and fetch timings change
+    # on every open-orders sync even when nothing else did.
+    order_rows = sorted(
+        (o.order_id, o.status, str(o.quantity), str(o.price), str(o.trigger_price)) for o in orders
+    )
+    sync_state = tuple(
+        str(sync_meta.get(k))
+        for k in ("sync_status", "error_code", "data_verified", "trigger_orders_status", "trigger_orders_error_code")
+    )
+    # resolve_open_orders falls back to exchange_orders when the cache is not usable
+    return (order_rows, sync_state, _exchange_orders_inputs(db))
+
+
+def _portfolio_section_inputs(db: Session) -> Tuple:
+    # Per-coin position counts, TP/SL and P&L come from the open orders and order history
+    return (_portfolio_inputs(db), _open_orders_inputs(db))
+
+
+def _watchlist_inputs(db: Session) -> Tuple:
+    return (
+        _safe_row(
+            db,
+            func.count(WatchlistItem.id),
+            func.max(WatchlistItem.id),
+            func.sum(WatchlistItem.trade_amount_usd),
+            func.sum(case((WatchlistItem.trade_enabled == True, 1), else_=0)),  # noqa: E712
+            func.sum(case((WatchlistItem.alert_enabled == True, 1), else_=0)),  # noqa: E712
+            func.sum(case((WatchlistItem.is_deleted == True, 1), else_=0)),  # noqa: E712
+        ),
+        _safe_row(db, func.count(MarketData.id), func.max(MarketData.updated_at)),
+        _safe_row(db, func.count(MarketPrice.id), func.max(MarketPrice.updated_at)),
+    )
+
+
+def _signals_inputs(db: Session) -> Tuple[str, ...]:
+    return _safe_row(
+        db,
+        func.count(WatchlistSignalState.symbol),
+        func.max(WatchlistSignalState.updated_at),
+        func.max(WatchlistSignalState.evaluated_at_utc),
+        func.max(WatchlistSignalState.last_alert_at_utc),
+        func.max(WatchlistSignalState.last_trade_at_utc),
+    )
+
+
+def _expected_tp_inputs(db: Session) -> Tuple:
+    return (_portfolio_inputs(db), _exchange_orders_inputs(db))
+
+
+# ------------------------------------------------------------------ compute
+# The payload builders live next to the routes that serve them (lazy imports:
+# routes_dashboard imports half the app).
+
+
+def _compute_bot_status(db: Session) -> Dict[str, Any]:
+    from app.api.routes_dashboard import _dashboard_bot_status
+
+    return _dashboard_bot_status(db)
+
+
+def _compute_open_orders(db: Session) -> Dict[str, Any]:
+    from app.api.routes_dashboard import _dashboard_open_orders_payload, _resolve_dashboard_open_orders
+
+    _, open_orders_summary = _resolve_dashboard_open_orders(db)
+    return _dashboard_open_orders_payload(open_orders_summary)
+
+
+async def _compute_portfolio(db: Session) -> Dict[str, Any]:
+    from app.api.routes_dashboard import (
+        _build_dashboard_portfolio,
+        _load_dashboard_portfolio,
+        _resolve_dashboard_open_orders,
+    )
+
+    loaded = await _load_dashboard_portfolio(db, {})
+    unified_open_orders, _ = _resolve_dashboard_open_orders(db)
+    return await _build_dashboard_portfolio(db, {}, loaded, unified_open_orders)
+
+
+def _compute_watchlist(db: Session) -> List[Dict[str, Any]]:
+    from app.api.routes_dashboard import list_watchlist_items
+
+    return list_watchlist_items(db)
+
+
+def _compute_signals(db: Session) -> Dict[str, Any]:
+    from app.api.routes_dashboard import _serialize_signal_state
+
+    return {
+        str(state.symbol or "").upper(): _serialize_signal_state(state)
+        for state in db.query(WatchlistSignalState).order_by(WatchlistSignalState.symbol).all()
+    }
+
+
+def _compute_expected_tp(db: Session) -> Dict[str, Any]:
+    from app.api.routes_dashboard import get_expected_take_profit_summary_endpoint
+
+    return get_expected_take_profit_summary_endpoint(db)
+
+
+SECTIONS: Tuple[SectionSpec, ...] = (
+    SectionSpec("bot_status", _compute_bot_status, None, 30, 30),
+    SectionSpec("open_orders", _compute_open_orders, _open_orders_inputs, 5, 60),
+    SectionSpec("portfolio", _compute_portfolio, _portfolio_section_inputs, 15, 300),
+    SectionSpec("watchlist", _compute_watchlist, _watchlist_inputs, 10, 120),
+    SectionSpec("signals", _compute_signals, _signals_inputs, 5, 300),
+    SectionSpec("expected_tp", _compute_expected_tp, _expected_tp_inputs, 60, 600),
+)
+SECTION_NAMES: Tuple[str, ...] = tuple(spec.name for spec in SECTIONS)
+
+# ------------------------------------------------------------------ state
+
+_lock = threading.Lock()
+_dirty: Set[str] = set()
+_last_checked: Dict[str, float] = {}
+_stats: Dict[str, Dict[str, Any]] = {}
+_tables_ready: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def _section_stats(name: str) -> Dict[str, Any]:
+    return _stats.setdefault(
+        name,
+        {
+            "checks": 0,
+            "recomputes": 0,
+            "changes": 0,
+            "unchanged": 0,
+            "failures": 0,
+            "last_compute_ms": None,
+            "total_compute_ms": 0.0,
+        },
+    )
+
+
+def _record(name: str, outcome: str, compute_ms: Optional[float] = None) -> None:
+    with _lock:
+        stats = _section_stats(name)
+        stats["checks"] += 1
+        if outcome == "unchanged":
+            stats["unchanged"] += 1
+        elif outcome == "failed":
+            stats["failures"] += 1
+        else:
+            stats["recomputes"] += 1
+            if outcome == "changed":
+                stats["changes"] += 1
+        if compute_ms is not None:
+            stats["last_compute_ms"] = compute_ms
+            stats["total_compute_ms"] = round(stats["total_compute_ms"] + compute_ms, 3)
+
+
+def mark_dashboard_sections_dirty(*names: str) -> None:
+    """Force a recompute of ``names`` (every section when empty) on their next check."""
+    with _lock:
+        _dirty.update(names or SECTION_NAMES)
+
+
+def get_dashboard_section_stats() -> Dict[str, Any]:
+    """Per-section counters of this process (checks, recomputes, compute timings)."""
+    with _lock:
+        return {
+            "sections": {name: dict(_section_stats(name)) for name in SECTION_NAMES},
+            "dirty": sorted(_dirty),
+        }
+
+
+def reset_dashboard_sections_for_tests() -> None:
+    with _lock:
+        _dirty.clear()
+        _last_checked.clear()
+        _stats.clear()
+    _tables_ready.clear()
+
+
+def sections_table_exists(db: Session) -> bool:
+    bind = db.get_bind()
+    ready = _tables_ready.get(bind)
+    if ready is None:
+        ready = DashboardSection.__tablename__ in inspect(bind).get_table_names()
+        _tables_ready[bind] = ready
+    return ready
+
+
+# Committed writes to these models dirty the section built from them
+_SECTION_BY_MODEL = {WatchlistItem: "watchlist", WatchlistSignalState: "signals"}
+
+
+def _note_write(mapper, connection, target) -> None:  # noqa: ARG001
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PENDING_KEY, set()).add(_SECTION_BY_MODEL[mapper.class_])
+
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        mark_dashboard_sections_dirty(*pending)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+for _model in _SECTION_BY_MODEL:
+    event.listen(_model, "after_insert", _note_write)
+    event.listen(_model, "after_update", _note_write)
+    event.listen(_model, "after_delete", _note_write)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+# ------------------------------------------------------------------ refresh
+
+
+def _fingerprint(db: Session, spec: SectionSpec) -> Optional[str]:
+    if spec.inputs is None:
+        return None
+    try:
+        inputs = spec.inputs(db)
+    except Exception as e:
+        logger.warning("[DASHBOARD_SECTIONS] %s inputs failed: %s", spec.name, e)
+        return None
+    return hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _age_seconds(value: Optional[datetime], now: datetime) -> Optional[float]:
+    value = _as_utc(value)
+    return (now - value).total_seconds() if value is not None else None
+
+
+async def _run_compute(db: Session, spec: SectionSpec) -> Any:
+    if pyinspect.iscoroutinefunction(spec.compute):
+        return await spec.compute(db)
+    return await asyncio.to_thread(spec.compute, db)
+
+
+async def _refresh_section(db: Session, spec: SectionSpec, dirty: bool) -> str:
+    """Check one section, recompute it when needed and commit. Returns the outcome."""
+    now = datetime.now(timezone.utc)
+    row = db.get(DashboardSection, spec.name)
+    fingerprint = _fingerprint(db, spec)
+    computed_age = _age_seconds(row.computed_at, now) if row is not None else None
+    if (
+        not dirty
+        and row is not None
+        and row.error is None
+        and fingerprint is not None
+        and row.inputs_fingerprint == fingerprint
+        and computed_age is not None
+        and computed_age < spec.max_age_seconds
+    ):
+        row.checked_at = now
+        db.commit()
+        _record(spec.name, "unchanged")
+        return "unchanged"
+
+    started = time.perf_counter()
+    try:
+        data = json.loads(json.dumps(await _run_compute(db, spec), default=str))
+    except Exception as e:
+        compute_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        logger.warning("[DASHBOARD_SECTIONS] %s compute failed after %.1fms: %s", spec.name, compute_ms, e, exc_info=True)
+        try:
+            db.rollback()
+            row = db.get(DashboardSection, spec.name)
+            if row is None:
+                row = DashboardSection(name=spec.name, data={}, version=0)
+                db.add(row)
+            row.error = str(e)[:1000]
+            row.compute_ms = compute_ms
+            row.checked_at = now
+            db.commit()
+        except Exception as store_err:
+            logger.warning("[DASHBOARD_SECTIONS] could not record %s failure: %s", spec.name, store_err)
+            db.rollback()
+        _record(spec.name, "failed", compute_ms)
+        return "failed"
+
+    compute_ms = round((time.perf_counter() - started) * 1000.0, 3)
+    data_hash = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    row = db.get(DashboardSection, spec.name)
+    if row is None:
+        row = DashboardSection(name=spec.name, version=0)
+        db.add(row)
+    changed = row.data_hash != data_hash
+    if changed:
+        row.data = data
+        row.data_hash = data_hash
+        row.version = (row.version or 0) + 1
+        row.updated_at = now
+    row.inputs_fingerprint = fingerprint
+    row.compute_ms = compute_ms
+    row.error = None
+    row.computed_at = now
+    row.checked_at = now
+    db.commit()
+    outcome = "changed" if changed else "recomputed"
+    _record(spec.name, outcome, compute_ms)
+    return outcome
+
+
+async def refresh_dashboard_sections(
+    db: Session,
+    force: bool = False,
+    names: Optional[Iterable[str]] = None,
+) -> Dict[str, str]:
+    """
+    Check every due section (or just ``names``) and recompute the dirty ones.
+
+    Sections run one after another on ``db`` (sessions are not thread-safe);
+    each commits on its own, so one failing section never loses another's
+    update. Returns ``{name: outcome}`` with outcome one of ``skipped`` (not
+    due), ``unchanged``, ``recomputed`` (same data), ``changed`` or ``failed``.
+    """
+    wanted = set(names) if names is not None else None
+    results: Dict[str, str] = {}
+    for spec in SECTIONS:
+        if wanted is not None and spec.name not in wanted:
+            continue
+        now = time.monotonic()
+        with _lock:
+            dirty = force or spec.name in _dirty
+            last = _last_checked.get(spec.name)
+            if not dirty and last is not None and now - last < spec.interval_seconds:
+                results[spec.name] = "skipped"
+                continue
+            _last_checked[spec.name] = now
+            _dirty.discard(spec.name)
+        results[spec.name] = await _refresh_section(db, spec, dirty)
+    return results
+
+
+# ------------------------------------------------------------------ assemble
+
+_EMPTY_PORTFOLIO = {
+    "source": "dashboard_sections",
+    "total_usd_value": 0.0,
+    "balances": [],
+    "portfolio": {
+        "assets": [],
+        "total_value_usd": 0.0,
+        "exchange": "Crypto.com Exchange",
+    },
+}
+_EMPTY_OPEN_ORDERS = {"open_orders": [], "exchange_open_orders_count": 0}
+
+
+def _section_meta(row: DashboardSection, now: datetime) -> Dict[str, Any]:
+    checked_age = _age_seconds(row.checked_at, now)
+    return {
+        "version": row.version,
+        "compute_ms": row.compute_ms,
+        "computed_at": _as_utc(row.computed_at).isoformat() if row.computed_at else None,
+        "updated_at": _as_utc(row.updated_at).isoformat() if row.updated_at else None,
+        "checked_at": _as_utc(row.checked_at).isoformat() if row.checked_at else None,
+        "stale_seconds": int(checked_age) if checked_age is not None else None,
+        "error": row.error,
+    }
+
+
+def assemble_dashboard_snapshot(db: Session) -> Optional[Dict[str, Any]]:
+    """
+    The ``get_dashboard_snapshot`` payload built from the stored sections, or
+    None when sections are disabled or neither the portfolio nor the open
+    orders section has been computed yet (callers fall back to dashboard_cache).
+    """
+    if not sections_enabled() or not sections_table_exists(db):
+        return None
+    rows = {row.name: row for row in db.query(DashboardSection).all()}
+    if "portfolio" not in rows and "open_orders" not in rows:
+        return None
+
+    now = datetime.now(timezone.utc)
+    errors: List[str] = []
+    sections: Dict[str, Any] = {}
+    for name in SECTION_NAMES:
+        row = rows.get(name)
+        if row is None:
+            errors.append(f"{name}: not computed yet")
+            sections[name] = None
+            continue
+        sections[name] = _section_meta(row, now)
+        if row.error:
+            errors.append(f"{name}: {row.error}")
+
+    def data_of(name: str, default: Any) -> Any:
+        row = rows.get(name)
+        return row.data if row is not None and row.data else default
+
+    data = {
+        **_EMPTY_PORTFOLIO,
+        **data_of("portfolio", {}),
+        "fast_signals": [],  # Signals are loaded separately by frontend
+        "slow_signals": [],
+        **_EMPTY_OPEN_ORDERS,
+        **data_of("open_orders", {}),
+        "bot_status": data_of("bot_status", {"is_running": True, "status": "running", "reason": None}),
+        "watchlist": data_of("watchlist", []),
+        "signals": data_of("signals", {}),
+        "expected_take_profit": data_of("expected_tp", None),
+        "partial": bool(errors),
+        "errors": errors,
+    }
+
+    # Freshness is that of the least recently verified core section
+    checked = [_as_utc(rows[name].checked_at) for name in ("portfolio", "open_orders") if name in rows and rows[name].checked_at]
+    last_updated = min(checked) if checked else None
+    stale_seconds = int((now - last_updated).total_seconds()) if last_updated else None
+    # Digest of the payload from the stored section hashes, without serializing it
+    content_hash = hashlib.sha1(
+        repr(([(name, rows[name].data_hash) for name in SECTION_NAMES if name in rows], errors)).encode()
+    ).hexdigest()
+    return {
+        "data": data,
+        "last_updated_at": last_updated.isoformat() if last_updated else None,
+        "stale_seconds": stale_seconds,
+        "stale": stale_seconds is None or stale_seconds > STALE_AFTER_SECONDS,
+        "empty": False,
+        "sections": sections,
+        "content_hash": content_hash,
+    }
@@ -7,6 +7,13 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models.dashboard_cache import DashboardCache
+from app.services.dashboard_sections import (
+    assemble_dashboard_snapshot,
+    get_dashboard_section_stats,
+    refresh_dashboard_sections,
+    sections_enabled,
+    sections_table_exists,
+)
 from app.utils.live_trading import get_live_trading_status
 
 logger = logging.getLogger(__name__)
@@ -14,8 +21,12 @@ logger = logging.getLogger(__name__)
 
 async def update_dashboard_snapshot(db: Session = None, dashboard_state: dict = None) -> dict:
     """
-    Update the dashboard snapshot cache by computing full dashboard state
-    and storing it in the database.
+    Update the dashboard snapshot cache.
+    
+    With dashboard sections enabled (and the dashboard_sections table present)
+    this refreshes the sections that are due and dirty (see
+    services.dashboard_sections); otherwise it computes the full dashboard
+    state and stores it in the dashboard_cache row.
     
     This function should only be called from background tasks, not from HTTP handlers.
     This function is now async to properly handle async get_dashboard_state call.
@@ -23,7 +34,8 @@ async def update_dashboard_snapshot(db: Session = None, dashboard_state: dict =
     Args:
         db: Database session (optional, will create if None)
         dashboard_state: Precomputed dashboard state dict (optional).
-                         If None, will compute it (this takes 40-70 seconds).
+                         If given, it is stored in dashboard_cache as-is.
+                         If None without sections, will compute it (this takes 40-70 seconds).
     
     Returns:
         dict: Update result with success status and timing info
@@ -37,6 +49,30 @@ async def update_dashboard_snapshot(db: Session = None, dashboard_state: dict =
             db = SessionLocal()
             should_close_db = True
         
+        if dashboard_state is None and sections_enabled() and sections_table_exists(db):
+            outcomes = await refresh_dashboard_sections(db)
+            failed = sorted(name for name, outcome in outcomes.items() if outcome == "failed")
+            stats = get_dashboard_section_stats()["sections"]
+            result = {
+                "success": not failed,
+                "duration_seconds": time.time() - start_time,
+                "last_updated_at": datetime.now(timezone.utc).isoformat(),
+                "sections": {
+                    name: {"outcome": outcome, "compute_ms": stats[name]["last_compute_ms"]}
+                    for name, outcome in outcomes.items()
+                },
+            }
+            if failed:
+                result["error"] = f"Dashboard section(s) failed: {', '.join(failed)}"
+            recomputed = [name for name, outcome in outcomes.items() if outcome in ("changed", "recomputed", "failed")]
+            if recomputed:
+                logger.info(
+                    "Dashboard sections refreshed in %.2fs: %s",
+                    result["duration_seconds"],
+                    ", ".join(f"{name}={outcomes[name]} ({stats[name]['last_compute_ms']}ms)" for name in recomputed),
+                )
+            return result
+        
         logger.info("🔄 Starting dashboard snapshot update...")
         
         # Compute full dashboard state if not provided (this may take 40-70 seconds)
@@ -112,11 +148,31 @@ async def update_dashboard_snapshot(db: Session = None, dashboard_state: dict =
             db.close()
 
 
+def _strip_transient_errors(data_out):
+    """
+    When returning cached data, strip known transient error so UI shows healthy
+    until next snapshot run (avoids UNHEALTHY from stale NoneType.keys error)
+    """
+    if isinstance(data_out, dict) and data_out.get("errors"):
+        errors_list = data_out.get("errors") or []
+        if isinstance(errors_list, list):
+            # Match exact or any message containing NoneType + keys (e.g. "'NoneType' object has no attribute 'keys'")
+            remaining = [
+                e for e in errors_list
+                if not (isinstance(e, str) and "NoneType" in e and "keys" in e)
+            ]
+            if len(remaining) != len(errors_list):
+                data_out = {**data_out, "errors": remaining}
+    return data_out
+
+
 def get_dashboard_snapshot(db: Optional[Session] = None) -> dict:
     """
     Get the latest dashboard snapshot from cache.
     
     This is a fast read-only operation that should be used by HTTP handlers.
+    Assembled from the dashboard sections when they exist (adds per-section
+    versions and compute timings under "sections"), else the dashboard_cache row.
     
     Returns:
         dict: Snapshot data with metadata (stale_seconds, stale flag, etc.)
@@ -128,6 +184,11 @@ def get_dashboard_snapshot(db: Optional[Session] = None) -> dict:
             db = SessionLocal()
             should_close_db = True
         
+        assembled = assemble_dashboard_snapshot(db)
+        if assembled is not None:
+            assembled["data"] = _strip_transient_errors(assembled["data"])
+            return assembled
+        
         cache_entry = db.query(DashboardCache).filter(DashboardCache.id == 1).first()
         
         if not cache_entry or not cache_entry.data:
@@ -170,22 +231,8 @@ def get_dashboard_snapshot(db: Optional[Session] = None) -> dict:
         stale_seconds = int((now - last_updated).total_seconds())
         stale = stale_seconds > 90
         
-        # When returning cached data, strip known transient error so UI shows healthy
-        # until next snapshot run (avoids UNHEALTHY from stale NoneType.keys error)
-        data_out = cache_entry.data
-        if isinstance(data_out, dict) and data_out.get("errors"):
-            errors_list = data_out.get("errors") or []
-            if isinstance(errors_list, list):
-                # Match exact or any message containing NoneType + keys (e.g. "'NoneType' object has no attribute 'keys'")
-                remaining = [
-                    e for e in errors_list
-                    if not (isinstance(e, str) and "NoneType" in e and "keys" in e)
-                ]
-                if len(remaining) != len(errors_list):
-                    data_out = {**data_out, "errors": remaining}
-        
         return {
-            "data": data_out,
+            "data": _strip_transient_errors(cache_entry.data),
             "last_updated_at": last_updated.isoformat(),
             "stale_seconds": stale_seconds,
             "stale": stale,
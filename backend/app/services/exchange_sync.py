@@ -6,6 +6,7 @@ import json
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -17,7 +18,21 @@ from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusE
 from app.models.trade_signal import TradeSignal, SignalStatusEnum
 from app.services.brokers.crypto_com_trade import CryptoComTradeClient, trade_client
 from app.services.open_orders import merge_orders, UnifiedOpenOrder
+from app.services.open_lot_ledger import refresh_touched_scopes
 from app.services.open_orders_cache import store_unified_open_orders, update_open_orders_cache
+from app.services.order_history_watermarks import (
+    HISTORY_ERROR_KEY,
+    MODE_DEEP,
+    MODE_RECENT,
+    HistorySyncPlan,
+    acquire_history_request,
+    begin_request_count,
+    note_history_cycle,
+    plan_history_sync,
+    record_history_sync,
+    request_count,
+    sync_concurrency,
+)
 from app.services.sl_tp_protection import (
     GHOST_CANCEL_GRACE_SECONDS,
     get_active_protection_order,
@@ -864,6 +879,17 @@ def _protection_order_price(order: ExchangeOrder) -> Optional[float]:
     return None
 
 
+def _history_fetch_failed(response: Any) -> Optional[str]:
+    """Why a get_order_history / advanced-history response did not cover its window (None if it did)."""
+    if not isinstance(response, dict):
+        return "no response"
+    if response.get("skipped"):
+        return f"skipped: {response.get('reason') or response.get('label')}"
+    if response.get("error"):
+        return str(response.get("error"))[:120]
+    return None
+
+
 class ExchangeSyncService:
     """Service to sync exchange data with database"""
     
@@ -1928,6 +1954,8 @@ class ExchangeSyncService:
                     sync_status=fetch_result.get("sync_status") or "api_error",
                     error_code=fetch_result.get("error_code"),
                     error_message=fetch_result.get("error_message"),
+                    fetch_ms=fetch_result.get("fetch_ms"),
+                    endpoint_timings_ms=fetch_result.get("endpoint_timings_ms"),
                 )
                 logger.warning(
                     "sync_open_orders end duration=%.2fs status=failed (%s): %s — preserving existing cache",
@@ -1953,6 +1981,8 @@ class ExchangeSyncService:
                 trigger_orders_status=fetch_result.get("trigger_orders_status"),
                 trigger_orders_error=fetch_result.get("trigger_orders_error"),
                 trigger_orders_error_code=fetch_result.get("trigger_orders_error_code"),
+                fetch_ms=fetch_result.get("fetch_ms"),
+                endpoint_timings_ms=fetch_result.get("endpoint_timings_ms"),
             )
             
             # Mark orders not in response as cancelled/closed
@@ -4971,10 +5001,12 @@ class ExchangeSyncService:
         all_orders: List[dict],
         seen_ids: set,
         window_sizes: Optional[List[int]] = None,
+        problems: Optional[List[str]] = None,
     ) -> None:
         """Subdivide [start_ms, end_ms] and fetch until count < limit or window size == min (1m).
         When at 1m and still full, log WARNING and merge (may be truncating).
         Always walks the whole range; does not break early and skip remaining sub-windows.
+        Failed sub-fetches and still-full 1m windows are appended to ``problems``.
         """
         if window_sizes is None:
             window_sizes = [
@@ -4998,6 +5030,7 @@ class ExchangeSyncService:
         chunk_end = end_ms
         while chunk_end > start_ms:
             chunk_start = max(start_ms, chunk_end - chunk_ms)
+            acquire_history_request(trade_client, "private/get-order-history")
             try:
                 response = trade_client.get_order_history(
                     start_time=chunk_start,
@@ -5020,6 +5053,9 @@ class ExchangeSyncService:
                     )
                 else:
                     raise
+            failure = _history_fetch_failed(response)
+            if failure and problems is not None:
+                problems.append(f"history {chunk_start}-{chunk_end}: {failure}")
             page_orders = response.get("data", []) if response else []
             fetched = len(page_orders)
             for o in page_orders:
@@ -5046,6 +5082,7 @@ class ExchangeSyncService:
                     all_orders,
                     seen_ids,
                     window_sizes=window_sizes,
+                    problems=problems,
                 )
             else:
                 # At floor (1 min) and still full
@@ -5055,6 +5092,8 @@ class ExchangeSyncService:
                     chunk_start,
                     chunk_end,
                 )
+                if problems is not None:
+                    problems.append(f"history {chunk_start}-{chunk_end}: still full at 1m")
             chunk_end = chunk_start
         return
 
@@ -5065,15 +5104,26 @@ class ExchangeSyncService:
         lookback_days: int = 180,
         window_days: int = 7,
         limit: int = 100,
+        since_ms: Optional[int] = None,
+        early_stop: bool = True,
+        problems: Optional[List[str]] = None,
     ) -> List[dict]:
         """Fetch order history for one instrument using time-windowed requests.
         Crypto.com returns data only when instrument_name is set AND the time window is narrow.
         Avoids large 180-day single requests that return empty.
         Subdivides full-page windows down to 1 day -> 1 hour -> 5 min -> 1 min; logs WARNING at 1m if still full.
+        since_ms (an instrument watermark) narrows the range to [since_ms, now], floored at lookback_days.
+        early_stop=False walks the whole lookback (deep reconciliation) instead of stopping after
+        ORDER_HISTORY_EMPTY_WINDOWS_STOP empty windows.
+        Every request takes a token from the shared rate limiter.
+        Windows that were not fully read (failed spot or advanced fetch, still full after
+        subdividing) are appended to ``problems`` so callers do not treat the range as synced.
         """
         now_ms = int(time.time() * 1000)
         end_ms = now_ms
         start_ms = now_ms - lookback_days * self.MS_PER_DAY
+        if since_ms is not None:
+            start_ms = max(start_ms, int(since_ms))
         all_orders: List[dict] = []
         seen_ids: set = set()
         window_end = end_ms
@@ -5088,6 +5138,7 @@ class ExchangeSyncService:
                 window_days,
                 limit,
             )
+            acquire_history_request(trade_client, "private/get-order-history")
             try:
                 response = trade_client.get_order_history(
                     start_time=window_start,
@@ -5110,6 +5161,9 @@ class ExchangeSyncService:
                     )
                 else:
                     raise
+            failure = _history_fetch_failed(response)
+            if failure and problems is not None:
+                problems.append(f"history {window_start}-{window_end}: {failure}")
             page_orders = response.get("data", []) if response else []
             fetched = len(page_orders)
             for o in page_orders:
@@ -5121,12 +5175,14 @@ class ExchangeSyncService:
             # Advanced/conditional TP-SL fills live only on advanced history (spot history
             # often omits them). Keep the same narrow window — wide ranges return empty.
             try:
+                acquire_history_request(trade_client, CryptoComTradeClient.ADVANCED_ORDER_HISTORY_ENDPOINT)
                 adv_response = trade_client.get_advanced_order_history(
                     instrument_name=instrument_name,
                     limit=limit,
                     start_time=window_start,
                     end_time=window_end,
                 )
+                adv_failure = _history_fetch_failed(adv_response)
                 adv_orders = adv_response.get("data", []) if adv_response else []
             except Exception as adv_err:
                 logger.debug(
@@ -5134,7 +5190,10 @@ class ExchangeSyncService:
                     instrument_name,
                     adv_err,
                 )
+                adv_failure = str(adv_err)[:120]
                 adv_orders = []
+            if adv_failure and problems is not None:
+                problems.append(f"advanced {window_start}-{window_end}: {adv_failure}")
             adv_added = 0
             for o in adv_orders:
                 if not isinstance(o, dict):
@@ -5158,7 +5217,7 @@ class ExchangeSyncService:
             )
             if fetched == 0 and adv_added == 0:
                 consecutive_empty += 1
-                if consecutive_empty >= ORDER_HISTORY_EMPTY_WINDOWS_STOP:
+                if early_stop and consecutive_empty >= ORDER_HISTORY_EMPTY_WINDOWS_STOP:
                     logger.info(
                         "Order history early stop: instrument=%s after %s consecutive empty windows",
                         instrument_name,
@@ -5177,6 +5236,7 @@ class ExchangeSyncService:
                     limit,
                     all_orders,
                     seen_ids,
+                    problems=problems,
                 )
             window_end = window_start
         return all_orders
@@ -5282,17 +5342,120 @@ class ExchangeSyncService:
     ) -> int:
         """Fetch order history for one instrument via windowed requests and upsert into DB.
         Returns total count of orders stored (new + updated) for this instrument.
+        A full-lookback fetch counts as the instrument's deep reconciliation.
         """
+        mode = MODE_DEEP if lookback_days >= ORDER_HISTORY_DEEP_LOOKBACK_DAYS else MODE_RECENT
+        through_ms = int(time.time() * 1000)
+        started = time.monotonic()
+        problems: List[str] = []
+        orders = self._fetch_order_history_windowed(
+            trade_client, instrument_name, lookback_days, window_days, limit, problems=problems
+        )
+        return self._store_fetched_history(
+            db,
+            HistorySyncPlan(instrument_name.upper(), mode),
+            orders,
+            through_ms,
+            (time.monotonic() - started) * 1000,
+            limit=limit,
+            problems=problems,
+        )
+
+    def _fetch_history_for_plan(
+        self, trade_client: CryptoComTradeClient, plan: HistorySyncPlan, limit: int = 100
+    ) -> Tuple[List[dict], int, float, int, List[str]]:
+        """Worker thread: fetch one planned instrument. Returns (orders, through_ms, fetch_ms, requests, problems)."""
+        if plan.mode == MODE_DEEP:
+            lookback_days, window_days = ORDER_HISTORY_DEEP_LOOKBACK_DAYS, ORDER_HISTORY_DEEP_WINDOW_DAYS
+        else:
+            lookback_days, window_days = ORDER_HISTORY_RECENT_LOOKBACK_DAYS, ORDER_HISTORY_RECENT_WINDOW_DAYS
+        if plan.open_orders:
+            # Reach the oldest open order even when it predates the recent lookback
+            lookback_days = ORDER_HISTORY_DEEP_LOOKBACK_DAYS
+        begin_request_count()
+        through_ms = int(time.time() * 1000)
+        started = time.monotonic()
+        problems: List[str] = []
         orders = self._fetch_order_history_windowed(
-            trade_client, instrument_name, lookback_days, window_days, limit
+            trade_client,
+            plan.instrument_name,
+            lookback_days,
+            window_days,
+            limit,
+            since_ms=plan.since_ms,
+            early_stop=plan.mode != MODE_DEEP and not plan.open_orders,
+            problems=problems,
         )
-        return self.sync_order_history(
+        return orders, through_ms, (time.monotonic() - started) * 1000, request_count(), problems
+
+    def _store_fetched_history(
+        self,
+        db: Session,
+        plan: HistorySyncPlan,
+        orders: List[dict],
+        through_ms: int,
+        fetch_ms: float,
+        limit: int = 100,
+        problems: Optional[List[str]] = None,
+    ) -> int:
+        """Upsert one instrument's fetched orders; advance its watermark only when they were committed
+        and every window was read in full (``problems`` empty), so a failed or truncated fetch is
+        retried next cycle instead of waiting for the deep reconciliation."""
+        db.info.pop(HISTORY_ERROR_KEY, None)
+        stored = self.sync_order_history(
             db,
             page_size=limit,
             max_pages=1,
-            instrument_name=instrument_name,
+            instrument_name=plan.instrument_name,
             prefetched_orders=orders,
         )
+        if db.info.pop(HISTORY_ERROR_KEY, None) is not None:
+            return stored
+        if problems:
+            logger.warning(
+                "Order history partial fetch instrument=%s mode=%s; watermark not advanced: %s",
+                plan.instrument_name,
+                plan.mode,
+                "; ".join(problems[:3]),
+            )
+            return stored
+        record_history_sync(db, plan, orders, through_ms, fetch_ms)
+        return stored
+
+    def _sync_order_history_instruments(self, db: Session, instruments: List[str]) -> int:
+        """One background pass over ``instruments``: plan from watermarks, fetch in parallel, upsert in order."""
+        plans = plan_history_sync(db, instruments)
+        if not plans:
+            return 0
+        started = time.monotonic()
+        results: Dict[str, Dict[str, Any]] = {}
+        total_stored = 0
+        with ThreadPoolExecutor(
+            max_workers=min(sync_concurrency(), len(plans)), thread_name_prefix="order-history"
+        ) as pool:
+            futures = [(plan, pool.submit(self._fetch_history_for_plan, trade_client, plan)) for plan in plans]
+            for plan, future in futures:
+                try:
+                    orders, through_ms, fetch_ms, requests, problems = future.result()
+                except Exception as e:
+                    logger.warning("Order history fetch failed instrument=%s mode=%s: %s", plan.instrument_name, plan.mode, e)
+                    results[plan.instrument_name] = {"mode": plan.mode, "error": str(e)[:200]}
+                    continue
+                stored = self._store_fetched_history(db, plan, orders, through_ms, fetch_ms, problems=problems)
+                total_stored += stored
+                results[plan.instrument_name] = {
+                    "mode": plan.mode,
+                    "orders": len(orders),
+                    "stored": stored,
+                    "requests": requests,
+                    "fetch_ms": round(fetch_ms, 1),
+                }
+                if plan.open_orders:
+                    results[plan.instrument_name]["open_orders"] = True
+                if problems:
+                    results[plan.instrument_name]["partial"] = problems[:5]
+        note_history_cycle(results, (time.monotonic() - started) * 1000)
+        return total_stored
 
     def _order_history_cursor_get_and_advance(
         self, db: Session, symbol_count: int, max_per_run: int
@@ -5421,23 +5584,10 @@ class ExchangeSyncService:
                 logger.info("Order history sync: using prefetched_orders count=%s", len(orders))
             else:
                 priority_symbols, all_symbols = self._get_order_history_sync_symbols(db)
-                ORDER_HISTORY_SYNC_SLEEP_BETWEEN_SYMBOLS_SEC = 0.2
-                total_stored = 0
-
-                # Priority pass: required + recently traded + open-order symbols every cycle (recent window).
-                for i, sym in enumerate(priority_symbols):
-                    if i > 0:
-                        time.sleep(ORDER_HISTORY_SYNC_SLEEP_BETWEEN_SYMBOLS_SEC)
-                    total_stored += self.sync_order_history_for_instrument(
-                        db,
-                        trade_client,
-                        sym,
-                        lookback_days=ORDER_HISTORY_RECENT_LOOKBACK_DAYS,
-                        window_days=ORDER_HISTORY_RECENT_WINDOW_DAYS,
-                        limit=100,
-                    )
 
-                # Rotating pass: remaining watchlist/traded symbols (recent window only; deep scan on manual sync).
+                # Priority symbols (required + recently traded + open orders) every cycle, plus a
+                # rotating slice of the remaining watchlist/traded symbols. Each is fetched from
+                # its watermark (see order_history_watermarks), a few instruments get a deep rescan.
                 start_index, next_cursor = self._order_history_cursor_get_and_advance(
                     db, len(all_symbols), ORDER_HISTORY_SYNC_MAX_SYMBOLS_PER_RUN
                 )
@@ -5448,19 +5598,9 @@ class ExchangeSyncService:
                     else []
                 )
                 priority_set = set(priority_symbols)
-                for i, sym in enumerate(symbols_this_run):
-                    if sym in priority_set:
-                        continue
-                    if i > 0:
-                        time.sleep(ORDER_HISTORY_SYNC_SLEEP_BETWEEN_SYMBOLS_SEC)
-                    total_stored += self.sync_order_history_for_instrument(
-                        db,
-                        trade_client,
-                        sym,
-                        lookback_days=ORDER_HISTORY_RECENT_LOOKBACK_DAYS,
-                        window_days=ORDER_HISTORY_RECENT_WINDOW_DAYS,
-                        limit=100,
-                    )
+                total_stored = self._sync_order_history_instruments(
+                    db, priority_symbols + [sym for sym in symbols_this_run if sym not in priority_set]
+                )
                 logger.info(
                     "Order history sync: priority=%s rotating=%s total_stored=%s next_cursor=%s",
                     len(priority_symbols),
@@ -6310,6 +6450,7 @@ class ExchangeSyncService:
 
         except Exception as e:
             logger.error(f"Error syncing order history: {e}", exc_info=True)
+            db.info[HISTORY_ERROR_KEY] = str(e)[:500]
             log_critical_failure(
                 message=str(e)[:500],
                 error_code="SYNC_ORDER_HISTORY",
@@ -6323,9 +6464,17 @@ class ExchangeSyncService:
                 pass
             return 0
 
+    def _refresh_open_lot_ledger(self, db: Session) -> None:
+        """Rebuild open-lot ledger scopes whose orders this cycle wrote (fills, cancels)."""
+        try:
+            refresh_touched_scopes(db)
+        except Exception as e:
+            logger.warning("Open-lot ledger refresh failed (non-fatal): %s", e)
+
     def _run_open_orders_sync_sync(self, db: Session):
         """Refresh open-orders cache and DB rows — fast path, must not wait on order history."""
         self.sync_open_orders(db)
+        self._refresh_open_lot_ledger(db)
 
     def _run_background_sync_sync(self, db: Session):
         """Run balances and order-history sync — may be slow; runs independently of open orders."""
@@ -6345,6 +6494,7 @@ class ExchangeSyncService:
                 e,
                 exc_info=True,
             )
+        self._refresh_open_lot_ledger(db)
 
     def _run_sync_sync(self, db: Session):
         """Legacy combined cycle — kept for tests; production uses split loops."""
@@ -6382,6 +6532,8 @@ class ExchangeSyncService:
                     "sync_order_history end duration=%.2fs",
                     time.monotonic() - history_started,
                 )
+                # Only when history finished: a timed-out scan still owns the session
+                await asyncio.to_thread(self._refresh_open_lot_ledger, db)
             except asyncio.TimeoutError:
                 logger.warning(
                     "sync_order_history timed out after %.2fs (limit=%ds) — open orders refresh continues independently",
@@ -717,6 +717,19 @@ def _parent_order_id(order: ExchangeOrder) -> Optional[str]:
 
 
 def rebuild_open_lots(db: Session, symbol: str) -> List[OpenLot]:
+    """
+    Open lots for ``symbol`` ("BTC" or "BTC_USDT").
+
+    Served from the open-lot ledger when the scope is current (O(open lots));
+    otherwise replayed from order history by ``replay_open_lots``. Both give
+    the same lots; see ``open_lot_ledger``.
+    """
+    from app.services.open_lot_ledger import read_open_lots
+
+    return read_open_lots(db, symbol)
+
+
+def replay_open_lots(db: Session, symbol: str) -> List[OpenLot]:
     """
     Rebuild open lots from executed orders.
 
@@ -794,7 +807,7 @@ def rebuild_open_lots(db: Session, symbol: str) -> List[OpenLot]:
     open_lots: List[OpenLot] = []
 
     logger.info(
-        f"rebuild_open_lots: Processing {len(buys)} buy orders and {len(sells)} sell orders for {symbol}"
+        f"replay_open_lots: Processing {len(buys)} buy orders and {len(sells)} sell orders for {symbol}"
     )
 
     # 1) Authoritative OTOCO parent linkage before FIFO (filled TP/SL closes).
@@ -886,7 +899,7 @@ def rebuild_open_lots(db: Session, symbol: str) -> List[OpenLot]:
                     oco_group_id=buy.oco_group_id,
                 ))
                 logger.debug(
-                    f"rebuild_open_lots: Found open lot - {order_symbol} qty={remaining_qty} "
+                    f"replay_open_lots: Found open lot - {order_symbol} qty={remaining_qty} "
                     f"price={buy_price} order_id={buy.exchange_order_id[:15]}..."
                 )
 
@@ -927,14 +940,14 @@ def rebuild_open_lots(db: Session, symbol: str) -> List[OpenLot]:
                 )
             )
             logger.debug(
-                "rebuild_open_lots: Found open short lot - %s qty=%s price=%s order_id=%s...",
+                "replay_open_lots: Found open short lot - %s qty=%s price=%s order_id=%s...",
                 sell.symbol,
                 remaining_qty,
                 sell_price,
                 sell.exchange_order_id[:15],
             )
     
-    logger.info(f"rebuild_open_lots: Found {len(open_lots)} open lots for {symbol}")
+    logger.info(f"replay_open_lots: Found {len(open_lots)} open lots for {symbol}")
     return open_lots
 
 
@@ -0,0 +1,572 @@
+"""
+Streaming indicator engine.
+
+``routes_signals.calculate_*`` recompute every indicator from full Python lists
+on each call. ``StreamingIndicators`` keeps per-symbol running state instead:
+
+- closing a candle (:meth:`StreamingIndicators.on_candle_close`) is O(1)
+- a tick on the forming candle (:meth:`StreamingIndicators.on_tick`) is O(1)
+- :meth:`StreamingIndicators.snapshot` combines closed state with the forming
+  candle in O(1), matching the legacy convention where the last candle's close
+  is replaced by the live price
+
+Cold start seeds the state from a candle history with vectorized NumPy
+(:meth:`StreamingIndicators.from_candles`). ``market_updater`` keeps one state
+per symbol in ``indicator_registry`` (:meth:`IndicatorRegistry.refresh`), so a
+cycle only applies the candles that closed since the previous one.
+
+RSI is reported two ways: ``rsi`` uses Wilder smoothing (the textbook RSI14),
+``rsi_simple`` keeps the legacy simple mean of the last 14 deltas so callers
+can compare before switching. SMA/EMA/ATR/volume index match the legacy
+functions (without their display rounding); see tests/test_indicator_engine.py.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.volume_index import calculate_volume_index
+
+# calculate_volume_index only looks at the last 12 volumes (10-period baseline + current + forming)
+VOLUME_WINDOW = 12
+
+
+def ema_last(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Last value of ``x_k = alpha*v_k + (1-alpha)*x_{k-1}`` seeded with ``v_0``, along the last axis."""
+    n = values.shape[-1]
+    decay = (1.0 - alpha) ** np.arange(n - 1, -1, -1, dtype=float)
+    weights = alpha * decay
+    weights[0] = decay[0]
+    return values @ weights
+
+
+def wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothed average: simple mean of the first ``period`` values, then alpha=1/period."""
+    seed = values[..., :period].mean(axis=-1)
+    rest = values[..., period:]
+    if rest.shape[-1] == 0:
+        return seed
+    alpha = 1.0 / period
+    decay = (1.0 - alpha) ** np.arange(rest.shape[-1] - 1, -1, -1, dtype=float)
+    return seed * (1.0 - alpha) ** rest.shape[-1] + rest @ (alpha * decay)
+
+
+def true_range(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """True range for candles 1..n-1 (legacy calculate_atr convention), along the last axis."""
+    prev_close = closes[..., :-1]
+    h = highs[..., 1:]
+    low = lows[..., 1:]
+    return np.maximum(h - low, np.maximum(np.abs(h - prev_close), np.abs(low - prev_close)))
+
+
+def _rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class _RollingSum:
+    """Fixed-size window with a running sum (O(1) push)."""
+
+    __slots__ = ("size", "values", "total")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque(maxlen=size)
+        self.total = 0.0
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def sum_last(self, count: int) -> float:
+        """Sum of the newest ``count`` values (count is size or size-1)."""
+        if count >= len(self.values):
+            return self.total
+        return self.total - self.values[0]
+
+
+class StreamingIndicators:
+    """O(1)-update indicator state for one symbol/timeframe."""
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        ma_fast: int = 50,
+        ma_slow: int = 200,
+        ema_period: int = 10,
+        atr_period: int = 14,
+        volume_period: int = 5,
+    ):
+        self.rsi_period = rsi_period
+        self.ma_fast = ma_fast
+        self.ma_slow = ma_slow
+        self.ema_period = ema_period
+        self.atr_period = atr_period
+        self.volume_period = volume_period
+        self._ema_alpha = 2.0 / (ema_period + 1)
+
+        self.closed_count = 0
+        self.last_closed: Optional[Dict[str, float]] = None
+        self.last_ts: Optional[int] = None
+        self._forming: Optional[Dict[str, float]] = None
+
+        self._ma_fast = _RollingSum(ma_fast)
+        self._ma_slow = _RollingSum(ma_slow)
+        self._ema: Optional[float] = None
+        self._gains = _RollingSum(rsi_period)
+        self._losses = _RollingSum(rsi_period)
+        self._wilder_gain: Optional[float] = None
+        self._wilder_loss: Optional[float] = None
+        self._tr = _RollingSum(atr_period)
+        self._volumes: Deque[float] = deque(maxlen=VOLUME_WINDOW)
+
+    # ------------------------------------------------------------------ seeding
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: Sequence[Dict[str, Any]],
+        last_is_open: bool = True,
+        **periods: int,
+    ) -> "StreamingIndicators":
+        """Seed from ``{"t","o","h","l","c","v"}`` candles (oldest first) with vectorized NumPy.
+
+        ``last_is_open`` treats the final candle as still forming (REST candle
+        endpoints return the current candle last).
+        """
+        state = cls(**periods)
+        if not candles:
+            return state
+        closed = candles[:-1] if last_is_open else candles
+        if closed:
+            state._seed_closed(closed)
+        if last_is_open:
+            last = candles[-1]
+            state._forming = {k: float(last.get(k, 0.0)) for k in ("o", "h", "l", "c", "v")}
+            state.last_ts = int(last.get("t", 0)) or state.last_ts
+        return state
+
+    def _seed_closed(self, closed: Sequence[Dict[str, Any]]) -> None:
+        closes = np.fromiter((float(c["c"]) for c in closed), dtype=float, count=len(closed))
+        highs = np.fromiter((float(c["h"]) for c in closed), dtype=float, count=len(closed))
+        lows = np.fromiter((float(c["l"]) for c in closed), dtype=float, count=len(closed))
+        volumes = np.fromiter((float(c.get("v", 0.0)) for c in closed), dtype=float, count=len(closed))
+        n = len(closed)
+
+        for value in closes[-self.ma_slow:]:
+            self._ma_slow.push(float(value))
+        for value in closes[-self.ma_fast:]:
+            self._ma_fast.push(float(value))
+        self._ema = float(ema_last(closes, self._ema_alpha))
+
+        if n >= 2:
+            deltas = np.diff(closes)
+            gains = np.where(deltas > 0, deltas, 0.0)
+            losses = np.where(deltas < 0, -deltas, 0.0)
+            for g, loss in zip(gains[-self.rsi_period:], losses[-self.rsi_period:]):
+                self._gains.push(float(g))
+                self._losses.push(float(loss))
+            if len(deltas) >= self.rsi_period:
+                self._wilder_gain = float(wilder_average(gains, self.rsi_period))
+                self._wilder_loss = float(wilder_average(losses, self.rsi_period))
+            for tr in true_range(highs, lows, closes)[-self.atr_period:]:
+                self._tr.push(float(tr))
+        for v in volumes[-VOLUME_WINDOW:]:
+            self._volumes.append(float(v))
+
+        self.closed_count = n
+        last = closed[-1]
+        self.last_closed = {k: float(last.get(k, 0.0)) for k in ("o", "h", "l", "c", "v")}
+        self.last_ts = int(last.get("t", 0)) or None
+
+    # ------------------------------------------------------------------ updates
+
+    def on_candle_close(self, candle: Dict[str, Any]) -> None:
+        """Append a closed candle. O(1)."""
+        c = {k: float(candle.get(k, 0.0)) for k in ("o", "h", "l", "c", "v")}
+        close = c["c"]
+        self._ma_fast.push(close)
+        self._ma_slow.push(close)
+        self._ema = close if self._ema is None else self._ema_alpha * close + (1 - self._ema_alpha) * self._ema
+        prev = self.last_closed
+        if prev is not None:
+            delta = close - prev["c"]
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self._gains.push(gain)
+            self._losses.push(loss)
+            if self._wilder_gain is None:
+                if len(self._gains.values) == self.rsi_period and self.closed_count == self.rsi_period:
+                    self._wilder_gain = self._gains.total / self.rsi_period
+                    self._wilder_loss = self._losses.total / self.rsi_period
+            else:
+                p = self.rsi_period
+                self._wilder_gain = (self._wilder_gain * (p - 1) + gain) / p
+                self._wilder_loss = (self._wilder_loss * (p - 1) + loss) / p
+            self._tr.push(max(c["h"] - c["l"], abs(c["h"] - prev["c"]), abs(c["l"] - prev["c"])))
+        self._volumes.append(c["v"])
+        self.closed_count += 1
+        self.last_closed = c
+        if candle.get("t") is not None:
+            self.last_ts = int(candle["t"])
+        self._forming = None
+
+    def on_tick(
+        self,
+        price: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        volume: Optional[float] = None,
+    ) -> None:
+        """Update the forming candle with a live price. O(1)."""
+        price = float(price)
+        f = self._forming
+        if f is None:
+            f = {"o": price, "h": price, "l": price, "c": price, "v": 0.0}
+            self._forming = f
+        f["c"] = price
+        f["h"] = max(f["h"], price if high is None else float(high))
+        f["l"] = min(f["l"], price if low is None else float(low))
+        if volume is not None:
+            f["v"] = float(volume)
+
+    def set_forming(self, candle: Dict[str, Any], close: Optional[float] = None) -> None:
+        """Replace the forming candle with a fetched one, optionally closing it at ``close``. O(1).
+
+        Unlike :meth:`on_tick`, high/low are taken as fetched: the legacy
+        calculators only substitute the last close, so a live price outside
+        the candle's range must not widen it (ATR parity).
+        """
+        f = {k: float(candle.get(k, 0.0)) for k in ("o", "h", "l", "c", "v")}
+        if close is not None:
+            f["c"] = float(close)
+        self._forming = f
+
+    # ------------------------------------------------------------------ output
+
+    def _window_mean(self, window: _RollingSum, period: int, forming_value: Optional[float]) -> Optional[float]:
+        """Mean over the last ``period`` values of closed history plus the forming value."""
+        if forming_value is None:
+            n = min(period, len(window.values))
+            return window.sum_last(n) / n if n else None
+        n = min(period - 1, len(window.values))
+        return (window.sum_last(n) + forming_value) / (n + 1)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Current indicator values (forming candle included when present). O(1)."""
+        f = self._forming
+        total = self.closed_count + (1 if f is not None else 0)
+        last_price = f["c"] if f is not None else (self.last_closed["c"] if self.last_closed else None)
+        out: Dict[str, Optional[float]] = {
+            "price": last_price,
+            "candles": float(total),
+        }
+        if total == 0:
+            return out
+
+        prev_close = self.last_closed["c"] if self.last_closed else None
+        fc = f["c"] if f is not None else None
+
+        # Moving averages (legacy: last price when history is shorter than the period)
+        for key, window, period in (("ma50", self._ma_fast, self.ma_fast), ("ma200", self._ma_slow, self.ma_slow)):
+            out[key] = self._window_mean(window, period, fc) if total >= period else last_price
+        if total >= self.ema_period:
+            ema = self._ema
+            if fc is not None:
+                ema = fc if ema is None else self._ema_alpha * fc + (1 - self._ema_alpha) * ema
+            out["ema10"] = ema
+        else:
+            out["ema10"] = last_price
+
+        # RSI
+        delta = (fc - prev_close) if (fc is not None and prev_close is not None) else None
+        gain = max(delta, 0.0) if delta is not None else None
+        loss = max(-delta, 0.0) if delta is not None else None
+        p = self.rsi_period
+        deltas_total = total - 1
+        if deltas_total >= p:
+            out["rsi_simple"] = _rsi_from_averages(
+                self._window_mean(self._gains, p, gain),
+                self._window_mean(self._losses, p, loss),
+            )
+            wg, wl = self._wilder_gain, self._wilder_loss
+            if wg is None:
+                # Forming delta is the p-th delta: seed is the plain mean
+                wg = (self._gains.total + gain) / p
+                wl = (self._losses.total + loss) / p
+            elif gain is not None:
+                wg = (wg * (p - 1) + gain) / p
+                wl = (wl * (p - 1) + loss) / p
+            out["rsi"] = _rsi_from_averages(wg, wl)
+        else:
+            out["rsi"] = 50.0
+            out["rsi_simple"] = 50.0
+
+        # ATR (legacy: simple mean of last 14 true ranges)
+        if total >= self.atr_period + 1:
+            tr = None
+            if f is not None and prev_close is not None:
+                tr = max(f["h"] - f["l"], abs(f["h"] - prev_close), abs(f["l"] - prev_close))
+            out["atr"] = self._window_mean(self._tr, self.atr_period, tr)
+        else:
+            out["atr"] = 0.0
+
+        volumes: List[float] = list(self._volumes)
+        if f is not None:
+            volumes.append(f["v"])
+        volumes = volumes[-VOLUME_WINDOW:]
+        vol = calculate_volume_index(volumes, period=self.volume_period)
+        out["current_volume"] = vol.get("current_volume")
+        out["avg_volume"] = vol.get("average_volume")
+        out["volume_ratio"] = vol.get("volume_ratio")
+        return out
+
+
+def _ma_decimals(value: float) -> int:
+    return 2 if value >= 1 else 6 if value >= 0.01 else 10
+
+
+def _atr_decimals(atr: float, current_price: Optional[float]) -> int:
+    ref = current_price if current_price is not None and current_price > 0 else None
+    if ref is not None:
+        return 2 if ref >= 100 else 4 if ref >= 1 else 6
+    return 2 if atr >= 1 else 4 if atr >= 0.01 else 6
+
+
+def legacy_rounded(snapshot: Dict[str, Optional[float]], current_price: Optional[float] = None) -> Dict[str, float]:
+    """
+    rsi / ma50 / ma200 / ema10 / atr rounded the way ``routes_signals.calculate_*``
+    round them, so stored values do not change precision. ``rsi`` is the legacy
+    simple-mean RSI (``rsi_simple``), as stored until now.
+    """
+    out: Dict[str, float] = {"rsi": round(float(snapshot["rsi_simple"]), 2)}
+    for key in ("ma50", "ma200", "ema10"):
+        value = float(snapshot[key] or 0.0)
+        out[key] = round(value, _ma_decimals(value))
+    atr = float(snapshot["atr"] or 0.0)
+    out["atr"] = round(atr, _atr_decimals(atr, current_price))
+    return out
+
+
+class IndicatorRegistry:
+    """Thread-safe per-(symbol, timeframe) map of :class:`StreamingIndicators`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: Dict[tuple, StreamingIndicators] = {}
+
+    def sync_candles(self, symbol: str, timeframe: str, candles: Sequence[Dict[str, Any]]) -> StreamingIndicators:
+        """Seed on first sight, otherwise apply only candles newer than the last seen one."""
+        key = (symbol, timeframe)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state.last_ts is None or not candles:
+                state = StreamingIndicators.from_candles(candles)
+                self._states[key] = state
+                return state
+            last_ts = state.last_ts
+            newer = [c for c in candles if int(c.get("t", 0)) >= last_ts]
+            if not newer or int(newer[0].get("t", 0)) != last_ts:
+                # Series jumped (gap/restart): reseed
+                state = StreamingIndicators.from_candles(candles)
+                self._states[key] = state
+                return state
+            # newer[0] is the candle that was forming; it and all but the last are now closed
+            for candle in newer[:-1]:
+                state.on_candle_close(candle)
+            last = newer[-1]
+            state.set_forming(last)
+            state.last_ts = int(last.get("t", 0))
+            return state
+
+    def refresh(
+        self, symbol: str, timeframe: str, candles: Sequence[Dict[str, Any]], price: float
+    ) -> Dict[str, Optional[float]]:
+        """Sync with a fetched candle series (last candle forming), close it at the live price, return the snapshot.
+
+        As in the legacy full recompute, only the forming close is replaced by
+        ``price``; its high/low stay as fetched.
+        """
+        state = self.sync_candles(symbol, timeframe, candles)
+        with self._lock:
+            if candles:
+                state.set_forming(candles[-1], close=price)
+            else:
+                state.on_tick(price)
+            return state.snapshot()
+
+    def on_price(self, symbol: str, timeframe: str, price: float) -> Optional[Dict[str, Optional[float]]]:
+        """Apply a live tick and return the refreshed snapshot (None if the symbol is not seeded)."""
+        with self._lock:
+            state = self._states.get((symbol, timeframe))
+            if state is None:
+                return None
+            state.on_tick(price)
+            return state.snapshot()
+
+    def get(self, symbol: str, timeframe: str = "1h") -> Optional[StreamingIndicators]:
+        with self._lock:
+            return self._states.get((symbol, timeframe))
+
+
+indicator_registry = IndicatorRegistry()
+
+
+# ---------------------------------------------------------------------- batch
+
+
+def stack_candle_series(
+    series: Sequence[Sequence[Dict[str, Any]]], width: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Right-align per-symbol candle lists into (n_symbols x width) arrays, NaN-padded on the left."""
+    width = width or max((len(s) for s in series), default=0)
+    out = {key: np.full((len(series), width), np.nan) for key in ("c", "h", "l", "v")}
+    for row, candles in enumerate(series):
+        tail = candles[-width:] if width else []
+        if not tail:
+            continue
+        offset = width - len(tail)
+        for key, arr in out.items():
+            arr[row, offset:] = [float(c.get(key, 0.0)) for c in tail]
+    return out
+
+
+def _first_valid_index(mask: np.ndarray) -> np.ndarray:
+    """Index of the first True along axis 1 (width if none)."""
+    width = mask.shape[1]
+    any_valid = mask.any(axis=1)
+    return np.where(any_valid, mask.argmax(axis=1), width)
+
+
+def _tail_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Mean of the last ``period`` columns; NaN when any of them is missing."""
+    if values.shape[1] < period:
+        return np.full(values.shape[0], np.nan)
+    return values[:, -period:].mean(axis=1)
+
+
+def compute_indicators_batch(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    rsi_period: int = 14,
+    ma_fast: int = 50,
+    ma_slow: int = 200,
+    ema_period: int = 10,
+    atr_period: int = 14,
+    volume_period: int = 5,
+) -> Dict[str, np.ndarray]:
+    """
+    Every indicator for every symbol in one vectorized pass.
+
+    Inputs are (n_symbols x n_candles) arrays, right-aligned with NaN left
+    padding for shorter histories (see :func:`stack_candle_series`); the last
+    column is the forming candle with its close already set to the live price.
+    Each output is a length-n_symbols array; NaN marks a symbol whose history
+    is too short for that indicator (callers apply their own fallbacks).
+    Values follow the same conventions as :class:`StreamingIndicators`.
+    """
+    close = np.asarray(close, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    n_rows, width = close.shape
+    valid = ~np.isnan(close)
+    start = _first_valid_index(valid)
+    lengths = width - start
+    rows = np.arange(n_rows)
+    filled = np.nan_to_num(close)
+
+    out: Dict[str, np.ndarray] = {"candles": lengths.astype(float)}
+    out["price"] = np.where(lengths > 0, close[:, -1] if width else np.nan, np.nan)
+    out["ma50"] = _tail_mean(close, ma_fast)
+    out["ma200"] = _tail_mean(close, ma_slow)
+
+    # EMA seeded at each row's first valid close
+    alpha = 2.0 / (ema_period + 1)
+    decay = (1.0 - alpha) ** np.arange(width - 1, -1, -1, dtype=float)
+    after_start = np.arange(width)[None, :] > start[:, None]
+    ema = (filled * (alpha * decay) * after_start).sum(axis=1)
+    seed_idx = np.minimum(start, width - 1)
+    ema += filled[rows, seed_idx] * decay[seed_idx]
+    out["ema10"] = np.where(lengths >= ema_period, ema, np.nan)
+
+    # RSI: deltas are NaN where either side is padding
+    deltas = np.diff(close, axis=1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    gains[np.isnan(deltas)] = np.nan
+    losses[np.isnan(deltas)] = np.nan
+    enough_rsi = lengths >= rsi_period + 1
+    simple_gain = _tail_mean(gains, rsi_period)
+    simple_loss = _tail_mean(losses, rsi_period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi_simple = np.where(simple_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + simple_gain / simple_loss))
+    out["rsi_simple"] = np.where(enough_rsi, rsi_simple, np.nan)
+
+    n_d = deltas.shape[1]
+    if n_d >= rsi_period:
+        g0 = np.nan_to_num(gains)
+        l0 = np.nan_to_num(losses)
+        cs_g = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(g0, axis=1)], axis=1)
+        cs_l = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(l0, axis=1)], axis=1)
+        d_start = np.minimum(start, n_d - rsi_period)
+        seed_end = d_start + rsi_period
+        seed_g = (cs_g[rows, seed_end] - cs_g[rows, d_start]) / rsi_period
+        seed_l = (cs_l[rows, seed_end] - cs_l[rows, d_start]) / rsi_period
+        w_alpha = 1.0 / rsi_period
+        w_decay = (1.0 - w_alpha) ** np.arange(n_d - 1, -1, -1, dtype=float)
+        after_seed = np.arange(n_d)[None, :] >= seed_end[:, None]
+        rest_g = (g0 * (w_alpha * w_decay) * after_seed).sum(axis=1)
+        rest_l = (l0 * (w_alpha * w_decay) * after_seed).sum(axis=1)
+        carry = (1.0 - w_alpha) ** (n_d - seed_end)
+        avg_g = seed_g * carry + rest_g
+        avg_l = seed_l * carry + rest_l
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(avg_l == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_g / avg_l))
+        out["rsi"] = np.where(enough_rsi, rsi, np.nan)
+    else:
+        out["rsi"] = np.full(n_rows, np.nan)
+
+    # ATR: mean of the last atr_period true ranges
+    tr = true_range(high, low, close) if width >= 2 else np.empty((n_rows, 0))
+    out["atr"] = np.where(lengths >= atr_period + 1, _tail_mean(tr, atr_period), np.nan)
+
+    out.update(_volume_index_batch(volume, lengths, volume_period))
+    return out
+
+
+def _volume_index_batch(volume: np.ndarray, lengths: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Vectorized calculate_volume_index for rows with a full 12-candle window; loop for the rest."""
+    n_rows = volume.shape[0]
+    current = np.full(n_rows, np.nan)
+    average = np.full(n_rows, np.nan)
+    ratio = np.full(n_rows, np.nan)
+    full = lengths >= VOLUME_WINDOW
+    if full.any() and volume.shape[1] >= VOLUME_WINDOW:
+        v = volume[full][:, -VOLUME_WINDOW:]
+        cur = v[:, -2]
+        ema_window = v[:, -(period + 2):-1]
+        avg = ema_last(ema_window, 2.0 / (period + 1))
+        baseline = v[:, :-1].mean(axis=1)
+        above = (v[:, -5:-1] > (baseline * 1.5)[:, None]).sum(axis=1)
+        boost = (above >= 3) & (baseline > 0)
+        avg = np.where(boost, np.maximum(avg, baseline * 0.8), avg)
+        tiny = avg < 0.0001
+        avg = np.where(tiny & (cur > 0), np.maximum(avg, cur * 0.1), np.where(tiny, 0.0, avg))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.where(avg > 0, np.minimum(cur / avg, 100.0), 0.0)
+        current[full], average[full], ratio[full] = cur, avg, r
+    for row in np.flatnonzero(~full & (lengths > 0)):
+        vols = [float(x) for x in volume[row, -int(lengths[row]):]]
+        res = calculate_volume_index(vols, period=period)
+        current[row] = res["current_volume"]
+        average[row] = res["average_volume"]
+        ratio[row] = res["volume_ratio"]
+    return {"current_volume": current, "avg_volume": average, "volume_ratio": ratio}
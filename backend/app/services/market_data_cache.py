@@ -0,0 +1,245 @@
+"""
+Live market-data cache
+
+In-memory last price and recent candles per symbol, fed by the market-data
+WebSocket (``brokers/crypto_com_market_websocket.py``). Each process that runs
+the WebSocket client has its own cache: the backend (price stream, signal
+monitor) and the market updater worker.
+
+Readers ask for a *fresh* value (``max_age`` seconds, ``MARKET_WS_PRICE_MAX_AGE_S``
+by default) and fall back to their REST/DB source when the cache has nothing
+fresh, so an idle or disconnected stream never serves stale prices.
+
+Candles use the ``{"t","o","h","l","c","v"}`` shape of ``candle_store`` /
+``market_updater.fetch_ohlcv_data``. ``update_candle`` reports a gap when a
+candle opens more than one interval after the last one held (missed updates,
+e.g. across a reconnect); the gap is left for the REST candle refresh to fill.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.services.candle_store import TIMEFRAME_MS
+
+logger = logging.getLogger(__name__)
+
+MARKET_WS_PRICE_MAX_AGE_S = float(os.getenv("MARKET_WS_PRICE_MAX_AGE_S", "5"))
+MARKET_WS_CANDLE_DEPTH = int(os.getenv("MARKET_WS_CANDLE_DEPTH", "300"))
+
+
+@dataclass(frozen=True)
+class LiveTicker:
+    symbol: str
+    price: float
+    bid: Optional[float]
+    ask: Optional[float]
+    volume_24h: Optional[float]
+    exchange_ts_ms: Optional[int]
+    received_at: float
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.received_at
+
+
+TickerListener = Callable[[LiveTicker], None]
+
+
+class MarketDataCache:
+    """Thread-safe last-price and candle cache."""
+
+    def __init__(self, candle_depth: int = MARKET_WS_CANDLE_DEPTH) -> None:
+        self.candle_depth = max(1, candle_depth)
+        self._lock = threading.Lock()
+        self._tickers: Dict[str, LiveTicker] = {}
+        # (symbol, timeframe) -> (open times, candles), both sorted by open time
+        self._candles: Dict[Tuple[str, str], Tuple[List[int], List[dict]]] = {}
+        self._listeners: List[TickerListener] = []
+        self._stats = {"ticker_updates": 0, "candle_updates": 0, "candle_gaps": 0}
+
+    # -- tickers ----------------------------------------------------------
+    def update_ticker(
+        self,
+        symbol: str,
+        price: float,
+        *,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        volume_24h: Optional[float] = None,
+        exchange_ts_ms: Optional[int] = None,
+    ) -> Optional[LiveTicker]:
+        if not symbol or not price or price <= 0:
+            return None
+        ticker = LiveTicker(
+            symbol=symbol,
+            price=float(price),
+            bid=bid,
+            ask=ask,
+            volume_24h=volume_24h,
+            exchange_ts_ms=exchange_ts_ms,
+            received_at=time.time(),
+        )
+        with self._lock:
+            self._tickers[symbol] = ticker
+            self._stats["ticker_updates"] += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(ticker)
+            except Exception as e:
+                logger.debug("Market data cache listener failed: %s", e)
+        return ticker
+
+    def last_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[LiveTicker]:
+        """Latest ticker for ``symbol`` if received within ``max_age`` seconds."""
+        limit = MARKET_WS_PRICE_MAX_AGE_S if max_age is None else max_age
+        with self._lock:
+            ticker = self._tickers.get(symbol)
+        if ticker is None or ticker.age() > limit:
+            return None
+        return ticker
+
+    def prices(self, max_age: Optional[float] = None) -> Dict[str, float]:
+        """symbol -> price for every fresh ticker."""
+        limit = MARKET_WS_PRICE_MAX_AGE_S if max_age is None else max_age
+        now = time.time()
+        with self._lock:
+            tickers = list(self._tickers.values())
+        return {t.symbol: t.price for t in tickers if t.age(now) <= limit}
+
+    def add_listener(self, listener: TickerListener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: TickerListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    # -- candles ----------------------------------------------------------
+    def update_candle(self, symbol: str, timeframe: str, candle: dict) -> Optional[Tuple[int, int]]:
+        """
+        Insert or replace a candle (keyed by open time ``t``).
+
+        Returns ``(last_open_ms, new_open_ms)`` when the candle leaves a gap
+        after the newest one held, else None.
+        """
+        open_ms = int(candle["t"])
+        step = TIMEFRAME_MS.get(timeframe)
+        gap = None
+        with self._lock:
+            times, rows = self._candles.setdefault((symbol, timeframe), ([], []))
+            if times and open_ms == times[-1]:
+                rows[-1] = candle
+            elif not times or open_ms > times[-1]:
+                if times and step and open_ms - times[-1] > step:
+                    gap = (times[-1], open_ms)
+                    self._stats["candle_gaps"] += 1
+                times.append(open_ms)
+                rows.append(candle)
+            else:
+                idx = bisect.bisect_left(times, open_ms)
+                if idx < len(times) and times[idx] == open_ms:
+                    rows[idx] = candle
+                else:
+                    times.insert(idx, open_ms)
+                    rows.insert(idx, candle)
+            if len(times) > self.candle_depth:
+                del times[: len(times) - self.candle_depth]
+                del rows[: len(rows) - self.candle_depth]
+            self._stats["candle_updates"] += 1
+        return gap
+
+    def candles(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> List[dict]:
+        """Cached candles, oldest first (newest ``limit`` when given)."""
+        with self._lock:
+            _, rows = self._candles.get((symbol, timeframe), ([], []))
+            out = list(rows if limit is None else rows[-limit:])
+        return out
+
+    def merge_candles(self, symbol: str, timeframe: str, candles: List[dict]) -> List[dict]:
+        """
+        ``candles`` (REST, oldest first) with cached candles at or after its
+        last open time applied on top: the forming candle is replaced by the
+        live one and newer closed candles are appended. Length is preserved.
+        """
+        if not candles:
+            return candles
+        last_t = int(candles[-1]["t"])
+        live = [c for c in self.candles(symbol, timeframe) if int(c["t"]) >= last_t]
+        if not live:
+            return candles
+        merged = list(candles[:-1]) if int(live[0]["t"]) == last_t else list(candles)
+        merged.extend(live)
+        return merged[-len(candles):]
+
+    # -- housekeeping -----------------------------------------------------
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["symbols"] = len(self._tickers)
+            out["candle_series"] = len(self._candles)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tickers.clear()
+            self._candles.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+class PriceMoveWatch:
+    """
+    Await a price move of at least ``min_move_pct`` on any symbol since the
+    last ``rebase()``. Ticker updates may arrive from any thread.
+    """
+
+    def __init__(self, cache: MarketDataCache, min_move_pct: float) -> None:
+        self.cache = cache
+        self.min_move_pct = min_move_pct
+        self._reference: Dict[str, float] = {}
+        self._moved: Optional[str] = None
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        cache.add_listener(self._on_ticker)
+
+    def rebase(self) -> None:
+        self._reference = self.cache.prices()
+        self._moved = None
+        if self._event is not None:
+            self._event.clear()
+
+    def _on_ticker(self, ticker: LiveTicker) -> None:
+        ref = self._reference.get(ticker.symbol)
+        if not ref or self._moved is not None:
+            return
+        if abs(ticker.price - ref) / ref * 100 >= self.min_move_pct:
+            self._moved = ticker.symbol
+            if self._loop is not None and self._event is not None:
+                self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: float) -> Optional[str]:
+        """Symbol that moved, or None when ``timeout`` elapsed first."""
+        self._loop = asyncio.get_running_loop()
+        if self._event is None:
+            self._event = asyncio.Event()
+        if self._moved is None:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._moved
+
+    def close(self) -> None:
+        self.cache.remove_listener(self._on_ticker)
+
+
+# Process-wide cache
+market_data_cache = MarketDataCache()
@@ -0,0 +1,123 @@
+"""
+Bulk writes of the market updater's per-symbol rows (market_prices, market_data).
+
+``market_updater.update_market_data`` used to SELECT both rows per symbol and
+update them attribute by attribute through the ORM unit of work (2N SELECTs +
+N UPDATEs per cycle). ``bulk_upsert_market_rows`` writes the whole cycle as one
+``INSERT ... ON CONFLICT (symbol) DO UPDATE`` per table, executed over
+executemany batches of MARKET_WRITE_BATCH_SIZE rows:
+
+- PostgreSQL and SQLite (3.24+) use their dialect's native upsert
+- any other dialect falls back to the per-row ORM merge
+
+Rows are de-duplicated by symbol (last wins); Postgres refuses to update the
+same row twice in one statement. ``exchange`` is only set on insert, as before.
+Nothing is committed here: the caller commits the cycle.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.market_price import MarketData, MarketPrice
+
+logger = logging.getLogger(__name__)
+
+MARKET_WRITE_BATCH_SIZE = max(1, int(os.getenv("MARKET_WRITE_BATCH_SIZE", "500")))
+
+MARKET_PRICE_FIELDS = ("price", "source", "volume_24h")
+MARKET_DATA_FIELDS = (
+    "price",
+    "rsi",
+    "atr",
+    "ma50",
+    "ma200",
+    "ema10",
+    "ma10w",
+    "volume_24h",
+    "current_volume",
+    "avg_volume",
+    "volume_ratio",
+    "res_up",
+    "res_down",
+    "source",
+)
+
+
+def market_rows_for_coin(coin: Dict[str, Any], source: str) -> tuple:
+    """(market_prices row, market_data row) for one enriched updater coin."""
+    symbol = coin["instrument_name"]
+    price = coin["current_price"]
+    price_row = {"symbol": symbol, "price": price, "source": source, "volume_24h": coin.get("volume_24h")}
+    data_row = {"symbol": symbol, "price": price, "source": source}
+    for field in MARKET_DATA_FIELDS:
+        if field not in data_row:
+            data_row[field] = coin.get(field)
+    data_row["res_up"] = price * 1.02 if price > 0 else None
+    data_row["res_down"] = price * 0.98 if price > 0 else None
+    return price_row, data_row
+
+
+def _dedupe(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return list({row["symbol"]: row for row in rows}.values())
+
+
+def _upsert_statement(dialect: str, model: Any, fields: tuple):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(model.__table__)
+    updates = {field: stmt.excluded[field] for field in fields}
+    updates["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=["symbol"], set_=updates)
+
+
+def _orm_merge(db: Session, model: Any, rows: List[Dict[str, Any]], fields: tuple) -> None:
+    existing = {
+        obj.symbol: obj
+        for obj in db.query(model).filter(model.symbol.in_([row["symbol"] for row in rows])).all()
+    }
+    for row in rows:
+        obj = existing.get(row["symbol"])
+        if obj is None:
+            db.add(model(exchange="CRYPTO_COM", **row))
+            continue
+        for field in fields:
+            setattr(obj, field, row.get(field))
+        obj.updated_at = func.now()
+
+
+def bulk_upsert_market_rows(
+    db: Session,
+    price_rows: Iterable[Dict[str, Any]],
+    data_rows: Iterable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Upsert the cycle's rows; returns ``{method, market_prices, market_data, batches, write_ms}``."""
+    started = time.perf_counter()
+    dialect = db.get_bind().dialect.name
+    method = dialect if dialect in ("postgresql", "sqlite") else "orm"
+    result: Dict[str, Any] = {"method": method, "batches": 0}
+    for model, rows, fields, key in (
+        (MarketPrice, price_rows, MARKET_PRICE_FIELDS, "market_prices"),
+        (MarketData, data_rows, MARKET_DATA_FIELDS, "market_data"),
+    ):
+        rows = [{"exchange": "CRYPTO_COM", **row} for row in _dedupe(rows)] if method != "orm" else _dedupe(rows)
+        result[key] = len(rows)
+        if not rows:
+            continue
+        if method == "orm":
+            _orm_merge(db, model, rows, fields)
+            result["batches"] += 1
+            continue
+        stmt = _upsert_statement(dialect, model, fields)
+        for start in range(0, len(rows), MARKET_WRITE_BATCH_SIZE):
+            db.execute(stmt, rows[start:start + MARKET_WRITE_BATCH_SIZE])
+            result["batches"] += 1
+    result["write_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
@@ -0,0 +1,676 @@
+"""
+Open-lot ledger
+
+``expected_take_profit.rebuild_open_lots`` used to replay a scope's whole
+executed-order history (twin dedupe, parent-linked closes, FIFO netting) on
+every call, and the Expected TP summary, details, sl_tp_checker, the signal
+monitor and the position counters all call it per asset. The ledger keeps the
+replay's output in ``open_lot_ledger`` so those reads cost O(open lots):
+
+- a scope is what callers pass as ``symbol`` (``BTC`` or ``BTC_USDT``); its
+  state row carries a ``version`` counter and the ``built_version`` its lots
+  reflect
+- the ExchangeOrder flush hooks bump ``version`` on the covering scopes when a
+  write can change lots (fills, protection placement/cancel of shorts, edits
+  of filled orders); plain order placement and cancels leave it alone
+- reads compare the two counters on the state row: when equal, lots come
+  straight from the ledger, otherwise (or when the scope was never built) the
+  caller gets a fresh replay and the scope is queued for a refresh
+- ``ExchangeSyncService`` refreshes stale scopes after each sync cycle.
+  Entry fills later than the scope's history and TP/SL fills that close part
+  of their parent lot are applied to the stored lots in place; anything else
+  (late parent backfills, short protection changes, twins, writes from another
+  session) re-derives the scope, since the replay rules are retroactive.
+  Readers never write, so request sessions stay read-only
+
+``verify_ledger`` replays every built scope from scratch and reports any
+difference.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, or_
+from sqlalchemy.orm import Session, object_session
+
+from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusEnum
+from app.models.open_lot_ledger import OpenLotLedgerEntry, OpenLotLedgerScope
+from app.services.expected_take_profit import (
+    ACTIVE_TP_STATUSES,
+    OpenLot,
+    _economic_entry_fingerprint,
+    _order_symbol_scope,
+    _times_within_economic_twin_gap,
+    replay_open_lots,
+)
+from app.utils.economic_twin_orders import PROTECTION_CLOSE_ROLES
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting symbols whose orders were written in the session
+TOUCHED_KEY = "open_lot_ledger_touched"
+# Session.info key listing (symbol, kind, exchange_order_id) of each version bump
+CHANGES_KEY = "open_lot_ledger_changes"
+# Scopes read while missing/stale, rebuilt on the next sync cycle
+MAX_REFRESH_PER_CYCLE = 200
+
+# Columns the replay reads; other ExchangeOrder updates never change lots
+_REPLAY_COLUMNS = (
+    "exchange_order_id",
+    "symbol",
+    "side",
+    "status",
+    "price",
+    "avg_price",
+    "quantity",
+    "cumulative_quantity",
+    "cumulative_value",
+    "exchange_create_time",
+    "exchange_update_time",
+    "created_at",
+    "parent_order_id",
+    "oco_group_id",
+    "order_role",
+    "order_type",
+)
+# Amendments of a pending long protection that neither the netting nor the twin dedupe read
+_PROTECTION_AMEND_COLUMNS = frozenset(
+    {"status", "price", "avg_price", "quantity", "cumulative_quantity", "cumulative_value", "exchange_update_time"}
+)
+
+_lock = threading.Lock()
+_missed: Set[str] = set()
+_stats: Dict[str, Any] = {
+    "hits": 0,
+    "misses": 0,
+    "stale": 0,
+    "refreshed_scopes": 0,
+    "incremental_scopes": 0,
+    "refresh_errors": 0,
+    "last_refresh_ms": None,
+}
+_tables_ready: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+def ledger_enabled() -> bool:
+    return (os.getenv("OPEN_LOT_LEDGER_ENABLED", "true") or "true").strip().lower() in ("1", "true", "yes")
+
+
+def _bump(key: str, n: int = 1) -> None:
+    with _lock:
+        _stats[key] += n
+
+
+def get_open_lot_ledger_stats() -> Dict[str, Any]:
+    with _lock:
+        stats = dict(_stats)
+        stats["pending_scopes"] = len(_missed)
+    return stats
+
+
+def reset_open_lot_ledger_for_tests() -> None:
+    with _lock:
+        _missed.clear()
+        for key in ("hits", "misses", "stale", "refreshed_scopes", "incremental_scopes", "refresh_errors"):
+            _stats[key] = 0
+        _stats["last_refresh_ms"] = None
+    _tables_ready.clear()
+
+
+def _tables_exist_for(engine, connection=None) -> bool:
+    ready = _tables_ready.get(engine)
+    if ready is None:
+        # Inside a flush, inspect on the flush's connection: checking out another
+        # one can reset (roll back) it on single-connection pools
+        names = inspect(connection if connection is not None else engine).get_table_names()
+        ready = OpenLotLedgerEntry.__tablename__ in names and OpenLotLedgerScope.__tablename__ in names
+        _tables_ready[engine] = ready
+    return ready
+
+
+def _ledger_tables_exist(db: Session) -> bool:
+    return _tables_exist_for(db.get_bind())
+
+
+def normalize_scope(symbol: str) -> str:
+    return (symbol or "").strip().upper()
+
+
+def scopes_for_symbol(symbol: str) -> Set[str]:
+    """Ledger scopes whose replay reads orders of ``symbol`` (the pair and its base)."""
+    symbol = normalize_scope(symbol)
+    if not symbol:
+        return set()
+    return {symbol, symbol.split("_")[0]}
+
+
+def _scope_versions(db: Session, scope: str) -> Optional[Tuple[int, int]]:
+    """(version, built_version) of ``scope`` from the database, not the identity map."""
+    row = (
+        db.query(OpenLotLedgerScope.version, OpenLotLedgerScope.built_version)
+        .filter(OpenLotLedgerScope.scope == scope)
+        .first()
+    )
+    return (row[0], row[1]) if row is not None else None
+
+
+# ------------------------------------------------------------------ read
+
+
+def _scope_rows(db: Session, scope: str) -> List[OpenLotLedgerEntry]:
+    return (
+        db.query(OpenLotLedgerEntry)
+        .filter(OpenLotLedgerEntry.scope == scope)
+        .order_by(OpenLotLedgerEntry.position.asc())
+        .all()
+    )
+
+
+def _lot_from_row(row: OpenLotLedgerEntry) -> OpenLot:
+    entry_time = row.entry_time
+    if entry_time is not None and entry_time.tzinfo is None:
+        entry_time = entry_time.replace(tzinfo=timezone.utc)
+    return OpenLot(
+        symbol=row.symbol,
+        buy_order_id=row.entry_order_id,
+        buy_time=entry_time,
+        buy_price=Decimal(row.entry_price),
+        lot_qty=Decimal(row.lot_qty),
+        parent_order_id=row.parent_order_id,
+        oco_group_id=row.oco_group_id,
+    )
+
+
+def read_open_lots(db: Session, symbol: str) -> List[OpenLot]:
+    """
+    Open lots for ``symbol`` from the ledger when its scope is current,
+    otherwise a fresh ``replay_open_lots`` (and the scope is queued for the
+    next sync-cycle refresh).
+    """
+    scope = normalize_scope(symbol)
+    if not ledger_enabled() or not scope:
+        return replay_open_lots(db, symbol)
+    try:
+        if _ledger_tables_exist(db):
+            versions = _scope_versions(db, scope)
+            if versions is not None and versions[0] == versions[1]:
+                rows = _scope_rows(db, scope)
+                _bump("hits")
+                return [_lot_from_row(r) for r in rows]
+            _bump("stale" if versions is not None else "misses")
+            with _lock:
+                _missed.add(scope)
+    except Exception as e:
+        logger.warning("[OPEN_LOT_LEDGER] read failed for %s, replaying: %s", scope, e)
+    return replay_open_lots(db, symbol)
+
+
+# ------------------------------------------------------------------ write
+
+
+def _lot_row(scope: str, position: int, lot: OpenLot) -> OpenLotLedgerEntry:
+    return OpenLotLedgerEntry(
+        scope=scope,
+        position=position,
+        symbol=lot.symbol,
+        entry_order_id=lot.buy_order_id,
+        entry_time=lot.buy_time,
+        entry_price=str(lot.buy_price),
+        lot_qty=str(lot.lot_qty),
+        parent_order_id=lot.parent_order_id,
+        oco_group_id=lot.oco_group_id,
+    )
+
+
+def rebuild_scope(db: Session, scope: str) -> List[OpenLot]:
+    """Replay ``scope`` and replace its ledger rows (flushed, not committed)."""
+    scope = normalize_scope(scope)
+    started = time.perf_counter()
+    # Version before the replay: a write racing the replay leaves the scope stale, never wrong
+    versions = _scope_versions(db, scope)
+    version = versions[0] if versions is not None else 0
+    lots = replay_open_lots(db, scope)
+    db.query(OpenLotLedgerEntry).filter(OpenLotLedgerEntry.scope == scope).delete(synchronize_session=False)
+    db.add_all([_lot_row(scope, i, lot) for i, lot in enumerate(lots)])
+    state = db.get(OpenLotLedgerScope, scope)
+    if state is None:
+        state = OpenLotLedgerScope(scope=scope, version=version)
+        db.add(state)
+    state.built_version = version
+    state.lot_count = len(lots)
+    state.rebuild_ms = round((time.perf_counter() - started) * 1000.0, 3)
+    state.rebuilt_at = datetime.now(timezone.utc)
+    db.flush()
+    return lots
+
+
+def _aware(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _fill_qty(order: ExchangeOrder) -> Decimal:
+    return Decimal(str(order.cumulative_quantity or order.quantity or 0))
+
+
+def _executed_in(variants: List[str]):
+    return (ExchangeOrder.symbol.in_(variants), ExchangeOrder.status == OrderStatusEnum.FILLED)
+
+
+def _has_economic_twin(db: Session, variants: List[str], order: ExchangeOrder) -> bool:
+    """True when another executed BUY could be a dual-ID copy of ``order`` (twin dedupe applies)."""
+    qty = _fill_qty(order)
+    candidates = (
+        db.query(ExchangeOrder)
+        .filter(
+            *_executed_in(variants),
+            ExchangeOrder.side == OrderSideEnum.BUY,
+            ExchangeOrder.id != order.id,
+            or_(ExchangeOrder.cumulative_quantity == qty, ExchangeOrder.quantity == qty),
+        )
+        .all()
+    )
+    fingerprint = _economic_entry_fingerprint(order)
+    for other in candidates:
+        if _economic_entry_fingerprint(other) != fingerprint:
+            continue
+        try:
+            if _times_within_economic_twin_gap(order, other) or _times_within_economic_twin_gap(other, order):
+                return True
+        except TypeError:  # naive vs aware timestamps: assume the worst
+            return True
+    return False
+
+
+def _apply_entry_fill(db: Session, scope: str, order: ExchangeOrder, later: Set[str]) -> bool:
+    """
+    Append the lot of a plain BUY fill when the replay would only add it at
+    the end: it is the latest executed order of the scope (no sell can net
+    against it, no earlier FIFO changes), has no twin and no shorts are open
+    (short lots sort after long ones). Fills applied after it in the same
+    refresh (``later``) are not history yet.
+    """
+    variants = _order_symbol_scope(scope)
+    created = _aware(order.exchange_create_time)
+    if order.symbol not in variants or created is None or order.parent_order_id:
+        return False
+    if "_" not in scope:
+        # The base fallback (any <BASE>_<QUOTE>) only applies while the usual quotes have no fills
+        others = db.query(func.count(ExchangeOrder.id)).filter(*_executed_in(variants), ExchangeOrder.id != order.id)
+        if not others.scalar():
+            return False
+    # Orders without an exchange time sort by the database's NULL ordering: rebuild
+    latest, untimed = (
+        db.query(
+            func.max(ExchangeOrder.exchange_create_time),
+            func.count(ExchangeOrder.id) - func.count(ExchangeOrder.exchange_create_time),
+        )
+        .filter(*_executed_in(variants), ExchangeOrder.id != order.id, ExchangeOrder.exchange_order_id.notin_(later))
+        .one()
+    )
+    if untimed or (latest is not None and _aware(latest) >= created):
+        return False
+    sell_ids = db.query(ExchangeOrder.exchange_order_id).filter(
+        *_executed_in(variants), ExchangeOrder.side == OrderSideEnum.SELL
+    )
+    short_rows = db.query(func.count(OpenLotLedgerEntry.id)).filter(
+        OpenLotLedgerEntry.scope == scope, OpenLotLedgerEntry.entry_order_id.in_(sell_ids)
+    )
+    if short_rows.scalar() or _has_economic_twin(db, variants, order):
+        return False
+    qty = _fill_qty(order)
+    price = Decimal(str(order.price or order.avg_price or 0))
+    if qty > 0 and price > 0:
+        last = db.query(func.max(OpenLotLedgerEntry.position)).filter(OpenLotLedgerEntry.scope == scope).scalar()
+        lot = OpenLot(
+            symbol=order.symbol,
+            buy_order_id=order.exchange_order_id,
+            buy_time=order.exchange_create_time,
+            buy_price=price,
+            lot_qty=qty,
+            parent_order_id=order.parent_order_id,
+            oco_group_id=order.oco_group_id,
+        )
+        db.add(_lot_row(scope, (last if last is not None else -1) + 1, lot))
+    return True
+
+
+def _apply_close_fill(db: Session, scope: str, order: ExchangeOrder, later: Set[str]) -> bool:  # noqa: ARG001
+    """
+    Reduce the parent lot by a filled TP/SL. Parent-linked closes settle
+    before FIFO, so this only holds while the fill fits in what FIFO left of
+    the lot; a larger close, a second close of the same parent or a close
+    carrying its own protection re-derives the scope.
+    """
+    variants = _order_symbol_scope(scope)
+    parent_id = (order.parent_order_id or "").strip()
+    if order.symbol not in variants or not parent_id:
+        return False
+    parent = (
+        db.query(ExchangeOrder)
+        .filter(*_executed_in(variants), ExchangeOrder.exchange_order_id == parent_id)
+        .first()
+    )
+    row = (
+        db.query(OpenLotLedgerEntry)
+        .filter(OpenLotLedgerEntry.scope == scope, OpenLotLedgerEntry.entry_order_id == parent_id)
+        .first()
+    )
+    if parent is None or parent.side != OrderSideEnum.BUY or row is None:
+        return False
+    sell_time = _aware(order.exchange_create_time or order.created_at)
+    parent_time = _aware(parent.exchange_create_time or parent.created_at)
+    if sell_time is None or parent_time is None or sell_time < parent_time:
+        return False
+    sibling_closes = db.query(func.count(ExchangeOrder.id)).filter(
+        *_executed_in(variants),
+        ExchangeOrder.parent_order_id == parent_id,
+        ExchangeOrder.id != order.id,
+    )
+    own_protection = db.query(func.count(ExchangeOrder.id)).filter(
+        ExchangeOrder.parent_order_id == order.exchange_order_id,
+        ExchangeOrder.status.in_(ACTIVE_TP_STATUSES),
+    )
+    if sibling_closes.scalar() or own_protection.scalar():
+        return False
+    qty = _fill_qty(order)
+    remaining = Decimal(row.lot_qty) - qty
+    if qty <= 0 or remaining < 0:
+        return False
+    if remaining == 0:
+        db.delete(row)
+    else:
+        row.lot_qty = str(remaining)
+    return True
+
+
+def _apply_protection(db: Session, scope: str, order: ExchangeOrder, later: Set[str]) -> bool:  # noqa: ARG001
+    """
+    A new TP/SL of a long only matters to the replay through the twin dedupe
+    (protected entries win over their dual-ID copies): nothing changes when
+    the parent already had protection or has no twin.
+    """
+    variants = _order_symbol_scope(scope)
+    parent_id = (order.parent_order_id or "").strip()
+    other_protection = db.query(func.count(ExchangeOrder.id)).filter(
+        ExchangeOrder.parent_order_id == parent_id,
+        ExchangeOrder.order_role.in_(tuple(PROTECTION_CLOSE_ROLES)),
+        ExchangeOrder.id != order.id,
+    )
+    if other_protection.scalar():
+        return True
+    parent = (
+        db.query(ExchangeOrder)
+        .filter(
+            *_executed_in(variants),
+            ExchangeOrder.side == OrderSideEnum.BUY,
+            ExchangeOrder.exchange_order_id == parent_id,
+        )
+        .first()
+    )
+    return parent is None or not _has_economic_twin(db, variants, parent)
+
+
+_APPLY = {
+    "entry_fill": _apply_entry_fill,
+    "close_fill": _apply_close_fill,
+    "protect": _apply_protection,
+}
+
+
+def _apply_changes(db: Session, scope: str, changes: List[Tuple[str, str, Optional[str]]]) -> bool:
+    """Patch ``scope``'s lots with this session's changes; False means rebuild instead."""
+    for i, (_symbol, kind, order_id) in enumerate(changes):
+        apply = _APPLY.get(kind)
+        if apply is None or not order_id:
+            return False
+        order = db.query(ExchangeOrder).filter(ExchangeOrder.exchange_order_id == order_id).first()
+        later = {c[2] for c in changes[i + 1:] if c[2]}
+        if order is None or not apply(db, scope, order, later):
+            return False
+    return True
+
+
+def _refresh_scope(db: Session, scope: str, changes: List[Tuple[str, str, Optional[str]]], forced: bool) -> bool:
+    """Bring ``scope`` up to date; True when it was patched in place rather than rebuilt."""
+    versions = _scope_versions(db, scope)
+    if versions is None:
+        rebuild_scope(db, scope)
+        return False
+    version, built_version = versions
+    if version == built_version and not forced:
+        return False
+    # Every bump must come from a change this session recorded; another writer means rebuild
+    if not forced and built_version >= 0 and changes and version - built_version == len(changes):
+        if _apply_changes(db, scope, changes):
+            state = db.get(OpenLotLedgerScope, scope)
+            state.built_version = version
+            state.lot_count = db.query(func.count(OpenLotLedgerEntry.id)).filter(
+                OpenLotLedgerEntry.scope == scope
+            ).scalar()
+            db.flush()
+            return True
+    rebuild_scope(db, scope)
+    return False
+
+
+def refresh_touched_scopes(db: Session, extra_symbols: Iterable[str] = ()) -> int:
+    """
+    Bring the built scopes covering symbols written in ``db`` (collected by
+    the ExchangeOrder flush hooks) up to date, plus scopes queued by read
+    misses, and commit. Stale scopes are patched in place when this session's
+    changes allow it, otherwise rebuilt; ``extra_symbols`` force a rebuild.
+    Fail-soft: errors are logged and rolled back. Returns the number of
+    scopes refreshed.
+    """
+    touched: Set[str] = set(db.info.pop(TOUCHED_KEY, set()))
+    changes: List[Tuple[str, str, Optional[str]]] = list(db.info.pop(CHANGES_KEY, []))
+    forced: Set[str] = set()
+    for symbol in extra_symbols:
+        if symbol:
+            forced |= scopes_for_symbol(symbol)
+    with _lock:
+        missed = set(list(_missed)[:MAX_REFRESH_PER_CYCLE])
+        _missed.difference_update(missed)
+    if not ledger_enabled() or (not touched and not forced and not missed):
+        return 0
+    started = time.perf_counter()
+    incremental = 0
+    try:
+        if not _ledger_tables_exist(db):
+            return 0
+        candidates: Set[str] = set(forced)
+        for symbol in touched:
+            candidates |= scopes_for_symbol(symbol)
+        stale: Set[str] = set()
+        if candidates:
+            for scope, version, built_version in (
+                db.query(OpenLotLedgerScope.scope, OpenLotLedgerScope.version, OpenLotLedgerScope.built_version)
+                .filter(OpenLotLedgerScope.scope.in_(candidates))
+                .all()
+            ):
+                if version != built_version or scope in forced:
+                    stale.add(scope)
+        scopes = sorted(stale | missed)
+        for scope in scopes:
+            scope_changes = [c for c in changes if scope in scopes_for_symbol(c[0])]
+            if _refresh_scope(db, scope, scope_changes, forced=scope in forced):
+                incremental += 1
+        db.commit()
+    except Exception as e:
+        _bump("refresh_errors")
+        logger.warning("[OPEN_LOT_LEDGER] refresh failed: %s", e, exc_info=True)
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        with _lock:
+            _missed.update(missed)
+        return 0
+    elapsed_ms = round((time.perf_counter() - started) * 1000.0, 3)
+    _bump("refreshed_scopes", len(scopes))
+    _bump("incremental_scopes", incremental)
+    with _lock:
+        _stats["last_refresh_ms"] = elapsed_ms
+    if scopes:
+        logger.info(
+            "[OPEN_LOT_LEDGER] refreshed %d scope(s) (%d in place) in %.1fms: %s",
+            len(scopes), incremental, elapsed_ms, scopes[:10],
+        )
+    return len(scopes)
+
+
+# ------------------------------------------------------------------ sync hooks
+
+
+def _net_changes(target: ExchangeOrder) -> Tuple[Set[str], Dict[str, Any]]:
+    """Replay columns whose value changed in this flush, and their previous values."""
+    state = inspect(target)
+    changed: Set[str] = set()
+    previous: Dict[str, Any] = {}
+    for key in _REPLAY_COLUMNS:
+        history = state.attrs[key].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        try:
+            same = old == new
+        except TypeError:  # naive vs aware datetimes
+            same = False
+        if not same:
+            changed.add(key)
+            previous[key] = old
+    return changed, previous
+
+
+def _is_protection(order: ExchangeOrder, previous: Dict[str, Any]) -> bool:
+    parent = previous.get("parent_order_id", order.parent_order_id) or order.parent_order_id
+    return bool((parent or "").strip())
+
+
+def _change_kind(target: ExchangeOrder, op: str) -> Optional[str]:
+    """
+    How an ExchangeOrder write affects lots: None (it cannot), ``entry_fill``,
+    ``close_fill`` or ``protect`` (candidates for an in-place update) or
+    ``rebuild``.
+    """
+    filled = target.status == OrderStatusEnum.FILLED
+    if op == "delete":
+        return "rebuild" if filled or _is_protection(target, {}) else None
+    if op == "insert":
+        changed, previous = set(_REPLAY_COLUMNS), {}
+    else:
+        changed, previous = _net_changes(target)
+        if not changed:
+            return None
+    was_filled = previous.get("status", target.status) == OrderStatusEnum.FILLED if op == "update" else False
+    if was_filled:
+        # Edits of an executed order (late parent backfill, quantity fix) are retroactive
+        return "rebuild"
+    if filled:
+        role = (target.order_role or "").strip().upper()
+        if target.side == OrderSideEnum.BUY and not target.parent_order_id:
+            return "entry_fill"
+        if target.side == OrderSideEnum.SELL and target.parent_order_id and role in PROTECTION_CLOSE_ROLES:
+            return "close_fill"
+        return "rebuild"
+    if not _is_protection(target, previous):
+        # Pending or cancelled plain orders are never replayed
+        return None
+    if target.side == OrderSideEnum.SELL:
+        # Long protection: only the twin dedupe reads it, by parent and role
+        if op == "insert":
+            return "protect"
+        if changed <= _PROTECTION_AMEND_COLUMNS:
+            return None
+    # Short protection (active SL/TP keeps the short out of FIFO) or a relinked order
+    return "rebuild"
+
+
+def _bump_scope_versions(connection, scopes: Set[str]) -> None:
+    table = OpenLotLedgerScope.__table__
+    connection.execute(
+        table.update().where(table.c.scope.in_(sorted(scopes))).values(version=table.c.version + 1)
+    )
+
+
+def _on_order_write(op: str):
+    def listener(mapper, connection, target) -> None:  # noqa: ARG001
+        symbol = normalize_scope(getattr(target, "symbol", None) or "")
+        if not symbol or not ledger_enabled():
+            return
+        kind = _change_kind(target, op)
+        if kind is None:
+            return
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(TOUCHED_KEY, set()).add(symbol)
+            session.info.setdefault(CHANGES_KEY, []).append((symbol, kind, target.exchange_order_id))
+        if _tables_exist_for(connection.engine, connection):
+            _bump_scope_versions(connection, scopes_for_symbol(symbol))
+
+    return listener
+
+
+event.listen(ExchangeOrder, "after_insert", _on_order_write("insert"))
+event.listen(ExchangeOrder, "after_update", _on_order_write("update"))
+event.listen(ExchangeOrder, "after_delete", _on_order_write("delete"))
+
+
+# ------------------------------------------------------------------ verify
+
+
+def _lot_key(lot: OpenLot) -> tuple:
+    buy_time = lot.buy_time
+    if buy_time is not None and buy_time.tzinfo is None:
+        buy_time = buy_time.replace(tzinfo=timezone.utc)
+    return (
+        lot.symbol,
+        lot.buy_order_id,
+        buy_time,
+        Decimal(str(lot.buy_price)),
+        Decimal(str(lot.lot_qty)),
+        lot.parent_order_id,
+        lot.oco_group_id,
+    )
+
+
+def verify_ledger(db: Session, scopes: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Replay each scope from order history and compare with its ledger rows.
+    Defaults to every built scope. ``ok`` is False if any scope differs;
+    per-scope entries list missing/extra lots and whether the scope is
+    current (a stale scope is expected to differ until refreshed).
+    """
+    if scopes is None:
+        scopes = [s for (s,) in db.query(OpenLotLedgerScope.scope).order_by(OpenLotLedgerScope.scope).all()]
+    report: Dict[str, Any] = {"ok": True, "scopes": {}}
+    for scope in scopes:
+        scope = normalize_scope(scope)
+        versions = _scope_versions(db, scope)
+        stored = [_lot_key(_lot_from_row(r)) for r in _scope_rows(db, scope)]
+        replayed = [_lot_key(lot) for lot in replay_open_lots(db, scope)]
+        missing = [k for k in replayed if k not in stored]
+        extra = [k for k in stored if k not in replayed]
+        entry = {
+            "ok": stored == replayed,
+            "built": versions is not None,
+            "fresh": versions is not None and versions[0] == versions[1],
+            "ledger_lots": len(stored),
+            "replayed_lots": len(replayed),
+            "missing": [[str(v) for v in k] for k in missing],
+            "extra": [[str(v) for v in k] for k in extra],
+        }
+        report["scopes"][scope] = entry
+        if not entry["ok"]:
+            report["ok"] = False
+    return report
@@ -19,6 +19,8 @@ _state: dict[str, Any] = {
     "trigger_orders_status": None,
     "trigger_orders_error": None,
     "trigger_orders_error_code": None,
+    "fetch_ms": None,
+    "endpoint_timings_ms": {},
 }
 
 
@@ -32,6 +34,8 @@ def record_open_orders_sync_success(
     trigger_orders_status: str | None = None,
     trigger_orders_error: str | None = None,
     trigger_orders_error_code: int | None = None,
+    fetch_ms: float | None = None,
+    endpoint_timings_ms: dict[str, float] | None = None,
 ) -> None:
     """Record a verified successful sync from the exchange."""
     with _lock:
@@ -47,6 +51,8 @@ def record_open_orders_sync_success(
                 "trigger_orders_status": trigger_orders_status,
                 "trigger_orders_error": trigger_orders_error,
                 "trigger_orders_error_code": trigger_orders_error_code,
+                "fetch_ms": fetch_ms,
+                "endpoint_timings_ms": dict(endpoint_timings_ms or {}),
             }
         )
 
@@ -56,6 +62,8 @@ def record_open_orders_sync_failure(
     sync_status: SyncStatus,
     error_code: Optional[int] = None,
     error_message: Optional[str] = None,
+    fetch_ms: float | None = None,
+    endpoint_timings_ms: dict[str, float] | None = None,
 ) -> None:
     """Record sync failure; does not clear cached orders."""
     with _lock:
@@ -67,6 +75,8 @@ def record_open_orders_sync_failure(
                 "error_code": error_code,
                 "error_message": error_message,
                 "data_verified": False,
+                "fetch_ms": fetch_ms,
+                "endpoint_timings_ms": dict(endpoint_timings_ms or {}),
             }
         )
 
@@ -89,6 +99,8 @@ def sync_status_public_dict() -> dict[str, Any]:
         "trigger_orders_status": status.get("trigger_orders_status"),
         "trigger_orders_error": status.get("trigger_orders_error"),
         "trigger_orders_error_code": status.get("trigger_orders_error_code"),
+        "fetch_ms": status.get("fetch_ms"),
+        "endpoint_timings_ms": dict(status.get("endpoint_timings_ms") or {}),
     }
 
 
@@ -106,6 +118,8 @@ def reset_open_orders_sync_status_for_tests() -> None:
                 "trigger_orders_status": None,
                 "trigger_orders_error": None,
                 "trigger_orders_error_code": None,
+                "fetch_ms": None,
+                "endpoint_timings_ms": {},
             }
         )
 
@@ -0,0 +1,326 @@
+"""
+Order fill registry
+
+After a market entry, ``SignalMonitorService._poll_order_fill_confirmation``
+polled get-order-detail / open orders / order history up to
+ORDER_FILL_POLL_MAX_ATTEMPTS times with sleeps in between before SL/TP could be
+created. The user-channel WebSocket (``CryptoComWebSocketClient``) already
+receives ``user.order`` and ``user.trade`` pushes; it now publishes them here:
+
+- the latest order update and the aggregated trades are kept per order_id
+  (bounded by ORDER_FILL_REGISTRY_MAX entries and ORDER_FILL_REGISTRY_TTL_S)
+- an update with a terminal status wakes the waiters of that order: async
+  callers await a future on their own loop, worker threads block on an Event
+- updates that arrive before anyone waits (the push can beat the REST reply of
+  create-order) are answered from the registry
+
+Waiting is only attempted while the stream is live (connected and
+subscribed), and never blocks the event loop the stream runs on; in every
+other case the caller goes straight to the REST poll, which stays the
+fallback when no push arrives within ORDER_FILL_WS_WAIT_SECONDS.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ORDER_FILL_WS_WAIT_SECONDS = float(os.getenv("ORDER_FILL_WS_WAIT_SECONDS", "5.0"))
+ORDER_FILL_REGISTRY_TTL_S = float(os.getenv("ORDER_FILL_REGISTRY_TTL_S", "900"))
+ORDER_FILL_REGISTRY_MAX = int(os.getenv("ORDER_FILL_REGISTRY_MAX", "2000"))
+
+TERMINAL_STATUSES = frozenset({"FILLED", "CANCELED", "CANCELLED", "REJECTED", "EXPIRED"})
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_events: Dict[str, List[threading.Event]] = {}
+_futures: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+_stream = {"live": False, "thread_id": None, "since": None}
+_COUNTERS = ("order_updates", "trade_updates", "waits", "ws_confirmed", "timeouts", "not_live", "unfilled_terminal")
+_stats: Dict[str, Any] = dict.fromkeys(_COUNTERS, 0)
+_stats.update({"last_wait_ms": None, "total_wait_ms": 0.0})
+
+
+def fill_stream_enabled() -> bool:
+    return (os.getenv("ORDER_FILL_WS_ENABLED", "true") or "true").strip().lower() in ("1", "true", "yes")
+
+
+def _bump(key: str, n: int = 1) -> None:
+    with _lock:
+        _stats[key] += n
+
+
+# ------------------------------------------------------------------ stream state
+
+
+def set_stream_live(live: bool) -> None:
+    """Called by the WebSocket client on subscribe (from its loop) and on disconnect."""
+    with _lock:
+        _stream["live"] = bool(live)
+        _stream["thread_id"] = threading.get_ident() if live else None
+        _stream["since"] = time.time() if live else None
+        if live:
+            return
+        # Nothing more will be pushed: let the waiters fall back to REST now
+        keys = set(_events) | set(_futures)
+    for key in keys:
+        _wake(key)
+
+
+def is_stream_live() -> bool:
+    return fill_stream_enabled() and _stream["live"]
+
+
+# ------------------------------------------------------------------ publishing
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+
+
+def _prune(now: float) -> None:
+    for key in list(_entries):
+        if len(_entries) <= ORDER_FILL_REGISTRY_MAX and now - _entries[key]["updated"] < ORDER_FILL_REGISTRY_TTL_S:
+            break
+        if key not in _events and key not in _futures:
+            _entries.pop(key)
+
+
+def _entry(order_id: str, now: float) -> Dict[str, Any]:
+    entry = _entries.get(order_id)
+    if entry is None:
+        entry = {"order": {}, "trade_ids": set(), "traded_qty": Decimal("0"), "traded_notional": Decimal("0"), "received": now}
+        _entries[order_id] = entry
+    else:
+        _entries.move_to_end(order_id)
+    entry["updated"] = now
+    _prune(now)
+    return entry
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _wake(order_id: str) -> None:
+    with _lock:
+        events = _events.pop(order_id, [])
+        futures = _futures.pop(order_id, [])
+    for event in events:
+        event.set()
+    for loop, future in futures:
+        try:
+            loop.call_soon_threadsafe(_resolve, future)
+        except RuntimeError:
+            # Loop closed: its waiter is gone
+            pass
+
+
+def publish_order_update(order: Dict[str, Any]) -> None:
+    """Record one ``user.order`` update; a terminal status wakes the order's waiters."""
+    order_id = str(order.get("order_id") or "")
+    if not order_id:
+        return
+    status = str(order.get("status") or "").upper()
+    with _lock:
+        entry = _entry(order_id, time.monotonic())
+        entry["order"].update({k: v for k, v in order.items() if v is not None})
+        _stats["order_updates"] += 1
+    if status in TERMINAL_STATUSES:
+        _wake(order_id)
+
+
+def publish_trade(trade: Dict[str, Any]) -> None:
+    """Aggregate one ``user.trade`` execution into its order (avg price fallback)."""
+    order_id = str(trade.get("order_id") or "")
+    qty = _decimal(trade.get("traded_quantity") or trade.get("quantity"))
+    if not order_id or qty is None:
+        return
+    price = _decimal(trade.get("traded_price") or trade.get("price"))
+    trade_id = str(trade.get("trade_id") or "")
+    with _lock:
+        entry = _entry(order_id, time.monotonic())
+        _stats["trade_updates"] += 1
+        if trade_id and trade_id in entry["trade_ids"]:
+            return
+        if trade_id:
+            entry["trade_ids"].add(trade_id)
+        entry["traded_qty"] += qty
+        if price is not None:
+            entry["traded_notional"] += qty * price
+
+
+# ------------------------------------------------------------------ lookups
+
+
+def _confirmation(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Same shape as ``_poll_order_fill_confirmation``; None unless terminal with quantity."""
+    order = entry["order"]
+    if str(order.get("status") or "").upper() not in TERMINAL_STATUSES:
+        return None
+    qty = _decimal(order.get("cumulative_quantity") or order.get("cumulative_qty")) or entry["traded_qty"]
+    if not qty or qty <= 0:
+        return None
+    avg_price = _decimal(order.get("avg_price") or order.get("avgPrice"))
+    if (avg_price is None or avg_price <= 0) and entry["traded_qty"] > 0 and entry["traded_notional"] > 0:
+        avg_price = entry["traded_notional"] / entry["traded_qty"]
+    price = float(avg_price) if avg_price else None
+    return {"status": "FILLED", "cumulative_quantity": qty, "avg_price": price, "filled_price": price, "source": "websocket"}
+
+
+def _lookup(order_id: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """(confirmation, terminal) for ``order_id`` from what has been pushed so far."""
+    with _lock:
+        entry = _entries.get(order_id)
+        if entry is None:
+            return None, False
+        terminal = str(entry["order"].get("status") or "").upper() in TERMINAL_STATUSES
+        return _confirmation(entry), terminal
+
+
+def get_order_update(order_id: str) -> Optional[Dict[str, Any]]:
+    """Latest pushed fields of ``order_id`` (None when nothing was pushed)."""
+    with _lock:
+        entry = _entries.get(str(order_id))
+        return dict(entry["order"]) if entry is not None else None
+
+
+def _finish(order_id: str, started: float, result: Optional[Dict[str, Any]], terminal: bool) -> Optional[Dict[str, Any]]:
+    wait_ms = round((time.perf_counter() - started) * 1000, 2)
+    with _lock:
+        _stats["last_wait_ms"] = wait_ms
+        _stats["total_wait_ms"] = round(_stats["total_wait_ms"] + wait_ms, 2)
+        if result is not None:
+            _stats["ws_confirmed"] += 1
+        elif terminal:
+            _stats["unfilled_terminal"] += 1
+        else:
+            _stats["timeouts"] += 1
+    if result is not None:
+        logger.info("[FILL_CONFIRMATION] order_id=%s confirmed via user.order push after %.0fms", order_id, wait_ms)
+    return result
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _begin(order_id: str) -> Tuple[Optional[Dict[str, Any]], bool, bool]:
+    """(confirmation, terminal, should_wait) before registering a waiter."""
+    result, terminal = _lookup(order_id)
+    if result is not None or terminal:
+        return result, terminal, False
+    if not is_stream_live():
+        _bump("not_live")
+        return None, False, False
+    return None, False, True
+
+
+def wait_for_order_fill(order_id: str, timeout: float = ORDER_FILL_WS_WAIT_SECONDS) -> Optional[Dict[str, Any]]:
+    """
+    Block the calling thread until ``order_id`` is pushed as filled, up to ``timeout``.
+
+    Returns the fill confirmation, or None (not live, not filled, timed out) so
+    the caller polls REST. On a thread running an event loop (the stream's own
+    included) only the registry is checked: blocking there would stall the loop
+    and could keep the push from ever arriving.
+    """
+    order_id = str(order_id)
+    result, terminal, should_wait = _begin(order_id)
+    if not should_wait or timeout <= 0 or threading.get_ident() == _stream["thread_id"] or _in_event_loop():
+        return result
+    started = time.perf_counter()
+    event = threading.Event()
+    with _lock:
+        _events.setdefault(order_id, []).append(event)
+    _bump("waits")
+    # Pushed between the lookup and the registration
+    result, terminal = _lookup(order_id)
+    if result is None and not terminal:
+        event.wait(timeout)
+        result, terminal = _lookup(order_id)
+    with _lock:
+        waiters = _events.get(order_id)
+        if waiters and event in waiters:
+            waiters.remove(event)
+            if not waiters:
+                _events.pop(order_id, None)
+    return _finish(order_id, started, result, terminal)
+
+
+async def wait_for_order_fill_async(order_id: str, timeout: float = ORDER_FILL_WS_WAIT_SECONDS) -> Optional[Dict[str, Any]]:
+    """Await the push of ``order_id`` as filled, up to ``timeout``; see ``wait_for_order_fill``."""
+    order_id = str(order_id)
+    result, terminal, should_wait = _begin(order_id)
+    if not should_wait or timeout <= 0:
+        return result
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    with _lock:
+        _futures.setdefault(order_id, []).append((loop, future))
+    _bump("waits")
+    try:
+        result, terminal = _lookup(order_id)
+        if result is None and not terminal:
+            try:
+                async with asyncio.timeout(timeout):
+                    await future
+            except TimeoutError:
+                pass
+            result, terminal = _lookup(order_id)
+    finally:
+        with _lock:
+            waiters = _futures.get(order_id)
+            if waiters:
+                waiters[:] = [w for w in waiters if w[1] is not future]
+                if not waiters:
+                    _futures.pop(order_id, None)
+    return _finish(order_id, started, result, terminal)
+
+
+# ------------------------------------------------------------------ stats
+
+
+def get_order_fill_stats() -> Dict[str, Any]:
+    with _lock:
+        stats = dict(_stats)
+        stats.update(
+            {
+                "enabled": fill_stream_enabled(),
+                "live": _stream["live"],
+                "live_since": _stream["since"],
+                "tracked_orders": len(_entries),
+                "pending_waiters": sum(len(v) for v in _events.values()) + sum(len(v) for v in _futures.values()),
+            }
+        )
+    waits = stats["ws_confirmed"] + stats["timeouts"] + stats["unfilled_terminal"]
+    stats["avg_wait_ms"] = round(stats["total_wait_ms"] / waits, 2) if waits else None
+    return stats
+
+
+def reset_order_fill_registry_for_tests() -> None:
+    with _lock:
+        _entries.clear()
+        _events.clear()
+        _futures.clear()
+        _stream.update({"live": False, "thread_id": None, "since": None})
+        _stats.update(dict.fromkeys(_COUNTERS, 0))
+        _stats.update({"last_wait_ms": None, "total_wait_ms": 0.0})
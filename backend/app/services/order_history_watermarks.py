@@ -0,0 +1,311 @@
+"""
+Order-history watermarks
+
+``ExchangeSyncService.sync_order_history`` used to rescan the last
+ORDER_HISTORY_RECENT_LOOKBACK_DAYS of every synced instrument on each
+background cycle (several windowed spot + advanced requests per instrument,
+paced by fixed sleeps) and regularly ran into ``order_history_timeout``. With a
+watermark row per instrument:
+
+- an instrument with a watermark is fetched from ``synced_through_ms`` minus
+  ORDER_HISTORY_WATERMARK_OVERLAP_MS (updates landing near the boundary) up to
+  now: one spot and one advanced request unless that window is full
+- an instrument without one gets the recent scan, which creates it
+- history is listed by create time, so a fill of an order placed before the
+  watermark never shows up in that window: an instrument with open orders in
+  exchange_orders (e.g. resting TP/SL legs) is fetched from its oldest open
+  order's create time instead, walking every window, until those orders close
+- each cycle, up to ORDER_HISTORY_DEEP_PER_CYCLE instruments whose last deep
+  scan is older than ORDER_HISTORY_DEEP_RECONCILE_HOURS get the full deep
+  rescan instead, for anything else the incremental windows cannot see (e.g.
+  an order the open-orders sync never recorded)
+- fetches run on up to ORDER_HISTORY_SYNC_CONCURRENCY threads; every request
+  takes a token from the shared rate limiter for its endpoint, and the upsert
+  stays on the caller's session
+- a watermark only advances after the orders of its window were committed
+
+Without the table (migration not applied) every instrument gets the recent
+scan, as before.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Session
+
+from app.models.exchange_order import ExchangeOrder, OrderStatusEnum
+from app.models.order_history_watermark import OrderHistoryWatermark
+from app.utils.rate_limiter import acquire_for_url
+
+logger = logging.getLogger(__name__)
+
+MODE_INCREMENTAL = "incremental"
+MODE_RECENT = "recent"
+MODE_DEEP = "deep"
+
+ORDER_HISTORY_WATERMARK_OVERLAP_MS = int(os.getenv("ORDER_HISTORY_WATERMARK_OVERLAP_MS", str(10 * 60 * 1000)))
+ORDER_HISTORY_DEEP_RECONCILE_HOURS = float(os.getenv("ORDER_HISTORY_DEEP_RECONCILE_HOURS", "24"))
+ORDER_HISTORY_DEEP_PER_CYCLE = int(os.getenv("ORDER_HISTORY_DEEP_PER_CYCLE", "1"))
+DEFAULT_REST_BASE = "https://api.crypto.com/exchange/v1"
+
+# Session.info key set by sync_order_history when its upsert rolled back
+HISTORY_ERROR_KEY = "order_history_sync_error"
+# Orders that can still fill; their instrument is rescanned from their create time
+OPEN_ORDER_STATUSES = (OrderStatusEnum.NEW, OrderStatusEnum.ACTIVE, OrderStatusEnum.PARTIALLY_FILLED)
+
+_lock = threading.Lock()
+_local = threading.local()
+_COUNTERS = (
+    "cycles",
+    "instruments",
+    "incremental",
+    "recent",
+    "deep",
+    "open_order_rescans",
+    "requests",
+    "rate_limit_waits",
+    "fetch_errors",
+    "partial_fetches",
+)
+_stats: Dict[str, Any] = dict.fromkeys(_COUNTERS, 0)
+_stats.update({"last_cycle_ms": None, "last_cycle_requests": None, "last_cycle": {}})
+_tables_ready: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+_orders_ready: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class HistorySyncPlan:
+    instrument_name: str
+    mode: str
+    since_ms: Optional[int] = None
+    # since_ms was pulled back to an open order: walk every window, no early stop
+    open_orders: bool = False
+
+
+def watermarks_enabled() -> bool:
+    return (os.getenv("ORDER_HISTORY_WATERMARKS_ENABLED", "true") or "true").strip().lower() in ("1", "true", "yes")
+
+
+def sync_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("ORDER_HISTORY_SYNC_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+def _bump(key: str, n: int = 1) -> None:
+    with _lock:
+        _stats[key] += n
+
+
+def get_order_history_sync_stats() -> Dict[str, Any]:
+    with _lock:
+        stats = dict(_stats)
+        stats["last_cycle"] = dict(_stats["last_cycle"])
+    return stats
+
+
+def reset_order_history_watermarks_for_tests() -> None:
+    with _lock:
+        _stats.update(dict.fromkeys(_COUNTERS, 0))
+        _stats.update({"last_cycle_ms": None, "last_cycle_requests": None, "last_cycle": {}})
+    _tables_ready.clear()
+    _orders_ready.clear()
+
+
+def _table_exists(db: Session) -> bool:
+    bind = db.get_bind()
+    ready = _tables_ready.get(bind)
+    if ready is None:
+        names = inspect(bind).get_table_names()
+        ready = OrderHistoryWatermark.__tablename__ in names
+        _tables_ready[bind] = ready
+        _orders_ready[bind] = ExchangeOrder.__tablename__ in names
+    return ready
+
+
+def _active(db: Session) -> bool:
+    try:
+        return watermarks_enabled() and _table_exists(db)
+    except Exception as e:
+        logger.debug("Order history watermarks unavailable: %s", e)
+        return False
+
+
+# ------------------------------------------------------------------ requests
+
+
+def acquire_history_request(trade_client: Any, method: str) -> float:
+    """Take a shared rate-limiter token for one history request; counted per thread and cycle."""
+    base = (getattr(trade_client, "base_url", "") or DEFAULT_REST_BASE).rstrip("/")
+    waited = acquire_for_url(f"{base}/{method}")
+    _local.requests = getattr(_local, "requests", 0) + 1
+    _bump("requests")
+    if waited > 0:
+        _bump("rate_limit_waits")
+    return waited
+
+
+def begin_request_count() -> None:
+    _local.requests = 0
+
+
+def request_count() -> int:
+    return getattr(_local, "requests", 0)
+
+
+# ------------------------------------------------------------------ planning
+
+
+def _epoch(value: Optional[datetime]) -> datetime:
+    if value is None:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _oldest_open_order_ms(db: Session, instruments: List[str]) -> Dict[str, int]:
+    """Create time (ms) of the oldest still-open order per instrument."""
+    if not instruments or not _orders_ready.get(db.get_bind()):
+        return {}
+    rows = (
+        db.query(
+            ExchangeOrder.symbol,
+            func.min(ExchangeOrder.exchange_create_time),
+            func.min(ExchangeOrder.created_at),
+        )
+        .filter(ExchangeOrder.symbol.in_(instruments), ExchangeOrder.status.in_(OPEN_ORDER_STATUSES))
+        .group_by(ExchangeOrder.symbol)
+        .all()
+    )
+    oldest: Dict[str, int] = {}
+    for symbol, create_time, created_at in rows:
+        times = [_epoch(t) for t in (create_time, created_at) if t is not None]
+        if times:
+            oldest[symbol.upper()] = int(min(times).timestamp() * 1000)
+    return oldest
+
+
+def plan_history_sync(
+    db: Session,
+    instruments: Iterable[str],
+    now: Optional[datetime] = None,
+) -> List[HistorySyncPlan]:
+    """
+    Fetch mode per instrument (order kept): incremental, recent (no watermark)
+    or deep. Incremental windows reach back to the instrument's oldest open order.
+    """
+    instruments = [i for i in dict.fromkeys(s.strip().upper() for s in instruments if s and s.strip())]
+    if not _active(db):
+        return [HistorySyncPlan(i, MODE_RECENT) for i in instruments]
+    now = now or datetime.now(timezone.utc)
+    rows = (
+        db.query(OrderHistoryWatermark)
+        .filter(OrderHistoryWatermark.instrument_name.in_(instruments))
+        .all()
+    ) if instruments else []
+    marks = {row.instrument_name: row for row in rows}
+    open_since = _oldest_open_order_ms(db, instruments)
+
+    cutoff = now - timedelta(hours=ORDER_HISTORY_DEEP_RECONCILE_HOURS)
+    due = [
+        i for i in instruments
+        if i in marks and _epoch(marks[i].last_deep_sync_at) <= cutoff
+    ]
+    due.sort(key=lambda i: _epoch(marks[i].last_deep_sync_at))
+    deep = set(due[: max(0, ORDER_HISTORY_DEEP_PER_CYCLE)])
+
+    plans: List[HistorySyncPlan] = []
+    for instrument in instruments:
+        mark = marks.get(instrument)
+        if instrument in deep:
+            plans.append(HistorySyncPlan(instrument, MODE_DEEP))
+        elif mark is None or mark.synced_through_ms is None:
+            plans.append(HistorySyncPlan(instrument, MODE_RECENT))
+        else:
+            since = max(0, int(mark.synced_through_ms) - ORDER_HISTORY_WATERMARK_OVERLAP_MS)
+            oldest_open = open_since.get(instrument)
+            if oldest_open is not None and oldest_open - ORDER_HISTORY_WATERMARK_OVERLAP_MS < since:
+                since = max(0, oldest_open - ORDER_HISTORY_WATERMARK_OVERLAP_MS)
+                plans.append(HistorySyncPlan(instrument, MODE_INCREMENTAL, since, open_orders=True))
+            else:
+                plans.append(HistorySyncPlan(instrument, MODE_INCREMENTAL, since))
+    return plans
+
+
+# ------------------------------------------------------------------ recording
+
+
+def _order_time_ms(order: Dict[str, Any]) -> Optional[int]:
+    for key in ("update_time", "create_time"):
+        try:
+            value = int(order.get(key) or 0)
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            return value
+    return None
+
+
+def record_history_sync(
+    db: Session,
+    plan: HistorySyncPlan,
+    orders: List[Dict[str, Any]],
+    through_ms: int,
+    fetch_ms: Optional[float] = None,
+) -> None:
+    """Advance the instrument's watermark after its whole window was read and stored (commits)."""
+    if not _active(db):
+        return
+    try:
+        mark = db.get(OrderHistoryWatermark, plan.instrument_name)
+        if mark is None:
+            mark = OrderHistoryWatermark(instrument_name=plan.instrument_name)
+            db.add(mark)
+        newest = max(
+            ((ms, str(o.get("order_id") or "")) for o in orders if (ms := _order_time_ms(o)) is not None),
+            default=None,
+        )
+        if newest is not None and (mark.last_update_time_ms is None or newest[0] >= mark.last_update_time_ms):
+            mark.last_update_time_ms, mark.last_order_id = newest
+        mark.synced_through_ms = max(int(mark.synced_through_ms or 0), int(through_ms))
+        now = datetime.now(timezone.utc)
+        mark.last_synced_at = now
+        if plan.mode == MODE_DEEP:
+            mark.last_deep_sync_at = now
+        mark.last_mode = plan.mode
+        mark.last_orders = len(orders)
+        mark.last_fetch_ms = round(fetch_ms, 1) if fetch_ms is not None else None
+        db.commit()
+    except Exception as e:
+        logger.warning("Order history watermark update failed instrument=%s: %s", plan.instrument_name, e)
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+
+def note_history_cycle(results: Dict[str, Dict[str, Any]], duration_ms: float) -> None:
+    """Record one cycle's per-instrument outcome (mode, orders, requests, fetch_ms, error, partial)."""
+    with _lock:
+        _stats["cycles"] += 1
+        _stats["instruments"] += len(results)
+        for entry in results.values():
+            mode = entry.get("mode")
+            if mode in (MODE_INCREMENTAL, MODE_RECENT, MODE_DEEP):
+                _stats[mode] += 1
+            if entry.get("open_orders"):
+                _stats["open_order_rescans"] += 1
+            if entry.get("error"):
+                _stats["fetch_errors"] += 1
+            if entry.get("partial"):
+                _stats["partial_fetches"] += 1
+        _stats["last_cycle_ms"] = round(duration_ms, 1)
+        _stats["last_cycle_requests"] = sum(int(e.get("requests") or 0) for e in results.values())
+        _stats["last_cycle"] = dict(results)
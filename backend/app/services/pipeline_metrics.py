@@ -0,0 +1,247 @@
+"""Trading pipeline stage metrics
+
+Latency and outcome of each stage of the signal → order → protection path,
+plus per-endpoint Crypto.com request latency and error codes, exported on
+``/metrics`` when prometheus_client is installed:
+
+- ``trading_pipeline_stage_seconds{stage,symbol,side}`` (histogram)
+- ``trading_pipeline_stage_total{stage,symbol,side,outcome}`` (counter)
+- ``crypto_com_request_seconds{endpoint}`` (histogram)
+- ``crypto_com_request_errors_total{endpoint,code}`` (counter)
+
+Label cardinality is bounded: stages are a fixed set, side is BUY/SELL/none,
+and only the first PIPELINE_METRICS_MAX_SYMBOLS symbols (and a fixed number of
+endpoints / error codes) get their own label value; the rest report as
+``other``. ``get_pipeline_stage_stats`` keeps an in-process summary per stage
+for diagnostics when Prometheus is not installed.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    "watchlist_fetch",
+    "market_data",
+    "signal_calc",
+    "throttle_check",
+    "order_placement",
+    "fill_confirmation",
+    "protection_creation",
+    "telegram_send",
+)
+STAGE_BUCKETS: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+EXCHANGE_BUCKETS: Sequence[float] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+OTHER = "other"
+
+_MAX_SYMBOLS = int(os.getenv("PIPELINE_METRICS_MAX_SYMBOLS", "50"))
+_MAX_ENDPOINTS = 64
+_MAX_CODES = 64
+
+try:
+    from prometheus_client import Counter, Histogram  # pyright: ignore[reportMissingImports]
+
+    _stage_seconds = Histogram(
+        "trading_pipeline_stage_seconds",
+        "Trading pipeline stage latency",
+        ["stage", "symbol", "side"],
+        buckets=STAGE_BUCKETS,
+    )
+    _stage_total = Counter(
+        "trading_pipeline_stage_total",
+        "Trading pipeline stage runs by outcome",
+        ["stage", "symbol", "side", "outcome"],
+    )
+    _exchange_seconds = Histogram(
+        "crypto_com_request_seconds",
+        "Crypto.com API request latency",
+        ["endpoint"],
+        buckets=EXCHANGE_BUCKETS,
+    )
+    _exchange_errors = Counter(
+        "crypto_com_request_errors_total",
+        "Crypto.com API requests that failed, by HTTP status or exchange code",
+        ["endpoint", "code"],
+    )
+except Exception:
+    _stage_seconds = None
+    _stage_total = None
+    _exchange_seconds = None
+    _exchange_errors = None
+
+_lock = threading.Lock()
+_symbols: Set[str] = set()
+_endpoints: Set[str] = set()
+_codes: Set[str] = set()
+_stage_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def _bounded(value: str, seen: Set[str], limit: int) -> str:
+    if value in seen:
+        return value
+    with _lock:
+        if value in seen:
+            return value
+        if len(seen) >= limit:
+            return OTHER
+        seen.add(value)
+        return value
+
+
+def _symbol_label(symbol: Optional[str]) -> str:
+    if not symbol:
+        return "none"
+    return _bounded(str(symbol).strip().upper(), _symbols, _MAX_SYMBOLS)
+
+
+def _side_label(side: Optional[str]) -> str:
+    side_upper = str(side or "").strip().upper()
+    return side_upper if side_upper in ("BUY", "SELL") else "none"
+
+
+def classify_outcome(result: Any) -> str:
+    """``error`` for False or an error dict, ``empty`` for None, otherwise ``ok``."""
+    if result is None:
+        return "empty"
+    if result is False:
+        return "error"
+    if isinstance(result, dict) and (result.get("error") or str(result.get("status") or "").lower() == "error"):
+        return "error"
+    return "ok"
+
+
+def observe_stage(
+    stage: str,
+    seconds: float,
+    symbol: Optional[str] = None,
+    side: Optional[str] = None,
+    outcome: str = "ok",
+) -> None:
+    if stage not in STAGES:
+        raise ValueError(f"unknown pipeline stage {stage!r}")
+    symbol_label = _symbol_label(symbol)
+    side_label = _side_label(side)
+    if _stage_seconds is not None and _stage_total is not None:
+        try:
+            _stage_seconds.labels(stage=stage, symbol=symbol_label, side=side_label).observe(seconds)
+            _stage_total.labels(stage=stage, symbol=symbol_label, side=side_label, outcome=outcome).inc()
+        except Exception as e:
+            logger.debug("pipeline metrics: observe failed for %s: %s", stage, e)
+    with _lock:
+        stats = _stage_stats.setdefault(stage, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "outcomes": {}})
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["outcomes"][outcome] = stats["outcomes"].get(outcome, 0) + 1
+
+
+@contextmanager
+def pipeline_stage(stage: str, symbol: Optional[str] = None, side: Optional[str] = None) -> Iterator[None]:
+    """Time the enclosed block as ``stage``; an exception counts as outcome ``error``."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - started, symbol, side, outcome)
+
+
+def instrument_stage(
+    stage: str,
+    symbol_arg: Optional[str] = "symbol",
+    side_arg: Optional[str] = "side",
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator form of ``pipeline_stage`` for sync and async functions. Symbol and
+    side labels are read from the named arguments; the outcome comes from
+    ``classify_outcome`` on the return value.
+    """
+    if stage not in STAGES:
+        raise ValueError(f"unknown pipeline stage {stage!r}")
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(fn)
+
+        def labels(args: tuple, kwargs: dict) -> tuple:
+            try:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+            except TypeError:
+                return None, None
+            return (bound.get(symbol_arg) if symbol_arg else None, bound.get(side_arg) if side_arg else None)
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await fn(*args, **kwargs)
+                    outcome = classify_outcome(result)
+                    return result
+                finally:
+                    observe_stage(stage, time.perf_counter() - started, *labels(args, kwargs), outcome=outcome)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = classify_outcome(result)
+                return result
+            finally:
+                observe_stage(stage, time.perf_counter() - started, *labels(args, kwargs), outcome=outcome)
+
+        return wrapper
+
+    return decorate
+
+
+def observe_exchange_request(endpoint: str, seconds: float, error_code: Optional[Any] = None) -> None:
+    """Record one Crypto.com request; ``error_code`` is the HTTP status or exchange code of a failure."""
+    endpoint_label = _bounded(endpoint or "unknown", _endpoints, _MAX_ENDPOINTS)
+    if _exchange_seconds is None or _exchange_errors is None:
+        return
+    try:
+        _exchange_seconds.labels(endpoint=endpoint_label).observe(seconds)
+        if error_code not in (None, 0, "0"):
+            code_label = _bounded(str(error_code), _codes, _MAX_CODES)
+            _exchange_errors.labels(endpoint=endpoint_label, code=code_label).inc()
+    except Exception as e:
+        logger.debug("pipeline metrics: exchange observe failed for %s: %s", endpoint, e)
+
+
+def get_pipeline_stage_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-stage count / avg / max seconds and outcome counts since start."""
+    with _lock:
+        return {
+            stage: {
+                "count": s["count"],
+                "avg_seconds": round(s["total_seconds"] / s["count"], 4) if s["count"] else 0.0,
+                "max_seconds": round(s["max_seconds"], 4),
+                "outcomes": dict(s["outcomes"]),
+            }
+            for stage, s in _stage_stats.items()
+        }
+
+
+def reset_pipeline_metrics_for_tests() -> None:
+    with _lock:
+        _symbols.clear()
+        _endpoints.clear()
+        _codes.clear()
+        _stage_stats.clear()
@@ -0,0 +1,508 @@
+"""
+Strategy preset parameter sweep
+
+Searches ``strategy_rules`` preset fields (``rsi.buyBelow``, ``volumeMinRatio``,
+``maChecks.ma200``, ...) with the backtest engine:
+
+- ``SearchSpace`` describes a grid (every combination) or a random sample of
+  dotted-path overrides; each candidate is applied to the preset's current
+  rules from trading_config.json
+- indicator series and candles are computed once per symbol in the parent
+  and packed into one ``multiprocessing.shared_memory`` block; pool workers
+  attach to it instead of receiving pickled series per task
+- candidates fan out over a ``ProcessPoolExecutor`` (one worker per core by
+  default), one task per (candidate, preset, risk mode) across all symbols
+- finished candidates are appended to a JSONL checkpoint; rerunning with the
+  same checkpoint skips them, so long sweeps can resume after a crash
+- ``rank_results`` orders candidates and ``build_preset_diff`` turns the best
+  one into a ``strategy_rules`` entry that ``config_loader.validate_preset``
+  accepts, plus the field-level changes against the current preset
+
+The preset's unmodified rules always run as the baseline candidate. Each
+candidate's throttle uses its own ``minPriceChangePct`` (the live monitor
+takes it from the coin's configured preset instead).
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field, replace
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.backtest_engine import (
+    DEFAULT_MIN_PRICE_CHANGE_PCT,
+    SERIES_KEYS,
+    BacktestConfig,
+    precompute_indicator_series,
+    run_symbol_backtest,
+)
+from app.services.config_loader import get_strategy_rules, load_config, validate_preset
+from app.services.strategy_profiles import RiskApproach, StrategyType
+
+logger = logging.getLogger(__name__)
+
+CANDLE_KEYS = ("t", "o", "h", "l", "c", "v")
+# Everything packed per symbol into the shared block, in this order
+PACKED_KEYS = CANDLE_KEYS + SERIES_KEYS + ("price",)
+OBJECTIVES = ("pnl_usd", "hit_rate", "pnl_per_drawdown")
+
+Preset = Tuple[StrategyType, RiskApproach]
+Overrides = Dict[str, Any]
+
+
+# ------------------------------------------------------------------ search space
+
+
+@dataclass
+class SearchSpace:
+    """
+    Dotted-path overrides to try. ``grid`` maps a path to the list of values
+    for a full cartesian product. ``random`` maps a path to a list of choices
+    or a ``{"min", "max", "step"}`` range; when it is set, ``samples``
+    candidates are drawn (grid lists count as choices) instead of the product.
+    """
+
+    grid: Dict[str, List[Any]] = field(default_factory=dict)
+    random: Dict[str, Any] = field(default_factory=dict)
+    samples: int = 100
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> "SearchSpace":
+        return cls(
+            grid=dict(raw.get("grid") or {}),
+            random=dict(raw.get("random") or {}),
+            samples=int(raw.get("samples", 100)),
+            seed=int(raw.get("seed", 0)),
+        )
+
+    def candidates(self) -> List[Overrides]:
+        if not self.random:
+            paths = sorted(self.grid)
+            return [dict(zip(paths, combo)) for combo in itertools.product(*(self.grid[p] for p in paths))]
+        rng = random.Random(self.seed)
+        choices = {path: list(values) for path, values in self.grid.items()}
+        choices.update(self.random)
+        out: List[Overrides] = []
+        seen = set()
+        for _ in range(self.samples * 20):
+            if len(out) >= self.samples:
+                break
+            candidate = {path: _draw(rng, spec) for path, spec in sorted(choices.items())}
+            key = json.dumps(candidate, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                out.append(candidate)
+        return out
+
+
+def _draw(rng: random.Random, spec: Any) -> Any:
+    if isinstance(spec, Mapping):
+        lo, hi, step = float(spec["min"]), float(spec["max"]), spec.get("step")
+        if step:
+            return round(lo + rng.randint(0, int(round((hi - lo) / float(step)))) * float(step), 6)
+        return round(rng.uniform(lo, hi), 4)
+    return rng.choice(list(spec))
+
+
+def _get_path(rules: Mapping[str, Any], path: str) -> Any:
+    node: Any = rules
+    for part in path.split("."):
+        if not isinstance(node, Mapping):
+            return None
+        node = node.get(part)
+    return node
+
+
+def apply_overrides(rules: Mapping[str, Any], overrides: Mapping[str, Any]) -> Dict[str, Any]:
+    """Copy of ``rules`` with each dotted path in ``overrides`` set."""
+    out = deepcopy(dict(rules))
+    for path, value in overrides.items():
+        node = out
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = {}
+                node[part] = child
+            node = child
+        node[parts[-1]] = value
+    return out
+
+
+# ------------------------------------------------------------------ shared series
+
+
+@dataclass(frozen=True)
+class SharedLayout:
+    """Where each symbol's arrays live in the shared block (picklable, sent once per worker)."""
+
+    shm_name: str
+    total: int
+    symbols: Tuple[Tuple[str, int, int], ...]  # (symbol, offset, length)
+
+
+class SharedSeries:
+    """
+    Candles and precomputed indicator series for every symbol, packed into
+    one float64 ``SharedMemory`` block shaped ``(len(PACKED_KEYS), total)``.
+    The parent creates and unlinks it; workers ``attach`` read-only views.
+    """
+
+    def __init__(self, layout: SharedLayout, shm: shared_memory.SharedMemory, owner: bool):
+        self.layout = layout
+        self._shm = shm
+        self._owner = owner
+        self._block = np.ndarray((len(PACKED_KEYS), layout.total), dtype=np.float64, buffer=shm.buf)
+        self._candles: Dict[str, List[Dict[str, float]]] = {}
+
+    @classmethod
+    def create(cls, candles_by_symbol: Mapping[str, Sequence[Mapping[str, Any]]]) -> "SharedSeries":
+        symbols, offset = [], 0
+        for symbol, candles in candles_by_symbol.items():
+            symbols.append((symbol, offset, len(candles)))
+            offset += len(candles)
+        total = max(offset, 1)
+        shm = shared_memory.SharedMemory(create=True, size=len(PACKED_KEYS) * total * 8)
+        shared = cls(SharedLayout(shm.name, total, tuple(symbols)), shm, owner=True)
+        rows = {key: i for i, key in enumerate(PACKED_KEYS)}
+        for symbol, start, length in symbols:
+            candles = candles_by_symbol[symbol]
+            series = precompute_indicator_series(candles)
+            cols = slice(start, start + length)
+            for key in CANDLE_KEYS:
+                shared._block[rows[key], cols] = [float(c.get(key, 0.0)) for c in candles]
+            for key in SERIES_KEYS + ("price",):
+                shared._block[rows[key], cols] = series[key]
+        return shared
+
+    @classmethod
+    def attach(cls, layout: SharedLayout) -> "SharedSeries":
+        return cls(layout, shared_memory.SharedMemory(name=layout.shm_name), owner=False)
+
+    @property
+    def symbols(self) -> List[str]:
+        return [symbol for symbol, _, _ in self.layout.symbols]
+
+    def _columns(self, symbol: str) -> slice:
+        for name, start, length in self.layout.symbols:
+            if name == symbol:
+                return slice(start, start + length)
+        raise KeyError(symbol)
+
+    def series(self, symbol: str) -> Dict[str, np.ndarray]:
+        cols = self._columns(symbol)
+        return {key: self._block[PACKED_KEYS.index(key), cols] for key in SERIES_KEYS + ("price",)}
+
+    def candles(self, symbol: str) -> List[Dict[str, float]]:
+        cached = self._candles.get(symbol)
+        if cached is None:
+            cols = self._columns(symbol)
+            columns = [self._block[PACKED_KEYS.index(key), cols].tolist() for key in CANDLE_KEYS]
+            cached = [dict(zip(CANDLE_KEYS, row)) for row in zip(*columns)]
+            for candle in cached:
+                candle["t"] = int(candle["t"])
+            self._candles[symbol] = cached
+        return cached
+
+    def close(self) -> None:
+        self._block = None  # release the buffer export before closing
+        self._candles.clear()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+_worker_series: Optional[SharedSeries] = None
+
+
+def _init_worker(layout: SharedLayout) -> None:
+    global _worker_series
+    _worker_series = SharedSeries.attach(layout)
+
+
+# ------------------------------------------------------------------ evaluation
+
+
+@dataclass
+class SweepResult:
+    preset: str
+    risk_mode: str
+    overrides: Overrides
+    symbols: int = 0
+    trades: int = 0
+    closed_trades: int = 0
+    wins: int = 0
+    pnl_usd: float = 0.0
+    worst_drawdown_pct: float = 0.0
+    elapsed_seconds: float = 0.0
+    score: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        return candidate_key(self.preset, self.risk_mode, self.overrides)
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        return self.wins / self.closed_trades if self.closed_trades else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out["hit_rate"] = round(self.hit_rate, 4) if self.hit_rate is not None else None
+        out["pnl_usd"] = round(self.pnl_usd, 4)
+        out["worst_drawdown_pct"] = round(self.worst_drawdown_pct, 4)
+        out["elapsed_seconds"] = round(self.elapsed_seconds, 4)
+        return out
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> "SweepResult":
+        names = {f for f in cls.__dataclass_fields__}
+        return cls(**{k: v for k, v in raw.items() if k in names})
+
+
+def candidate_key(preset: str, risk_mode: str, overrides: Mapping[str, Any]) -> str:
+    payload = json.dumps([preset, risk_mode, sorted(overrides.items())], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _evaluate(
+    shared: SharedSeries, preset: str, risk_mode: str, rules: Dict[str, Any], overrides: Overrides, config: BacktestConfig
+) -> SweepResult:
+    started = time.perf_counter()
+    strategy_type, risk_approach = StrategyType(preset), RiskApproach(risk_mode.lower())
+    min_pct = rules.get("minPriceChangePct")
+    if config.min_price_change_pct is None:
+        config = replace(
+            config, min_price_change_pct=float(min_pct) if min_pct is not None else DEFAULT_MIN_PRICE_CHANGE_PCT
+        )
+    result = SweepResult(preset=preset, risk_mode=risk_mode, overrides=dict(overrides))
+    for symbol in shared.symbols:
+        run = run_symbol_backtest(
+            symbol,
+            shared.candles(symbol),
+            strategy_type,
+            risk_approach,
+            config,
+            rules=rules,
+            series=shared.series(symbol),
+        )
+        closed = run.closed_trades
+        result.symbols += 1
+        result.trades += len(run.trades)
+        result.closed_trades += len(closed)
+        result.wins += sum(1 for t in closed if t.pnl_usd > 0)
+        result.pnl_usd += run.pnl_usd
+        result.worst_drawdown_pct = max(result.worst_drawdown_pct, run.max_drawdown_pct)
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def _evaluate_in_worker(
+    preset: str, risk_mode: str, rules: Dict[str, Any], overrides: Overrides, config: BacktestConfig
+) -> SweepResult:
+    if _worker_series is None:
+        raise RuntimeError("sweep worker started without shared series")
+    return _evaluate(_worker_series, preset, risk_mode, rules, overrides, config)
+
+
+# ------------------------------------------------------------------ checkpoint
+
+
+def dataset_fingerprint(candles_by_symbol: Mapping[str, Sequence[Mapping[str, Any]]], config: BacktestConfig) -> str:
+    """Identifies the candles and backtest settings a checkpoint belongs to."""
+    parts = [asdict(config)]
+    for symbol in sorted(candles_by_symbol):
+        candles = candles_by_symbol[symbol]
+        edge = (candles[0]["t"], candles[-1]["t"], candles[-1]["c"]) if candles else None
+        parts.append([symbol, len(candles), edge])
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def load_checkpoint(path: Path, fingerprint: str) -> Dict[str, SweepResult]:
+    """Completed candidates from ``path``; empty when it does not exist yet."""
+    if not path.exists():
+        return {}
+    done: Dict[str, SweepResult] = {}
+    with path.open() as fh:
+        for lineno, line in enumerate(fh):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                logger.warning("[SWEEP] Ignoring truncated checkpoint line %d in %s", lineno + 1, path)
+                continue
+            if lineno == 0:
+                if row.get("fingerprint") != fingerprint:
+                    raise ValueError(f"Checkpoint {path} was written for a different dataset or config")
+                continue
+            result = SweepResult.from_dict(row)
+            done[result.key] = result
+    return done
+
+
+class _CheckpointWriter:
+    def __init__(self, path: Optional[Path], fingerprint: str):
+        self._fh = None
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not path.exists() or path.stat().st_size == 0
+        self._fh = path.open("a")
+        if fresh:
+            self._write({"fingerprint": fingerprint})
+
+    def _write(self, row: Mapping[str, Any]) -> None:
+        self._fh.write(json.dumps(row, default=str) + "\n")
+        self._fh.flush()
+
+    def append(self, result: SweepResult) -> None:
+        if self._fh is not None:
+            self._write(asdict(result))  # unrounded, so resumed results rank exactly like fresh ones
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+
+# ------------------------------------------------------------------ sweep
+
+
+def _base_rules(preset: str, risk_mode: str) -> Dict[str, Any]:
+    return deepcopy(get_strategy_rules(preset, risk_mode))
+
+
+def run_sweep(
+    candles_by_symbol: Mapping[str, Sequence[Mapping[str, Any]]],
+    presets: Iterable[Preset],
+    space: SearchSpace,
+    config: BacktestConfig = BacktestConfig(),
+    workers: Optional[int] = None,
+    checkpoint: Optional[Path] = None,
+    base_rules: Optional[Mapping[Preset, Dict[str, Any]]] = None,
+    progress: Optional[Callable[[int, int, SweepResult], None]] = None,
+) -> List[SweepResult]:
+    """
+    Backtest every candidate in ``space`` (plus the baseline) for each preset
+    across all symbols. ``workers`` defaults to ``os.cpu_count()``; ``1`` runs
+    in-process. Results already in ``checkpoint`` are reused, new ones are
+    appended as they finish. Returns results in no particular order.
+    """
+    config = replace(config, fast=True)
+    candidates = space.candidates()
+    fingerprint = dataset_fingerprint(candles_by_symbol, config)
+    done = load_checkpoint(Path(checkpoint), fingerprint) if checkpoint else {}
+
+    tasks: List[Tuple[str, str, Dict[str, Any], Overrides]] = []
+    results: List[SweepResult] = []
+    for strategy_type, risk_approach in presets:
+        preset, risk_mode = strategy_type.value, risk_approach.value.capitalize()
+        rules = (base_rules or {}).get((strategy_type, risk_approach)) or _base_rules(preset, risk_mode)
+        for overrides in [{}] + [c for c in candidates if c]:
+            key = candidate_key(preset, risk_mode, overrides)
+            if key in done:
+                results.append(done[key])
+                continue
+            tasks.append((preset, risk_mode, apply_overrides(rules, overrides), overrides))
+    logger.info(
+        "[SWEEP] %d candidates x %d symbols: %d to run, %d from checkpoint",
+        len(tasks) + len(results), len(candles_by_symbol), len(tasks), len(results),
+    )
+    if not tasks:
+        return results
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    writer = _CheckpointWriter(Path(checkpoint) if checkpoint else None, fingerprint)
+    shared = SharedSeries.create(candles_by_symbol)
+    try:
+        if workers == 1:
+            for i, (preset, risk_mode, rules, overrides) in enumerate(tasks):
+                result = _evaluate(shared, preset, risk_mode, rules, overrides, config)
+                writer.append(result)
+                results.append(result)
+                if progress:
+                    progress(i + 1, len(tasks), result)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.layout,)) as pool:
+                futures = [pool.submit(_evaluate_in_worker, *task, config) for task in tasks]
+                for i, future in enumerate(as_completed(futures)):
+                    result = future.result()
+                    writer.append(result)
+                    results.append(result)
+                    if progress:
+                        progress(i + 1, len(tasks), result)
+    finally:
+        writer.close()
+        shared.close()
+    return results
+
+
+def _score(result: SweepResult, objective: str) -> float:
+    if objective == "hit_rate":
+        return result.hit_rate or 0.0
+    if objective == "pnl_per_drawdown":
+        return result.pnl_usd / (1.0 + result.worst_drawdown_pct)
+    return result.pnl_usd
+
+
+def rank_results(
+    results: Iterable[SweepResult], objective: str = "pnl_usd", min_trades: int = 10
+) -> List[SweepResult]:
+    """Best first by ``objective``; candidates with fewer than ``min_trades`` trades are dropped."""
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    ranked = [r for r in results if r.trades >= min_trades]
+    for r in ranked:
+        r.score = round(_score(r, objective), 6)
+    ranked.sort(key=lambda r: (r.score, r.pnl_usd), reverse=True)
+    return ranked
+
+
+def build_preset_diff(
+    best: SweepResult,
+    results: Iterable[SweepResult] = (),
+    strategy_rules: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Candidate ``strategy_rules[preset]`` entry with ``best``'s overrides
+    applied, the changed fields (from/to), and best vs. baseline metrics.
+    Raises ValueError if the candidate fails ``validate_preset``.
+    """
+    if strategy_rules is None:
+        strategy_rules = load_config().get("strategy_rules", {})
+    current = deepcopy(strategy_rules.get(best.preset) or {"rules": {}})
+    current.setdefault("rules", {})
+    current_rules = current["rules"].get(best.risk_mode) or _base_rules(best.preset, best.risk_mode)
+    changes = {
+        path: {"from": _get_path(current_rules, path), "to": value}
+        for path, value in sorted(best.overrides.items())
+        if _get_path(current_rules, path) != value
+    }
+    current["rules"][best.risk_mode] = apply_overrides(current_rules, best.overrides)
+    ok, msg = validate_preset(current)
+    if not ok:
+        raise ValueError(f"Candidate preset {best.preset}/{best.risk_mode} is invalid: {msg}")
+    baseline = next(
+        (r for r in results if r.preset == best.preset and r.risk_mode == best.risk_mode and not r.overrides),
+        None,
+    )
+    return {
+        "preset": best.preset,
+        "risk_mode": best.risk_mode,
+        "changes": changes,
+        "candidate": current,
+        "metrics": best.to_dict(),
+        "baseline_metrics": baseline.to_dict() if baseline else None,
+    }
@@ -2,15 +2,33 @@
 Real-time price stream for dashboard WebSocket.
 
 Maintains an in-memory cache of symbol -> price from Crypto.com get-tickers,
-and broadcasts updates to all connected WebSocket clients at a configurable interval.
+and pushes updates to connected WebSocket clients at a configurable interval.
 Uses the existing portfolio_cache.get_crypto_prices() so egress and logic stay centralized.
+
+When the market-data WebSocket is running (ENABLE_MARKET_WS), its fresh ticker
+prices are overlaid on the REST snapshot and pushed as they arrive (at most
+every PRICE_STREAM_PUSH_MIN_INTERVAL_S) instead of waiting for the next poll.
+
+Each connection subscribes to a set of base symbols (all by default) and gets:
+- a keyframe ``{"type": "snapshot", "prices": {...}, "ts", "source", "seq"}``
+  on connect, on subscription changes and every PRICE_STREAM_KEYFRAME_S
+- in between, deltas ``{"type": "delta", "changed": {...}, "removed": [...], "ts", "seq"}``
+  with only the subscribed prices that changed
+
+``_broadcast`` only records the changes on the interested clients (a symbol ->
+clients index), so its cost is changes x interested clients. Every client has
+its own sender task: pending price changes coalesce per symbol while a send is
+in flight, control messages sit in a bounded queue (oldest dropped), and a
+client whose send takes longer than PRICE_STREAM_SEND_TIMEOUT_S is disconnected
+instead of holding up the others.
 """
 
 import asyncio
 import logging
 import os
 import time
-from typing import Dict, Set, Any
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -18,20 +36,115 @@ logger = logging.getLogger(__name__)
 PRICE_STREAM_INTERVAL_S = int(os.getenv("PRICE_STREAM_INTERVAL_S", "10"))
 # Set to "false" to disable the price stream (no background task, WS still accepts connections but may have stale/empty snapshot)
 ENABLE_PRICE_STREAM = os.getenv("ENABLE_WS_PRICES", "true").lower() in ("true", "1", "yes")
+# Minimum spacing (seconds) between pushes triggered by live WebSocket ticks
+PRICE_STREAM_PUSH_MIN_INTERVAL_S = float(os.getenv("PRICE_STREAM_PUSH_MIN_INTERVAL_S", "0.5"))
+# Full snapshot to every client at least this often (seconds), so a missed delta heals
+PRICE_STREAM_KEYFRAME_S = float(os.getenv("PRICE_STREAM_KEYFRAME_S", "60"))
+# Control messages (pong/keepalive) queued per connection before the oldest is dropped
+PRICE_STREAM_QUEUE_SIZE = int(os.getenv("PRICE_STREAM_QUEUE_SIZE", "16"))
+# A single send slower than this disconnects the client
+PRICE_STREAM_SEND_TIMEOUT_S = float(os.getenv("PRICE_STREAM_SEND_TIMEOUT_S", "10"))
 
 
 # In-memory cache: symbol -> price (e.g. {"BTC": 45000.0, "ETH": 2400.0})
 _cache: Dict[str, float] = {}
 _cache_ts: float = 0
-_subscribers: Set[Any] = set()
-_lock = asyncio.Lock()
 _task: asyncio.Task | None = None
+_wake: asyncio.Event | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+_STAT_KEYS = ("keyframes", "deltas", "controls", "coalesced", "controls_dropped", "clients_dropped", "send_errors")
+_stats: Dict[str, int] = dict.fromkeys(_STAT_KEYS, 0)
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Base symbol the cache is keyed by (BTC_USDT / btc -> BTC)."""
+    return (symbol or "").strip().upper().split("_")[0]
+
+
+class _Client:
+    """One connection: its subscription, pending changes and sender task."""
+
+    def __init__(self, ws: Any, symbols: Optional[Set[str]]):
+        self.ws = ws
+        self.symbols = symbols  # None = every symbol
+        self.changed: Dict[str, float] = {}
+        self.removed: Set[str] = set()
+        self.controls: Deque[Dict[str, Any]] = deque()
+        self.needs_keyframe = True
+        self.last_keyframe = 0.0
+        self.seq = 0
+        self.wake = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def wants(self, symbol: str) -> bool:
+        return self.symbols is None or symbol in self.symbols
+
+    def push_changes(self, changed: Dict[str, float], removed: Iterable[str]) -> None:
+        if self.needs_keyframe:
+            return  # the keyframe will carry them
+        if self.changed or self.removed:
+            _stats["coalesced"] += 1
+        for symbol, price in changed.items():
+            self.changed[symbol] = price
+            self.removed.discard(symbol)
+        for symbol in removed:
+            self.changed.pop(symbol, None)
+            self.removed.add(symbol)
+        self.wake.set()
+
+    def push_control(self, message: Dict[str, Any]) -> None:
+        if len(self.controls) >= PRICE_STREAM_QUEUE_SIZE:
+            self.controls.popleft()
+            _stats["controls_dropped"] += 1
+        self.controls.append(message)
+        self.wake.set()
+
+    def request_keyframe(self) -> None:
+        self.needs_keyframe = True
+        self.changed.clear()
+        self.removed.clear()
+        self.wake.set()
+
+    def next_message(self) -> Optional[Dict[str, Any]]:
+        if self.controls:
+            _stats["controls"] += 1
+            return self.controls.popleft()
+        if self.needs_keyframe:
+            self.needs_keyframe = False
+            self.last_keyframe = time.monotonic()
+            self.seq += 1
+            _stats["keyframes"] += 1
+            return {"type": "snapshot", **get_snapshot(self.symbols), "seq": self.seq}
+        if self.changed or self.removed:
+            message = {
+                "type": "delta",
+                "changed": self.changed,
+                "removed": sorted(self.removed),
+                "ts": _cache_ts,
+                "seq": self.seq + 1,
+            }
+            self.seq += 1
+            self.changed, self.removed = {}, set()
+            _stats["deltas"] += 1
+            return message
+        return None
+
 
+_clients: Dict[Any, _Client] = {}
+# symbol -> clients subscribed to it by name; _wildcard clients get everything
+_by_symbol: Dict[str, Set[_Client]] = {}
+_wildcard: Set[_Client] = set()
 
-def get_snapshot() -> Dict[str, Any]:
-    """Return current cache as a JSON-serializable snapshot for new WS clients."""
+
+def get_snapshot(symbols: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Return current cache (optionally only ``symbols``) as a JSON-serializable snapshot."""
+    if symbols is None:
+        prices = dict(_cache)
+    else:
+        prices = {symbol: _cache[symbol] for symbol in symbols if symbol in _cache}
     return {
-        "prices": dict(_cache),
+        "prices": prices,
         "ts": _cache_ts,
         "source": "crypto_com",
     }
@@ -44,49 +157,162 @@ async def _fetch_prices() -> Dict[str, float]:
     return await loop.run_in_executor(None, get_crypto_prices)
 
 
-async def _broadcast(payload: Dict[str, Any]) -> None:
-    """Send payload to all connected WebSocket clients; remove dead connections."""
-    global _subscribers
-    dead = set()
-    async with _lock:
-        for ws in _subscribers:
+def _index(client: _Client) -> None:
+    if client.symbols is None:
+        _wildcard.add(client)
+        return
+    for symbol in client.symbols:
+        _by_symbol.setdefault(symbol, set()).add(client)
+
+
+def _unindex(client: _Client) -> None:
+    _wildcard.discard(client)
+    for symbol in client.symbols or ():
+        interested = _by_symbol.get(symbol)
+        if interested is not None:
+            interested.discard(client)
+            if not interested:
+                del _by_symbol[symbol]
+
+
+def _broadcast(changed: Dict[str, float], removed: Iterable[str] = ()) -> int:
+    """Queue changed/removed prices on the clients subscribed to them; returns clients woken."""
+    removed = list(removed)
+    interested: Set[_Client] = set()
+    for symbol in list(changed) + removed:
+        interested.update(_by_symbol.get(symbol, ()))
+    for client in interested:
+        client.push_changes(
+            {s: p for s, p in changed.items() if s in client.symbols},
+            [s for s in removed if s in client.symbols],
+        )
+    for client in _wildcard:
+        client.push_changes(changed, removed)
+    return len(interested) + len(_wildcard)
+
+
+def _schedule_keyframes() -> None:
+    due = time.monotonic() - PRICE_STREAM_KEYFRAME_S
+    for client in _clients.values():
+        if not client.needs_keyframe and client.last_keyframe <= due:
+            client.request_keyframe()
+
+
+async def _drop(client: _Client) -> None:
+    if _clients.get(client.ws) is client:
+        del _clients[client.ws]
+        _unindex(client)
+    try:
+        await client.ws.close()
+    except Exception:
+        pass
+
+
+async def _sender(client: _Client) -> None:
+    """Drain one client's queue; a failed or too-slow send disconnects only that client."""
+    while True:
+        await client.wake.wait()
+        client.wake.clear()
+        while True:
+            message = client.next_message()
+            if message is None:
+                break
             try:
-                await ws.send_json(payload)
+                async with asyncio.timeout(PRICE_STREAM_SEND_TIMEOUT_S):
+                    await client.ws.send_json(message)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.debug("Price stream: client send failed, dropping: %s", e)
-                dead.add(ws)
-        for ws in dead:
-            _subscribers.discard(ws)
+                _stats["send_errors"] += 1
+                _stats["clients_dropped"] += 1
+                await _drop(client)
+                return
+
+
+def _live_prices() -> Dict[str, float]:
+    """Fresh market-WS prices keyed like get_crypto_prices() (BTC_USDT -> BTC)."""
+    from app.services.market_data_cache import market_data_cache
+    return {
+        symbol[: -len("_USDT")]: price
+        for symbol, price in market_data_cache.prices().items()
+        if symbol.endswith("_USDT")
+    }
+
+
+def _on_live_ticker(ticker: Any) -> None:
+    if _wake is not None and _loop is not None and ticker.symbol.endswith("_USDT"):
+        _loop.call_soon_threadsafe(_wake.set)
+
+
+def _apply_prices(polled: Optional[Dict[str, float]], live: Dict[str, float]) -> tuple:
+    """Update the cache from a full poll (if any) and live ticks; return (changed, removed)."""
+    changed: Dict[str, float] = {}
+    removed: List[str] = []
+    if polled:
+        removed = [symbol for symbol in _cache if symbol not in polled and symbol not in live]
+        for symbol in removed:
+            del _cache[symbol]
+        for symbol, price in polled.items():
+            if _cache.get(symbol) != price:
+                _cache[symbol] = price
+                changed[symbol] = price
+    for symbol, price in live.items():
+        if _cache.get(symbol) != price:
+            _cache[symbol] = price
+            changed[symbol] = price
+    return changed, removed
 
 
 async def _run_loop() -> None:
-    """Background task: fetch prices periodically and broadcast to subscribers."""
-    global _cache, _cache_ts
+    """Background task: fetch prices periodically and push changes to subscribers."""
+    global _cache_ts, _wake
+    if _wake is None:
+        _wake = asyncio.Event()
+    next_poll = 0.0
     while True:
         try:
-            prices = await _fetch_prices()
-            if prices:
-                _cache.clear()
-                _cache.update(prices)
+            polled = None
+            if time.monotonic() >= next_poll:
+                next_poll = time.monotonic() + PRICE_STREAM_INTERVAL_S
+                polled = await _fetch_prices()
+            live = _live_prices()
+            changed, removed = _apply_prices(polled, live)
+            if changed or removed:
                 _cache_ts = time.time()
-                snapshot = get_snapshot()
-                await _broadcast(snapshot)
-                logger.debug("Price stream: updated %d symbols", len(prices))
+                woken = _broadcast(changed, removed)
+                logger.debug(
+                    "Price stream: %d changed, %d removed of %d symbols (%d live), %d clients",
+                    len(changed), len(removed), len(_cache), len(live), woken,
+                )
+            _schedule_keyframes()
         except asyncio.CancelledError:
             break
         except Exception as e:
             logger.warning("Price stream fetch failed: %s", e)
-        await asyncio.sleep(PRICE_STREAM_INTERVAL_S)
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=max(0.0, next_poll - time.monotonic()))
+            _wake.clear()
+            await asyncio.sleep(PRICE_STREAM_PUSH_MIN_INTERVAL_S)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            break
 
 
 def start_price_stream() -> None:
     """Start the background price-fetch loop if enabled and not already running."""
-    global _task
+    global _task, _wake, _loop
     if not ENABLE_PRICE_STREAM:
         logger.info("Price stream disabled (ENABLE_WS_PRICES=false)")
         return
     if _task is not None and not _task.done():
         return
+    from app.services.market_data_cache import market_data_cache
+    _wake = asyncio.Event()
+    _loop = asyncio.get_running_loop()
+    market_data_cache.remove_listener(_on_live_ticker)
+    market_data_cache.add_listener(_on_live_ticker)
     _task = asyncio.create_task(_run_loop())
     logger.info("Price stream started (interval=%ss)", PRICE_STREAM_INTERVAL_S)
 
@@ -100,20 +326,100 @@ def stop_price_stream() -> None:
         logger.info("Price stream stopped")
 
 
-async def subscribe(ws: Any) -> None:
-    """Register a WebSocket for price updates and send current snapshot."""
-    async with _lock:
-        _subscribers.add(ws)
-    snapshot = get_snapshot()
-    try:
-        await ws.send_json(snapshot)
-    except Exception as e:
-        logger.debug("Price stream: initial send failed: %s", e)
-        async with _lock:
-            _subscribers.discard(ws)
+def _parse_symbols(symbols: Any) -> Optional[Set[str]]:
+    """``None``/``"*"`` -> every symbol, else a set of base symbols (list or comma-separated)."""
+    if symbols is None or symbols == "*" or (isinstance(symbols, (list, tuple)) and "*" in symbols):
+        return None
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    return {normalize_symbol(str(symbol)) for symbol in symbols if normalize_symbol(str(symbol))}
+
+
+async def subscribe(ws: Any, symbols: Any = None) -> None:
+    """Register a WebSocket for price updates (``symbols`` or everything); a keyframe is sent first."""
+    await unsubscribe(ws)
+    client = _Client(ws, _parse_symbols(symbols))
+    _clients[ws] = client
+    _index(client)
+    client.task = asyncio.create_task(_sender(client))
+    client.wake.set()
+
+
+def set_symbols(ws: Any, symbols: Any, mode: str = "replace") -> Optional[Set[str]]:
+    """
+    Change a connection's subscription (``mode`` replace/add/remove) and send it
+    a fresh keyframe. Returns the new set (None = every symbol).
+    """
+    client = _clients.get(ws)
+    if client is None:
+        return None
+    parsed = _parse_symbols(symbols)
+    if mode == "add":
+        new = None if parsed is None or client.symbols is None else client.symbols | parsed
+    elif mode == "remove":
+        if parsed is None:
+            new = set()
+        elif client.symbols is None:
+            new = set(_cache) - parsed
+        else:
+            new = client.symbols - parsed
+    else:
+        new = parsed
+    _unindex(client)
+    client.symbols = new
+    _index(client)
+    client.request_keyframe()
+    return new
+
+
+def send_control(ws: Any, message: Dict[str, Any]) -> bool:
+    """Queue a small control message (pong, keepalive, ack) behind the connection's sender."""
+    client = _clients.get(ws)
+    if client is None:
+        return False
+    client.push_control(message)
+    return True
+
+
+def request_keyframe(ws: Any) -> None:
+    client = _clients.get(ws)
+    if client is not None:
+        client.request_keyframe()
 
 
 async def unsubscribe(ws: Any) -> None:
-    """Remove a WebSocket from subscribers."""
-    async with _lock:
-        _subscribers.discard(ws)
+    """Remove a WebSocket from subscribers and stop its sender."""
+    client = _clients.pop(ws, None)
+    if client is None:
+        return
+    _unindex(client)
+    if client.task is not None and not client.task.done() and client.task is not asyncio.current_task():
+        client.task.cancel()
+        try:
+            await client.task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+def get_price_stream_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "clients": len(_clients),
+        "wildcard_clients": len(_wildcard),
+        "indexed_symbols": len(_by_symbol),
+        "pending_clients": sum(1 for c in _clients.values() if c.changed or c.removed or c.controls),
+        "symbols": len(_cache),
+    }
+
+
+def reset_price_stream_for_tests() -> None:
+    global _cache_ts
+    for client in list(_clients.values()):
+        if client.task is not None and not client.task.get_loop().is_closed():
+            client.task.cancel()
+    _clients.clear()
+    _by_symbol.clear()
+    _wildcard.clear()
+    _cache.clear()
+    _cache_ts = 0
+    _stats.update(dict.fromkeys(_STAT_KEYS, 0))
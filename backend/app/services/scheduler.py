@@ -913,22 +913,25 @@ class TradingScheduler:
                 await asyncio.sleep(120)
     
     async def update_dashboard_snapshot(self):
-        """Update dashboard snapshot cache periodically (every 60 seconds)"""
+        """Update dashboard snapshot cache periodically (every 60 seconds; sections check every few seconds)"""
         try:
             from app.services.dashboard_snapshot import update_dashboard_snapshot
+            from app.services.dashboard_sections import TICK_SECONDS, sections_enabled
             
             if not hasattr(self, '_last_snapshot_update'):
                 self._last_snapshot_update = 0
             
+            # Sections recompute only when their inputs change, so they can be checked often
+            interval = TICK_SECONDS if sections_enabled() else 60
             now = time.time()
-            if now - self._last_snapshot_update >= 60:  # Update every 60 seconds
-                logger.info("[SCHEDULER] 📸 Updating dashboard snapshot...")
+            if now - self._last_snapshot_update >= interval:
+                logger.debug("[SCHEDULER] 📸 Updating dashboard snapshot...")
                 # update_dashboard_snapshot is now async, so we await it directly
                 # Database operations will run in thread pool executor if needed
                 result = await update_dashboard_snapshot()
                 if result.get("success"):
                     self._last_snapshot_update = time.time()
-                    logger.info(f"[SCHEDULER] ✅ Dashboard snapshot updated in {result.get('duration_seconds', 0):.2f}s")
+                    logger.debug(f"[SCHEDULER] ✅ Dashboard snapshot updated in {result.get('duration_seconds', 0):.2f}s")
                     # Record successful execution (no report file for snapshot workflow)
                     from app.api.routes_monitoring import record_workflow_execution
                     record_workflow_execution("dashboard_snapshot", "success", None)
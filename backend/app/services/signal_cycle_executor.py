@@ -0,0 +1,247 @@
+"""Signal cycle executor
+
+Runs the per-symbol signal evaluations of one monitor cycle concurrently on a
+bounded pool of worker threads, so cycle time follows the slowest symbol
+instead of the sum of all symbols.
+
+- ``SIGNAL_MONITOR_CONCURRENCY`` bounds how many symbols are evaluated at once
+  (``1`` restores the previous serial behaviour).
+- ``SymbolGate`` guarantees a gate key is never evaluated twice at the same
+  time (e.g. a previous cycle that outlived its timeout is still running): the
+  new evaluation is skipped instead of racing the old one. The signal monitor
+  keys it by base currency, so pairs sharing a base (BTC_USD, BTC_USDT) run one
+  after another and cannot both pass the per-base open-order cap. Order
+  placement is also claimed per (base, side) by ``_try_claim_order_slot``.
+- Per-symbol latency goes to an in-process histogram (``get_symbol_latency_stats``)
+  and, when prometheus_client is installed, to
+  ``signal_monitor_symbol_eval_seconds{symbol}``.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS: Sequence[float] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+try:
+    from prometheus_client import Histogram  # pyright: ignore[reportMissingImports]
+
+    _symbol_eval_seconds = Histogram(
+        "signal_monitor_symbol_eval_seconds",
+        "Signal monitor per-symbol evaluation latency",
+        ["symbol"],
+        buckets=LATENCY_BUCKETS,
+    )
+except Exception:
+    _symbol_eval_seconds = None
+
+
+def signal_monitor_concurrency() -> int:
+    """Worker count for per-symbol evaluation (SIGNAL_MONITOR_CONCURRENCY, default 4)."""
+    try:
+        return max(1, int(os.getenv("SIGNAL_MONITOR_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+@dataclass
+class _LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+    last: float = 0.0
+    max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{b:g}": c for b, c in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_seconds": round(self.total / self.count, 4) if self.count else 0.0,
+            "last_seconds": round(self.last, 4),
+            "max_seconds": round(self.max, 4),
+            "buckets": buckets,
+        }
+
+
+_latency_lock = threading.Lock()
+_latency: Dict[str, _LatencyHistogram] = {}
+
+
+def observe_symbol_latency(symbol: str, seconds: float) -> None:
+    with _latency_lock:
+        _latency.setdefault(symbol, _LatencyHistogram()).observe(seconds)
+    if _symbol_eval_seconds is not None:
+        try:
+            _symbol_eval_seconds.labels(symbol=symbol).observe(seconds)
+        except Exception:
+            pass
+
+
+def get_symbol_latency_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-symbol evaluation latency histograms since process start."""
+    with _latency_lock:
+        return {symbol: hist.as_dict() for symbol, hist in sorted(_latency.items())}
+
+
+def reset_symbol_latency_stats() -> None:
+    with _latency_lock:
+        _latency.clear()
+
+
+class SymbolGate:
+    """Non-blocking per-symbol mutex: at most one evaluation per symbol in flight."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._busy: set = set()
+
+    def try_enter(self, symbol: str) -> bool:
+        with self._lock:
+            if symbol in self._busy:
+                return False
+            self._busy.add(symbol)
+            return True
+
+    def leave(self, symbol: str) -> None:
+        with self._lock:
+            self._busy.discard(symbol)
+
+    def busy(self) -> List[str]:
+        with self._lock:
+            return sorted(self._busy)
+
+
+@dataclass
+class CycleResult:
+    evaluated: int = 0
+    failed: int = 0
+    skipped_busy: int = 0
+    wall_seconds: float = 0.0
+    slowest_symbol: Optional[str] = None
+    slowest_seconds: float = 0.0
+    latencies: Dict[str, float] = field(default_factory=dict)
+
+
+async def run_symbol_evaluations(
+    items: Iterable[Any],
+    evaluate: Callable[[Any], None],
+    *,
+    concurrency: int,
+    gate: SymbolGate,
+    symbol_of: Callable[[Any], str] = lambda item: str(getattr(item, "symbol", "")),
+    gate_key: Optional[Callable[[Any], str]] = None,
+) -> CycleResult:
+    """
+    Run ``evaluate(item)`` for every item in worker threads, at most ``concurrency`` at once.
+
+    Items are gated by ``gate_key`` (default: the symbol). Items sharing a key
+    (e.g. BTC_USD and BTC_USDT keyed by base currency) run one after another in
+    the same worker, never side by side; keys still held by a previous cycle
+    are skipped. Exceptions are logged per symbol and never abort the cycle.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    result = CycleResult()
+    started = time.perf_counter()
+    key_of = gate_key or symbol_of
+    groups: Dict[str, List[Any]] = {}
+    for item in items:
+        groups.setdefault(key_of(item), []).append(item)
+
+    async def _one(key: str, members: List[Any]) -> None:
+        async with semaphore:
+            if not gate.try_enter(key):
+                result.skipped_busy += len(members)
+                logger.warning(
+                    "[SIGNAL_CYCLE] %s skipped: previous evaluation still running",
+                    ", ".join(symbol_of(item) for item in members),
+                )
+                return
+            job = _GatedJob(evaluate, members, gate, key, symbol_of)
+            try:
+                outcomes = await asyncio.to_thread(job.run)
+            except asyncio.CancelledError:
+                job.abandon()
+                raise
+            for symbol, elapsed, error in outcomes:
+                if error is None:
+                    result.evaluated += 1
+                else:
+                    result.failed += 1
+                    logger.error(f"Error monitoring signal for {symbol}: {error}", exc_info=error)
+                result.latencies[symbol] = elapsed
+                observe_symbol_latency(symbol, elapsed)
+                if elapsed > result.slowest_seconds:
+                    result.slowest_seconds = elapsed
+                    result.slowest_symbol = symbol
+
+    await asyncio.gather(*(_one(key, members) for key, members in groups.items()))
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+class _GatedJob:
+    """The evaluations of one gate key; releases the gate from the worker thread.
+
+    A cancelled cycle (timeout) therefore keeps the key gated until its
+    evaluations have really finished; a job cancelled before its thread started
+    releases the gate itself and never runs.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Any], None],
+        items: List[Any],
+        gate: SymbolGate,
+        key: str,
+        symbol_of: Callable[[Any], str],
+    ) -> None:
+        self._evaluate = evaluate
+        self._items = items
+        self._gate = gate
+        self._key = key
+        self._symbol_of = symbol_of
+        self._lock = threading.Lock()
+        self._state = "pending"
+
+    def run(self) -> List[Tuple[str, float, Optional[Exception]]]:
+        """Evaluate the items in order; returns (symbol, seconds, error) per item."""
+        with self._lock:
+            if self._state != "pending":
+                return []
+            self._state = "running"
+        outcomes: List[Tuple[str, float, Optional[Exception]]] = []
+        try:
+            for item in self._items:
+                t0 = time.perf_counter()
+                error: Optional[Exception] = None
+                try:
+                    self._evaluate(item)
+                except Exception as e:
+                    error = e
+                outcomes.append((self._symbol_of(item), time.perf_counter() - t0, error))
+        finally:
+            self._gate.leave(self._key)
+        return outcomes
+
+    def abandon(self) -> None:
+        with self._lock:
+            if self._state != "pending":
+                return
+            self._state = "abandoned"
+        self._gate.leave(self._key)
@@ -0,0 +1,278 @@
+"""Signal cycle snapshot
+
+One read of everything the per-symbol signal evaluation needs at the start of
+a monitor cycle, built with a single bulk query per table instead of several
+queries per symbol:
+
+- kill switch (TradingSettings, once per cycle)
+- watchlist rows for the cycle's symbols
+- MarketPrice / MarketData rows
+- signal throttle states (every strategy_key of the cycle's symbols)
+- open bot positions per base currency (and their global total)
+
+Rows are copied into read-only records, so the snapshot can be shared by the
+worker threads of the cycle executor whatever session they use. Re-checks made
+right before placing an order (fresh watchlist toggles, final exposure count)
+still query the database live.
+
+signal_monitor does not write exchange_orders (exchange_sync records them
+later), so an order placed earlier in the cycle is invisible to both the
+snapshot and a live re-count. ``CyclePlacements`` keeps this cycle's BUY
+placements per base; the snapshot counts include them and the monitor adds
+them to its live exposure re-checks.
+
+``count_queries()`` counts the SQL statements executed in the current context
+(including ``asyncio.to_thread`` workers, which inherit it); the monitor uses
+it to report queries-per-cycle.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusEnum
+from app.models.market_price import MarketData, MarketPrice
+from app.models.watchlist import WatchlistItem
+
+logger = logging.getLogger(__name__)
+
+
+class ReadOnlyRow:
+    """Attribute view of a DB row's column values; assignment is refused."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_values", dict(values))
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"cycle snapshot rows are read-only ({name})")
+
+    def __repr__(self) -> str:
+        return f"ReadOnlyRow({self._values.get('symbol')!r})"
+
+
+def _freeze(row: Any) -> ReadOnlyRow:
+    return ReadOnlyRow({col.key: getattr(row, col.key) for col in row.__table__.columns})
+
+
+# ---------------------------------------------------------------------------
+# Queries-per-cycle counter
+# ---------------------------------------------------------------------------
+class QueryCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def bump(self) -> None:
+        with self._lock:
+            self.count += 1
+
+
+_current_counter: contextvars.ContextVar[Optional[QueryCounter]] = contextvars.ContextVar(
+    "signal_cycle_query_counter", default=None
+)
+_listener_lock = threading.Lock()
+_listener_installed = False
+
+
+def _on_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.bump()
+
+
+def _install_listener() -> None:
+    global _listener_installed
+    with _listener_lock:
+        if not _listener_installed:
+            event.listen(Engine, "before_cursor_execute", _on_cursor_execute)
+            _listener_installed = True
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count SQL statements run in this context (and threads started from it)."""
+    _install_listener()
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Snapshot
+# ---------------------------------------------------------------------------
+class CyclePlacements:
+    """BUY orders placed during the current cycle, per base currency."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_base: Dict[str, int] = {}
+
+    def record(self, base: str) -> None:
+        with self._lock:
+            key = base.upper()
+            self._by_base[key] = self._by_base.get(key, 0) + 1
+
+    def for_base(self, base: str) -> int:
+        with self._lock:
+            return self._by_base.get(base.upper(), 0)
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(self._by_base.values())
+
+
+@dataclass(frozen=True)
+class CycleSnapshot:
+    symbols: Tuple[str, ...]
+    # A section is None when it could not be loaded (caller falls back to its own query)
+    kill_switch_on: Optional[bool] = None
+    watchlist: Optional[Dict[str, ReadOnlyRow]] = None
+    market_prices: Optional[Dict[str, ReadOnlyRow]] = None
+    market_data: Optional[Dict[str, ReadOnlyRow]] = None
+    throttle_states: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None
+    open_positions_by_base: Optional[Dict[str, int]] = None
+    errors: Tuple[str, ...] = ()
+    placements: CyclePlacements = field(default_factory=CyclePlacements, compare=False)
+
+    def has(self, section: str, symbol: str) -> bool:
+        """True when ``section`` was loaded and the snapshot was built for ``symbol``."""
+        return symbol in self.symbols and getattr(self, section) is not None
+
+    def watchlist_row(self, symbol: str) -> Optional[ReadOnlyRow]:
+        return (self.watchlist or {}).get(symbol)
+
+    def market_price(self, symbol: str) -> Optional[ReadOnlyRow]:
+        return (self.market_prices or {}).get(symbol)
+
+    def market_data_row(self, symbol: str) -> Optional[ReadOnlyRow]:
+        return (self.market_data or {}).get(symbol)
+
+    def signal_states(self, symbol: str, strategy_key: str) -> Dict[str, Any]:
+        return dict((self.throttle_states or {}).get((symbol, strategy_key), {}))
+
+    def open_positions_for_base(self, base: str) -> Optional[int]:
+        if self.open_positions_by_base is None:
+            return None
+        return self.open_positions_by_base.get(base.upper(), 0) + self.placements.for_base(base)
+
+    def total_open_positions(self) -> Optional[int]:
+        if self.open_positions_by_base is None:
+            return None
+        return sum(self.open_positions_by_base.values()) + self.placements.total()
+
+
+def _load_watchlist(db: Session, symbols: List[str]) -> Dict[str, ReadOnlyRow]:
+    from app.services.watchlist_selector import select_preferred_watchlist_item
+
+    rows = db.query(WatchlistItem).filter(WatchlistItem.symbol.in_(symbols)).all()
+    grouped: Dict[str, list] = {}
+    for row in rows:
+        if getattr(row, "is_deleted", False):
+            continue
+        grouped.setdefault(row.symbol, []).append(row)
+    out: Dict[str, ReadOnlyRow] = {}
+    for symbol, items in grouped.items():
+        preferred = select_preferred_watchlist_item(items, symbol)
+        if preferred is not None:
+            out[symbol] = _freeze(preferred)
+    return out
+
+
+def _load_by_symbol(db: Session, model: Any, symbols: List[str]) -> Dict[str, ReadOnlyRow]:
+    out: Dict[str, ReadOnlyRow] = {}
+    for row in db.query(model).filter(model.symbol.in_(symbols)).all():
+        out.setdefault(row.symbol, _freeze(row))
+    return out
+
+
+def _load_open_positions(db: Session) -> Dict[str, int]:
+    """Open bot positions per base, computed once for every base with bot activity."""
+    from app.services.order_position_service import (
+        _bot_main_entry_filter,
+        count_open_positions_for_symbol,
+    )
+
+    statuses = [
+        OrderStatusEnum.NEW,
+        OrderStatusEnum.ACTIVE,
+        OrderStatusEnum.PARTIALLY_FILLED,
+        OrderStatusEnum.FILLED,
+    ]
+    pending_enum = getattr(OrderStatusEnum, "PENDING", None)
+    if pending_enum is not None:
+        statuses.append(pending_enum)
+    rows = (
+        db.query(ExchangeOrder.symbol)
+        .filter(
+            ExchangeOrder.side.in_([OrderSideEnum.BUY, OrderSideEnum.SELL]),
+            ExchangeOrder.status.in_(statuses),
+            _bot_main_entry_filter(),
+        )
+        .distinct()
+        .all()
+    )
+    bases = {str(r[0]).upper().split("_")[0] for r in rows if r[0]}
+    return {base: count_open_positions_for_symbol(db, base) for base in sorted(bases)}
+
+
+def build_cycle_snapshot(db: Session, symbols: Iterable[str]) -> CycleSnapshot:
+    """
+    Load the cycle snapshot. Each section fails independently: a section that
+    could not be read is left empty/None and the evaluation falls back to its
+    own per-symbol query for it.
+    """
+    symbol_list = sorted({s for s in symbols if s})
+    errors: List[str] = []
+    sections: Dict[str, Any] = {}
+
+    def _section(name: str, loader) -> None:
+        try:
+            sections[name] = loader()
+        except Exception as e:
+            errors.append(name)
+            logger.warning("[CYCLE_SNAPSHOT] %s not loaded: %s", name, e)
+            try:
+                db.rollback()
+            except Exception:
+                pass
+
+    from app.services.signal_throttle import fetch_signal_states_bulk
+    from app.utils.trading_guardrails import _get_telegram_kill_switch_status
+
+    if symbol_list:
+        _section("kill_switch_on", lambda: _get_telegram_kill_switch_status(db))
+        _section("watchlist", lambda: _load_watchlist(db, symbol_list))
+        _section("market_prices", lambda: _load_by_symbol(db, MarketPrice, symbol_list))
+        _section("market_data", lambda: _load_by_symbol(db, MarketData, symbol_list))
+        _section("throttle_states", lambda: fetch_signal_states_bulk(db, symbol_list))
+        _section("open_positions_by_base", lambda: _load_open_positions(db))
+
+    return CycleSnapshot(
+        symbols=tuple(symbol_list),
+        kill_switch_on=sections.get("kill_switch_on"),
+        watchlist=sections.get("watchlist"),
+        market_prices=sections.get("market_prices"),
+        market_data=sections.get("market_data"),
+        throttle_states=sections.get("throttle_states"),
+        open_positions_by_base=sections.get("open_positions_by_base"),
+        errors=tuple(errors),
+    )
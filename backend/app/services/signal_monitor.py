@@ -51,6 +51,16 @@ from app.services.strategy_profiles import (
 from app.api.routes_signals import calculate_stop_loss_and_take_profit
 from app.services.config_loader import get_alert_thresholds, load_config
 from app.services.order_position_service import calculate_portfolio_value_for_symbol
+from app.services.signal_cycle_executor import (
+    SymbolGate,
+    run_symbol_evaluations,
+    signal_monitor_concurrency,
+)
+from app.services.signal_cycle_snapshot import CyclePlacements, CycleSnapshot, build_cycle_snapshot, count_queries
+from app.services.watchlist_fetch import fetch_monitored_watchlist, watchlist_log_sampler
+from app.services.market_data_cache import PriceMoveWatch, market_data_cache
+from app.services.order_fill_registry import wait_for_order_fill, wait_for_order_fill_async
+from app.services.pipeline_metrics import instrument_stage, observe_stage, pipeline_stage
 # throttle_service may be absent in some deployments; run with throttling disabled if missing.
 try:
     from app.services.throttle_service import (  # pyright: ignore[reportMissingImports]
@@ -455,10 +465,11 @@ class SignalMonitorService:
     def __init__(self):
         self.is_running = False
         self.monitor_interval = 30  # Check signals every 30 seconds
+        self._price_move_watch: Optional[PriceMoveWatch] = None  # early wake-up on live price moves
         self.last_signal_states: Dict[str, Dict] = {}  # Track previous signal states: {symbol: {state: BUY/WAIT/SELL, last_order_price: float, orders_count: int}}
         self.processed_orders: set = set()  # Track orders we've created to avoid duplicates
         self.order_creation_locks: Dict[str, float] = {}  # Track when we're creating orders: {symbol: timestamp} and {symbol:side: timestamp} (atomic dedup)
-        self._order_dedup_lock = threading.Lock()  # Guards check-and-set on order_creation_locks for the in-memory (symbol, side) dedup
+        self._order_dedup_lock = threading.Lock()  # Guards check-and-set on order_creation_locks for the in-memory (base, side) dedup
         self.MIN_PRICE_CHANGE_PCT = 1.0  # Minimum 1% price change to create another order
         self.ORDER_CREATION_LOCK_SECONDS = 10  # Lock for 10 seconds after creating an order
         # Alert throttling state: {symbol: {side: {last_alert_time: datetime, last_alert_price: float}}}
@@ -492,6 +503,11 @@ class SignalMonitorService:
         self._lock_engine = None
         self.status_file_path = Path(os.getenv("SIGNAL_MONITOR_STATUS_FILE", "/tmp/signal_monitor_status.json"))
         self._latest_status_snapshot: Dict[str, str] = {}
+        # Per-symbol evaluation: at most one in flight per base currency across cycles
+        self._symbol_gate = SymbolGate()
+        # BUYs placed by the running cycle (not yet in exchange_orders); None between cycles
+        self._cycle_placements: Optional[CyclePlacements] = None
+        self.last_cycle_stats: Dict[str, Any] = {}
         self._load_persisted_status()
 
     @property
@@ -1539,6 +1555,9 @@ class SignalMonitorService:
             from app.services.order_position_service import count_total_open_positions
 
             total = count_total_open_positions(db)
+            placements = self._cycle_placements
+            if placements is not None:
+                total += placements.total()
             logger.info(f"📊 Total exposición (unified): {total} posiciones/órdenes abiertas")
             return total
         except Exception as e:
@@ -1546,6 +1565,16 @@ class SignalMonitorService:
             # On error, return a safe default (assume we're at limit to be conservative)
             return self.MAX_OPEN_ORDERS_PER_SYMBOL
     
+    def _count_open_positions_for_base(self, db: Session, base_symbol: str) -> int:
+        """Unified open positions for a base, plus BUYs this cycle placed that exchange_sync has not recorded yet."""
+        from app.services.order_position_service import count_open_positions_for_symbol
+
+        count = count_open_positions_for_symbol(db, base_symbol)
+        placements = self._cycle_placements
+        if placements is not None:
+            count += placements.for_base(base_symbol)
+        return count
+
     def _should_monitor_inactive_coin(self) -> bool:
         """Determines if the full monitoring cycle should run for inactive coins."""
         now = time.time()
@@ -2182,12 +2211,14 @@ class SignalMonitorService:
         except Exception as e:
             logger.warning(f"Failed to log startup alert configuration: {e}", exc_info=True)
     
+    @instrument_stage("watchlist_fetch", symbol_arg=None, side_arg=None)
     def _fetch_watchlist_items_sync(self, db: Session) -> list:
         """Synchronous helper to fetch watchlist items from database
         This function runs in a thread pool to avoid blocking the event loop
         
         Returns:
-            List of WatchlistItem objects with alert_enabled = True
+            List of detached WatchlistRecord rows with alert_enabled = True
+            (see app.services.watchlist_fetch)
         """
         # IMPORTANT: Refresh the session to ensure we get the latest alert_enabled values
         # This prevents issues where alert_enabled was changed in the dashboard but the
@@ -2196,81 +2227,15 @@ class SignalMonitorService:
         
         # Get all watchlist items with alert_enabled = true (for alerts)
         # Note: This includes coins that may have trade_enabled = false
-        # IMPORTANT: Use SQL directly to check which columns exist to avoid SQLAlchemy errors
+        # Column capabilities are cached per process (cleared by ensure_optional_columns), and
+        # the select only names columns that exist, so older schemas never raise here.
         try:
-            from sqlalchemy import text, inspect
-            
-            # Check which columns exist by querying the database schema
-            inspector = inspect(db.bind) if hasattr(db, 'bind') and db.bind else None
-            available_columns = []
-            if inspector:
-                try:
-                    columns = inspector.get_columns('watchlist_items')
-                    available_columns = [col['name'] for col in columns]
-                    logger.debug(f"Available columns in watchlist_items: {available_columns}")
-                except Exception as e:
-                    logger.warning(f"Could not inspect table columns: {e}")
-            
-            has_alert_enabled = 'alert_enabled' in available_columns
-            has_trade_enabled = 'trade_enabled' in available_columns
-            has_is_deleted = 'is_deleted' in available_columns
-            
-            # Try querying with SQL directly to avoid SQLAlchemy column issues
-            # Build WHERE clause based on available columns
-            where_parts = []
-            if has_alert_enabled:
-                where_parts.append("alert_enabled = true")
-            elif has_trade_enabled:
-                logger.warning("⚠️ alert_enabled column not found, using trade_enabled as fallback")
-                where_parts.append("trade_enabled = true")
-            else:
+            watchlist_items, selected_by = fetch_monitored_watchlist(db)
+            if selected_by is None:
                 logger.error("❌ Neither alert_enabled nor trade_enabled columns found!")
                 return []
-            
-            if has_is_deleted:
-                where_parts.append("is_deleted = false")
-            
-            where_clause = " AND ".join(where_parts)
-            sql = f"SELECT * FROM watchlist_items WHERE {where_clause}"
-            
-            # Execute raw SQL and map to WatchlistItem objects
-            result = db.execute(text(sql))
-            rows = result.fetchall()
-            
-            # Get column names from the result
-            if not rows:
-                logger.warning("⚠️ No watchlist items found matching criteria!")
-                return []
-            first_row = rows[0]
-            if first_row is None:
-                logger.warning("⚠️ First watchlist row is None, skipping.")
-                return []
-            # Get column names from first row (guard: avoid 'NoneType' has no attribute 'keys')
-            column_names = list(first_row._mapping.keys()) if hasattr(first_row, '_mapping') else (list(first_row.keys()) if isinstance(first_row, dict) else [])
-            
-            watchlist_items = []
-            for row in rows:
-                # Create WatchlistItem and set attributes from row
-                item = WatchlistItem()
-                row_dict = dict(row._mapping) if hasattr(row, '_mapping') else dict(zip(column_names, row))
-                
-                for key, value in row_dict.items():
-                    if hasattr(WatchlistItem, key):
-                        try:
-                            setattr(item, key, value)
-                        except Exception as e:
-                            logger.debug(f"Could not set {key}={value} on WatchlistItem: {e}")
-                
-                # If alert_enabled column doesn't exist, infer it from trade_enabled (legacy databases)
-                # This allows the system to work with older database schemas
-                if not has_alert_enabled and has_trade_enabled:
-                    setattr(item, "alert_enabled", bool(getattr(item, "trade_enabled", False)))
-                    logger.debug(f"Inferred alert_enabled={getattr(item, 'alert_enabled')} from trade_enabled for {getattr(item, 'symbol', 'unknown')}")
-                # If alert_enabled column exists, ensure it's a boolean
-                elif has_alert_enabled:
-                    setattr(item, "alert_enabled", bool(getattr(item, "alert_enabled", False)))
-                
-                watchlist_items.append(item)
+            if selected_by == "trade_enabled":
+                logger.warning("⚠️ alert_enabled column not found, using trade_enabled as fallback")
             
             if not watchlist_items:
                 logger.warning("⚠️ No watchlist items with alert_enabled = true (or trade_enabled = true as fallback) found in database!")
@@ -2288,19 +2253,26 @@ class SignalMonitorService:
                 )
                 watchlist_items = canonical_items
             
-            logger.info(f"📊 Monitoring {len(watchlist_items)} coins with {'alert_enabled' if has_alert_enabled else 'trade_enabled'} = true:")
-            for item in watchlist_items:
-                # Log item details
-                symbol = getattr(item, 'symbol', 'unknown')
-                alert_enabled = getattr(item, 'alert_enabled', False)
-                trade_enabled = getattr(item, 'trade_enabled', False)
-                trade_amount = getattr(item, 'trade_amount_usd', None) or 0
-                is_deleted = getattr(item, 'is_deleted', None)
-                
-                logger.info(
-                    f"   - {symbol}: alert_enabled={alert_enabled}, trade_enabled={trade_enabled}, "
-                    f"trade_amount=${trade_amount}, is_deleted={is_deleted}"
+            logger.info(f"📊 Monitoring {len(watchlist_items)} coins with {selected_by} = true")
+            # Per-item detail only when the monitored set/flags change or every N ticks
+            item_lines = [
+                (
+                    getattr(item, 'symbol', 'unknown'),
+                    getattr(item, 'alert_enabled', False),
+                    getattr(item, 'trade_enabled', False),
+                    getattr(item, 'trade_amount_usd', None) or 0,
+                    getattr(item, 'is_deleted', None),
                 )
+                for item in watchlist_items
+            ]
+            detail_level = logging.INFO if watchlist_log_sampler.should_log(item_lines) else logging.DEBUG
+            if logger.isEnabledFor(detail_level):
+                for symbol, alert_enabled, trade_enabled, trade_amount, is_deleted in item_lines:
+                    logger.log(
+                        detail_level,
+                        f"   - {symbol}: alert_enabled={alert_enabled}, trade_enabled={trade_enabled}, "
+                        f"trade_amount=${trade_amount}, is_deleted={is_deleted}"
+                    )
             
             return watchlist_items
         except Exception as e:
@@ -2318,6 +2290,12 @@ class SignalMonitorService:
         """Monitor signals for all coins with alert_enabled = true (for alerts)
         Orders are only created if trade_enabled = true in addition to alert_enabled = true
         """
+        with count_queries() as query_counter:
+            await self._monitor_signals(db)
+        self.last_cycle_stats["queries"] = query_counter.count
+        logger.info("[SIGNAL_CYCLE] queries=%d", query_counter.count)
+
+    async def _monitor_signals(self, db: Session):
         logger.debug("[SIGNAL_MONITOR_REFACTOR] flow=throttle_service+signal_order_orchestrator")
         try:
             telegram_config = self._get_telegram_runtime_config(refresh=True)
@@ -2368,12 +2346,49 @@ class SignalMonitorService:
                     return
                 logger.info(f"🔧 [DIAG_MODE] Filtered to {len(watchlist_items)} item(s) for {DIAG_SYMBOL}")
             
-            for item in watchlist_items:
-                try:
-                    await self._check_signal_for_coin(db, item)
-                except Exception as e:
-                    logger.error(f"Error monitoring signal for {item.symbol}: {e}", exc_info=True)
-                    continue  # Continue with next coin even if one fails
+            # One bulk read per table for the whole cycle, shared read-only by every evaluation
+            snapshot = await asyncio.to_thread(
+                build_cycle_snapshot, db, [getattr(item, "symbol", None) for item in watchlist_items]
+            )
+
+            # Evaluate symbols on a bounded worker pool; one slow symbol no longer delays the rest.
+            # A failing coin is logged and never aborts the cycle.
+            concurrency = self._cycle_concurrency(db)
+            if concurrency > 1:
+                evaluate = lambda item: self._check_signal_for_coin_in_worker_session(db, item, snapshot)
+            else:
+                evaluate = lambda item: self._check_signal_for_coin_sync(db, item, cycle_snapshot=snapshot)
+            # Gated per base currency: the open-order cap counts per base, so pairs sharing one
+            # (BTC_USD, BTC_USDT) are evaluated one after another, never side by side.
+            self._cycle_placements = snapshot.placements
+            try:
+                cycle = await run_symbol_evaluations(
+                    watchlist_items,
+                    evaluate,
+                    concurrency=concurrency,
+                    gate=self._symbol_gate,
+                    gate_key=lambda item: self._base_currency(getattr(item, "symbol", "")),
+                )
+            finally:
+                self._cycle_placements = None
+            self.last_cycle_stats = {
+                "symbols": len(watchlist_items),
+                "concurrency": concurrency,
+                "evaluated": cycle.evaluated,
+                "failed": cycle.failed,
+                "skipped_busy": cycle.skipped_busy,
+                "wall_seconds": round(cycle.wall_seconds, 3),
+                "sum_symbol_seconds": round(sum(cycle.latencies.values()), 3),
+                "slowest_symbol": cycle.slowest_symbol,
+                "slowest_seconds": round(cycle.slowest_seconds, 3),
+            }
+            logger.info(
+                "[SIGNAL_CYCLE] symbols=%d concurrency=%d wall=%.2fs sum=%.2fs slowest=%s(%.2fs) "
+                "failed=%d skipped_busy=%d",
+                len(watchlist_items), concurrency, cycle.wall_seconds,
+                sum(cycle.latencies.values()), cycle.slowest_symbol, cycle.slowest_seconds,
+                cycle.failed, cycle.skipped_busy,
+            )
         except Exception as e:
             logger.error(f"Error in monitor_signals: {e}", exc_info=True)
             _bug_on = (os.getenv("NOTION_BUG_TASK_FROM_SIGNAL_MONITOR") or "true").strip().lower() not in (
@@ -2400,8 +2415,78 @@ class SignalMonitorService:
         """Async wrapper to run the synchronous signal check in a thread"""
         await asyncio.to_thread(self._check_signal_for_coin_sync, db, watchlist_item)
 
-    def _check_signal_for_coin_sync(self, db: Session, watchlist_item: WatchlistItem):  # pyright: ignore[reportGeneralTypeIssues]
-        """Check signal for a specific coin and take action if needed"""
+    @staticmethod
+    def _cycle_concurrency(db: Session) -> int:
+        """Parallel workers for this cycle (SIGNAL_MONITOR_CONCURRENCY).
+
+        Only PostgreSQL runs in parallel. SQLite (tests / local dev) stays serial on the
+        shared session: it serialises writers and in-memory databases live on a single
+        connection.
+        """
+        concurrency = signal_monitor_concurrency()
+        if concurrency <= 1:
+            return 1
+        try:
+            bind = db.get_bind()
+        except Exception:
+            return 1
+        if getattr(getattr(bind, "dialect", None), "name", "") != "postgresql":
+            return 1
+        return concurrency
+
+    async def _sleep_until_next_cycle(self) -> None:
+        """
+        Wait ``monitor_interval`` seconds. While the market-data WebSocket runs,
+        a move of SIGNAL_MONITOR_WAKE_MOVE_PCT (default 0.5%) on any live symbol
+        starts the next cycle early, but never within SIGNAL_MONITOR_MIN_CYCLE_GAP_S.
+        """
+        from app.services.websocket_manager import is_market_ws_running
+
+        if not is_market_ws_running():
+            await asyncio.sleep(self.monitor_interval)
+            return
+        if self._price_move_watch is None:
+            self._price_move_watch = PriceMoveWatch(
+                market_data_cache, float(os.getenv("SIGNAL_MONITOR_WAKE_MOVE_PCT", "0.5"))
+            )
+        watch = self._price_move_watch
+        min_gap = min(self.monitor_interval, float(os.getenv("SIGNAL_MONITOR_MIN_CYCLE_GAP_S", "5")))
+        watch.rebase()
+        await asyncio.sleep(min_gap)
+        moved = await watch.wait(self.monitor_interval - min_gap)
+        if moved:
+            logger.info("[SIGNAL_MONITOR] %s moved >= %.2f%%, starting next cycle early", moved, watch.min_move_pct)
+
+    @staticmethod
+    def _open_worker_session(db: Session) -> Session:
+        """Fresh session on the cycle session's engine (one per worker evaluation)."""
+        return Session(bind=db.get_bind(), autoflush=False)
+
+    def _check_signal_for_coin_in_worker_session(
+        self, db: Session, watchlist_item: WatchlistItem, cycle_snapshot: Optional[CycleSnapshot] = None
+    ) -> None:
+        """Run one symbol's evaluation on its own session and commit it independently.
+
+        Watchlist items from _fetch_watchlist_items_sync are detached objects, so they can
+        be handed to any session.
+        """
+        worker_db = self._open_worker_session(db)
+        try:
+            self._check_signal_for_coin_sync(worker_db, watchlist_item, cycle_snapshot=cycle_snapshot)
+            worker_db.commit()
+        except Exception:
+            worker_db.rollback()
+            raise
+        finally:
+            worker_db.close()
+
+    def _check_signal_for_coin_sync(self, db: Session, watchlist_item: WatchlistItem, cycle_snapshot: Optional[CycleSnapshot] = None):  # pyright: ignore[reportGeneralTypeIssues]
+        """Check signal for a specific coin and take action if needed
+
+        ``cycle_snapshot`` (built once per cycle by monitor_signals) replaces the per-symbol
+        reads of kill switch, watchlist refresh, MarketPrice/MarketData, throttle state
+        and exposure counts. Without it every value is queried here as before.
+        """
         import uuid
         import os
         from datetime import datetime, timezone
@@ -2424,8 +2509,11 @@ class SignalMonitorService:
         
         # EARLY CHECK: Kill switch - if ON, skip all signal processing
         try:
-            from app.utils.trading_guardrails import _get_telegram_kill_switch_status
-            kill_switch_on = _get_telegram_kill_switch_status(db)
+            if cycle_snapshot is not None and cycle_snapshot.has("kill_switch_on", symbol):
+                kill_switch_on = cycle_snapshot.kill_switch_on
+            else:
+                from app.utils.trading_guardrails import _get_telegram_kill_switch_status
+                kill_switch_on = _get_telegram_kill_switch_status(db)
             if kill_switch_on:
                 logger.debug(f"🚫 [KILL_SWITCH] Skipping signal check for {symbol} - kill switch is ON")
                 return  # Exit early - no signal processing when kill switch is on
@@ -2439,10 +2527,13 @@ class SignalMonitorService:
             # Using a fresh query instead of refresh() to avoid any session caching issues
             # Try to filter by is_deleted if column exists, otherwise just filter by symbol
             try:
-                fresh_item = db.query(WatchlistItem).filter(
-                    WatchlistItem.symbol == symbol,
-                    WatchlistItem.is_deleted == False
-                ).first()
+                if cycle_snapshot is not None and cycle_snapshot.has("watchlist", symbol):
+                    fresh_item = cycle_snapshot.watchlist_row(symbol)
+                else:
+                    fresh_item = db.query(WatchlistItem).filter(
+                        WatchlistItem.symbol == symbol,
+                        WatchlistItem.is_deleted == False
+                    ).first()
             except Exception:
                 # If is_deleted column doesn't exist, fall back to filtering only by symbol
                 fresh_item = db.query(WatchlistItem).filter(
@@ -2637,11 +2728,18 @@ class SignalMonitorService:
         # Limits do not skip signal evaluation. When trade_enabled, live Telegram is
         # suppressed later via persist_only if the order cannot execute.
         try:
-            total_open_buy_orders = self._count_total_open_buy_orders(db)
+            snapshot_total = cycle_snapshot.total_open_positions() if cycle_snapshot is not None else None
+            if snapshot_total is not None:
+                total_open_buy_orders = snapshot_total
+            else:
+                total_open_buy_orders = self._count_total_open_buy_orders(db)
             try:
-                from app.services.order_position_service import count_open_positions_for_symbol
                 base_symbol = symbol.split('_')[0] if '_' in symbol else symbol
-                base_open = count_open_positions_for_symbol(db, base_symbol)
+                snapshot_base = cycle_snapshot.open_positions_for_base(base_symbol) if snapshot_total is not None else None
+                base_open = (
+                    snapshot_base if snapshot_base is not None
+                    else self._count_open_positions_for_base(db, base_symbol)
+                )
             except Exception as _e:
                 logger.warning(f"Failed to compute base exposure (first check) for {symbol}: {_e}")
                 base_symbol = symbol.split('_')[0] if '_' in symbol else symbol
@@ -2663,6 +2761,7 @@ class SignalMonitorService:
             logger.error(f"Error verificando exposición para {symbol}: {e}", exc_info=True)
             # No bloquear por error - continuar con el procesamiento
         
+        market_data_started = time.perf_counter()
         try:
             # CRITICAL: Use the SAME data source as the dashboard (MarketData/MarketPrice)
             # This ensures consistency between dashboard display and alert sending
@@ -2671,8 +2770,14 @@ class SignalMonitorService:
             from price_fetcher import get_price_with_fallback
             
             # First, try to get data from MarketPrice and MarketData (same as dashboard)
-            mp = db.query(MarketPrice).filter(MarketPrice.symbol == symbol).first()
-            md = db.query(MarketData).filter(MarketData.symbol == symbol).first()
+            if cycle_snapshot is not None and cycle_snapshot.has("market_prices", symbol):
+                mp = cycle_snapshot.market_price(symbol)
+            else:
+                mp = db.query(MarketPrice).filter(MarketPrice.symbol == symbol).first()
+            if cycle_snapshot is not None and cycle_snapshot.has("market_data", symbol):
+                md = cycle_snapshot.market_data_row(symbol)
+            else:
+                md = db.query(MarketData).filter(MarketData.symbol == symbol).first()
             
             # Get price from MarketPrice if available (same priority as dashboard)
             if mp and mp.price and mp.price > 0:
@@ -2686,6 +2791,12 @@ class SignalMonitorService:
                 current_price = result.get('price', 0)
                 volume_24h = result.get('volume_24h', 0)
                 price_source = "API (fallback)"
+
+            # Fresh tick from the market-data WebSocket (ENABLE_MARKET_WS) beats the last REST poll
+            live_ticker = market_data_cache.last_price(symbol)
+            if live_ticker is not None:
+                current_price = live_ticker.price
+                price_source = "MarketWS"
             
             if not current_price or current_price <= 0:
                 logger.warning(f"⚠️ {symbol}: No price data available (tried MarketPrice and API), skipping signal check")
@@ -2789,7 +2900,9 @@ class SignalMonitorService:
             
         except Exception as e:
             logger.warning(f"Error fetching price data for {symbol}: {e}", exc_info=True)
+            observe_stage("market_data", time.perf_counter() - market_data_started, symbol, outcome="error")
             return
+        observe_stage("market_data", time.perf_counter() - market_data_started, symbol)
         
         # Calculate trading signals (moved outside try/except block)
         try:
@@ -2802,26 +2915,27 @@ class SignalMonitorService:
                     f"rsi_sell_threshold=70"
                 )
             
-            signals = calculate_trading_signals(
-                symbol=symbol,
-                price=current_price,
-                rsi=rsi,
-                atr14=atr,
-                ma50=ma50,
-                ma200=ma200,
-                ema10=ema10,
-                ma10w=ma10w,
-                volume=current_volume,  # CRITICAL: Use current_volume (hourly) instead of volume_24h
-                avg_volume=avg_volume,
-                resistance_up=res_up,
-                buy_target=watchlist_item.buy_target,
-                last_buy_price=watchlist_item.purchase_price if watchlist_item.purchase_price and watchlist_item.purchase_price > 0 else None,
-                position_size_usd=watchlist_item.trade_amount_usd if watchlist_item.trade_amount_usd and watchlist_item.trade_amount_usd > 0 else 100.0,
-                rsi_buy_threshold=40,
-                rsi_sell_threshold=70,
-                strategy_type=strategy_type,
-                risk_approach=risk_approach,
-            )
+            with pipeline_stage("signal_calc", symbol):
+                signals = calculate_trading_signals(
+                    symbol=symbol,
+                    price=current_price,
+                    rsi=rsi,
+                    atr14=atr,
+                    ma50=ma50,
+                    ma200=ma200,
+                    ema10=ema10,
+                    ma10w=ma10w,
+                    volume=current_volume,  # CRITICAL: Use current_volume (hourly) instead of volume_24h
+                    avg_volume=avg_volume,
+                    resistance_up=res_up,
+                    buy_target=watchlist_item.buy_target,
+                    last_buy_price=watchlist_item.purchase_price if watchlist_item.purchase_price and watchlist_item.purchase_price > 0 else None,
+                    position_size_usd=watchlist_item.trade_amount_usd if watchlist_item.trade_amount_usd and watchlist_item.trade_amount_usd > 0 else 100.0,
+                    rsi_buy_threshold=40,
+                    rsi_sell_threshold=70,
+                    strategy_type=strategy_type,
+                    risk_approach=risk_approach,
+                )
             
             # Check if manual signals are set in dashboard (watchlist_item.signals)
             # If manual signals exist, use them instead of calculated signals
@@ -3012,9 +3126,12 @@ class SignalMonitorService:
         # This ensures that changes to trade_amount_usd, alert_enabled, etc. reset the throttle immediately
         signal_snapshots: Dict[str, LastSignalSnapshot] = {}
         try:
-            signal_snapshots = fetch_signal_states(
-                db, symbol=symbol, strategy_key=strategy_key
-            )
+            if cycle_snapshot is not None and cycle_snapshot.has("throttle_states", symbol):
+                signal_snapshots = cycle_snapshot.signal_states(symbol, strategy_key)
+            else:
+                signal_snapshots = fetch_signal_states(
+                    db, symbol=symbol, strategy_key=strategy_key
+                )
         except Exception as snapshot_err:
             logger.warning(f"Failed to load throttle state for {symbol}: {snapshot_err}")
             # CRITICAL: Rollback the transaction to allow subsequent operations to proceed
@@ -3184,17 +3301,18 @@ class SignalMonitorService:
                     "last_signal_price": last_buy_snapshot.price if last_buy_snapshot else None,
                 },
             )
-            buy_allowed, buy_reason = should_emit_signal(
-                symbol=symbol,
-                side="BUY",
-                current_price=current_price,
-                current_time=now_utc,
-                config=throttle_config,
-                last_same_side=signal_snapshots.get("BUY"),
-                last_opposite_side=signal_snapshots.get("SELL"),
-                db=db,
-                strategy_key=strategy_key,
-            )
+            with pipeline_stage("throttle_check", symbol, "BUY"):
+                buy_allowed, buy_reason = should_emit_signal(
+                    symbol=symbol,
+                    side="BUY",
+                    current_price=current_price,
+                    current_time=now_utc,
+                    config=throttle_config,
+                    last_same_side=signal_snapshots.get("BUY"),
+                    last_opposite_side=signal_snapshots.get("SELL"),
+                    db=db,
+                    strategy_key=strategy_key,
+                )
             logger.info(
                 "[GATE] symbol=%s gate=throttle decision=%s reason=%s evaluation_id=%s thresholds=%s",
                 symbol,
@@ -3489,9 +3607,12 @@ class SignalMonitorService:
                     price_move_strategy_key = f"{strategy_key}:PRICE_MOVE"
                     
                     # Fetch price move throttle state (using separate strategy_key)
-                    price_move_snapshots = fetch_signal_states(
-                        db, symbol=symbol, strategy_key=price_move_strategy_key
-                    )
+                    if cycle_snapshot is not None and cycle_snapshot.has("throttle_states", symbol):
+                        price_move_snapshots = cycle_snapshot.signal_states(symbol, price_move_strategy_key)
+                    else:
+                        price_move_snapshots = fetch_signal_states(
+                            db, symbol=symbol, strategy_key=price_move_strategy_key
+                        )
                     price_move_snapshot = price_move_snapshots.get("PRICE_MOVE")
                     
                     # Check cooldown
@@ -3581,17 +3702,18 @@ class SignalMonitorService:
                     "last_signal_price": last_sell_snapshot.price if last_sell_snapshot else None,
                 },
             )
-            sell_allowed, sell_reason = should_emit_signal(
-                symbol=symbol,
-                side="SELL",
-                current_price=current_price,
-                current_time=now_utc,
-                config=throttle_config,
-                last_same_side=signal_snapshots.get("SELL"),
-                last_opposite_side=signal_snapshots.get("BUY"),
-                db=db,
-                strategy_key=strategy_key,
-            )
+            with pipeline_stage("throttle_check", symbol, "SELL"):
+                sell_allowed, sell_reason = should_emit_signal(
+                    symbol=symbol,
+                    side="SELL",
+                    current_price=current_price,
+                    current_time=now_utc,
+                    config=throttle_config,
+                    last_same_side=signal_snapshots.get("SELL"),
+                    last_opposite_side=signal_snapshots.get("BUY"),
+                    db=db,
+                    strategy_key=strategy_key,
+                )
             logger.info(
                 "[GATE] symbol=%s gate=throttle decision=%s reason=%s evaluation_id=%s thresholds=%s",
                 symbol,
@@ -3966,9 +4088,8 @@ class SignalMonitorService:
                 final_total_open_orders = self._count_total_open_buy_orders(db)
                 # Also compute per-base exposure for this symbol
                 try:
-                    from app.services.order_position_service import count_open_positions_for_symbol
                     base_symbol = symbol.split('_')[0] if '_' in symbol else symbol
-                    base_open = count_open_positions_for_symbol(db, base_symbol)
+                    base_open = self._count_open_positions_for_base(db, base_symbol)
                 except Exception as _e:
                     logger.warning(f"Failed to compute base exposure for {symbol}: {_e}")
                     base_symbol = symbol.split('_')[0] if '_' in symbol else symbol
@@ -5044,9 +5165,8 @@ class SignalMonitorService:
             db_open_orders_count = len(open_buy_orders)
             # Unified open-position count (pending BUY + net BUY after SELL offsets)
             try:
-                from app.services.order_position_service import count_open_positions_for_symbol
                 # Use base currency so we count exposure across all pairs for this coin
-                unified_open_positions = count_open_positions_for_symbol(db, symbol_base)
+                unified_open_positions = self._count_open_positions_for_base(db, symbol_base)
             except Exception as e:
                 logger.warning(f"Could not compute unified open position count for {symbol_base}: {e}")
                 unified_open_positions = db_open_orders_count
@@ -5382,8 +5502,7 @@ class SignalMonitorService:
                 # CRITICAL: This check is essential because the limit check at line 2058 might have passed
                 # but new orders could have been created between then and now, or the count might be stale
                 try:
-                    from app.services.order_position_service import count_open_positions_for_symbol
-                    final_unified_open_positions = count_open_positions_for_symbol(db, symbol_base_final)
+                    final_unified_open_positions = self._count_open_positions_for_base(db, symbol_base_final)
                 except Exception as e:
                     logger.error(f"Could not compute unified open position count in final check for {symbol_base_final}: {e}")
                     # Conservative fallback: if we can't count, assume we're at limit to prevent over-ordering
@@ -7337,19 +7456,29 @@ class SignalMonitorService:
                 })
                 self.last_signal_states[symbol] = state_entry
     
+    @staticmethod
+    def _base_currency(symbol: str) -> str:
+        """Base currency of a pair (BTC_USDT -> BTC); the open-order cap counts per base."""
+        symbol = normalize_symbol_for_exchange(str(symbol or ""))
+        return symbol.split("_")[0] if "_" in symbol else symbol
+
+    def _order_slot_key(self, symbol: str, side: str) -> str:
+        return f"{self._base_currency(symbol)}:{side}"
+
     def _try_claim_order_slot(self, symbol: str, side: str) -> bool:
-        """Atomically claim an in-memory dedup slot for (symbol, side).
+        """Atomically claim an in-memory dedup slot for (base currency, side).
 
         PART B (cap race): the exchange_orders-based guardrail cannot see orders that
         signal_monitor is *currently* placing (exchange_sync writes those rows later), so two
         signals ~2s apart both pass the cap check and place a second order. This claims a
-        per-(symbol, side) slot under an instance lock before any cap check runs.
+        per-(base, side) slot under an instance lock before any cap check runs; the cap
+        counts per base currency, so BTC_USD and BTC_USDT share one slot.
 
         Returns True if the slot was claimed (caller may proceed), or False if a live claim
         already exists (caller must reject as a duplicate). Slots older than
         ORDER_CREATION_LOCK_SECONDS are treated as stale and reclaimed.
         """
-        key = f"{symbol}:{side}"
+        key = self._order_slot_key(symbol, side)
         now = time.time()
         with self._order_dedup_lock:
             existing = self.order_creation_locks.get(key)
@@ -7358,9 +7487,15 @@ class SignalMonitorService:
             self.order_creation_locks[key] = now
             return True
 
+    def _record_cycle_placement(self, symbol: str) -> None:
+        """Count a placed BUY in the running cycle's exposure until exchange_sync records it."""
+        placements = self._cycle_placements
+        if placements is not None:
+            placements.record(self._base_currency(symbol))
+
     def _release_order_slot(self, symbol: str, side: str) -> None:
         """Release the in-memory dedup slot claimed by _try_claim_order_slot."""
-        key = f"{symbol}:{side}"
+        key = self._order_slot_key(symbol, side)
         with self._order_dedup_lock:
             self.order_creation_locks.pop(key, None)
 
@@ -7386,7 +7521,10 @@ class SignalMonitorService:
                 "message": f"Duplicate BUY suppressed for {symbol} (in-memory cap-race guard)",
             }
         try:
-            return await self._create_buy_order_impl(db, watchlist_item, current_price, res_up, res_down)
+            result = await self._create_buy_order_impl(db, watchlist_item, current_price, res_up, res_down)
+            if isinstance(result, dict) and "error" not in result and result.get("order_id"):
+                self._record_cycle_placement(symbol)
+            return result
         except Exception:
             # Real failure: release the slot so a legitimate retry is not blocked for the whole TTL.
             self._release_order_slot(symbol, "BUY")
@@ -7675,9 +7813,8 @@ class SignalMonitorService:
         try:
             total_open_buy_orders_final = self._count_total_open_buy_orders(db)
             try:
-                from app.services.order_position_service import count_open_positions_for_symbol
                 base_symbol = symbol.split('_')[0] if '_' in symbol else symbol
-                base_open = count_open_positions_for_symbol(db, base_symbol)
+                base_open = self._count_open_positions_for_base(db, base_symbol)
             except Exception as _e:
                 logger.warning(f"Failed to compute base exposure (segunda verificación) para {symbol}: {_e}")
                 base_symbol = symbol.split('_')[0] if '_' in symbol else symbol
@@ -8692,12 +8829,7 @@ class SignalMonitorService:
                 f"🔄 [SL/TP] BUY order {order_id} not immediately FILLED (status={result_status}, "
                 f"has_cumulative_qty={has_cumulative_qty}). Polling for fill confirmation..."
             )
-            filled_confirmation = self._poll_order_fill_confirmation(
-                symbol=symbol,
-                order_id=str(order_id),
-                max_attempts=ORDER_FILL_POLL_MAX_ATTEMPTS,
-                poll_interval=ORDER_FILL_POLL_INTERVAL_SECONDS
-            )
+            filled_confirmation = await self._await_order_fill_confirmation(symbol, str(order_id))
         
         # Attempt SL/TP creation only if order is confirmed FILLED
         if filled_confirmation and filled_confirmation.get("status") == "FILLED":
@@ -9213,6 +9345,8 @@ class SignalMonitorService:
                 result.get("order_id") or result.get("exchange_order_id")
             ):
                 placed = True
+                if side_key == "BUY":
+                    self._record_cycle_placement(symbol_key)
             return result
         finally:
             if not placed:
@@ -9553,6 +9687,19 @@ class SignalMonitorService:
                 "message": error_msg,
             }
     
+    @instrument_stage("fill_confirmation", side_arg=None)
+    async def _await_order_fill_confirmation(self, symbol: str, order_id: str) -> Optional[Dict[str, Any]]:
+        """Wait for the user.order push of the fill; REST poll when none arrives in time."""
+        pushed = await wait_for_order_fill_async(order_id)
+        if pushed:
+            return pushed
+        return self._poll_order_fill_confirmation(
+            symbol=symbol,
+            order_id=order_id,
+            max_attempts=ORDER_FILL_POLL_MAX_ATTEMPTS,
+            poll_interval=ORDER_FILL_POLL_INTERVAL_SECONDS,
+        )
+
     def _poll_order_fill_confirmation(
         self,
         symbol: str,
@@ -9580,12 +9727,20 @@ class SignalMonitorService:
             max_attempts: Maximum number of polling attempts (default: 10)
             poll_interval: Seconds to wait between attempts (default: 1.0)
         
+        A fill already pushed by the user-channel WebSocket (order_fill_registry) is
+        returned without polling; off the event loop, the push is awaited for up to
+        ORDER_FILL_WS_WAIT_SECONDS first.
+        
         Returns:
             Dict with keys: status, cumulative_quantity (Decimal), avg_price, filled_price
             Returns None if order not filled after max_attempts or not found
         """
         from decimal import Decimal, InvalidOperation
         
+        pushed = wait_for_order_fill(order_id)
+        if pushed:
+            return pushed
+
         logger.info(
             f"🔄 [FILL_CONFIRMATION] Polling for order fill: {symbol} order_id={order_id} "
             f"(max_attempts={max_attempts}, interval={poll_interval}s)"
@@ -9826,6 +9981,7 @@ class SignalMonitorService:
         )
         return True
 
+    @instrument_stage("protection_creation", side_arg="entry_side")
     def _create_protection_after_entry_fill(
         self,
         db: Session,
@@ -11272,12 +11428,7 @@ class SignalMonitorService:
                     f"🔄 [SL/TP] Order {order_id} not immediately FILLED (status={result_status}, "
                     f"has_cumulative_qty={has_cumulative_qty}). Polling for fill confirmation..."
                 )
-                filled_confirmation = self._poll_order_fill_confirmation(
-                    symbol=symbol,
-                    order_id=str(order_id),
-                    max_attempts=ORDER_FILL_POLL_MAX_ATTEMPTS,
-                    poll_interval=ORDER_FILL_POLL_INTERVAL_SECONDS
-                )
+                filled_confirmation = await self._await_order_fill_confirmation(symbol, str(order_id))
             
             # Attempt SL/TP creation only if order is confirmed FILLED
             if filled_confirmation and filled_confirmation.get("status") == "FILLED":
@@ -11877,7 +12028,7 @@ class SignalMonitorService:
                 
                 # Sleep before next cycle, with error handling
                 try:
-                    await asyncio.sleep(self.monitor_interval)
+                    await self._sleep_until_next_cycle()
                 except asyncio.CancelledError:
                     logger.info("SignalMonitorService sleep cancelled, exiting loop")
                     raise
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import hashlib
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
@@ -63,6 +63,16 @@ def compute_config_hash(config: Dict[str, object]) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
+def _row_to_snapshot(row: SignalThrottleState) -> LastSignalSnapshot:
+    return LastSignalSnapshot(
+        side=row.side.upper(),
+        price=row.last_price,
+        timestamp=row.last_time,
+        force_next_signal=getattr(row, 'force_next_signal', False),
+        config_hash=getattr(row, 'config_hash', None),
+    )
+
+
 def fetch_signal_states(
     db: Session, *, symbol: str, strategy_key: str
 ) -> Dict[str, LastSignalSnapshot]:
@@ -77,16 +87,31 @@ def fetch_signal_states(
     )
     snapshots: Dict[str, LastSignalSnapshot] = {}
     for row in rows:
-        snapshots[row.side.upper()] = LastSignalSnapshot(
-            side=row.side.upper(),
-            price=row.last_price,
-            timestamp=row.last_time,
-            force_next_signal=getattr(row, 'force_next_signal', False),
-            config_hash=getattr(row, 'config_hash', None),
-        )
+        snapshots[row.side.upper()] = _row_to_snapshot(row)
     return snapshots
 
 
+def fetch_signal_states_bulk(
+    db: Session, symbols: Iterable[str]
+) -> Dict[Tuple[str, str], Dict[str, LastSignalSnapshot]]:
+    """Snapshots for every (symbol, strategy_key) of ``symbols`` in one query.
+
+    Same per-key shape as ``fetch_signal_states``; keys with no rows are absent.
+    """
+    symbol_list = sorted({s for s in symbols if s})
+    if not symbol_list:
+        return {}
+    rows = (
+        db.query(SignalThrottleState)
+        .filter(SignalThrottleState.symbol.in_(symbol_list))
+        .all()
+    )
+    states: Dict[Tuple[str, str], Dict[str, LastSignalSnapshot]] = {}
+    for row in rows:
+        states.setdefault((row.symbol, row.strategy_key), {})[row.side.upper()] = _row_to_snapshot(row)
+    return states
+
+
 def _normalize_timestamp(ts: Optional[datetime]) -> Optional[datetime]:
     if ts is None:
         return None
@@ -8,7 +8,7 @@ from typing import Any, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
-from app.services.config_loader import load_config, get_config_path
+from app.services.config_loader import load_config, get_config_path, invalidate_config_snapshot
 
 try:
     from app.models.trade_signal import TradeSignal
@@ -43,6 +43,8 @@ def invalidate_config_cache() -> None:
     global _CONFIG_CACHE, _CONFIG_MTIME
     _CONFIG_CACHE = None
     _CONFIG_MTIME = None
+    # Keep config_loader's snapshot (get_strategy_rules, get_alert_thresholds) coherent.
+    invalidate_config_snapshot()
     logger.debug("Config cache invalidated")
 
 
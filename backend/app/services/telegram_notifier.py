@@ -25,6 +25,7 @@ import logging
 import inspect
 import socket
 import hashlib
+import threading
 import time
 from typing import Optional, Literal, Dict, Tuple, Any, List
 from datetime import datetime
@@ -38,6 +39,13 @@ from app.database import SessionLocal
 from app.models.watchlist import WatchlistItem
 from app.models.trading_settings import TradingSettings
 from app.utils.http_client import http_get, http_post, requests_exceptions
+from app.services.pipeline_metrics import instrument_stage
+from app.services.telegram_outbox import (
+    OutboundMessage,
+    RetryLater,
+    get_telegram_outbox,
+    telegram_async_send_enabled,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +60,10 @@ def _escape_tg_html(value: Any) -> str:
 # Cooldown timestamp after Telegram 429 rate limit; None = no cooldown active
 _TELEGRAM_COOLDOWN_UNTIL_TS: Optional[float] = None
 
+# Seconds to wait before retrying the last failed _send_message_now on this
+# thread (429, cooldown, 5xx, network error); None = not worth retrying.
+_send_retry_hint = threading.local()
+
 # Telegram Bot API hard limit is 4096; leave headroom for source footer / parse quirks.
 _TELEGRAM_MAX_MESSAGE_CHARS = 3500
 
@@ -193,6 +205,8 @@ class TelegramNotifier:
         # Messages are considered duplicates if same hash within DUPLICATE_WINDOW_SECONDS
         # Window matches throttling time gate: 60 seconds (FIXED per ALERTAS_Y_ORDENES_NORMAS.md)
         self.recent_messages: Dict[str, Tuple[float, str, float, str]] = {}
+        # Guarded: with TELEGRAM_ASYNC_SEND the outbox sender thread forgets entries on failure
+        self._recent_lock = threading.Lock()
         self.DUPLICATE_WINDOW_SECONDS = 60  # Matches throttling time gate (60 seconds fixed)
         
         # Startup logging
@@ -264,16 +278,18 @@ class TelegramNotifier:
         
         # Clean up old entries (older than duplicate window)
         # Window matches throttling: 60 seconds fixed (per ALERTAS_Y_ORDENES_NORMAS.md)
-        expired_hashes = [
-            h for h, (ts, sym, pr, sd) in self.recent_messages.items()
-            if current_time - ts > self.DUPLICATE_WINDOW_SECONDS
-        ]
-        for h in expired_hashes:
-            del self.recent_messages[h]
+        with self._recent_lock:
+            expired_hashes = [
+                h for h, (ts, sym, pr, sd) in self.recent_messages.items()
+                if current_time - ts > self.DUPLICATE_WINDOW_SECONDS
+            ]
+            for h in expired_hashes:
+                del self.recent_messages[h]
+            recent = self.recent_messages.get(message_hash)
         
         # Check if this message was sent recently
-        if message_hash in self.recent_messages:
-            sent_time, sent_symbol, sent_price, sent_side = self.recent_messages[message_hash]
+        if recent is not None:
+            sent_time, sent_symbol, sent_price, sent_side = recent
             age_seconds = current_time - sent_time
             if age_seconds <= self.DUPLICATE_WINDOW_SECONDS:
                 duplicate_info = (
@@ -300,9 +316,17 @@ class TelegramNotifier:
         """
         current_time = time.time()
         message_hash = self._create_message_hash(symbol, price, reason, side)
-        self.recent_messages[message_hash] = (current_time, symbol, price, side.upper())
+        with self._recent_lock:
+            self.recent_messages[message_hash] = (current_time, symbol, price, side.upper())
         logger.debug(f"📝 Registered sent message: {side} {symbol} @ ${price:.4f} (hash: {message_hash[:8]}...)")
 
+    def _forget_sent_message(self, symbol: str, price: float, reason: str, side: str = "BUY") -> None:
+        """Undo ``_register_sent_message`` when a queued send finally failed (outbox ``on_failed``)."""
+        message_hash = self._create_message_hash(symbol, price, reason, side)
+        with self._recent_lock:
+            self.recent_messages.pop(message_hash, None)
+        logger.debug(f"🗑️ Forgot failed message: {side} {symbol} @ ${price:.4f} (hash: {message_hash[:8]}...)")
+
     def refresh_config(self) -> Dict[str, Any]:
         """
         Resolve *current* runtime Telegram configuration without sending.
@@ -451,10 +475,19 @@ class TelegramNotifier:
         origin: Optional[str] = None,
         symbol: Optional[str] = None,
         chat_destination: Literal["trading", "ops"] = "trading",
+        dedup: Optional[Tuple[str, float, str, str]] = None,
     ) -> bool:
         """
         Send a message to Telegram with optional inline keyboard.
-        
+
+        With ``TELEGRAM_ASYNC_SEND=true`` the send guard runs here and a
+        message it allows is only queued (``telegram_outbox``): True means
+        "accepted", False "blocked by the guard" or "queue full". The outbox
+        sender delivers it through ``_send_message_now`` (guard re-checked)
+        under per-chat and global rate limits. ``dedup`` is the ``(symbol, price, reason, side)`` key the
+        caller registers with ``_register_sent_message``; it is forgotten again
+        if the queued send finally fails.
+                
         This is the canonical helper that ALL alerts must route through.
         It automatically:
         - Blocks Telegram sends for non-AWS origins (logs instead)
@@ -472,35 +505,70 @@ class TelegramNotifier:
             chat_destination: "trading" for ATP Alerts (signals, orders), "ops" for AWS_alerts (health, anomalies).
             
         Returns:
-            True if message sent successfully, False otherwise
+            True if message sent (or queued) successfully, False otherwise
         """
-        global _TELEGRAM_COOLDOWN_UNTIL_TS
-        now = time.time()
-        if _TELEGRAM_COOLDOWN_UNTIL_TS and now < _TELEGRAM_COOLDOWN_UNTIL_TS:
-            remaining = int(_TELEGRAM_COOLDOWN_UNTIL_TS - now)
-            logger.warning("[TELEGRAM_COOLDOWN] Skipping send (cooldown active), remaining=%ds", remaining)
-            return False
+        if telegram_async_send_enabled():
+            if self._send_guard_config(message, self._resolve_symbol(message, symbol)) is None:
+                return False
+            outbox = get_telegram_outbox(self._deliver_outbound)
+            on_failed = (lambda: self._forget_sent_message(*dedup)) if dedup else None
+            return outbox.enqueue(
+                OutboundMessage(
+                    message=message,
+                    chat_destination=chat_destination,
+                    reply_markup=reply_markup,
+                    origin=origin,
+                    symbol=symbol,
+                    on_failed=on_failed,
+                )
+            )
+        return self._send_message_now(message, reply_markup, origin, symbol, chat_destination)
 
-        # Extract symbol for logging (used later in TELEGRAM_SEND)
-        # Use provided symbol if available, otherwise extract from message
-        if symbol is None:
-            try:
-                import re
-                # First try to find a trading symbol with underscore (most specific)
-                symbol_match = re.search(r'\b([A-Z]{2,10}_[A-Z]{2,10})\b', message)
-                if symbol_match:
-                    symbol = symbol_match.group(1)
-                else:
-                    # Fallback: look for symbol pattern after "Symbol:" or similar
-                    symbol_match = re.search(r'Symbol[:\s]*<b>([A-Z]{2,10}_[A-Z]{2,10})</b>', message, re.IGNORECASE)
-                    if symbol_match:
-                        symbol = symbol_match.group(1)
-            except Exception:
-                pass
-        
-        # ============================================================
-        # HARD TELEGRAM SEND GUARD (SINGLE SOURCE OF TRUTH)
-        # ============================================================
+    def _deliver_outbound(self, item: OutboundMessage, parts: List[OutboundMessage]) -> bool:
+        """
+        Outbox delivery callback; a coalesced batch is still listed per part in
+        the dashboard. Transient failures raise ``RetryLater`` so the outbox
+        retries them instead of dropping the alert.
+        """
+        dashboard_parts = [(part.message, part.symbol) for part in parts] if len(parts) > 1 else None
+        ok = self._send_message_now(
+            item.message,
+            item.reply_markup,
+            item.origin,
+            item.symbol,
+            item.chat_destination,  # type: ignore[arg-type]
+            dashboard_parts=dashboard_parts,
+        )
+        retry_after = getattr(_send_retry_hint, "retry_after", None)
+        if not ok and retry_after is not None:
+            raise RetryLater(retry_after, "telegram send failed transiently")
+        return ok
+
+    @staticmethod
+    def _resolve_symbol(message: str, symbol: Optional[str]) -> Optional[str]:
+        """Symbol for logging: the given one, otherwise the first trading pair found in the message."""
+        if symbol is not None:
+            return symbol
+        try:
+            import re
+            # First try to find a trading symbol with underscore (most specific)
+            symbol_match = re.search(r'\b([A-Z]{2,10}_[A-Z]{2,10})\b', message)
+            if symbol_match:
+                return symbol_match.group(1)
+            # Fallback: look for symbol pattern after "Symbol:" or similar
+            symbol_match = re.search(r'Symbol[:\s]*<b>([A-Z]{2,10}_[A-Z]{2,10})</b>', message, re.IGNORECASE)
+            if symbol_match:
+                return symbol_match.group(1)
+        except Exception:
+            pass
+        return None
+
+    def _send_guard_config(self, message: str, symbol: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        HARD TELEGRAM SEND GUARD (single source of truth): the refreshed runtime
+        config when sending is allowed, None when blocked (logged, listed as
+        blocked in the dashboard and recorded for health monitoring).
+        """
         # Refresh and use the exact same runtime config that signal_monitor logs.
         config = self.refresh_config()
         runtime_env = str(config.get("runtime_env") or "local")
@@ -535,7 +603,40 @@ class TelegramNotifier:
                 record_telegram_send_result(False)
             except Exception:
                 pass  # Don't fail if health module not available
+            return None
+        return config
+
+    @instrument_stage("telegram_send", side_arg=None)
+    def _send_message_now(
+        self,
+        message: str,
+        reply_markup: Optional[dict] = None,
+        origin: Optional[str] = None,
+        symbol: Optional[str] = None,
+        chat_destination: Literal["trading", "ops"] = "trading",
+        dashboard_parts: Optional[List[Tuple[str, Optional[str]]]] = None,
+    ) -> bool:
+        """Guard + Bot API call behind ``send_message`` (see there)."""
+        global _TELEGRAM_COOLDOWN_UNTIL_TS
+        _send_retry_hint.retry_after = None
+        now = time.time()
+        if _TELEGRAM_COOLDOWN_UNTIL_TS and now < _TELEGRAM_COOLDOWN_UNTIL_TS:
+            remaining = int(_TELEGRAM_COOLDOWN_UNTIL_TS - now)
+            logger.warning("[TELEGRAM_COOLDOWN] Skipping send (cooldown active), remaining=%ds", remaining)
+            _send_retry_hint.retry_after = _TELEGRAM_COOLDOWN_UNTIL_TS - now
             return False
+
+        # Extract symbol for logging (used later in TELEGRAM_SEND)
+        symbol = self._resolve_symbol(message, symbol)
+
+        # ============================================================
+        # HARD TELEGRAM SEND GUARD (SINGLE SOURCE OF TRUTH)
+        # ============================================================
+        config = self._send_guard_config(message, symbol)
+        if config is None:
+            return False
+        runtime_env = str(config.get("runtime_env") or "local")
+
         # From here on, refresh_config() has already updated instance fields:
         # self.bot_token, self.chat_id, self._chat_id_trading, self._chat_id_ops, self.enabled
         effective_chat_id = (
@@ -652,6 +753,7 @@ class TelegramNotifier:
                         data = {}
                     retry_after = int((data.get("parameters") or {}).get("retry_after") or 60)
                     _TELEGRAM_COOLDOWN_UNTIL_TS = time.time() + retry_after
+                    _send_retry_hint.retry_after = retry_after
                     logger.warning("[TELEGRAM_COOLDOWN] Activated for %ds due to 429", retry_after)
                     logger.error(
                         "[TELEGRAM_RESPONSE] status=%d RESULT=FAILURE response_text=%s",
@@ -723,6 +825,8 @@ class TelegramNotifier:
                             status_code,
                             response_text,
                         )
+                        if status_code >= 500:
+                            _send_retry_hint.retry_after = 0.0
                         # Persist non-200 response to DB (delivery failure — not a trade guardrail)
                         try:
                             from app.api.routes_monitoring import add_telegram_message
@@ -805,7 +909,8 @@ class TelegramNotifier:
                 
                 raise
             except Exception as e:
-                # Log other Telegram errors
+                # Log other Telegram errors (network / timeout: worth a retry)
+                _send_retry_hint.retry_after = 0.0
                 error_str = _redact_telegram_secrets(str(e)[:200])
                 logger.error(
                     "[TELEGRAM_RESPONSE] status=unknown RESULT=FAILURE error_type=Exception error=%s",
@@ -869,7 +974,11 @@ class TelegramNotifier:
             # Register sent message in dashboard
             try:
                 from app.api.routes_monitoring import add_telegram_message
-                add_telegram_message(full_message, symbol=symbol, blocked=False)
+                if dashboard_parts:
+                    for part_message, part_symbol in dashboard_parts:
+                        add_telegram_message(part_message, symbol=part_symbol, blocked=False)
+                else:
+                    add_telegram_message(full_message, symbol=symbol, blocked=False)
             except Exception as e:
                 logger.debug(f"Could not register Telegram message in dashboard: {e}")
                 # Non-critical, continue
@@ -1678,7 +1787,9 @@ class TelegramNotifier:
         if origin is None:
             origin = get_runtime_origin()
         
-        result = self.send_message(message.strip(), origin=origin, symbol=symbol)
+        result = self.send_message(
+            message.strip(), origin=origin, symbol=symbol, dedup=(symbol, price, reason, "BUY")
+        )
         
         # Register sent message
         if result:
@@ -1848,7 +1959,9 @@ class TelegramNotifier:
         if origin is None:
             origin = get_runtime_origin()
         
-        result = self.send_message(message.strip(), origin=origin, symbol=symbol)
+        result = self.send_message(
+            message.strip(), origin=origin, symbol=symbol, dedup=(symbol, price, reason, "SELL")
+        )
         
         # Register sent message
         if result:
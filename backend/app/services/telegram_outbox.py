@@ -0,0 +1,642 @@
+"""
+Telegram outbound queue
+
+With ``TELEGRAM_ASYNC_SEND=true``, ``TelegramNotifier.send_message`` runs
+the send guard and only appends the message to this queue (no I/O); a single
+background sender thread persists it and runs the guard + Bot API call
+(``_send_message_now``), so a slow Telegram round trip or database commit no
+longer stalls signal evaluation or order sync.
+
+- Rate limits: one token bucket per chat destination (Telegram allows about
+  one message per second per chat, short bursts tolerated) and one global
+  bucket (about 30 messages per second per bot). The sender always serves the
+  destination whose bucket frees up first.
+- Coalescing: messages waiting for the same destination are merged into one
+  Telegram message (up to ``TELEGRAM_COALESCE_MAX`` parts and the message
+  length limit). Messages with buttons are never merged; identical texts in
+  one batch are sent once.
+- Retries: a delivery that raises ``RetryLater`` (Telegram 429, cooldown,
+  5xx, network error) goes back to the head of its queue with exponential
+  backoff (``TELEGRAM_OUTBOX_RETRY_BASE_S``, doubling, at most
+  ``TELEGRAM_OUTBOX_RETRY_MAX_S``), never sooner than the 429 ``retry_after``,
+  which also holds every destination. After ``TELEGRAM_OUTBOX_MAX_ATTEMPTS``
+  the message is failed.
+- Dedup: ``_is_duplicate_message`` still runs before enqueueing; a message
+  whose delivery finally fails runs its ``on_failed`` hook, which lets the
+  notifier forget the dedup registration just as a failed synchronous send
+  never registered it.
+- Durability: the sender thread writes newly queued messages to
+  ``telegram_outbox`` in one batch per wake-up, as ``pending`` and claimed by
+  this process (``claimed_by``/``claimed_at``), before it delivers anything
+  else; it marks them sent/failed afterwards. The sender renews its claims
+  every ``TELEGRAM_OUTBOX_CLAIM_TTL_S`` / 3 and takes over pending rows whose
+  claim is older than that TTL (a crashed or restarted process) with one
+  conditional UPDATE, so two workers never replay the same row. Rows older
+  than ``TELEGRAM_OUTBOX_REPLAY_MAX_AGE_S`` are expired instead.
+- Metrics: ``get_telegram_outbox_stats()`` (queue depth, enqueue-to-send
+  latency percentiles, Bot API call duration, counters) and, when
+  prometheus_client is installed, ``telegram_outbox_*`` series.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from app.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+COALESCE_SEPARATOR = "\n\n━━━━━━━━━━━━\n\n"
+LATENCY_BUCKETS: Sequence[float] = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram  # pyright: ignore[reportMissingImports]
+
+    _depth_gauge = Gauge("telegram_outbox_depth", "Telegram messages waiting to be sent")
+    _latency_hist = Histogram(
+        "telegram_outbox_latency_seconds",
+        "Time from enqueue to Bot API response",
+        buckets=LATENCY_BUCKETS,
+    )
+    _send_hist = Histogram(
+        "telegram_outbox_send_seconds",
+        "Bot API sendMessage call duration",
+        buckets=LATENCY_BUCKETS,
+    )
+    _events_counter = Counter(
+        "telegram_outbox_messages_total",
+        "Telegram outbox messages by outcome",
+        ["event"],
+    )
+except Exception:
+    _depth_gauge = None
+    _latency_hist = None
+    _send_hist = None
+    _events_counter = None
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def telegram_async_send_enabled() -> bool:
+    return os.getenv("TELEGRAM_ASYNC_SEND", "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class OutboundMessage:
+    message: str
+    chat_destination: str = "trading"
+    reply_markup: Optional[dict] = None
+    origin: Optional[str] = None
+    symbol: Optional[str] = None
+    on_failed: Optional[Callable[[], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    outbox_id: Optional[int] = None
+    attempts: int = 0
+    not_before: float = 0.0  # time.monotonic() before which no retry is made
+
+
+class RetryLater(Exception):
+    """Raised by a deliver function for a transient failure; ``retry_after`` is in seconds."""
+
+    def __init__(self, retry_after: float = 0.0, reason: str = "") -> None:
+        super().__init__(reason or f"retry after {retry_after:.0f}s")
+        self.retry_after = max(0.0, float(retry_after or 0.0))
+
+
+# deliver(message_to_send, original_parts) -> True when Telegram accepted it,
+# False for a permanent failure; raises RetryLater for a transient one.
+DeliverFn = Callable[[OutboundMessage, List[OutboundMessage]], bool]
+
+
+def _outbox_owner() -> str:
+    return f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SqlOutboxStore:
+    """``telegram_outbox`` persistence; every method fails soft (logs, returns empty)."""
+
+    def __init__(self, session_factory: Callable[[], Any]) -> None:
+        self.session_factory = session_factory
+
+    def add(self, batch: List[OutboundMessage], owner: Optional[str] = None) -> None:
+        """Insert ``batch`` as pending rows, claimed by ``owner``."""
+        from app.models.telegram_outbox import TelegramOutboxMessage
+
+        new = [m for m in batch if m.outbox_id is None]
+        if not new:
+            return
+        now = datetime.now(timezone.utc)
+        db = self.session_factory()
+        try:
+            rows = [
+                TelegramOutboxMessage(
+                    chat_destination=m.chat_destination,
+                    message=m.message,
+                    reply_markup=json.dumps(m.reply_markup) if m.reply_markup else None,
+                    origin=m.origin,
+                    symbol=m.symbol,
+                    status="pending",
+                    claimed_by=owner,
+                    claimed_at=now if owner else None,
+                )
+                for m in new
+            ]
+            db.add_all(rows)
+            db.commit()
+            for m, row in zip(new, rows):
+                m.outbox_id = row.id
+        except Exception as e:
+            db.rollback()
+            logger.warning("[TELEGRAM_OUTBOX] persist failed: %s", e)
+        finally:
+            db.close()
+
+    def mark(self, batch: List[OutboundMessage], status: str, error: Optional[str] = None) -> None:
+        from app.models.telegram_outbox import TelegramOutboxMessage
+
+        ids = [m.outbox_id for m in batch if m.outbox_id is not None]
+        if not ids:
+            return
+        values: Dict[str, Any] = {
+            "status": status,
+            "attempts": TelegramOutboxMessage.attempts + 1,
+        }
+        if status == "sent":
+            values["sent_at"] = datetime.now(timezone.utc)
+        if error:
+            values["last_error"] = error[:500]
+        db = self.session_factory()
+        try:
+            db.query(TelegramOutboxMessage).filter(TelegramOutboxMessage.id.in_(ids)).update(
+                values, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("[TELEGRAM_OUTBOX] status update failed: %s", e)
+        finally:
+            db.close()
+
+    def renew_claims(self, owner: str) -> None:
+        """Keep this process's pending rows from looking abandoned."""
+        from app.models.telegram_outbox import TelegramOutboxMessage
+
+        db = self.session_factory()
+        try:
+            db.query(TelegramOutboxMessage).filter(
+                TelegramOutboxMessage.status == "pending", TelegramOutboxMessage.claimed_by == owner
+            ).update({"claimed_at": datetime.now(timezone.utc)}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("[TELEGRAM_OUTBOX] claim renewal failed: %s", e)
+        finally:
+            db.close()
+
+    def claim_pending(self, max_age_seconds: float, owner: str, claim_ttl: float) -> List[OutboundMessage]:
+        """
+        Claim pending rows nobody holds (unclaimed, or claim older than
+        ``claim_ttl``) for ``owner`` and return them; abandoned rows older than
+        ``max_age_seconds`` are expired instead. The claim is a single
+        ``UPDATE ... WHERE <still claimable> RETURNING``, so concurrent
+        claimers never get the same row.
+        """
+        from sqlalchemy import and_, or_, update
+
+        from app.models.telegram_outbox import TelegramOutboxMessage as M
+
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=max_age_seconds)
+        claimable = and_(
+            M.status == "pending",
+            or_(M.claimed_by.is_(None), M.claimed_at.is_(None), M.claimed_at < now - timedelta(seconds=claim_ttl)),
+        )
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(M).where(claimable, M.created_at < cutoff).values(status="expired"),
+                execution_options={"synchronize_session": False},
+            )
+            rows = db.execute(
+                update(M)
+                .where(claimable)
+                .values(claimed_by=owner, claimed_at=now)
+                .returning(M.id, M.message, M.chat_destination, M.reply_markup, M.origin, M.symbol, M.attempts),
+                execution_options={"synchronize_session": False},
+            ).all()
+            db.commit()
+            return [
+                OutboundMessage(
+                    message=row.message,
+                    chat_destination=row.chat_destination,
+                    reply_markup=json.loads(row.reply_markup) if row.reply_markup else None,
+                    origin=row.origin,
+                    symbol=row.symbol,
+                    outbox_id=row.id,
+                    attempts=row.attempts or 0,
+                )
+                for row in sorted(rows, key=lambda r: r.id)
+            ]
+        except Exception as e:
+            db.rollback()
+            logger.warning("[TELEGRAM_OUTBOX] replay of pending messages failed: %s", e)
+            return []
+        finally:
+            db.close()
+
+
+class TelegramOutbox:
+    """Bounded in-memory queue with one sender thread."""
+
+    def __init__(
+        self,
+        deliver: DeliverFn,
+        *,
+        store: Optional[SqlOutboxStore] = None,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        global_rate: float = 25.0,
+        max_pending: int = 1000,
+        coalesce_max: int = 10,
+        max_chars: int = 3500,
+        replay_max_age: float = 600.0,
+        max_attempts: int = 5,
+        retry_base: float = 2.0,
+        retry_max: float = 300.0,
+        claim_ttl: float = 60.0,
+    ) -> None:
+        self.deliver = deliver
+        self.store = store
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_pending = max(1, max_pending)
+        self.coalesce_max = max(1, coalesce_max)
+        self.max_chars = max_chars
+        self.replay_max_age = replay_max_age
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.claim_ttl = claim_ttl
+        self.owner = _outbox_owner()
+        self._next_maintenance = 0.0
+        self._hold_until = 0.0  # after a 429 / cooldown no destination is served
+        self._global_bucket = TokenBucket("telegram:global", global_rate, global_rate)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._pending: Dict[str, Deque[OutboundMessage]] = {}
+        self._unpersisted: List[OutboundMessage] = []  # queued, not yet written by the sender
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._send_durations: Deque[float] = deque(maxlen=1000)
+        self._counters = {
+            "enqueued": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "replayed": 0,
+            "retried": 0,
+            "api_calls": 0,
+        }
+
+    # -- producer side ----------------------------------------------------
+    def enqueue(self, item: OutboundMessage) -> bool:
+        """Queue ``item`` (the sender persists it); False when the queue is full (the message is dropped)."""
+        with self._cond:
+            if self._depth_locked() >= self.max_pending:
+                self._bump("dropped")
+                logger.error(
+                    "[TELEGRAM_OUTBOX] queue full (%d), dropping message dest=%s symbol=%s",
+                    self.max_pending, item.chat_destination, item.symbol,
+                )
+                return False
+            if self.store is not None:
+                self._unpersisted.append(item)
+            self._pending.setdefault(item.chat_destination, deque()).append(item)
+            self._bump("enqueued")
+            self._publish_depth_locked()
+            self._cond.notify()
+        self._ensure_thread()
+        return True
+
+    def depth(self) -> int:
+        with self._cond:
+            return self._depth_locked()
+
+    def _depth_locked(self) -> int:
+        return sum(len(q) for q in self._pending.values())
+
+    def _bump(self, event: str, n: int = 1) -> None:
+        self._counters[event] += n
+        if _events_counter is not None:
+            try:
+                _events_counter.labels(event=event).inc(n)
+            except Exception:
+                pass
+
+    def _publish_depth_locked(self) -> None:
+        if _depth_gauge is not None:
+            try:
+                _depth_gauge.set(self._depth_locked())
+            except Exception:
+                pass
+
+    # -- sender side ------------------------------------------------------
+    def _ensure_thread(self) -> None:
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="telegram-outbox", daemon=True)
+            self._thread.start()
+
+    def _chat_bucket(self, dest: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(dest)
+        if bucket is None:
+            bucket = TokenBucket(f"telegram:{dest}", self.chat_rate, self.chat_burst)
+            self._chat_buckets[dest] = bucket
+        return bucket
+
+    def _persist_new(self) -> None:
+        """Write the messages queued since the last wake-up (sender thread, one commit)."""
+        with self._cond:
+            if not self._unpersisted:
+                return
+            batch, self._unpersisted = self._unpersisted, []
+        if self.store is not None:
+            self.store.add(batch, self.owner)
+
+    def _maintain(self) -> None:
+        """Renew this process's claims and take over abandoned pending rows."""
+        if self.store is None or time.monotonic() < self._next_maintenance:
+            return
+        self._next_maintenance = time.monotonic() + self.claim_ttl / 3
+        self.store.renew_claims(self.owner)
+        replayed = self.store.claim_pending(self.replay_max_age, self.owner, self.claim_ttl)
+        if not replayed:
+            return
+        with self._cond:
+            for item in reversed(replayed):
+                self._pending.setdefault(item.chat_destination, deque()).appendleft(item)
+            self._bump("replayed", len(replayed))
+            self._publish_depth_locked()
+            self._cond.notify_all()
+        logger.info("[TELEGRAM_OUTBOX] replaying %d pending message(s) left by another run", len(replayed))
+
+    def _maintenance_in(self) -> Optional[float]:
+        if self.store is None:
+            return None
+        return max(0.0, self._next_maintenance - time.monotonic())
+
+    def _ready_in_locked(self, dest: str, now: float) -> float:
+        head = self._pending[dest][0]
+        return max(self._chat_bucket(dest).ready_in(), head.not_before - now, self._hold_until - now)
+
+    def _run(self) -> None:
+        while True:
+            self._persist_new()
+            self._maintain()
+            with self._cond:
+                if not self._depth_locked():
+                    if self._stopping:
+                        return
+                    self._cond.wait(timeout=self._maintenance_in())
+                    continue
+                now = time.monotonic()
+                dest, wait = min(
+                    ((d, self._ready_in_locked(d, now)) for d, q in self._pending.items() if q),
+                    key=lambda pair: pair[1],
+                )
+                if wait > 0:
+                    if self._stopping:
+                        return  # only backoff waits left; the rows stay pending for the next run
+                    maintenance_in = self._maintenance_in()
+                    self._cond.wait(timeout=wait if maintenance_in is None else min(wait, maintenance_in))
+                    continue
+                batch = self._take_batch_locked(dest)
+                self._in_flight += 1
+                self._publish_depth_locked()
+            try:
+                self._persist_new()  # anything queued since the top of the loop, batch included
+                self._send_batch(dest, batch)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def _take_batch_locked(self, dest: str) -> List[OutboundMessage]:
+        queue = self._pending[dest]
+        batch = [queue.popleft()]
+        if batch[0].reply_markup:
+            return batch
+        length = len(batch[0].message)
+        while queue and len(batch) < self.coalesce_max:
+            nxt = queue[0]
+            if nxt.reply_markup or nxt.origin != batch[0].origin:
+                break
+            extra = len(nxt.message) + len(COALESCE_SEPARATOR)
+            if length + extra > self.max_chars:
+                break
+            batch.append(queue.popleft())
+            length += extra
+        return batch
+
+    def _send_batch(self, dest: str, batch: List[OutboundMessage]) -> None:
+        texts: List[str] = []
+        for item in batch:
+            if item.message not in texts:
+                texts.append(item.message)
+        if len(batch) > 1:
+            self._bump("coalesced", len(batch) - 1)
+            symbols = {item.symbol for item in batch}
+            to_send = OutboundMessage(
+                message=COALESCE_SEPARATOR.join(texts),
+                chat_destination=dest,
+                origin=batch[0].origin,
+                symbol=symbols.pop() if len(symbols) == 1 else None,
+            )
+        else:
+            to_send = batch[0]
+
+        self._global_bucket.acquire()
+        self._chat_bucket(dest).acquire()
+        started = time.monotonic()
+        retry_after: Optional[float] = None
+        try:
+            ok = bool(self.deliver(to_send, batch))
+            error = None if ok else "delivery returned False"
+        except RetryLater as e:
+            ok = False
+            error = str(e)
+            retry_after = e.retry_after
+        except Exception as e:
+            ok = False
+            error = str(e)
+            logger.error("[TELEGRAM_OUTBOX] delivery raised: %s", e)
+        finished = time.monotonic()
+        self._record_timing(finished - started, [finished - item.enqueued_at for item in batch])
+        self._bump("api_calls")
+
+        if ok:
+            self._bump("sent", len(batch))
+            if self.store is not None:
+                self.store.mark(batch, "sent")
+            return
+        if retry_after is not None and self._requeue(dest, batch, retry_after, error):
+            return
+        self._bump("failed", len(batch))
+        if self.store is not None:
+            self.store.mark(batch, "failed", error)
+        for item in batch:
+            if item.on_failed is not None:
+                try:
+                    item.on_failed()
+                except Exception as e:
+                    logger.debug("[TELEGRAM_OUTBOX] on_failed hook raised: %s", e)
+
+    def _requeue(self, dest: str, batch: List[OutboundMessage], retry_after: float, error: Optional[str]) -> bool:
+        """Put a transiently failed batch back at the head of its queue; False once attempts are used up."""
+        attempts = max(item.attempts for item in batch) + 1
+        if attempts >= self.max_attempts:
+            logger.error("[TELEGRAM_OUTBOX] giving up after %d attempts dest=%s: %s", attempts, dest, error)
+            return False
+        now = time.monotonic()
+        delay = max(retry_after, min(self.retry_max, self.retry_base * (2 ** (attempts - 1))))
+        for item in batch:
+            item.attempts = attempts
+            item.not_before = now + delay
+        if self.store is not None:
+            self.store.mark(batch, "pending", error)
+        with self._cond:
+            if retry_after > 0:
+                self._hold_until = max(self._hold_until, now + retry_after)
+            self._pending.setdefault(dest, deque()).extendleft(reversed(batch))
+            self._bump("retried", len(batch))
+            self._publish_depth_locked()
+        logger.warning(
+            "[TELEGRAM_OUTBOX] retrying %d message(s) dest=%s in %.1fs (attempt %d/%d): %s",
+            len(batch), dest, delay, attempts + 1, self.max_attempts, error,
+        )
+        return True
+
+    def _record_timing(self, send_seconds: float, latencies: List[float]) -> None:
+        with self._cond:
+            self._send_durations.append(send_seconds)
+            self._latencies.extend(latencies)
+        if _send_hist is not None:
+            try:
+                _send_hist.observe(send_seconds)
+                for value in latencies:
+                    _latency_hist.observe(value)
+            except Exception:
+                pass
+
+    # -- lifecycle / metrics ----------------------------------------------
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the queue is empty and nothing is in flight."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._depth_locked() or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(timeout=min(remaining, 0.1))
+        return True
+
+    def stop(self, flush_timeout: float = 5.0) -> None:
+        """Try to drain the queue, then stop the sender (unsent rows stay pending in telegram_outbox)."""
+        self.flush(flush_timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        def _pct(values: List[float], q: float) -> float:
+            if not values:
+                return 0.0
+            return round(values[min(len(values) - 1, int(q * len(values)))], 4)
+
+        with self._cond:
+            latencies = sorted(self._latencies)
+            durations = sorted(self._send_durations)
+            out: Dict[str, Any] = dict(self._counters)
+            out["depth"] = self._depth_locked()
+            out["depth_by_destination"] = {d: len(q) for d, q in self._pending.items()}
+            out["in_flight"] = self._in_flight
+        out["latency_seconds"] = {
+            "p50": _pct(latencies, 0.5),
+            "p95": _pct(latencies, 0.95),
+            "max": round(latencies[-1], 4) if latencies else 0.0,
+        }
+        out["send_seconds"] = {
+            "p50": _pct(durations, 0.5),
+            "p95": _pct(durations, 0.95),
+            "max": round(durations[-1], 4) if durations else 0.0,
+        }
+        return out
+
+
+_outbox: Optional[TelegramOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_telegram_outbox(deliver: Optional[DeliverFn] = None) -> Optional[TelegramOutbox]:
+    """Process-wide outbox (created on first call with a ``deliver`` function)."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None and deliver is not None:
+            store = None
+            if os.getenv("TELEGRAM_OUTBOX_PERSIST", "true").strip().lower() in ("1", "true", "yes", "on"):
+                from app.database import SessionLocal
+
+                if SessionLocal is not None:
+                    store = SqlOutboxStore(SessionLocal)
+            _outbox = TelegramOutbox(
+                deliver,
+                store=store,
+                chat_rate=_env_float("TELEGRAM_CHAT_RATE_PER_S", 1.0),
+                chat_burst=_env_float("TELEGRAM_CHAT_BURST", 3.0),
+                global_rate=_env_float("TELEGRAM_GLOBAL_RATE_PER_S", 25.0),
+                max_pending=int(_env_float("TELEGRAM_OUTBOX_MAX", 1000)),
+                coalesce_max=int(_env_float("TELEGRAM_COALESCE_MAX", 10)),
+                replay_max_age=_env_float("TELEGRAM_OUTBOX_REPLAY_MAX_AGE_S", 600.0),
+                max_attempts=int(_env_float("TELEGRAM_OUTBOX_MAX_ATTEMPTS", 5)),
+                retry_base=_env_float("TELEGRAM_OUTBOX_RETRY_BASE_S", 2.0),
+                retry_max=_env_float("TELEGRAM_OUTBOX_RETRY_MAX_S", 300.0),
+                claim_ttl=_env_float("TELEGRAM_OUTBOX_CLAIM_TTL_S", 60.0),
+            )
+        return _outbox
+
+
+def get_telegram_outbox_stats() -> Dict[str, Any]:
+    outbox = _outbox
+    if outbox is None:
+        return {"enabled": telegram_async_send_enabled(), "started": False}
+    stats = outbox.stats()
+    stats.update({"enabled": telegram_async_send_enabled(), "started": True})
+    return stats
+
+
+def stop_telegram_outbox(flush_timeout: float = 5.0) -> None:
+    outbox = _outbox
+    if outbox is not None:
+        outbox.stop(flush_timeout)
@@ -16,6 +16,7 @@ from app.services.signal_throttle import (  # noqa: F401
     LastSignalSnapshot,
     build_strategy_key,
     fetch_signal_states,
+    fetch_signal_states_bulk,
     should_emit_signal,
     reset_throttle_state,
     set_force_next_signal,
@@ -368,6 +368,7 @@ def calculate_trading_signals(
     rsi_sell_threshold: int = 70,
     strategy_type: StrategyType = StrategyType.SWING,
     risk_approach: RiskApproach = RiskApproach.CONSERVATIVE,
+    rules_override: Optional[Dict[str, Any]] = None,
     ) -> Dict:
     """
     Calculate BUY/SELL signals with dynamic TP/SL adjustment logic.
@@ -396,6 +397,8 @@ def calculate_trading_signals(
         rsi_sell_threshold: RSI sell threshold (legacy, overridden by strategy_rules)
         strategy_type: Trading strategy archetype (swing/intraday/scalp)
         risk_approach: Risk tolerance (conservative/aggressive)
+        rules_override: Strategy rules to use instead of trading_config.json
+            (backtests of candidate presets, see backtest_engine)
     
     Returns:
         Dict with signals, TP, SL, strategy_state (decision, index, reasons), and rationale
@@ -432,7 +435,10 @@ def calculate_trading_signals(
     
     # CANONICAL: Load strategy rules from trading_config.json (source of truth)
     try:
-        strategy_rules = get_strategy_rules(preset_name, risk_mode)
+        if rules_override is not None:
+            strategy_rules = rules_override
+        else:
+            strategy_rules = get_strategy_rules(preset_name, risk_mode)
         logger.debug(
             "[DEBUG_RESOLVED_PROFILE] symbol=%s | preset=%s-%s | rsi_buyBelow=%s | maChecks=%s | volumeMinRatio=%s",
             symbol,
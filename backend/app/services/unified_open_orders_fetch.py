@@ -1,17 +1,33 @@
-"""Shared Crypto.com open-orders fetch used by sync, APIs, and reconciliation."""
+"""
+Shared Crypto.com open-orders fetch used by sync, APIs, and reconciliation.
+
+The regular (paged) and advanced endpoint families are independent, so they are
+fetched concurrently and a refresh takes as long as the slowest one. When a
+regular page comes back full, the next OPEN_ORDERS_PAGE_PREFETCH pages are
+requested together. Every request takes a token from the shared rate limiter
+first; per-endpoint timings are returned in ``endpoint_timings_ms``.
+"""
 
 from __future__ import annotations
 
+import contextvars
 import logging
-from typing import Any, List, Optional
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
 
 from app.services.crypto_com_sync_errors import extract_sync_failure, is_sync_failure_response
 from app.services.open_orders import UnifiedOpenOrder
+from app.utils.rate_limiter import acquire_for_url
 
 logger = logging.getLogger(__name__)
 
 PAGE_SIZE = 200
+REGULAR_SOURCE_ENDPOINT = "private/get-open-orders"
 ADVANCED_SOURCE_ENDPOINT = "private/advanced/get-open-orders"
+DEFAULT_REST_BASE = "https://api.crypto.com/exchange/v1"
+OPEN_ORDERS_PAGE_PREFETCH = max(1, int(os.getenv("OPEN_ORDERS_PAGE_PREFETCH", "2")))
 
 
 def _extract_orders(response: Optional[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -148,6 +164,82 @@ def _merge_raw_orders(
     return list(merged.values())
 
 
+def _acquire(trade_client: Any, method: str) -> None:
+    """Take a shared rate-limiter token for one request to ``method``."""
+    base = getattr(trade_client, "base_url", None)
+    if not isinstance(base, str) or not base:
+        base = DEFAULT_REST_BASE
+    acquire_for_url(f"{base.rstrip('/')}/{method}")
+
+
+def _submit(pool: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any):
+    # Run in a copy of the caller's context so per-request overrides
+    # (e.g. trade_client.use_proxy) apply inside the worker threads too.
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _get_open_orders_page(trade_client: Any, page: int) -> Optional[dict[str, Any]]:
+    _acquire(trade_client, REGULAR_SOURCE_ENDPOINT)
+    return trade_client.get_open_orders(page=page, page_size=PAGE_SIZE)
+
+
+def _fetch_regular_orders(trade_client: Any) -> Tuple[list[dict[str, Any]], Optional[dict[str, Any]], int]:
+    """
+    Page through regular open orders: ``(orders, failure_response, pages_requested)``.
+
+    Page 0 is fetched alone; while pages come back full, the next
+    OPEN_ORDERS_PAGE_PREFETCH pages are requested concurrently. Pages after the
+    first short one are discarded.
+    """
+    regular_raw: list[dict[str, Any]] = []
+    requested = 0
+    pages = [0]
+    with ThreadPoolExecutor(max_workers=OPEN_ORDERS_PAGE_PREFETCH, thread_name_prefix="open-orders-page") as pool:
+        while True:
+            if len(pages) == 1:
+                responses = [_get_open_orders_page(trade_client, pages[0])]
+            else:
+                futures = [_submit(pool, _get_open_orders_page, trade_client, page) for page in pages]
+                responses = [future.result() for future in futures]
+            requested += len(pages)
+            for response in responses:
+                if is_sync_failure_response(response):
+                    return [], response, requested
+                batch = _extract_orders(response)
+                regular_raw.extend(batch)
+                if len(batch) < PAGE_SIZE:
+                    return regular_raw, None, requested
+            last = pages[-1]
+            pages = list(range(last + 1, last + 1 + OPEN_ORDERS_PAGE_PREFETCH))
+
+
+def _fetch_advanced_orders(trade_client: Any) -> Tuple[list[dict[str, Any]], str, Optional[str], Optional[int]]:
+    """Advanced open orders: ``(orders, status, error, error_code)``; failures are non-fatal."""
+    try:
+        _acquire(trade_client, ADVANCED_SOURCE_ENDPOINT)
+        response = trade_client.get_advanced_open_orders()
+        if is_sync_failure_response(response):
+            failure = extract_sync_failure(response)
+            advanced_status = failure.get("sync_status") or "api_error"
+            advanced_error = failure.get("error_message")
+            logger.warning(
+                "Advanced open orders fetch failed (%s): %s — continuing with regular/trigger orders",
+                advanced_status,
+                advanced_error,
+            )
+            return [], advanced_status, advanced_error, failure.get("error_code")
+        return _extract_orders(response), "ok", None, None
+    except Exception as exc:
+        logger.warning("Advanced open orders fetch raised %s", exc)
+        return [], "api_error", str(exc), None
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    value = fn(*args)
+    return value, round((time.perf_counter() - started) * 1000, 1)
+
+
 def fetch_unified_open_orders(trade_client: Any | None = None) -> dict[str, Any]:
     """
     Fetch live open orders from Crypto.com (regular + trigger + advanced).
@@ -158,6 +250,7 @@ def fetch_unified_open_orders(trade_client: Any | None = None) -> dict[str, Any]
     - Advanced orders supplement margin SPOT_ATTACH and trigger orders
     - instrument_name preserved exactly as returned (aside from .upper())
     - failed_auth / missing_credentials only when regular fetch fails
+    - regular and advanced endpoints are fetched concurrently
     """
     if trade_client is None:
         from app.services.brokers.crypto_com_trade import trade_client as default_client
@@ -182,27 +275,28 @@ def fetch_unified_open_orders(trade_client: Any | None = None) -> dict[str, Any]
         "advanced_orders_error_code": None,
         "regular_count": 0,
         "trigger_count": 0,
+        "regular_pages": 0,
+        "endpoint_timings_ms": {},
+        "fetch_ms": None,
     }
 
-    regular_raw: list[dict[str, Any]] = []
-    page = 0
-    while True:
-        response = trade_client.get_open_orders(page=page, page_size=PAGE_SIZE)
-        if is_sync_failure_response(response):
-            failure = extract_sync_failure(response)
-            result["sync_status"] = failure.get("sync_status") or "api_error"
-            result["error_code"] = failure.get("error_code")
-            result["error_message"] = failure.get("error_message")
-            result["data_verified"] = False
-            return result
-
-        batch = _extract_orders(response)
-        if not batch:
-            break
-        regular_raw.extend(batch)
-        if len(batch) < PAGE_SIZE:
-            break
-        page += 1
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="open-orders") as pool:
+        regular_future = _submit(pool, _timed, _fetch_regular_orders, trade_client)
+        advanced_future = _submit(pool, _timed, _fetch_advanced_orders, trade_client)
+        (regular_raw, regular_failure, regular_pages), regular_ms = regular_future.result()
+        (advanced_raw, advanced_status, advanced_error, advanced_error_code), advanced_ms = advanced_future.result()
+    result["regular_pages"] = regular_pages
+    result["endpoint_timings_ms"] = {REGULAR_SOURCE_ENDPOINT: regular_ms, ADVANCED_SOURCE_ENDPOINT: advanced_ms}
+    result["fetch_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if regular_failure is not None:
+        failure = extract_sync_failure(regular_failure)
+        result["sync_status"] = failure.get("sync_status") or "api_error"
+        result["error_code"] = failure.get("error_code")
+        result["error_message"] = failure.get("error_message")
+        result["data_verified"] = False
+        return result
 
     # Legacy private/get-trigger-orders returns ERR_INTERNAL (50001) for some accounts and
     # is unused here. TP/SL orders are covered by private/advanced/get-open-orders below.
@@ -211,30 +305,6 @@ def fetch_unified_open_orders(trade_client: Any | None = None) -> dict[str, Any]
     trigger_error: str | None = None
     trigger_error_code: int | None = None
 
-    advanced_raw: list[dict[str, Any]] = []
-    advanced_status: str | None = "ok"
-    advanced_error: str | None = None
-    advanced_error_code: int | None = None
-
-    try:
-        response = trade_client.get_advanced_open_orders()
-        if is_sync_failure_response(response):
-            failure = extract_sync_failure(response)
-            advanced_status = failure.get("sync_status") or "api_error"
-            advanced_error = failure.get("error_message")
-            advanced_error_code = failure.get("error_code")
-            logger.warning(
-                "Advanced open orders fetch failed (%s): %s — continuing with regular/trigger orders",
-                advanced_status,
-                advanced_error,
-            )
-        else:
-            advanced_raw = _extract_orders(response)
-    except Exception as exc:
-        advanced_status = "api_error"
-        advanced_error = str(exc)
-        logger.warning("Advanced open orders fetch raised %s", exc)
-
     merged_pairs = _merge_raw_orders(regular_raw, trigger_raw, advanced_raw)
     all_raw_orders = [raw for raw, _ in merged_pairs]
 
@@ -278,19 +348,25 @@ def fetch_unified_open_orders(trade_client: Any | None = None) -> dict[str, Any]
         }
     )
     logger.info(
-        "Unified open orders fetched: regular=%s, trigger=%s, advanced_raw=%s, total=%s, trigger_status=%s, advanced_status=%s",
+        "Unified open orders fetched: regular=%s, trigger=%s, advanced_raw=%s, total=%s, trigger_status=%s, "
+        "advanced_status=%s, pages=%s, fetch_ms=%s (regular=%s, advanced=%s)",
         regular_count,
         trigger_count,
         len(advanced_raw),
         len(combined),
         trigger_status,
         advanced_status,
+        regular_pages,
+        result["fetch_ms"],
+        regular_ms,
+        advanced_ms,
     )
     return result
 
 
 __all__ = [
     "ADVANCED_SOURCE_ENDPOINT",
+    "REGULAR_SOURCE_ENDPOINT",
     "_is_valid_order_id",
     "_order_dedup_key",
     "classify_advanced_open_order",
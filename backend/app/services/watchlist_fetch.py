@@ -0,0 +1,117 @@
+"""Fast watchlist fetch for the signal monitor tick.
+
+``fetch_monitored_watchlist`` replaces the per-tick schema inspection + raw
+``SELECT *`` + per-column ``setattr`` into ``WatchlistItem()`` with:
+
+- column capabilities from ``get_table_columns_cached`` (one inspection per
+  process, cleared when ``ensure_optional_columns`` alters the schema);
+- a Core ``select`` built once per capability set, so SQLAlchemy's compiled
+  statement cache is hit on every tick;
+- rows mapped straight to ``WatchlistRecord`` (plain attributes, no ORM
+  instrumentation or identity map).
+
+``WatchlistRecord`` exposes every ``WatchlistItem`` column (``None`` when the
+database lacks it), like the transient ``WatchlistItem()`` objects it replaces,
+and stays mutable because the evaluation refreshes fields in place.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import get_table_columns_cached
+from app.models.watchlist import WatchlistItem
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST_COLUMNS: Tuple[str, ...] = tuple(col.key for col in WatchlistItem.__table__.columns)
+_EMPTY_ROW = dict.fromkeys(WATCHLIST_COLUMNS)
+
+
+class WatchlistRecord:
+    """Detached, ORM-free watchlist row used by the monitor cycle."""
+
+    def __init__(self, **values: Any) -> None:
+        self.__dict__.update(_EMPTY_ROW)
+        self.__dict__.update(values)
+
+    @classmethod
+    def from_row(cls, keys: Sequence[str], row: Sequence[Any]) -> "WatchlistRecord":
+        record = cls.__new__(cls)
+        state = record.__dict__
+        state.update(_EMPTY_ROW)
+        state.update(zip(keys, row))
+        return record
+
+    def __repr__(self) -> str:
+        return f"WatchlistRecord(id={self.id!r}, symbol={self.symbol!r}, exchange={self.exchange!r})"
+
+
+@lru_cache(maxsize=8)
+def _monitored_select(capabilities: FrozenSet[str]):
+    """(statement, selected column keys, filter mode) for a given column capability set."""
+    table = WatchlistItem.__table__
+    keys = tuple(key for key in WATCHLIST_COLUMNS if key in capabilities)
+    if "alert_enabled" in capabilities:
+        mode = "alert_enabled"
+        condition = table.c.alert_enabled == True  # noqa: E712
+    elif "trade_enabled" in capabilities:
+        mode = "trade_enabled"
+        condition = table.c.trade_enabled == True  # noqa: E712
+    else:
+        return None, keys, None
+    stmt = select(*(table.c[key] for key in keys)).where(condition)
+    if "is_deleted" in capabilities:
+        stmt = stmt.where(table.c.is_deleted == False)  # noqa: E712
+    return stmt, keys, mode
+
+
+def fetch_monitored_watchlist(db: Session) -> Tuple[List[WatchlistRecord], Optional[str]]:
+    """
+    Rows the monitor should evaluate and the flag used to select them.
+
+    Returns ``([], None)`` when neither ``alert_enabled`` nor ``trade_enabled``
+    exists. With only ``trade_enabled`` (legacy schema) ``alert_enabled`` is
+    inferred from it, as before.
+    """
+    capabilities = get_table_columns_cached(db.get_bind(), WatchlistItem.__tablename__)
+    stmt, keys, mode = _monitored_select(capabilities)
+    if stmt is None:
+        return [], None
+    records = [WatchlistRecord.from_row(keys, row) for row in db.execute(stmt)]
+    for record in records:
+        if mode == "trade_enabled":
+            record.alert_enabled = bool(record.trade_enabled)
+        else:
+            record.alert_enabled = bool(record.alert_enabled)
+    return records, mode
+
+
+class LogSampler:
+    """Emit a detailed log block on change, or once every ``every`` calls otherwise."""
+
+    def __init__(self, every: int) -> None:
+        self.every = max(1, every)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._last_signature: Optional[Tuple] = None
+
+    def should_log(self, signature: Sequence[Any]) -> bool:
+        signature = tuple(signature)
+        with self._lock:
+            self._calls += 1
+            changed = signature != self._last_signature
+            self._last_signature = signature
+            if changed or self._calls >= self.every:
+                self._calls = 0
+                return True
+            return False
+
+
+watchlist_log_sampler = LogSampler(int(os.getenv("WATCHLIST_LOG_EVERY_N_TICKS", "20")))
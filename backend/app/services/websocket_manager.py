@@ -5,6 +5,7 @@ Manages the lifecycle of the Crypto.com WebSocket connection
 
 import asyncio
 import logging
+import os
 from app.services.brokers.crypto_com_websocket import get_ws_client
 
 logger = logging.getLogger(__name__)
@@ -82,3 +83,93 @@ def is_websocket_connected() -> bool:
         return ws_client.connected
     except:
         return False
+
+
+# ---------------------------------------------------------------------------
+# Market-data WebSocket (ticker + candlestick for watchlist symbols)
+# ---------------------------------------------------------------------------
+ENABLE_MARKET_WS = os.getenv("ENABLE_MARKET_WS", "false").lower() in ("true", "1", "yes")
+MARKET_WS_SYMBOL_REFRESH_S = int(os.getenv("MARKET_WS_SYMBOL_REFRESH_S", "60"))
+
+_market_ws_task = None
+_market_symbols_task = None
+
+
+def _load_watchlist_symbols() -> list:
+    """Symbols of non-deleted watchlist items"""
+    from app.database import SessionLocal
+    from app.models.watchlist import WatchlistItem
+
+    if SessionLocal is None:
+        return []
+    db = SessionLocal()
+    try:
+        query = db.query(WatchlistItem.symbol)
+        if hasattr(WatchlistItem, "is_deleted"):
+            query = query.filter(WatchlistItem.is_deleted == False)  # noqa: E712
+        return sorted({row[0].upper() for row in query.all() if row[0]})
+    finally:
+        db.close()
+
+
+async def _refresh_market_symbols_loop(client, symbols_provider):
+    while True:
+        try:
+            symbols = await asyncio.to_thread(symbols_provider)
+            await client.update_symbols(symbols)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Market WS symbol refresh failed: {e}")
+        await asyncio.sleep(MARKET_WS_SYMBOL_REFRESH_S)
+
+
+async def start_market_ws_background(symbols_provider=None):
+    """Start the market-data WebSocket (ENABLE_MARKET_WS) for the watchlist symbols"""
+    global _market_ws_task, _market_symbols_task
+
+    if not ENABLE_MARKET_WS:
+        logger.info("Market WebSocket disabled (ENABLE_MARKET_WS=false), prices stay on REST polling")
+        return
+    if _market_ws_task is not None and not _market_ws_task.done():
+        logger.info("Market WebSocket already running")
+        return
+
+    try:
+        from app.services.brokers.crypto_com_market_websocket import get_market_ws_client
+
+        client = get_market_ws_client()
+        provider = symbols_provider or _load_watchlist_symbols
+        await client.update_symbols(await asyncio.to_thread(provider))
+        _market_ws_task = asyncio.create_task(client.start())
+        _market_symbols_task = asyncio.create_task(_refresh_market_symbols_loop(client, provider))
+        logger.info("Market WebSocket background task started")
+    except Exception as e:
+        logger.error(f"Failed to start market WebSocket: {e}")
+
+
+async def stop_market_ws():
+    """Stop the market-data WebSocket"""
+    global _market_ws_task, _market_symbols_task
+
+    try:
+        from app.services.brokers.crypto_com_market_websocket import get_market_ws_client
+
+        await get_market_ws_client().stop()
+        for task in (_market_symbols_task, _market_ws_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        _market_ws_task = None
+        _market_symbols_task = None
+        logger.info("Market WebSocket stopped")
+    except Exception as e:
+        logger.error(f"Error stopping market WebSocket: {e}")
+
+
+def is_market_ws_running() -> bool:
+    """True while the market-data WebSocket task is alive"""
+    return _market_ws_task is not None and not _market_ws_task.done()
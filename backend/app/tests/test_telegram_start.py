@@ -131,8 +131,8 @@ def test_telegram_authorize_matches_is_authorized_for_group_user():
 # Test webhook deletion
 def test_webhook_deletion_on_startup():
     """Test that webhook deletion is called on startup"""
-    with patch('requests.get') as mock_get, \
-         patch('requests.post') as mock_post:
+    with patch('requests.Session.get') as mock_get, \
+         patch('requests.Session.post') as mock_post:
         
         # Mock getWebhookInfo response with webhook
         mock_webhook_response = Mock()
@@ -173,8 +173,8 @@ def test_webhook_deletion_on_startup():
 
 def test_webhook_not_deleted_if_none():
     """Test that deleteWebhook is not called if no webhook exists"""
-    with patch('requests.get') as mock_get, \
-         patch('requests.post') as mock_post:
+    with patch('requests.Session.get') as mock_get, \
+         patch('requests.Session.post') as mock_post:
         
         # Mock getWebhookInfo response without webhook
         mock_webhook_response = Mock()
@@ -208,7 +208,7 @@ def test_webhook_not_deleted_if_none():
 # Test menu rendering
 def test_welcome_message_has_keyboard():
     """Test that welcome message includes reply keyboard"""
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.raise_for_status = Mock()
@@ -4,10 +4,13 @@ Egress Guard: Enforce outbound allowlist to prevent scanning-like traffic
 This module provides centralized validation for all outbound HTTP requests
 to ensure they only target approved domains and never raw IP addresses.
 """
+import os
 import re
 import logging
 import socket
-from typing import Optional, Tuple, Set
+import threading
+import time
+from typing import Dict, Optional, Tuple, Set
 from urllib.parse import urlparse
 import ipaddress
 
@@ -17,6 +20,8 @@ logger = logging.getLogger(__name__)
 ALLOWLISTED_DOMAINS: Set[str] = {
     # Crypto.com Exchange API
     "api.crypto.com",
+    # Crypto.com Exchange WebSocket (market data)
+    "stream.crypto.com",
     # CoinGecko API
     "api.coingecko.com",
     # Telegram Bot API
@@ -39,6 +44,15 @@ ALLOWLISTED_IPS: Set[str] = {
     "169.254.169.254",  # AWS metadata service
 }
 
+# DNS lookups done for audit logging are cached per host; failures are cached
+# for a shorter time so a transient resolver error does not stick.
+DNS_CACHE_TTL_SECONDS = float(os.getenv("EGRESS_DNS_CACHE_TTL", "300"))
+DNS_NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("EGRESS_DNS_NEGATIVE_CACHE_TTL", "30"))
+
+_dns_cache_lock = threading.Lock()
+_dns_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+_dns_stats: Dict[str, int] = {"hits": 0, "misses": 0, "failures": 0}
+
 # Regex pattern to detect raw IP addresses in URLs
 IP_PATTERN = re.compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}(?::\d+)?$')
 
@@ -92,6 +106,51 @@ def is_domain_allowed(host: str) -> bool:
     return False
 
 
+def resolve_host_cached(host: str) -> Optional[str]:
+    """
+    Resolve ``host`` to an IPv4 address, caching the answer for DNS_CACHE_TTL_SECONDS.
+
+    Returns None when resolution fails (the failure itself is cached briefly).
+    Only call this after the host has passed the allowlist checks.
+    """
+    now = time.monotonic()
+    with _dns_cache_lock:
+        entry = _dns_cache.get(host)
+        if entry is not None and entry[0] > now:
+            _dns_stats["hits"] += 1
+            return entry[1]
+        _dns_stats["misses"] += 1
+
+    try:
+        resolved_ip: Optional[str] = socket.gethostbyname(host)
+        ttl = DNS_CACHE_TTL_SECONDS
+    except socket.gaierror:
+        resolved_ip = None
+        ttl = DNS_NEGATIVE_CACHE_TTL_SECONDS
+
+    with _dns_cache_lock:
+        if resolved_ip is None:
+            _dns_stats["failures"] += 1
+        _dns_cache[host] = (time.monotonic() + ttl, resolved_ip)
+    return resolved_ip
+
+
+def get_dns_cache_stats() -> Dict[str, int]:
+    """DNS cache counters since process start (plus current entry count)."""
+    with _dns_cache_lock:
+        stats = dict(_dns_stats)
+        stats["entries"] = len(_dns_cache)
+    return stats
+
+
+def clear_dns_cache() -> None:
+    """Drop cached DNS answers and reset counters (tests / after network changes)."""
+    with _dns_cache_lock:
+        _dns_cache.clear()
+        for key in _dns_stats:
+            _dns_stats[key] = 0
+
+
 def validate_outbound_url(url: str, calling_module: str = "unknown") -> Tuple[str, Optional[str]]:
     """
     Validate that an outbound URL is allowed.
@@ -173,14 +232,13 @@ def validate_outbound_url(url: str, calling_module: str = "unknown") -> Tuple[st
             raise EgressGuardError(error_msg)
         
         # Domain is allowed - optionally resolve IP for logging (but don't block if resolution fails)
-        resolved_ip = None
-        try:
-            resolved_ip = socket.gethostbyname(host)
+        resolved_ip = resolve_host_cached(host)
+        if resolved_ip is not None:
             logger.debug(
                 f"[EGRESS_GUARD] Allowed outbound request: {host} -> {resolved_ip} "
                 f"(called from {calling_module})"
             )
-        except socket.gaierror:
+        else:
             # DNS resolution failed, but we'll allow it (DNS will fail at connection time anyway)
             logger.warning(
                 f"[EGRESS_GUARD] DNS resolution failed for {host}, but allowing request "
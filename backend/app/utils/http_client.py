@@ -21,11 +21,24 @@ Security:
 - Raw IP addresses are blocked
 - Non-allowlisted domains are blocked
 - All requests are logged for audit
+
+Connection reuse:
+- Sync requests go through one keep-alive requests.Session per origin
+  (scheme://host:port), so repeated calls skip the TCP/TLS handshake.
+  Pool size is HTTP_POOL_MAXSIZE (default 10) connections per origin.
+- async_http_get reuses one aiohttp.ClientSession per event loop.
+- get_http_pool_stats() reports session hits/misses, reused connections and
+  new connections (handshakes) per origin.
 """
+import asyncio
+import http.cookiejar
 import logging
+import os
 import re
+import threading
 import time
 from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlparse
 import uuid
 
 from app.utils.egress_guard import (
@@ -62,6 +75,137 @@ except ImportError:
     AIOHTTP_AVAILABLE = False
 
 
+HTTP_POOL_MAXSIZE = max(1, int(os.getenv("HTTP_POOL_MAXSIZE", "10")))
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+
+_pool_lock = threading.Lock()
+_sessions: Dict[str, Any] = {}
+_pool_stats: Dict[str, int] = {"session_hits": 0, "session_misses": 0}
+_async_sessions: Dict[Any, Any] = {}
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return f"{parsed.scheme}://{(parsed.hostname or '').lower()}:{port}"
+
+
+def _new_session() -> "requests.Session":
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=HTTP_POOL_BLOCK,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Shared sessions must not carry cookies from one caller's response into another's request
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def _get_session(url: str) -> "requests.Session":
+    """Keep-alive session for the URL's origin (created on first use)."""
+    key = _origin(url)
+    with _pool_lock:
+        session = _sessions.get(key)
+        if session is not None:
+            _pool_stats["session_hits"] += 1
+            return session
+        _pool_stats["session_misses"] += 1
+        session = _new_session()
+        _sessions[key] = session
+        return session
+
+
+def _connection_counts(session: Any) -> Tuple[int, int]:
+    """(requests served, connections opened) across the session's urllib3 pools."""
+    served = opened = 0
+    # One adapter is mounted for both schemes: count it once
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            served += getattr(pool, "num_requests", 0)
+            opened += getattr(pool, "num_connections", 0)
+    return served, opened
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """
+    Connection pool counters since process start.
+
+    ``handshakes`` is the number of new connections opened (each one a TCP and,
+    for https, TLS handshake); ``pool_hits`` are requests served on an already
+    open keep-alive connection.
+    """
+    with _pool_lock:
+        sessions = dict(_sessions)
+        stats: Dict[str, Any] = dict(_pool_stats)
+    per_origin: Dict[str, Dict[str, int]] = {}
+    total_requests = total_handshakes = 0
+    for origin, session in sessions.items():
+        served, opened = _connection_counts(session)
+        per_origin[origin] = {
+            "requests": served,
+            "handshakes": opened,
+            "pool_hits": max(0, served - opened),
+        }
+        total_requests += served
+        total_handshakes += opened
+    stats.update(
+        {
+            "pool_maxsize": HTTP_POOL_MAXSIZE,
+            "requests": total_requests,
+            "handshakes": total_handshakes,
+            "pool_hits": max(0, total_requests - total_handshakes),
+            "pool_misses": total_handshakes,
+            "origins": per_origin,
+            "async_sessions": len(_async_sessions),
+        }
+    )
+    return stats
+
+
+def close_http_sessions() -> None:
+    """Close every pooled sync session (shutdown / tests)."""
+    with _pool_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _pool_stats["session_hits"] = 0
+        _pool_stats["session_misses"] = 0
+    for session in sessions:
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"[HTTP_CLIENT] Error closing pooled session: {e}")
+
+
+async def _get_async_session() -> "aiohttp.ClientSession":
+    """Long-lived aiohttp session for the running event loop (sessions are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        # Drop sessions whose loop is gone so closed loops do not pin connectors
+        for stale_loop in [l for l in _async_sessions if l.is_closed()]:
+            _async_sessions.pop(stale_loop, None)
+        connector = aiohttp.TCPConnector(limit_per_host=HTTP_POOL_MAXSIZE, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(connector=connector)
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_http_session() -> None:
+    """Close the aiohttp session bound to the running loop (call on app shutdown)."""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
 def is_aws_metadata_reachable(timeout: float = 1.0) -> bool:
     """
     Check if AWS instance metadata (169.254.169.254) is reachable.
@@ -104,7 +248,7 @@ def http_get(
         calling_module: Name of the calling module (for logging)
         allow_redirects: Whether to follow redirects (default: False for security).
                         If True, final redirect destination is validated against allowlist.
-        **kwargs: Additional arguments passed to requests.get()
+        **kwargs: Additional arguments passed to Session.get()
     
     Returns:
         requests.Response object
@@ -136,7 +280,7 @@ def http_get(
             )
         
         # Make the request
-        response = requests.get(
+        response = _get_session(validated_url).get(
             validated_url,
             timeout=timeout,
             headers=request_headers,
@@ -212,7 +356,7 @@ def http_post(
         timeout: Request timeout in seconds
         headers: Optional HTTP headers
         calling_module: Name of the calling module (for logging)
-        **kwargs: Additional arguments passed to requests.post()
+        **kwargs: Additional arguments passed to Session.post()
     
     Returns:
         requests.Response object
@@ -247,7 +391,7 @@ def http_post(
         
         # Make the request
         if json:
-            response = requests.post(
+            response = _get_session(validated_url).post(
                 validated_url,
                 json=json,
                 timeout=timeout,
@@ -256,7 +400,7 @@ def http_post(
                 **kwargs
             )
         else:
-            response = requests.post(
+            response = _get_session(validated_url).post(
                 validated_url,
                 data=data,
                 timeout=timeout,
@@ -352,24 +496,24 @@ async def async_http_get(
         try:
             from aiohttp import ClientTimeout
             timeout_obj = ClientTimeout(total=timeout)
-            async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-                async with session.get(validated_url, headers=request_headers, **kwargs) as response:
-                    status_code = response.status
-                    try:
-                        data = await response.json()
-                    except Exception:
-                        data = None
-                    
-                    # Log the request for security audit
-                    log_outbound_request(
-                        _redact_telegram_url(validated_url),
-                        method="GET",
-                        status_code=status_code,
-                        calling_module=calling_module,
-                        correlation_id=correlation_id
-                    )
-                    
-                    return status_code, data
+            session = await _get_async_session()
+            async with session.get(validated_url, headers=request_headers, timeout=timeout_obj, **kwargs) as response:
+                status_code = response.status
+                try:
+                    data = await response.json()
+                except Exception:
+                    data = None
+                
+                # Log the request for security audit
+                log_outbound_request(
+                    _redact_telegram_url(validated_url),
+                    method="GET",
+                    status_code=status_code,
+                    calling_module=calling_module,
+                    correlation_id=correlation_id
+                )
+                
+                return status_code, data
         except Exception as e:
             logger.error(f"[HTTP_CLIENT] aiohttp GET failed: {_redact_telegram_url(url)}: {e}")
             return None, None
@@ -0,0 +1,194 @@
+"""
+Shared outbound rate limiter (token bucket per host / endpoint group).
+
+Replaces fixed ``sleep()`` pacing with buckets sized from the providers'
+published limits, so callers can fan requests out concurrently and only wait
+when a bucket is actually empty.
+
+Crypto.com Exchange v1 limits (per API key / IP):
+- public/* market data: 100 requests per second
+- private/create-order, cancel-order, cancel-all-orders: 15 per 100ms
+- private/get-order-detail: 30 per 100ms
+- private/get-trades, private/get-order-history: 1 per second
+- all other private/* methods: 3 per 100ms
+
+Usage::
+
+    from app.utils.rate_limiter import acquire_for_url
+    acquire_for_url(url)                  # blocking (threads)
+    await acquire_for_url_async(url)      # asyncio
+
+Buckets are process-wide singletons and thread-safe; waits are counted so
+callers can report how often a cycle was throttled.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# (requests per second, burst capacity)
+CRYPTO_COM_PUBLIC_LIMIT: Tuple[float, float] = (100.0, 100.0)
+CRYPTO_COM_PRIVATE_DEFAULT_LIMIT: Tuple[float, float] = (30.0, 3.0)
+CRYPTO_COM_PRIVATE_METHOD_LIMITS: Dict[str, Tuple[float, float]] = {
+    "private/create-order": (150.0, 15.0),
+    "private/cancel-order": (150.0, 15.0),
+    "private/cancel-all-orders": (150.0, 15.0),
+    "private/get-order-detail": (300.0, 30.0),
+    "private/get-trades": (1.0, 1.0),
+    "private/get-order-history": (1.0, 1.0),
+}
+
+# Host-level limits for non-Crypto.com providers (conservative vs. published).
+HOST_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "api.binance.com": (20.0, 20.0),
+    "api.coingecko.com": (0.5, 5.0),
+    "api.coinpaprika.com": (2.0, 5.0),
+}
+DEFAULT_HOST_LIMIT: Tuple[float, float] = (10.0, 10.0)
+
+CRYPTO_COM_HOSTS = ("api.crypto.com", "uat-api.3ona.co")
+
+
+def _env_scale() -> float:
+    """RATE_LIMIT_SCALE (0 < x <= 1) shrinks every bucket, e.g. when sharing an IP."""
+    raw = (os.getenv("RATE_LIMIT_SCALE") or "1").strip()
+    try:
+        value = float(raw)
+    except ValueError:
+        return 1.0
+    return value if 0 < value <= 1 else 1.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Tokens may go negative to queue callers FIFO."""
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    def _reserve(self, tokens: float) -> float:
+        """Take ``tokens`` now and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            self.acquired += 1
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+            self.waits += 1
+            self.waited_seconds += delay
+            return delay
+
+    def ready_in(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` could be taken without waiting (nothing is reserved)."""
+        with self._lock:
+            available = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            return max(0.0, (tokens - available) / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available. Returns seconds waited."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Async variant of :meth:`acquire` (does not block the event loop)."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket_key_and_limit(url: str) -> Tuple[str, Tuple[float, float]]:
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host in CRYPTO_COM_HOSTS:
+        path = parsed.path or ""
+        if "/public/" in path:
+            return f"{host}:public", CRYPTO_COM_PUBLIC_LIMIT
+        for method, limit in CRYPTO_COM_PRIVATE_METHOD_LIMITS.items():
+            if path.endswith(method):
+                return f"{host}:{method}", limit
+        return f"{host}:private", CRYPTO_COM_PRIVATE_DEFAULT_LIMIT
+    return host or "unknown", HOST_RATE_LIMITS.get(host, DEFAULT_HOST_LIMIT)
+
+
+def get_bucket(url: str) -> TokenBucket:
+    """Return the shared bucket that governs ``url`` (created on first use)."""
+    key, (rate, capacity) = _bucket_key_and_limit(url)
+    bucket = _buckets.get(key)
+    if bucket is not None:
+        return bucket
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            scale = _env_scale()
+            bucket = TokenBucket(key, rate * scale, max(1.0, capacity * scale))
+            _buckets[key] = bucket
+        return bucket
+
+
+def acquire_for_url(url: str, tokens: float = 1.0) -> float:
+    """Blocking acquire on the bucket for ``url``. Returns seconds waited."""
+    waited = get_bucket(url).acquire(tokens)
+    if waited > 0:
+        logger.debug("[RATE_LIMIT] waited %.3fs for %s", waited, _bucket_key_and_limit(url)[0])
+    return waited
+
+
+async def acquire_for_url_async(url: str, tokens: float = 1.0) -> float:
+    """Async acquire on the bucket for ``url``. Returns seconds waited."""
+    waited = await get_bucket(url).acquire_async(tokens)
+    if waited > 0:
+        logger.debug("[RATE_LIMIT] waited %.3fs for %s", waited, _bucket_key_and_limit(url)[0])
+    return waited
+
+
+def total_waits() -> int:
+    """Total number of throttled acquisitions across all buckets (monotonic)."""
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    return sum(b.waits for b in buckets)
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    """Per-bucket counters for diagnostics endpoints."""
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    return {b.name: b.stats() for b in buckets}
+
+
+def reset_rate_limiters_for_tests() -> None:
+    with _buckets_lock:
+        _buckets.clear()
@@ -1,7 +1,9 @@
 """
 Market Data Updater Worker
 This module runs as a separate process to update market data from external APIs.
-It respects rate limits (3s delay between coins) and saves results to shared storage.
+Symbols and timeframes are fetched concurrently (bounded by MARKET_UPDATER_CONCURRENCY)
+and paced by the shared per-host token buckets in app.utils.rate_limiter.
+Results are saved to shared storage.
 Now includes technical indicators: RSI, MA50, MA200, EMA10, ATR
 """
 import asyncio
@@ -11,7 +13,7 @@ import os
 import time
 import requests
 import numpy as np
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -44,6 +46,10 @@ def _orm_updated_at_iso(mp: Any) -> Optional[str]:
 
 
 FETCH_SYMBOL_LIMIT = 50  # Increased from 10 to 50 to process more symbols
+# Max in-flight HTTP fetches per cycle; pacing itself is done by the token buckets
+MARKET_UPDATER_CONCURRENCY = max(1, int(os.getenv("MARKET_UPDATER_CONCURRENCY", "8")))
+# (interval, limit) per timeframe: 1h for RSI/MA/EMA/ATR, 1d for MA10w, 5m for volume
+OHLCV_TIMEFRAMES = (("1h", 200), ("1d", 75), ("5m", 288))
 _non_custom_offset = 0
 
 # Default list of major cryptocurrencies that should always be tracked
@@ -66,8 +72,11 @@ from app.api.routes_signals import (
     calculate_atr,
     calculate_ma,
     calculate_ema,
-    calculate_volume_index
 )
+from app.utils.volume_index import calculate_volume_index
+from app.services.indicator_engine import indicator_registry, legacy_rounded
+from app.utils.rate_limiter import acquire_for_url, total_waits
+from app.services.market_data_cache import market_data_cache
 from simple_price_fetcher import price_fetcher, PriceResult
 from market_cache_storage import save_cache_to_storage
 
@@ -75,11 +84,13 @@ from market_cache_storage import save_cache_to_storage
 try:
     from app.database import Base, engine, create_db_session
     from app.models.market_price import MarketPrice, MarketData
-    from sqlalchemy import func
-    # Only create MarketPrice and MarketData tables, not all tables
+    from app.models.ohlcv_candle import OhlcvCandle
+    from app.services.market_data_writer import bulk_upsert_market_rows, market_rows_for_coin
+    # Only create MarketPrice, MarketData and candle store tables, not all tables
     # This avoids errors with other tables that may have schema issues
     MarketPrice.__table__.create(bind=engine, checkfirst=True)
     MarketData.__table__.create(bind=engine, checkfirst=True)
+    OhlcvCandle.__table__.create(bind=engine, checkfirst=True)
     DB_AVAILABLE = True
 except Exception as e:
     logger.warning(f"Database not available, will only use JSON cache: {e}")
@@ -96,7 +107,12 @@ except Exception as e:
 # Prometheus heartbeat for Phase 7 observability (MarketUpdaterStalled alert)
 _METRICS_AVAILABLE = False
 _heartbeat_gauge = None
+_cycle_fetch_gauge = None
+_cycle_waits_gauge = None
+_cycle_write_gauge = None
 _last_heartbeat = [time.time()]
+# Stats of the most recent update_market_data() cycle (wall time, rate-limit waits, DB write)
+_last_cycle_stats: Dict[str, Any] = {}
 
 try:
     from prometheus_client import Gauge, start_http_server  # pyright: ignore[reportMissingImports]
@@ -104,6 +120,18 @@ try:
         "market_updater_heartbeat_age_seconds",
         "Seconds since last successful market data update",
     )
+    _cycle_fetch_gauge = Gauge(
+        "market_updater_fetch_seconds",
+        "Wall time of the concurrent price/OHLCV fetch stage in the last cycle",
+    )
+    _cycle_waits_gauge = Gauge(
+        "market_updater_rate_limit_waits",
+        "Requests delayed by the per-host token bucket in the last cycle",
+    )
+    _cycle_write_gauge = Gauge(
+        "market_updater_db_write_seconds",
+        "Wall time of the bulk market_prices/market_data upsert and commit in the last cycle",
+    )
     _METRICS_AVAILABLE = True
 except ImportError:
     pass
@@ -194,6 +222,7 @@ def fetch_ohlcv_data(symbol: str, interval: str = "1h", limit: int = 200) -> Opt
             "count": min(max(int(limit or 200), 1), 300),
         }
         
+        acquire_for_url(url)
         response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
         result = response.json()
@@ -250,6 +279,7 @@ def fetch_ohlcv_data(symbol: str, interval: str = "1h", limit: int = 200) -> Opt
             "limit": min(limit, 1000)  # Binance max is 1000
         }
         
+        acquire_for_url(url)
         response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
@@ -286,13 +316,43 @@ def fetch_ohlcv_data(symbol: str, interval: str = "1h", limit: int = 200) -> Opt
         return cdc_partial
     return None
 
-def calculate_technical_indicators(ohlcv_data: List[Dict], current_price: float, ohlcv_data_daily: Optional[List[Dict]] = None, ohlcv_data_volume: Optional[List[Dict]] = None) -> Dict[str, float]:
+def fetch_ohlcv_cached(symbol: str, interval: str = "1h", limit: int = 200) -> Optional[List[Dict]]:
+    """Like fetch_ohlcv_data, but served from the local candle store with only the tail fetched remotely.
+
+    Falls back to a plain remote fetch when the database is unavailable.
+    """
+    if DB_AVAILABLE:
+        try:
+            from app.services.candle_store import fetch_candles_incremental
+            db = create_db_session()
+            try:
+                return fetch_candles_incremental(db, symbol, interval, limit, fetch_ohlcv_data)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.debug(f"Candle store unavailable for {symbol} {interval}, fetching in full: {e}")
+    return fetch_ohlcv_data(symbol, interval=interval, limit=limit)
+
+
+def _streaming_core_indicators(symbol: str, ohlcv_data: List[Dict], current_price: float) -> Optional[Dict[str, float]]:
+    """RSI/MA50/MA200/EMA10/ATR from the symbol's streaming state (None -> use the full recompute)."""
+    try:
+        snapshot = indicator_registry.refresh(symbol, "1h", ohlcv_data, current_price)
+        return legacy_rounded(snapshot, current_price)
+    except Exception as e:
+        logger.debug(f"Streaming indicators unavailable for {symbol}: {e}")
+        return None
+
+
+def calculate_technical_indicators(ohlcv_data: List[Dict], current_price: float, ohlcv_data_daily: Optional[List[Dict]] = None, ohlcv_data_volume: Optional[List[Dict]] = None, symbol: Optional[str] = None) -> Dict[str, float]:
     """Calculate all technical indicators from OHLCV data
     Args:
         ohlcv_data: Hourly OHLCV data for most indicators (RSI, MA50, MA200, EMA10, ATR)
         current_price: Current market price
         ohlcv_data_daily: Optional daily OHLCV data for accurate MA10w calculation (10-week MA = 70 days)
         ohlcv_data_volume: Optional OHLCV data with shorter timeframe (e.g., 10m) for volume calculation
+        symbol: When given, RSI/MA50/MA200/EMA10/ATR come from the symbol's streaming state in
+            ``indicator_registry`` (only candles closed since the last cycle are applied)
     """
     if not ohlcv_data or len(ohlcv_data) < 50:
         # Return default values if insufficient data
@@ -322,10 +382,16 @@ def calculate_technical_indicators(ohlcv_data: List[Dict], current_price: float,
     
     try:
         # Calculate indicators
-        rsi = calculate_rsi(closes, period=14)
-        ma50 = calculate_ma(closes, period=50)
-        ma200 = calculate_ma(closes, period=200) if len(closes) >= 200 else calculate_ma(closes, period=min(200, len(closes)))
-        ema10 = calculate_ema(closes, period=10)
+        core = _streaming_core_indicators(symbol, ohlcv_data, current_price) if symbol else None
+        if core is not None:
+            rsi, ma50, ema10 = core["rsi"], core["ma50"], core["ema10"]
+            # Legacy MA200 averages whatever history there is when it is shorter than 200
+            ma200 = core["ma200"] if len(closes) >= 200 else calculate_ma(closes, period=len(closes))
+        else:
+            rsi = calculate_rsi(closes, period=14)
+            ma50 = calculate_ma(closes, period=50)
+            ma200 = calculate_ma(closes, period=200) if len(closes) >= 200 else calculate_ma(closes, period=min(200, len(closes)))
+            ema10 = calculate_ema(closes, period=10)
         
         # Calculate MA10w (10-week moving average = 70 days)
         # Use daily data if available for accurate calculation, otherwise use hourly data as approximation
@@ -359,7 +425,7 @@ def calculate_technical_indicators(ohlcv_data: List[Dict], current_price: float,
             logger.debug(f"⚠️ MA10w using fallback (MA200 or price): {ma10w:.2f}")
         
         # Calculate ATR with adaptive precision based on current price
-        atr = calculate_atr(highs, lows, closes, period=14, current_price=current_price)
+        atr = core["atr"] if core is not None else calculate_atr(highs, lows, closes, period=14, current_price=current_price)
         
         # Volume indicators - use shorter timeframe data if available (e.g., 5m), otherwise use hourly data
         # Using period=5 means: 5 periods of the selected timeframe (5*5m = 25min with 5m data, or 5h with 1h data)
@@ -407,6 +473,58 @@ def calculate_technical_indicators(ohlcv_data: List[Dict], current_price: float,
         }
 
 
+async def _run_bounded(semaphore: asyncio.Semaphore, fn, *args, **kwargs):
+    """Run a blocking fetch in a worker thread, holding one concurrency slot."""
+    async with semaphore:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def _fetch_symbol_market_data(
+    symbol: str, semaphore: asyncio.Semaphore
+) -> Tuple[Optional[PriceResult], Dict[str, Any]]:
+    """Fetch price, then all OHLCV timeframes in parallel, and compute indicators for one symbol."""
+    live = market_data_cache.last_price(symbol)
+    if live is not None:
+        # Fresh tick from the market-data WebSocket: no REST price call needed
+        price_result = PriceResult(price=live.price, source="crypto_com_ws", timestamp=live.received_at, success=True)
+    else:
+        price_result = await _run_bounded(semaphore, price_fetcher.get_price, symbol)
+
+    current_price = 0.0
+    if price_result and price_result.success:
+        current_price = price_result.price
+        logger.debug(f"✅ Price for {symbol}: ${current_price} from {price_result.source}")
+    else:
+        logger.debug(f"⚠️ Failed to get price for {symbol}, using 0.0")
+        # No price, use defaults
+        return price_result, calculate_technical_indicators([], 0.0, ohlcv_data_daily=None, ohlcv_data_volume=None)
+
+    try:
+        ohlcv_data_1h, ohlcv_data_1d, ohlcv_data_5m = [
+            market_data_cache.merge_candles(symbol, interval, data) if data else data
+            for (interval, _), data in zip(
+                OHLCV_TIMEFRAMES,
+                await asyncio.gather(
+                    *(
+                        _run_bounded(semaphore, fetch_ohlcv_cached, symbol, interval=interval, limit=limit)
+                        for interval, limit in OHLCV_TIMEFRAMES
+                    )
+                ),
+            )
+        ]
+        if ohlcv_data_1h:
+            indicators = calculate_technical_indicators(ohlcv_data_1h, current_price, ohlcv_data_daily=ohlcv_data_1d, ohlcv_data_volume=ohlcv_data_5m, symbol=symbol)
+            # Log at INFO level so it's visible in production logs
+            logger.info(f"✅ Indicators for {symbol}: RSI={indicators.get('rsi', 0):.1f}, MA50={indicators.get('ma50', 0):.2f}, MA10w={indicators.get('ma10w', 0):.2f}, Volume ratio={('%.2f' % indicators['volume_ratio']) if indicators.get('volume_ratio') is not None else 'n/a'}x (candles: {len(ohlcv_data_1h)})")
+        else:
+            logger.warning(f"⚠️ No OHLCV data for {symbol}, using defaults (price={current_price})")
+            indicators = calculate_technical_indicators([], current_price, ohlcv_data_daily=None, ohlcv_data_volume=None)
+    except Exception as e:
+        logger.warning(f"Error calculating indicators for {symbol}: {e}")
+        indicators = calculate_technical_indicators([], current_price, ohlcv_data_daily=None, ohlcv_data_volume=None)
+    return price_result, indicators
+
+
 async def update_market_data():
     """Update market data from external APIs (slow operation with delays)
     Now includes technical indicators calculation
@@ -603,7 +721,7 @@ async def update_market_data():
         symbols = [coin["instrument_name"] for coin in coins]
         
         try:
-            logger.info(f"Starting price fetch for {len(symbols)} symbols (with 3s delay between each)")
+            logger.info(f"Starting price fetch for {len(symbols)} symbols (concurrency={MARKET_UPDATER_CONCURRENCY})")
             max_symbols = FETCH_SYMBOL_LIMIT
             if len(symbols) > max_symbols:
                 custom_symbols = [coin["instrument_name"] for coin in coins if coin.get("is_custom")]
@@ -658,77 +776,39 @@ async def update_market_data():
                 symbol: data.copy() for symbol, data in existing_indicators.items()
             }
             
-            # Fetch prices sequentially with 3s delay between each coin
+            # Fetch prices + OHLCV for all symbols concurrently; the token buckets pace the requests
             price_results: Dict[str, Optional["PriceResult"]] = {}
-            
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            # Fetch prices, OHLCV, and indicators one by one with 3s delay between each
-            for idx, symbol in enumerate(symbols):
-                try:
-                    logger.debug(f"Fetching price and indicators for {symbol} ({idx + 1}/{len(symbols)})")
-                    
-                    # Fetch price
-                    price_result = await loop.run_in_executor(
-                        None,
-                        price_fetcher.get_price,
-                        symbol
-                    )
-                    price_results[symbol] = price_result
-                    
-                    current_price = 0.0
-                    if price_result and price_result.success:
-                        current_price = price_result.price
-                        logger.debug(f"✅ Price for {symbol}: ${current_price} from {price_result.source}")
-                    else:
-                        logger.debug(f"⚠️ Failed to get price for {symbol}, using 0.0")
-                    
-                    # Fetch OHLCV data for indicators (if we got a price)
-                    indicators = {}
-                    if current_price > 0:
-                        try:
-                            # Fetch hourly data for most indicators (RSI, MA50, MA200, EMA10, ATR)
-                            ohlcv_data_1h = fetch_ohlcv_data(symbol, interval="1h", limit=200)
-                            
-                            # Fetch daily data for MA10w (10-week MA = 70 days)
-                            ohlcv_data_1d = fetch_ohlcv_data(symbol, interval="1d", limit=75)  # Get 75 daily candles for 10-week MA (70 days + buffer)
-                            
-                            # Fetch 5-minute data for volume calculation (more responsive)
-                            # Get ~288 periods = 24 hours of 5-minute data
-                            ohlcv_data_5m = fetch_ohlcv_data(symbol, interval="5m", limit=288)
-                            
-                            if ohlcv_data_1h:
-                                indicators = calculate_technical_indicators(ohlcv_data_1h, current_price, ohlcv_data_daily=ohlcv_data_1d, ohlcv_data_volume=ohlcv_data_5m)
-                                # Log at INFO level so it's visible in production logs
-                                logger.info(f"✅ Indicators for {symbol}: RSI={indicators.get('rsi', 0):.1f}, MA50={indicators.get('ma50', 0):.2f}, MA10w={indicators.get('ma10w', 0):.2f}, Volume ratio={('%.2f' % indicators['volume_ratio']) if indicators.get('volume_ratio') is not None else 'n/a'}x (candles: {len(ohlcv_data_1h)})")
-                            else:
-                                logger.warning(f"⚠️ No OHLCV data for {symbol}, using defaults (price={current_price})")
-                                # Use defaults
-                                indicators = calculate_technical_indicators([], current_price, ohlcv_data_daily=None, ohlcv_data_volume=None)
-                        except Exception as e:
-                            logger.warning(f"Error calculating indicators for {symbol}: {e}")
-                            indicators = calculate_technical_indicators([], current_price, ohlcv_data_daily=None, ohlcv_data_volume=None)
-                    else:
-                        # No price, use defaults
-                        indicators = calculate_technical_indicators([], 0.0, ohlcv_data_daily=None, ohlcv_data_volume=None)
-                    
-                    indicators_map[symbol] = indicators
-                    
-                    # Wait 3 seconds before next coin (except after the last one)
-                    if idx < len(symbols) - 1:
-                        await asyncio.sleep(3)
-                        
-                except Exception as e:
-                    logger.warning(f"Error fetching data for {symbol}: {e}")
+            waits_before = total_waits()
+            fetch_started = time.time()
+            semaphore = asyncio.Semaphore(MARKET_UPDATER_CONCURRENCY)
+            results = await asyncio.gather(
+                *(_fetch_symbol_market_data(symbol, semaphore) for symbol in symbols),
+                return_exceptions=True,
+            )
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"Error fetching data for {symbol}: {result}")
                     price_results[symbol] = None
                     if symbol not in indicators_map:
-                                indicators_map[symbol] = calculate_technical_indicators([], prices_map.get(symbol, 0.0), ohlcv_data_daily=None, ohlcv_data_volume=None)
-            
-            logger.info(f"Finished price fetch for {len(symbols)} symbols, got {len(price_results)} results")
+                        indicators_map[symbol] = calculate_technical_indicators([], prices_map.get(symbol, 0.0), ohlcv_data_daily=None, ohlcv_data_volume=None)
+                    continue
+                price_results[symbol], indicators_map[symbol] = result
+
+            fetch_elapsed = time.time() - fetch_started
+            rate_limit_waits = total_waits() - waits_before
+            _last_cycle_stats.update({
+                "symbols": len(symbols),
+                "fetch_seconds": round(fetch_elapsed, 3),
+                "rate_limit_waits": rate_limit_waits,
+                "concurrency": MARKET_UPDATER_CONCURRENCY,
+            })
+            if _cycle_fetch_gauge is not None:
+                _cycle_fetch_gauge.set(fetch_elapsed)
+                _cycle_waits_gauge.set(rate_limit_waits)
+            logger.info(
+                f"Finished price fetch for {len(symbols)} symbols, got {len(price_results)} results "
+                f"in {fetch_elapsed:.2f}s (concurrency={MARKET_UPDATER_CONCURRENCY}, rate_limit_waits={rate_limit_waits})"
+            )
             
             # Process results (prices and indicators) - keep price_results for later use
             for coin in coins:
@@ -817,6 +897,8 @@ async def update_market_data():
             try:
                 db = create_db_session()
                 try:
+                    price_rows: List[Dict[str, Any]] = []
+                    data_rows: List[Dict[str, Any]] = []
                     for coin in enriched_coins:
                         symbol = coin["instrument_name"]
                         price = coin["current_price"]
@@ -827,69 +909,9 @@ async def update_market_data():
                         if price_result and price_result.success:
                             source = price_result.source
                         
-                        # Update or insert MarketPrice
-                        market_price = db.query(MarketPrice).filter(MarketPrice.symbol == symbol).first()
-                        if market_price:
-                            setattr(market_price, "price", price)
-                            setattr(market_price, "source", source)
-                            setattr(market_price, "volume_24h", coin.get("volume_24h"))
-                            setattr(market_price, "updated_at", func.now())
-                        else:
-                            market_price = MarketPrice(
-                                symbol=symbol,
-                                exchange="CRYPTO_COM",
-                                price=price,
-                                source=source,
-                                volume_24h=coin.get("volume_24h")
-                            )
-                            db.add(market_price)
-                        
-                        # Update or insert MarketData
-                        market_data = db.query(MarketData).filter(MarketData.symbol == symbol).first()
-                        if market_data:
-                            setattr(market_data, "price", price)
-                            setattr(market_data, "rsi", coin.get("rsi"))
-                            setattr(market_data, "atr", coin.get("atr"))
-                            setattr(market_data, "ma50", coin.get("ma50"))
-                            setattr(market_data, "ma200", coin.get("ma200"))
-                            setattr(market_data, "ema10", coin.get("ema10"))
-                            setattr(market_data, "ma10w", coin.get("ma10w"))
-                            setattr(market_data, "volume_24h", coin.get("volume_24h"))
-                            setattr(market_data, "current_volume", coin.get("current_volume"))
-                            setattr(market_data, "avg_volume", coin.get("avg_volume"))
-                            setattr(market_data, "volume_ratio", coin.get("volume_ratio"))
-                            setattr(
-                                market_data,
-                                "res_up",
-                                price * 1.02 if price > 0 else None,
-                            )
-                            setattr(
-                                market_data,
-                                "res_down",
-                                price * 0.98 if price > 0 else None,
-                            )
-                            setattr(market_data, "source", source)
-                            setattr(market_data, "updated_at", func.now())
-                        else:
-                            market_data = MarketData(
-                                symbol=symbol,
-                                exchange="CRYPTO_COM",
-                                price=price,
-                                rsi=coin.get("rsi"),
-                                atr=coin.get("atr"),
-                                ma50=coin.get("ma50"),
-                                ma200=coin.get("ma200"),
-                                ema10=coin.get("ema10"),
-                                ma10w=coin.get("ma10w"),
-                                volume_24h=coin.get("volume_24h"),
-                                current_volume=coin.get("current_volume"),
-                                avg_volume=coin.get("avg_volume"),
-                                volume_ratio=coin.get("volume_ratio"),
-                                res_up=price * 1.02 if price > 0 else None,
-                                res_down=price * 0.98 if price > 0 else None,
-                                source=source
-                            )
-                            db.add(market_data)
+                        price_row, data_row = market_rows_for_coin(coin, source)
+                        price_rows.append(price_row)
+                        data_rows.append(data_row)
                         
                         # CRITICAL: Also update watchlist_master table (source of truth for UI)
                         # Use a savepoint to isolate this update so it doesn't abort the main transaction
@@ -945,8 +967,24 @@ async def update_market_data():
                             # Don't fail the entire update if master table update fails
                             logger.warning(f"Error updating watchlist_master for {symbol}: {master_err}")
                     
+                    # One upsert per table (market_prices, market_data) for the whole cycle
+                    write_stats = bulk_upsert_market_rows(db, price_rows, data_rows)
+                    commit_started = time.perf_counter()
                     db.commit()
-                    logger.info(f"✅ Saved {len(enriched_coins)} market prices and data to database")
+                    write_stats["commit_ms"] = round((time.perf_counter() - commit_started) * 1000, 2)
+                    _last_cycle_stats["db_write"] = write_stats
+                    if _cycle_write_gauge is not None:
+                        _cycle_write_gauge.set((write_stats["write_ms"] + write_stats["commit_ms"]) / 1000)
+                    logger.info(
+                        "✅ Saved market data to database: market_prices=%s market_data=%s method=%s "
+                        "batches=%s write_ms=%s commit_ms=%s",
+                        write_stats["market_prices"],
+                        write_stats["market_data"],
+                        write_stats["method"],
+                        write_stats["batches"],
+                        write_stats["write_ms"],
+                        write_stats["commit_ms"],
+                    )
                     
                     # Sync watchlist to TradeSignal after updating market data
                     if SIGNAL_WRITER_AVAILABLE:
@@ -978,7 +1016,11 @@ async def update_market_data():
         save_cache_to_storage(cache_data)
         
         elapsed = time.time() - start_time
-        logger.info(f"✅ Updated market data cache, {len(enriched_coins)} items, took {elapsed:.2f} seconds")
+        _last_cycle_stats["cycle_seconds"] = round(elapsed, 3)
+        logger.info(
+            f"✅ Updated market data cache, {len(enriched_coins)} items, took {elapsed:.2f} seconds "
+            f"(rate_limit_waits={_last_cycle_stats.get('rate_limit_waits', 0)})"
+        )
         
     except Exception as e:
         logger.error(f"Error updating market data: {e}", exc_info=True)
@@ -992,6 +1034,13 @@ async def run_updater():
 
     logger.info("Market data updater worker started")
     logger.info("Update interval: 60 seconds")
+
+    # Live ticker/candle feed for this process (ENABLE_MARKET_WS); REST polling stays the fallback
+    try:
+        from app.services.websocket_manager import start_market_ws_background
+        await start_market_ws_background()
+    except Exception as e:
+        logger.warning(f"Market WebSocket not started: {e}")
     
     # Run initial update immediately
     logger.info("Running initial update...")
@@ -0,0 +1,21 @@
+-- Migration: Create dashboard_sections table (per-section dashboard state)
+-- Date: 2026-10-16
+-- Description: The dashboard state is stored as independently refreshed
+-- sections (portfolio, open orders, watchlist, signals, expected TP, bot
+-- status) instead of one dashboard_cache blob, so /dashboard/snapshot can
+-- assemble them and each section is recomputed only when its inputs change.
+--   psql -U trader -d atp -f backend/migrations/create_dashboard_sections.sql
+-- Idempotent.
+
+CREATE TABLE IF NOT EXISTS dashboard_sections (
+    name VARCHAR(50) PRIMARY KEY,
+    data JSON NOT NULL,
+    inputs_fingerprint VARCHAR(64),
+    data_hash VARCHAR(64),
+    version INTEGER NOT NULL DEFAULT 0,
+    compute_ms DOUBLE PRECISION,
+    error TEXT,
+    computed_at TIMESTAMPTZ,
+    checked_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ
+);
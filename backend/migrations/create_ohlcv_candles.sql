@@ -0,0 +1,23 @@
+-- Migration: Create ohlcv_candles table (local candle store for market_updater)
+-- Date: 2026-10-16
+-- Description: Persistent OHLCV candles keyed by (symbol, timeframe, ts) so each
+-- market_updater cycle only fetches the tail newer than the last stored candle.
+--   psql -U trader -d atp -f backend/migrations/create_ohlcv_candles.sql
+-- Idempotent.
+
+CREATE TABLE IF NOT EXISTS ohlcv_candles (
+    symbol VARCHAR(50) NOT NULL,
+    timeframe VARCHAR(8) NOT NULL,
+    ts BIGINT NOT NULL,
+    open DOUBLE PRECISION NOT NULL,
+    high DOUBLE PRECISION NOT NULL,
+    low DOUBLE PRECISION NOT NULL,
+    close DOUBLE PRECISION NOT NULL,
+    volume DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (symbol, timeframe, ts)
+);
+
+-- The primary key already indexes (symbol, timeframe, ts); drop the duplicate
+-- index created by earlier runs of this migration.
+DROP INDEX IF EXISTS ix_ohlcv_candles_symbol_tf_ts;
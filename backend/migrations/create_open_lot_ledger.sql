@@ -0,0 +1,40 @@
+-- Migration: Create open_lot_ledger tables (materialized Expected TP open lots)
+-- Date: 2026-10-16
+-- Description: Open lots per ledger scope, refreshed by exchange sync when it
+-- records fills/cancels, so Expected TP and position counts stop replaying the
+-- full order history per request. Each scope row carries a version counter the
+-- order sync bumps on fills/cancels and the version its lots were built at.
+--   psql -U trader -d atp -f backend/migrations/create_open_lot_ledger.sql
+-- Idempotent.
+
+CREATE TABLE IF NOT EXISTS open_lot_ledger (
+    id SERIAL PRIMARY KEY,
+    scope VARCHAR(50) NOT NULL,
+    position INTEGER NOT NULL,
+    symbol VARCHAR(50),
+    entry_order_id VARCHAR(100),
+    entry_time TIMESTAMPTZ,
+    entry_price VARCHAR(64) NOT NULL,
+    lot_qty VARCHAR(64) NOT NULL,
+    parent_order_id VARCHAR(100),
+    oco_group_id VARCHAR(100)
+);
+
+CREATE INDEX IF NOT EXISTS ix_open_lot_ledger_scope_position
+    ON open_lot_ledger (scope, position);
+
+CREATE TABLE IF NOT EXISTS open_lot_ledger_scopes (
+    scope VARCHAR(50) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    built_version INTEGER NOT NULL DEFAULT -1,
+    lot_count INTEGER NOT NULL DEFAULT 0,
+    rebuild_ms DOUBLE PRECISION,
+    rebuilt_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Earlier revision tracked freshness with an exchange_orders fingerprint;
+-- existing scope rows start stale (built_version -1) and are rebuilt after their next read.
+ALTER TABLE open_lot_ledger_scopes ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE open_lot_ledger_scopes ADD COLUMN IF NOT EXISTS built_version INTEGER NOT NULL DEFAULT -1;
+ALTER TABLE open_lot_ledger_scopes DROP COLUMN IF EXISTS fingerprint;
+DROP INDEX IF EXISTS ix_exchange_orders_symbol_updated_at;
@@ -0,0 +1,21 @@
+-- Migration: Create order_history_watermarks table (incremental order-history sync)
+-- Date: 2026-10-16
+-- Description: Per-instrument high-water mark (newest update_time / order id)
+-- and the end of the last stored fetch window, so each background
+-- order-history cycle only asks Crypto.com for what is newer. Deep
+-- reconciliation timestamps decide which instrument gets a full rescan.
+--   psql -U trader -d atp -f backend/migrations/create_order_history_watermarks.sql
+-- Idempotent.
+
+CREATE TABLE IF NOT EXISTS order_history_watermarks (
+    instrument_name VARCHAR(50) PRIMARY KEY,
+    last_update_time_ms BIGINT,
+    last_order_id VARCHAR(100),
+    synced_through_ms BIGINT,
+    last_synced_at TIMESTAMPTZ,
+    last_deep_sync_at TIMESTAMPTZ,
+    last_mode VARCHAR(20),
+    last_orders INTEGER,
+    last_fetch_ms DOUBLE PRECISION,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
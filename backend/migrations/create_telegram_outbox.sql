@@ -0,0 +1,28 @@
+-- Migration: Create telegram_outbox table (durable Telegram outbound queue)
+-- Date: 2026-10-16
+-- Description: Messages queued for the Telegram sender thread, so sends still
+-- pending at shutdown/crash are replayed by the next sender that claims them.
+--   psql -U trader -d atp -f backend/migrations/create_telegram_outbox.sql
+-- Idempotent.
+
+CREATE TABLE IF NOT EXISTS telegram_outbox (
+    id SERIAL PRIMARY KEY,
+    chat_destination VARCHAR(16) NOT NULL,
+    message TEXT NOT NULL,
+    reply_markup TEXT,
+    origin VARCHAR(16),
+    symbol VARCHAR(50),
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error VARCHAR(500),
+    claimed_by VARCHAR(64),
+    claimed_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_telegram_outbox_status_created
+    ON telegram_outbox (status, created_at);
+
+ALTER TABLE telegram_outbox ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(64);
+ALTER TABLE telegram_outbox ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ;
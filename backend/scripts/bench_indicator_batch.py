@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-symbol calculate_technical_indicators vs. compute_indicators_batch.
+
+Generates synthetic hourly candles for N symbols and times both paths.
+
+Usage:
+    python scripts/bench_indicator_batch.py [--symbols 120] [--candles 200] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from market_updater import calculate_technical_indicators  # noqa: E402
+from app.services.indicator_engine import compute_indicators_batch, stack_candle_series  # noqa: E402
+
+
+def _synthetic_candles(n: int, seed: int):
+    rng = random.Random(seed)
+    price = rng.uniform(0.1, 50_000)
+    out = []
+    for i in range(n):
+        o = price
+        c = max(1e-6, o * (1 + rng.uniform(-0.02, 0.02)))
+        out.append({
+            "t": i * 3_600_000,
+            "o": o,
+            "h": max(o, c) * (1 + rng.uniform(0, 0.01)),
+            "l": min(o, c) * (1 - rng.uniform(0, 0.01)),
+            "c": c,
+            "v": rng.uniform(10, 10_000),
+        })
+        price = c
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=120)
+    parser.add_argument("--candles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    series = [_synthetic_candles(args.candles, seed) for seed in range(args.symbols)]
+    prices = [s[-1]["c"] for s in series]
+
+    per_symbol = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for candles, price in zip(series, prices):
+            calculate_technical_indicators(candles, price)
+        per_symbol.append(time.perf_counter() - started)
+
+    batch = []
+    stack_times = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        stacked = stack_candle_series(series, width=args.candles)
+        stack_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        compute_indicators_batch(stacked["c"], stacked["h"], stacked["l"], stacked["v"])
+        batch.append(time.perf_counter() - started)
+
+    best_loop, best_batch, best_stack = min(per_symbol), min(batch), min(stack_times)
+    print(f"symbols={args.symbols} candles={args.candles} repeat={args.repeat}")
+    print(f"per-symbol loop : {best_loop * 1000:8.2f} ms")
+    print(f"batch (compute) : {best_batch * 1000:8.2f} ms")
+    print(f"batch (stacking): {best_stack * 1000:8.2f} ms")
+    print(f"speedup (compute only): {best_loop / best_batch:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
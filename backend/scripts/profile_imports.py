@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the backend: per-module cumulative import cost.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+reports the modules with the largest cumulative cost, plus self time rolled up
+per top-level package (``app.jarvis``, ``boto3``, ``pandas`` ...) so heavy
+dependency chains stand out. Use it to decide what belongs behind the lazy
+router registry (app/api/router_registry.py).
+
+Usage:
+    python scripts/profile_imports.py [--module app.factory] [--top 30] [--depth 2] [--json]
+    python scripts/profile_imports.py --module app.api.routes_jarvis   # cost deferred to first /api/jarvis request
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+backend_dir = Path(__file__).parent.parent
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Parse ``-X importtime`` lines into {module, self_us, cumulative_us, depth}."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header row
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({"module": name.strip(), "self_us": self_us, "cumulative_us": cumulative_us, "depth": depth})
+    return rows
+
+
+def rollup(rows: List[Dict], depth: int) -> Dict[str, int]:
+    """Self time summed per package prefix of ``depth`` dotted components."""
+    totals: Dict[str, int] = {}
+    for r in rows:
+        key = ".".join(r["module"].split(".")[:depth])
+        totals[key] = totals.get(key, 0) + r["self_us"]
+    return totals
+
+
+def profile(module: str) -> List[Dict]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(backend_dir),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-15:])
+        raise SystemExit(f"import {module} failed:\n{tail}")
+    return parse_importtime(proc.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.factory")
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--depth", type=int, default=2, help="package depth for the rollup (default 2)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    total_us = sum(r["self_us"] for r in rows)
+    by_cumulative = sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[: args.top]
+    by_package = sorted(rollup(rows, args.depth).items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "modules_imported": len(rows),
+            "total_ms": round(total_us / 1000, 1),
+            "top_cumulative": by_cumulative,
+            "top_packages": [{"package": k, "self_us": v} for k, v in by_package],
+        }, indent=2))
+        return
+
+    print(f"import {args.module}: {len(rows)} modules, {total_us / 1000:.1f}ms total")
+    print(f"\nTop {len(by_cumulative)} modules by cumulative import time:")
+    print(f"  {'cumulative ms':>13}  {'self ms':>8}  module")
+    for r in by_cumulative:
+        print(f"  {r['cumulative_us'] / 1000:>13.1f}  {r['self_us'] / 1000:>8.1f}  {r['module']}")
+    print(f"\nTop {len(by_package)} packages by self time (depth {args.depth}):")
+    for pkg, us in by_package:
+        print(f"  {us / 1000:>13.1f}  {pkg}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Replay stored OHLCV candles through the live strategy code and report trades,
+PnL, hit rate and drawdown per (symbol, preset, risk approach).
+
+Candles come from the ohlcv_candles table (candle_store) or from a JSON file
+shaped like ``{"BTC_USDT": [{"t", "o", "h", "l", "c", "v"}, ...]}``.
+
+Usage:
+    python scripts/run_backtest.py --symbols BTC_USDT,ETH_USDT [--limit 8760]
+    python scripts/run_backtest.py --candles-json candles.json --presets swing:conservative,scalp:aggressive
+    python scripts/run_backtest.py --symbols BTC_USDT --sl-pct 3 --tp-pct 6 --json report.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.backtest_engine import BacktestConfig, run_backtest, summarize_results  # noqa: E402
+from app.services.strategy_profiles import RiskApproach, StrategyType  # noqa: E402
+
+
+def _parse_presets(raw: str):
+    if not raw:
+        return [(s, r) for s in StrategyType for r in RiskApproach]
+    presets = []
+    for item in raw.split(","):
+        strategy, _, risk = item.strip().partition(":")
+        presets.append((StrategyType(strategy.lower()), RiskApproach((risk or "conservative").lower())))
+    return presets
+
+
+def _load_from_db(symbols, timeframe: str, limit: int):
+    from app.database import SessionLocal
+    from app.services.candle_store import load_candles
+
+    if SessionLocal is None:
+        raise SystemExit("Database not configured; use --candles-json")
+    db = SessionLocal()
+    try:
+        return {symbol: load_candles(db, symbol, timeframe, limit) for symbol in symbols}
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", default="", help="Comma-separated symbols (database source)")
+    parser.add_argument("--candles-json", help="Read candles from this JSON file instead of the database")
+    parser.add_argument("--timeframe", default="1h")
+    parser.add_argument("--limit", type=int, default=24 * 365)
+    parser.add_argument("--presets", default="", help="strategy:risk pairs, default all")
+    parser.add_argument("--position-size", type=float, default=100.0)
+    parser.add_argument("--fee-pct", type=float, default=0.1)
+    parser.add_argument("--min-price-change-pct", type=float)
+    parser.add_argument("--sl-pct", type=float)
+    parser.add_argument("--tp-pct", type=float)
+    parser.add_argument("--no-sell-exit", action="store_true", help="Ignore SELL signals; exit on TP/SL only")
+    parser.add_argument("--slow", action="store_true", help="Per-candle legacy indicators and every decision")
+    parser.add_argument("--json", help="Write per-symbol results and the summary to this file")
+    args = parser.parse_args()
+
+    if args.candles_json:
+        candles_by_symbol = json.loads(Path(args.candles_json).read_text())
+    else:
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+        if not symbols:
+            parser.error("--symbols or --candles-json is required")
+        candles_by_symbol = _load_from_db(symbols, args.timeframe, args.limit)
+
+    config = BacktestConfig(
+        position_size_usd=args.position_size,
+        fee_pct=args.fee_pct,
+        min_price_change_pct=args.min_price_change_pct,
+        sl_pct=args.sl_pct,
+        tp_pct=args.tp_pct,
+        exit_on_sell_signal=not args.no_sell_exit,
+        timeframe=args.timeframe,
+        fast=not args.slow,
+    )
+    started = time.perf_counter()
+    results = run_backtest(candles_by_symbol, _parse_presets(args.presets), config)
+    elapsed = time.perf_counter() - started
+    summary = summarize_results(results)
+
+    bars = sum(len(c) for c in candles_by_symbol.values())
+    print(f"symbols={len(candles_by_symbol)} candles={bars} runs={len(results)} elapsed={elapsed:.2f}s")
+    print(f"{'preset':<12}{'risk':<14}{'trades':>8}{'hit rate':>10}{'pnl usd':>12}{'worst dd %':>12}")
+    for row in summary:
+        hit = f"{row['hit_rate']:.1%}" if row["hit_rate"] is not None else "-"
+        print(
+            f"{row['preset']:<12}{row['risk_approach']:<14}{row['trades']:>8}{hit:>10}"
+            f"{row['pnl_usd']:>12.2f}{row['worst_drawdown_pct']:>12.2f}"
+        )
+
+    if args.json:
+        report = {"summary": summary, "results": [r.to_dict(include_trades=True) for r in results]}
+        Path(args.json).write_text(json.dumps(report, indent=2, default=str))
+        print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
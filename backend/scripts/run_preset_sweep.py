@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Sweep strategy preset fields with the backtest engine and propose a preset diff.
+
+The search space is a JSON file:
+    {"grid": {"rsi.buyBelow": [30, 35, 40], "maChecks.ma200": [true, false]}}
+    {"random": {"rsi.buyBelow": {"min": 25, "max": 50, "step": 1}, "volumeMinRatio": [0.5, 1.0, 1.5]},
+     "samples": 300, "seed": 7}
+
+Candles come from the ohlcv_candles table (candle_store) or a JSON file shaped
+like ``{"BTC_USDT": [{"t", "o", "h", "l", "c", "v"}, ...]}``.
+
+Usage:
+    python scripts/run_preset_sweep.py --space space.json --symbols BTC_USDT,ETH_USDT --presets swing:conservative
+    python scripts/run_preset_sweep.py --space space.json --candles-json candles.json \\
+        --checkpoint sweep.jsonl --diff-out swing_diff.json --workers 8
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.backtest_engine import BacktestConfig  # noqa: E402
+from app.services.preset_sweep import (  # noqa: E402
+    OBJECTIVES,
+    SearchSpace,
+    build_preset_diff,
+    rank_results,
+    run_sweep,
+)
+from app.services.strategy_profiles import RiskApproach, StrategyType  # noqa: E402
+
+
+def _parse_presets(raw: str):
+    presets = []
+    for item in raw.split(","):
+        strategy, _, risk = item.strip().partition(":")
+        presets.append((StrategyType(strategy.lower()), RiskApproach((risk or "conservative").lower())))
+    return presets
+
+
+def _load_from_db(symbols, timeframe: str, limit: int):
+    from app.database import SessionLocal
+    from app.services.candle_store import load_candles
+
+    if SessionLocal is None:
+        raise SystemExit("Database not configured; use --candles-json")
+    db = SessionLocal()
+    try:
+        return {symbol: load_candles(db, symbol, timeframe, limit) for symbol in symbols}
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--space", required=True, help="Search space JSON file")
+    parser.add_argument("--presets", default="swing:conservative", help="strategy:risk pairs")
+    parser.add_argument("--symbols", default="", help="Comma-separated symbols (database source)")
+    parser.add_argument("--candles-json", help="Read candles from this JSON file instead of the database")
+    parser.add_argument("--timeframe", default="1h")
+    parser.add_argument("--limit", type=int, default=24 * 365)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--checkpoint", help="JSONL file to resume from and append results to")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="pnl_usd")
+    parser.add_argument("--min-trades", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--fee-pct", type=float, default=0.1)
+    parser.add_argument("--diff-out", help="Write the best candidate's preset diff to this file")
+    args = parser.parse_args()
+
+    space = SearchSpace.from_dict(json.loads(Path(args.space).read_text()))
+    if args.candles_json:
+        candles_by_symbol = json.loads(Path(args.candles_json).read_text())
+    else:
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+        if not symbols:
+            parser.error("--symbols or --candles-json is required")
+        candles_by_symbol = _load_from_db(symbols, args.timeframe, args.limit)
+
+    started = time.perf_counter()
+
+    def progress(done: int, total: int, _result) -> None:
+        if done == total or done % 25 == 0:
+            print(f"  {done}/{total} candidates ({time.perf_counter() - started:.1f}s)", flush=True)
+
+    results = run_sweep(
+        candles_by_symbol,
+        _parse_presets(args.presets),
+        space,
+        BacktestConfig(fee_pct=args.fee_pct, timeframe=args.timeframe),
+        workers=args.workers,
+        checkpoint=Path(args.checkpoint) if args.checkpoint else None,
+        progress=progress,
+    )
+    ranked = rank_results(results, objective=args.objective, min_trades=args.min_trades)
+    print(f"candidates={len(results)} ranked={len(ranked)} elapsed={time.perf_counter() - started:.1f}s")
+    for r in ranked[:args.top]:
+        hit = f"{r.hit_rate:.1%}" if r.hit_rate is not None else "-"
+        overrides = json.dumps(r.overrides, sort_keys=True) if r.overrides else "(baseline)"
+        print(f"{r.score:>12.4f}  {r.preset}/{r.risk_mode:<12} trades={r.trades:<5} hit={hit:<6} {overrides}")
+
+    if not ranked:
+        print("no candidate reached --min-trades")
+        return
+    diff = build_preset_diff(ranked[0], results)
+    print(json.dumps(diff["changes"], indent=2) if diff["changes"] else "baseline is best; no changes proposed")
+    if args.diff_out:
+        Path(args.diff_out).write_text(json.dumps(diff, indent=2, default=str))
+        print(f"wrote {args.diff_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Verify the open-lot ledger against a from-scratch FIFO replay of order history.
+
+Exits non-zero when any scope differs. ``--rebuild`` first rebuilds the given
+scopes (or every built scope) and commits, e.g. after deploying the ledger.
+
+Usage:
+    python scripts/verify_open_lot_ledger.py [--scopes BTC,ETH_USDT] [--rebuild] [--json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.database import SessionLocal  # noqa: E402
+from app.models.open_lot_ledger import OpenLotLedgerScope  # noqa: E402
+from app.services.open_lot_ledger import rebuild_scope, verify_ledger  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scopes", default="", help="Comma-separated scopes (default: every built scope)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the scopes before verifying")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Database not configured")
+        return 2
+    db = SessionLocal()
+    try:
+        scopes = [s.strip().upper() for s in args.scopes.split(",") if s.strip()] or None
+        if args.rebuild:
+            targets = scopes or [s for (s,) in db.query(OpenLotLedgerScope.scope).all()]
+            for scope in targets:
+                rebuild_scope(db, scope)
+            db.commit()
+            print(f"rebuilt {len(targets)} scope(s)")
+        report = verify_ledger(db, scopes)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for scope, entry in report["scopes"].items():
+            state = "OK" if entry["ok"] else ("STALE" if not entry["fresh"] else "MISMATCH")
+            print(f"{scope:<16} {state:<9} ledger={entry['ledger_lots']:<4} replay={entry['replayed_lots']}")
+            for lot in entry["missing"]:
+                print(f"    missing {lot}")
+            for lot in entry["extra"]:
+                print(f"    extra   {lot}")
+        print("parity OK" if report["ok"] else "parity FAILED")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Backtest engine: fast path parity with the legacy indicators, exit mechanics, metrics."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.services.backtest_engine import (
+    BacktestConfig,
+    BacktestTrade,
+    _check_exit,
+    precompute_indicator_series,
+    reference_indicator_series,
+    run_backtest,
+    run_symbol_backtest,
+    summarize_results,
+)
+from app.services.strategy_profiles import RiskApproach, StrategyType
+
+SCALP = (StrategyType.SCALP, RiskApproach.AGGRESSIVE)
+
+# Permissive preset: trend filters off, volume gate off, 1.5x ATR stop / 2R target
+RULES = {
+    "rsi": {"buyBelow": 45, "sellAbove": 70},
+    "maChecks": {"ema10": False, "ma50": False, "ma200": False},
+    "sl": {"atrMult": 1.5},
+    "tp": {"rr": 2.0},
+    "volumeMinRatio": 0.0,
+    "minPriceChangePct": 1.0,
+}
+
+
+def _candles(n, seed=3, start=100.0, vol=0.012):
+    rng = random.Random(seed)
+    out, price = [], start
+    for i in range(n):
+        o = price
+        c = max(0.01, o * (1 + rng.gauss(0, vol)))
+        h = max(o, c) * (1 + rng.uniform(0, 0.006))
+        low = min(o, c) * (1 - rng.uniform(0, 0.006))
+        out.append({"t": i * 3_600_000, "o": o, "h": h, "l": low, "c": c, "v": rng.uniform(10, 1000)})
+        price = c
+    return out
+
+
+def _trade_keys(result):
+    return [(t.entry_ts, t.exit_ts, t.exit_reason, round(t.pnl_usd, 8)) for t in result.trades]
+
+
+def test_precomputed_series_match_market_updater_per_candle():
+    candles = _candles(24 * 40)
+    fast = precompute_indicator_series(candles)
+    ref = reference_indicator_series(candles)
+    for key in ("rsi", "ma50", "ma200", "ema10", "ma10w", "atr", "current_volume", "avg_volume"):
+        assert np.isnan(fast[key][:199]).all()
+        np.testing.assert_allclose(fast[key][199:], ref[key][199:], rtol=1e-9, atol=1e-9, err_msg=key)
+
+
+def test_fast_path_produces_same_trades_as_full_replay():
+    candles = _candles(24 * 50, seed=11)
+    fast = run_symbol_backtest("AAA_USDT", candles, *SCALP, BacktestConfig(min_price_change_pct=1.0), rules=RULES)
+    slow = run_symbol_backtest(
+        "AAA_USDT", candles, *SCALP, BacktestConfig(min_price_change_pct=1.0, fast=False), rules=RULES
+    )
+    assert fast.trades, "fixture should trade"
+    assert _trade_keys(fast) == _trade_keys(slow)
+    assert fast.signals == slow.signals
+    assert fast.max_drawdown_usd == pytest.approx(slow.max_drawdown_usd)
+    # Only RSI candidates are evaluated on the fast path
+    assert fast.evaluated < slow.evaluated == len(candles) - 199
+
+
+def test_exit_checks_stop_before_target_and_fills_gaps_at_open():
+    trade = BacktestTrade("AAA_USDT", 0, 100.0, sl=95.0, tp=110.0)
+    assert _check_exit(trade, {"o": 100, "h": 111, "l": 94}) == (95.0, "SL")
+    assert _check_exit(trade, {"o": 92, "h": 93, "l": 90}) == (92.0, "SL")
+    assert _check_exit(trade, {"o": 112, "h": 115, "l": 111}) == (112.0, "TP")
+    assert _check_exit(trade, {"o": 100, "h": 109, "l": 96}) is None
+
+
+def test_fixed_percentage_exits_and_trade_accounting():
+    candles = _candles(24 * 30, seed=5)
+    config = BacktestConfig(min_price_change_pct=1.0, sl_pct=2.0, tp_pct=4.0, exit_on_sell_signal=False, fee_pct=0.0)
+    result = run_symbol_backtest("AAA_USDT", candles, *SCALP, config, rules=RULES)
+    assert result.trades
+    for t in result.trades:
+        assert t.sl == pytest.approx(t.entry_price * 0.98, rel=1e-3)
+        assert t.tp == pytest.approx(t.entry_price * 1.04, rel=1e-3)
+        assert t.exit_reason in ("TP", "SL", "END")
+        assert t.pnl_usd == pytest.approx(100.0 / t.entry_price * (t.exit_price - t.entry_price))
+        assert t.pnl_pct == pytest.approx(t.pnl_usd)
+    closed = result.closed_trades
+    assert result.hit_rate == pytest.approx(sum(t.pnl_usd > 0 for t in closed) / len(closed))
+    # one position at a time: every entry comes after the previous exit
+    for prev, nxt in zip(result.trades, result.trades[1:]):
+        assert nxt.entry_ts >= prev.exit_ts
+
+
+def test_throttle_price_gate_suppresses_repeated_signals():
+    candles = _candles(24 * 30, seed=5)
+    loose = run_symbol_backtest("AAA_USDT", candles, *SCALP, BacktestConfig(min_price_change_pct=0.0), rules=RULES)
+    tight = run_symbol_backtest("AAA_USDT", candles, *SCALP, BacktestConfig(min_price_change_pct=5.0), rules=RULES)
+    assert tight.signals["buy"] < loose.signals["buy"]
+    assert tight.signals["buy_throttled"] > loose.signals["buy_throttled"]
+    assert len(tight.trades) <= len(loose.trades)
+
+
+def test_drawdown_tracks_mark_to_market_equity():
+    # Steady decline after the warmup: every BUY loses, drawdown equals the realized loss
+    candles = _candles(260, seed=1, vol=0.0)
+    for i, c in enumerate(candles[200:], start=200):
+        price = 100.0 * (0.99 ** (i - 199))
+        c.update(o=price / 0.99, h=price / 0.99, l=price, c=price)
+    result = run_symbol_backtest(
+        "AAA_USDT", candles, *SCALP, BacktestConfig(min_price_change_pct=0.5, fee_pct=0.0), rules=RULES
+    )
+    assert result.trades
+    assert result.pnl_usd < 0
+    assert result.max_drawdown_usd == pytest.approx(-result.pnl_usd, rel=1e-6)
+    assert result.hit_rate in (None, 0.0)
+
+
+def test_run_backtest_reports_every_symbol_and_preset():
+    data = {"AAA_USDT": _candles(24 * 20, seed=2), "BBB_USDT": _candles(24 * 20, seed=4)}
+    presets = [SCALP, (StrategyType.SWING, RiskApproach.CONSERVATIVE)]
+    rules = {SCALP: RULES, presets[1]: dict(RULES, rsi={"buyBelow": None, "sellAbove": 70})}
+    results = run_backtest(data, presets, BacktestConfig(min_price_change_pct=1.0), rules_by_preset=rules)
+    assert [(r.symbol, r.preset, r.risk_approach) for r in results] == [
+        ("AAA_USDT", "scalp", "aggressive"),
+        ("AAA_USDT", "swing", "conservative"),
+        ("BBB_USDT", "scalp", "aggressive"),
+        ("BBB_USDT", "swing", "conservative"),
+    ]
+    # buyBelow=None blocks every BUY
+    assert all(not r.trades for r in results if r.preset == "swing")
+    summary = summarize_results(results)
+    assert {(row["preset"], row["symbols"]) for row in summary} == {("scalp", 2), ("swing", 2)}
+    scalp = next(row for row in summary if row["preset"] == "scalp")
+    assert scalp["trades"] == sum(len(r.trades) for r in results if r.preset == "scalp")
+    assert results[0].to_dict()["signals"] == results[0].signals
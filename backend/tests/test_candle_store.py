@@ -0,0 +1,130 @@
+"""Local OHLCV candle store: only the tail newer than the last stored candle is fetched."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.ohlcv_candle import OhlcvCandle
+from app.services import candle_store
+from app.services.candle_store import (
+    candles_to_request,
+    fetch_candles_incremental,
+    load_candles,
+    load_recent_candles,
+)
+
+HOUR = 3_600_000
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine, tables=[OhlcvCandle.__table__])
+    session = session_local()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=[OhlcvCandle.__table__])
+        engine.dispose()
+
+
+class _FakeExchange:
+    """Serves hourly candles ending at ``now``; records every requested count."""
+
+    def __init__(self, now_ms: int):
+        self.now_ms = now_ms
+        self.calls = []
+
+    def __call__(self, symbol, interval="1h", limit=200):
+        self.calls.append(limit)
+        last = self.now_ms - (self.now_ms % HOUR)
+        return [
+            {"t": last - i * HOUR, "o": 1.0, "h": 2.0, "l": 0.5, "c": float(i), "v": 10.0}
+            for i in reversed(range(limit))
+        ]
+
+
+def test_candles_to_request():
+    assert candles_to_request(None, "1h", 200, 10 * HOUR) == 200
+    assert candles_to_request(10 * HOUR, "1h", 200, 10 * HOUR + 5) == 1
+    assert candles_to_request(8 * HOUR, "1h", 200, 10 * HOUR + 5) == 3
+    assert candles_to_request(0, "1h", 200, 500 * HOUR) == 200
+
+
+def test_cold_then_incremental_fetch(db_session):
+    now = 1_000 * HOUR + 60_000
+    exchange = _FakeExchange(now)
+
+    first = fetch_candles_incremental(db_session, "BTC_USDT", "1h", 200, exchange, now_ms=now)
+    assert len(first) == 200
+    assert exchange.calls == [200]
+
+    exchange.now_ms = now + 2 * HOUR
+    second = fetch_candles_incremental(db_session, "BTC_USDT", "1h", 200, exchange, now_ms=now + 2 * HOUR)
+    assert exchange.calls[-1] == 3  # re-fetch the open candle + 2 new ones
+    assert len(second) == 200
+    assert second[-1]["t"] == first[-1]["t"] + 2 * HOUR
+    assert [c["t"] for c in second] == sorted({c["t"] for c in second})
+    assert load_candles(db_session, "BTC_USDT", "1h", 500)[-1]["t"] == second[-1]["t"]
+
+    stats = candle_store.get_candle_store_stats()
+    assert stats["incremental_fetches"] >= 1
+
+
+def test_retention_is_bounded(db_session):
+    now = 1_000 * HOUR
+    exchange = _FakeExchange(now)
+    fetch_candles_incremental(db_session, "ETH_USDT", "1h", 10, exchange, now_ms=now)
+    for step in range(1, 30):
+        exchange.now_ms = now + step * HOUR
+        fetch_candles_incremental(db_session, "ETH_USDT", "1h", 10, exchange, now_ms=exchange.now_ms)
+    count = db_session.query(OhlcvCandle).filter(OhlcvCandle.symbol == "ETH_USDT").count()
+    assert count <= 10 * candle_store.RETENTION_MULTIPLIER
+
+
+def test_exchange_down_serves_stored(db_session):
+    now = 1_000 * HOUR
+    fetch_candles_incremental(db_session, "SOL_USDT", "1h", 50, _FakeExchange(now), now_ms=now)
+    out = fetch_candles_incremental(
+        db_session, "SOL_USDT", "1h", 50, lambda *a, **k: None, now_ms=now + HOUR
+    )
+    assert out is not None and len(out) == 50
+
+
+def test_load_recent_candles_rejects_stale_series(db_session):
+    now = 1_000 * HOUR
+    fetch_candles_incremental(db_session, "ADA_USDT", "1h", 20, _FakeExchange(now), now_ms=now)
+    assert load_recent_candles(db_session, "ADA_USDT", "1h", 20, now_ms=now + HOUR)
+    assert load_recent_candles(db_session, "ADA_USDT", "1h", 20, now_ms=now + 5 * HOUR) is None
+
+
+def test_short_stored_series_is_backfilled(db_session):
+    now = 1_000 * HOUR
+    exchange = _FakeExchange(now)
+    # A partial fetch left only 30 of the 200 candles the indicators need
+    fetch_candles_incremental(db_session, "DOT_USDT", "1h", 30, exchange, now_ms=now)
+
+    exchange.now_ms = now + HOUR
+    out = fetch_candles_incremental(db_session, "DOT_USDT", "1h", 200, exchange, now_ms=now + HOUR)
+    assert exchange.calls[-1] == 200
+    assert len(out) == 200
+
+    exchange.now_ms = now + 2 * HOUR
+    fetch_candles_incremental(db_session, "DOT_USDT", "1h", 200, exchange, now_ms=now + 2 * HOUR)
+    assert exchange.calls[-1] == 2  # full window stored: tail only from now on
+
+
+def test_gapped_stored_series_is_refetched(db_session):
+    now = 1_000 * HOUR
+    exchange = _FakeExchange(now)
+    fetch_candles_incremental(db_session, "XRP_USDT", "1h", 50, exchange, now_ms=now)
+    middle = load_candles(db_session, "XRP_USDT", "1h", 50)[25]["t"]
+    db_session.query(OhlcvCandle).filter(OhlcvCandle.symbol == "XRP_USDT", OhlcvCandle.ts == middle).delete()
+    db_session.commit()
+
+    out = fetch_candles_incremental(db_session, "XRP_USDT", "1h", 50, exchange, now_ms=now + HOUR)
+    assert exchange.calls[-1] == 50
+    assert [c["t"] for c in out] == [out[0]["t"] + i * HOUR for i in range(50)]
@@ -0,0 +1,110 @@
+"""Config snapshot cache: no file read/parse on the hot path, explicit and mtime-based invalidation."""
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.services import config_loader
+from app.services.config_loader import (
+    get_alert_thresholds,
+    get_config_snapshot_stats,
+    get_strategy_rules,
+    invalidate_config_snapshot,
+    load_config,
+    save_config,
+)
+from app.services.strategy_profiles import invalidate_config_cache
+
+
+def _rules(buy_below, vol=1.0):
+    return {
+        "rsi": {"buyBelow": buy_below, "sellAbove": 70},
+        "maChecks": {"ema10": True, "ma50": True, "ma200": False},
+        "volumeMinRatio": vol,
+        "minPriceChangePct": 2.0,
+        "alertCooldownMinutes": 5,
+        "sl": {"atrMult": 1.5},
+        "tp": {"rr": 1.5},
+    }
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    cfg = {
+        "defaults": {"preset": "swing", "alert_cooldown_minutes": 1, "alert_min_price_change_pct": 1.0},
+        "presets": {"scalp": {"RSI_BUY": 45, "RSI_SELL": 60, "ALERT_COOLDOWN_MINUTES": 3}},
+        "strategy_rules": {
+            "swing": {"notificationProfile": "swing", "rules": {"Conservative": _rules(31), "Aggressive": _rules(41)}},
+        },
+        "coins": {"BTC_USDT": {"preset": "scalp", "overrides": {"ALERT_MIN_PRICE_CHANGE_PCT": 0.7}}},
+    }
+    path = tmp_path / "trading_config.json"
+    path.write_text(json.dumps(cfg))
+    monkeypatch.setenv("TRADING_CONFIG_PATH", str(path))
+    invalidate_config_snapshot()
+    yield path
+    invalidate_config_snapshot()
+
+
+def test_hot_path_does_not_read_or_parse(config_file):
+    first = get_strategy_rules("swing", "Aggressive")
+    assert first["rsi"]["buyBelow"] == 41
+    loads = get_config_snapshot_stats()["loads"]
+    with patch.object(config_loader.json, "loads", side_effect=AssertionError("parsed")), \
+         patch.object(config_loader, "_normalize_config", side_effect=AssertionError("normalized")):
+        for _ in range(50):
+            assert get_strategy_rules("SWING", "aggressive") == first
+            assert get_strategy_rules("swing", "bogus")["rsi"]["buyBelow"] == 31
+            get_alert_thresholds("BTC_USDT", "Conservative")
+    stats = get_config_snapshot_stats()
+    assert stats["loads"] == loads
+    assert stats["cached_path"] == str(config_file)
+
+
+def test_returned_values_are_private_copies(config_file):
+    rules = get_strategy_rules("swing", "Conservative")
+    rules["rsi"]["buyBelow"] = 99
+    rules["maChecks"]["ema10"] = False
+    assert get_strategy_rules("swing", "Conservative")["rsi"]["buyBelow"] == 31
+    cfg = load_config()
+    cfg["strategy_rules"]["swing"]["rules"]["Conservative"]["volumeMinRatio"] = 9.0
+    assert get_strategy_rules("swing", "Conservative")["volumeMinRatio"] == 1.0
+
+
+def test_save_config_invalidates(config_file):
+    assert get_strategy_rules("swing", "Conservative")["rsi"]["buyBelow"] == 31
+    cfg = load_config()
+    cfg["strategy_rules"]["swing"]["rules"]["Conservative"]["rsi"]["buyBelow"] = 27
+    # Same size and mtime as far as the stat key can tell: only the explicit hook can notice.
+    st = config_file.stat()
+    save_config(cfg)
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert get_strategy_rules("swing", "Conservative")["rsi"]["buyBelow"] == 27
+
+
+def test_external_edit_detected_by_file_key(config_file):
+    assert get_alert_thresholds("BTC_USDT") == (0.7, 3)
+    cfg = json.loads(config_file.read_text())
+    cfg["coins"]["BTC_USDT"]["overrides"]["ALERT_MIN_PRICE_CHANGE_PCT"] = 0.25
+    config_file.write_text(json.dumps(cfg))
+    st = config_file.stat()
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert get_alert_thresholds("BTC_USDT") == (0.25, 3)
+
+
+def test_strategy_profiles_invalidation_is_coherent(config_file):
+    get_strategy_rules("swing")
+    loads = get_config_snapshot_stats()["loads"]
+    invalidate_config_cache()
+    get_strategy_rules("swing")
+    assert get_config_snapshot_stats()["loads"] == loads + 1
+
+
+def test_precomputed_tables_match_legacy_fallback(config_file):
+    # Legacy "presets" entry and an unknown preset both resolve to the old defaults.
+    scalp = get_strategy_rules("scalp", "Conservative")
+    assert scalp["rsi"] == {"buyBelow": 45, "sellAbove": 60}
+    assert scalp["alertCooldownMinutes"] == 3
+    unknown = get_strategy_rules("intraday", "Aggressive")
+    assert unknown["maChecks"] == {"ema10": True, "ma50": True, "ma200": False}
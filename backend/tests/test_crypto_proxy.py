@@ -0,0 +1,146 @@
+"""crypto_proxy.py: concurrent upstream relay, non-blocking egress-IP refresh, error mapping (httpx MockTransport)."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+TOKEN = "test-proxy-token"
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    monkeypatch.setenv("CRYPTO_API_KEY", "test-api-key-1234")
+    monkeypatch.setenv("CRYPTO_API_SECRET", "test-api-secret-5678")
+    monkeypatch.setenv("CRYPTO_PROXY_TOKEN", TOKEN)
+    monkeypatch.setenv("PROXY_MAX_CONCURRENCY", "2")
+    spec = importlib.util.spec_from_file_location("crypto_proxy_under_test", REPO_ROOT / "crypto_proxy.py")
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(mod)
+    mod._egress.update({"ip": "203.0.113.7", "checked_at": time.time(), "refreshing": False})
+    return mod
+
+
+def _install_upstream(mod, handler) -> None:
+    mod._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _call(mod, method: str = "private/get-open-orders") -> httpx.Response:
+    transport = httpx.ASGITransport(app=mod.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://proxy") as client:
+        return await client.post(
+            "/proxy/private",
+            json={"method": method, "params": {}},
+            headers={"X-Proxy-Token": TOKEN},
+        )
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"code": 0, "result": {"data": []}})
+
+
+def test_requests_overlap_up_to_max_concurrency(proxy):
+    active = {"now": 0, "max": 0}
+
+    async def handler(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.1)
+        active["now"] -= 1
+        return _ok(request)
+
+    async def run():
+        _install_upstream(proxy, handler)
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(_call(proxy) for _ in range(5)))
+        return responses, time.perf_counter() - started
+
+    responses, elapsed = asyncio.run(run())
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert all(r.json()["status"] == 200 for r in responses)
+    # Two upstream calls at a time: overlapped, but never above the limit (3 waves of 0.1s).
+    assert active["max"] == 2
+    assert elapsed >= 0.3
+    m = proxy._metrics
+    assert m["requests"] == 5
+    assert m["max_in_flight"] == 2
+    assert m["max_queued"] == 3
+    assert m["in_flight"] == 0 and m["queued"] == 0
+    assert m["queue_wait_ms_total"] > 0
+
+
+def test_stale_egress_ip_refreshes_in_background(proxy):
+    proxy._egress["checked_at"] = 0.0  # stale
+
+    async def run():
+        release = asyncio.Event()
+        ipify_started = asyncio.Event()
+
+        async def handler(request):
+            if request.url.host == "api.ipify.org":
+                ipify_started.set()
+                await release.wait()
+                return httpx.Response(200, text="198.51.100.9")
+            return _ok(request)
+
+        _install_upstream(proxy, handler)
+        response = await asyncio.wait_for(_call(proxy), timeout=2)
+        # The proxied call finished while the egress probe is still waiting.
+        assert ipify_started.is_set()
+        assert proxy._egress["refreshing"] is True
+        assert proxy._egress["ip"] == "203.0.113.7"
+        release.set()
+        for _ in range(100):
+            if not proxy._egress["refreshing"]:
+                break
+            await asyncio.sleep(0.01)
+        return response
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert proxy._egress["ip"] == "198.51.100.9"
+    assert proxy._egress["refreshing"] is False
+    assert proxy._egress["checked_at"] > 0
+
+
+def test_upstream_timeout_maps_to_504(proxy):
+    def handler(request):
+        raise httpx.ReadTimeout("upstream too slow", request=request)
+
+    async def run():
+        _install_upstream(proxy, handler)
+        return await _call(proxy)
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 504
+    assert response.json()["body"] == {"error": "Crypto.com API timeout"}
+    assert proxy._metrics["upstream_timeouts"] == 1
+    assert proxy._metrics["upstream_errors"] == 0
+    assert proxy._methods["private/get-open-orders"]["errors"] == 1
+
+
+def test_upstream_http_error_maps_to_502(proxy):
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def run():
+        _install_upstream(proxy, handler)
+        return await _call(proxy)
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 502
+    assert "connection refused" in response.json()["body"]["error"]
+    assert proxy._metrics["upstream_errors"] == 1
+    assert proxy._metrics["upstream_timeouts"] == 0
+    assert proxy._metrics["in_flight"] == 0
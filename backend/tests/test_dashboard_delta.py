@@ -0,0 +1,125 @@
+"""Dashboard ETags, versions and ?since deltas."""
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from app.api.routes_dashboard import get_dashboard_snapshot_endpoint
+from app.database import Base
+from app.models.dashboard_cache import DashboardCache, DashboardSection
+from app.services import dashboard_sections
+from app.services.dashboard_delta import (
+    DashboardVersions,
+    build_delta,
+    content_etag,
+    if_none_match,
+    reset_dashboard_versions_for_tests,
+)
+from app.services.dashboard_sections import SectionSpec, refresh_dashboard_sections
+
+
+def _request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/dashboard/snapshot", "headers": headers, "query_string": b""})
+
+
+def test_versions_increase_only_when_the_etag_changes():
+    versions = DashboardVersions(history=2)
+    v1 = versions.observe("a", {"n": 1})
+    assert versions.observe("a", {"n": 1}) == v1
+    v2 = versions.observe("b", {"n": 2})
+    v3 = versions.observe("c", {"n": 3})
+    assert v1 < v2 < v3
+    # Only the last two payloads are kept for deltas
+    assert versions.get(v1) is None and versions.get(v2) == {"n": 2}
+
+
+def test_build_delta_reports_changed_and_removed_rows():
+    old = {
+        "watchlist": [{"symbol": "BTC_USDT", "price": 1}, {"symbol": "ETH_USDT", "price": 2}],
+        "open_orders": [{"order_id": "1", "status": "NEW"}],
+        "portfolio": {"assets": [{"currency": "BTC", "balance": 1}], "total_value_usd": 10},
+        "balances": [{"currency": "BTC", "balance": 1}],
+        "total_usd_value": 10,
+        "bot_status": {"is_running": True},
+    }
+    new = json.loads(json.dumps(old))
+    new["watchlist"][0]["price"] = 5
+    new["watchlist"].pop()
+    new["open_orders"].append({"order_id": "2", "status": "NEW"})
+    new["portfolio"]["assets"][0]["balance"] = 2
+    new["portfolio"]["total_value_usd"] = 20
+    new["balances"][0]["balance"] = 2
+    new["total_usd_value"] = 20
+
+    delta = build_delta(old, new)
+    assert delta["changed"] == {
+        "watchlist": [{"symbol": "BTC_USDT", "price": 5}],
+        "open_orders": [{"order_id": "2", "status": "NEW"}],
+        "portfolio_assets": [{"currency": "BTC", "balance": 2}],
+    }
+    assert delta["removed"] == {"watchlist": ["ETH_USDT"], "open_orders": [], "portfolio_assets": []}
+    # balances mirrors portfolio.assets; unchanged keys are left out
+    assert delta["data"] == {"portfolio": {"total_value_usd": 20}, "total_usd_value": 20}
+
+
+def test_if_none_match_accepts_lists_and_weak_tags():
+    assert if_none_match('"x", W/"abc"', "abc")
+    assert if_none_match("*", "abc")
+    assert not if_none_match('"x"', "abc")
+    assert not if_none_match(None, "abc")
+    assert content_etag({"a": 1, "b": 2}) == content_etag({"b": 2, "a": 1})
+
+
+@pytest.fixture
+def db(monkeypatch):
+    dashboard_sections.reset_dashboard_sections_for_tests()
+    reset_dashboard_versions_for_tests()
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[DashboardCache.__table__, DashboardSection.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        dashboard_sections.reset_dashboard_sections_for_tests()
+        reset_dashboard_versions_for_tests()
+
+
+def test_snapshot_endpoint_serves_304_and_since_deltas(db, monkeypatch):
+    payload = {"open_orders": [{"order_id": "1"}], "exchange_open_orders_count": 1}
+    spec = SectionSpec("open_orders", lambda _db: payload, lambda _db: {"ids": [o["order_id"] for o in payload["open_orders"]]}, 0, 3600)
+    monkeypatch.setattr(dashboard_sections, "SECTIONS", (spec,))
+    monkeypatch.setattr(dashboard_sections, "SECTION_NAMES", ("open_orders",))
+    asyncio.run(refresh_dashboard_sections(db))
+
+    first = get_dashboard_snapshot_endpoint(_request(), db=db)
+    etag = first.headers["etag"]
+    version = int(first.headers["x-dashboard-version"])
+    body = json.loads(first.body)
+    assert body["version"] == version and body["data"]["open_orders"] == [{"order_id": "1"}]
+
+    assert get_dashboard_snapshot_endpoint(_request(etag), db=db).status_code == 304
+    same = json.loads(get_dashboard_snapshot_endpoint(_request(), since=version, db=db).body)
+    assert same["delta"] is True and same["changed"]["open_orders"] == []
+
+    payload = {"open_orders": [{"order_id": "2"}], "exchange_open_orders_count": 1}
+    asyncio.run(refresh_dashboard_sections(db))
+    response = get_dashboard_snapshot_endpoint(_request(etag), since=version, db=db)
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    delta = json.loads(response.body)
+    assert delta["delta"] is True and delta["since"] == version and delta["version"] > version
+    assert delta["changed"]["open_orders"] == [{"order_id": "2"}]
+    assert delta["removed"]["open_orders"] == ["1"]
+    assert delta["data"] == {}
+    assert "stale" in delta and "data" not in delta["sections"]
+
+    # A version this process never served gets the full payload
+    full = json.loads(get_dashboard_snapshot_endpoint(_request(), since=1, db=db).body)
+    assert full["delta"] is False and full["data"]["open_orders"] == [{"order_id": "2"}]
@@ -0,0 +1,206 @@
+"""Dashboard sections: recompute only dirty sections, keep versions, assemble the snapshot."""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.dashboard_cache import DashboardCache, DashboardSection
+from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusEnum
+from app.models.watchlist_signal_state import WatchlistSignalState
+from app.services import dashboard_sections
+from app.services.dashboard_sections import SectionSpec, refresh_dashboard_sections
+from app.services.dashboard_snapshot import get_dashboard_snapshot, update_dashboard_snapshot
+from app.services.open_orders import UnifiedOpenOrder
+from app.services.open_orders_cache import clear_open_orders_cache, store_unified_open_orders
+from app.services.open_orders_sync_status import (
+    record_open_orders_sync_success,
+    reset_open_orders_sync_status_for_tests,
+)
+
+
+@pytest.fixture
+def db():
+    dashboard_sections.reset_dashboard_sections_for_tests()
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[
+            DashboardCache.__table__,
+            DashboardSection.__table__,
+            ExchangeOrder.__table__,
+            WatchlistSignalState.__table__,
+        ],
+    )
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        dashboard_sections.reset_dashboard_sections_for_tests()
+
+
+class FakeSection:
+    def __init__(self, name, data, interval=0, max_age=3600):
+        self.inputs = {"rows": 1}
+        self.data = data
+        self.calls = 0
+        self.fail = False
+        self.spec = SectionSpec(name, self.compute, lambda _db: dict(self.inputs), interval, max_age)
+
+    def compute(self, _db):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return self.data
+
+
+@pytest.fixture
+def fake_sections(monkeypatch):
+    portfolio = FakeSection("portfolio", {"total_usd_value": 100.0, "balances": [{"asset": "BTC"}]})
+    orders = FakeSection("open_orders", {"open_orders": [{"order_id": "1"}], "exchange_open_orders_count": 1}, interval=60)
+    monkeypatch.setattr(dashboard_sections, "SECTIONS", (portfolio.spec, orders.spec))
+    monkeypatch.setattr(dashboard_sections, "SECTION_NAMES", ("portfolio", "open_orders"))
+    return portfolio, orders
+
+
+def _refresh(db, **kw):
+    return asyncio.run(refresh_dashboard_sections(db, **kw))
+
+
+def test_sections_recompute_only_when_inputs_change(db, fake_sections):
+    portfolio, _ = fake_sections
+    assert _refresh(db) == {"portfolio": "changed", "open_orders": "changed"}
+    assert _refresh(db, names=["portfolio"]) == {"portfolio": "unchanged"}
+    assert portfolio.calls == 1
+
+    # New inputs, same payload: recomputed but the version stays
+    portfolio.inputs["rows"] = 2
+    assert _refresh(db, names=["portfolio"]) == {"portfolio": "recomputed"}
+    assert db.get(DashboardSection, "portfolio").version == 1
+
+    portfolio.inputs["rows"] = 3
+    portfolio.data = {"total_usd_value": 150.0, "balances": []}
+    assert _refresh(db, names=["portfolio"]) == {"portfolio": "changed"}
+    row = db.get(DashboardSection, "portfolio")
+    assert row.version == 2 and row.data["total_usd_value"] == 150.0
+    assert row.compute_ms is not None
+
+    stats = dashboard_sections.get_dashboard_section_stats()["sections"]["portfolio"]
+    assert stats["checks"] == 4 and stats["recomputes"] == 3 and stats["changes"] == 2 and stats["unchanged"] == 1
+
+
+def test_interval_and_dirty_flag(db, fake_sections):
+    _, orders = fake_sections
+    _refresh(db)
+    # open_orders is not due for 60s...
+    assert _refresh(db)["open_orders"] == "skipped"
+    # ...unless something marked it dirty; that recomputes even with unchanged inputs
+    dashboard_sections.mark_dashboard_sections_dirty("open_orders")
+    assert _refresh(db)["open_orders"] == "recomputed"
+    assert orders.calls == 2
+    assert dashboard_sections.get_dashboard_section_stats()["dirty"] == []
+
+
+def test_failed_section_keeps_previous_data_and_snapshot_reports_it(db, fake_sections):
+    portfolio, _ = fake_sections
+    _refresh(db)
+    portfolio.fail = True
+    portfolio.inputs["rows"] = 2
+    assert _refresh(db, names=["portfolio"]) == {"portfolio": "failed"}
+
+    snapshot = get_dashboard_snapshot(db)
+    assert snapshot["empty"] is False and snapshot["stale"] is False
+    assert snapshot["data"]["total_usd_value"] == 100.0
+    assert snapshot["data"]["open_orders"] == [{"order_id": "1"}]
+    assert snapshot["data"]["partial"] is True
+    assert snapshot["data"]["errors"] == ["portfolio: upstream down"]
+    assert snapshot["sections"]["portfolio"]["error"] == "upstream down"
+    assert snapshot["sections"]["open_orders"]["version"] == 1
+
+    # A failed section is retried on the next check even with unchanged inputs
+    portfolio.fail = False
+    assert _refresh(db, names=["portfolio"]) == {"portfolio": "recomputed"}
+    assert get_dashboard_snapshot(db)["data"]["errors"] == []
+
+
+def test_update_dashboard_snapshot_runs_the_section_pipeline(db, fake_sections):
+    result = asyncio.run(update_dashboard_snapshot(db))
+    assert result["success"] is True
+    assert result["sections"]["portfolio"]["outcome"] == "changed"
+    assert result["sections"]["portfolio"]["compute_ms"] is not None
+    # The legacy blob is no longer rewritten
+    assert db.query(DashboardCache).count() == 0
+
+
+def test_committed_signal_state_write_marks_signals_dirty(db):
+    db.add(WatchlistSignalState(symbol="BTC_USDT", signal_side="BUY"))
+    db.flush()
+    db.rollback()
+    assert dashboard_sections.get_dashboard_section_stats()["dirty"] == []
+
+    db.add(WatchlistSignalState(symbol="BTC_USDT", signal_side="BUY"))
+    db.commit()
+    assert dashboard_sections.get_dashboard_section_stats()["dirty"] == ["signals"]
+
+
+def test_open_orders_and_signals_sections_follow_their_inputs(db):
+    clear_open_orders_cache()
+    reset_open_orders_sync_status_for_tests()
+
+    def add_order(oid):
+        db.add(ExchangeOrder(
+            exchange_order_id=oid,
+            symbol="ETH_USDT",
+            side=OrderSideEnum.BUY,
+            order_type="LIMIT",
+            status=OrderStatusEnum.NEW,
+            price=Decimal("3000"),
+            quantity=Decimal("0.5"),
+        ))
+        db.commit()
+
+    add_order("o1")
+    db.add(WatchlistSignalState(symbol="ETH_USDT", signal_side="WAIT"))
+    db.commit()
+
+    names = ["open_orders", "signals"]
+    assert _refresh(db, names=names) == {"open_orders": "changed", "signals": "changed"}
+    signals = db.get(DashboardSection, "signals").data
+    assert signals["ETH_USDT"]["signal_side"] == "NONE"
+    assert [o["order_id"] for o in db.get(DashboardSection, "open_orders").data["open_orders"]] == ["o1"]
+
+    dashboard_sections.reset_dashboard_sections_for_tests()
+    assert _refresh(db, names=names) == {"open_orders": "unchanged", "signals": "unchanged"}
+
+    dashboard_sections.reset_dashboard_sections_for_tests()
+    add_order("o2")
+    assert _refresh(db, names=names) == {"open_orders": "changed", "signals": "unchanged"}
+    section = db.get(DashboardSection, "open_orders")
+    assert section.version == 2 and section.data["exchange_open_orders_count"] == 2
+
+
+def test_open_orders_fingerprint_ignores_sync_timestamps_and_timings(db):
+    clear_open_orders_cache()
+    reset_open_orders_sync_status_for_tests()
+    order = UnifiedOpenOrder(order_id="o1", symbol="ETH_USDT", side="BUY", price=Decimal("3000"), quantity=Decimal("0.5"))
+    spec = next(s for s in dashboard_sections.SECTIONS if s.name == "portfolio")
+
+    store_unified_open_orders([order])
+    record_open_orders_sync_success(order_count=1, fetch_ms=120.0, endpoint_timings_ms={"private/get-open-orders": 80.0})
+    before = dashboard_sections._open_orders_inputs(db)
+    portfolio_before = spec.inputs(db)
+
+    # Next 5s sync: same orders, new timestamp and timings
+    store_unified_open_orders([order.model_copy()])
+    record_open_orders_sync_success(order_count=1, fetch_ms=95.0, endpoint_timings_ms={"private/get-open-orders": 60.0})
+    assert dashboard_sections._open_orders_inputs(db) == before
+    assert spec.inputs(db) == portfolio_before
+
+    store_unified_open_orders([order.model_copy(update={"quantity": Decimal("0.25")})])
+    assert dashboard_sections._open_orders_inputs(db) != before
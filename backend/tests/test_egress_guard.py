@@ -75,7 +75,7 @@ class TestEgressGuard:
 class TestHttpClient:
     """Test HTTP client wrapper enforces egress guard"""
     
-    @patch('app.utils.http_client.requests.get')
+    @patch('app.utils.http_client.requests.Session.get')
     def test_http_get_blocks_raw_ip(self, mock_get):
         """Test that http_get blocks raw IP addresses"""
         with pytest.raises(EgressGuardError):
@@ -84,7 +84,7 @@ class TestHttpClient:
         # Should not make the request
         mock_get.assert_not_called()
     
-    @patch('app.utils.http_client.requests.get')
+    @patch('app.utils.http_client.requests.Session.get')
     def test_http_get_allows_allowlisted_domain(self, mock_get):
         """Test that http_get allows allowlisted domains"""
         mock_response = MagicMock()
@@ -98,7 +98,7 @@ class TestHttpClient:
         mock_get.assert_called_once()
         assert response.status_code == 200
     
-    @patch('app.utils.http_client.requests.post')
+    @patch('app.utils.http_client.requests.Session.post')
     def test_http_post_blocks_raw_ip(self, mock_post):
         """Test that http_post blocks raw IP addresses"""
         with pytest.raises(EgressGuardError):
@@ -107,7 +107,7 @@ class TestHttpClient:
         # Should not make the request
         mock_post.assert_not_called()
     
-    @patch('app.utils.http_client.requests.post')
+    @patch('app.utils.http_client.requests.Session.post')
     def test_http_post_allows_allowlisted_domain(self, mock_post):
         """Test that http_post allows allowlisted domains"""
         mock_response = MagicMock()
@@ -160,7 +160,7 @@ class TestGuardrailBypass:
 class TestRedirectProtection:
     """Test redirect protection in HTTP client"""
     
-    @patch('app.utils.http_client.requests.get')
+    @patch('app.utils.http_client.requests.Session.get')
     @patch('app.utils.egress_guard.validate_outbound_url')
     def test_redirect_to_non_allowlisted_blocked(self, mock_validate, mock_get):
         """Test that redirects to non-allowlisted domains are blocked"""
@@ -192,7 +192,7 @@ class TestRedirectProtection:
         # Response should be closed when redirect target is blocked
         mock_response.close.assert_called_once()
     
-    @patch('app.utils.http_client.requests.get')
+    @patch('app.utils.http_client.requests.Session.get')
     def test_redirect_to_allowlisted_allowed(self, mock_get):
         """Test that redirects to allowlisted domains are allowed"""
         # Create a mock response that simulates a redirect to an allowlisted domain
@@ -210,7 +210,7 @@ class TestRedirectProtection:
         
         assert response.status_code == 200
     
-    @patch('app.utils.http_client.requests.get')
+    @patch('app.utils.http_client.requests.Session.get')
     def test_redirects_disabled_by_default(self, mock_get):
         """Test that redirects are disabled by default"""
         mock_response = MagicMock()
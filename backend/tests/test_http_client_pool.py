@@ -0,0 +1,125 @@
+"""Keep-alive session pool in http_client and the egress guard DNS cache."""
+import asyncio
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import egress_guard
+from app.utils import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _reply(self):
+        body = json.dumps({"ok": True, "path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/login":
+            self.send_header("Set-Cookie", "sid=secret; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    http_client.close_http_sessions()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        http_client.close_http_sessions()
+        server.shutdown()
+        server.server_close()
+
+
+def test_sync_requests_reuse_one_connection(local_server):
+    for i in range(3):
+        assert http_client.http_get(f"{local_server}/a{i}", calling_module="test").json()["ok"]
+    http_client.http_post(f"{local_server}/p", json={"x": 1}, calling_module="test")
+
+    stats = http_client.get_http_pool_stats()
+    origin = stats["origins"][http_client._origin(local_server)]
+    assert origin["requests"] == 4
+    assert origin["handshakes"] == 1
+    assert origin["pool_hits"] == 3
+    assert stats["session_misses"] == 1
+    assert stats["session_hits"] == 3
+
+
+def test_sessions_are_per_origin():
+    a = http_client._get_session("https://api.crypto.com/exchange/v1/public/get-tickers")
+    b = http_client._get_session("https://api.crypto.com/exchange/v1/private/user-balance")
+    c = http_client._get_session("https://api.telegram.org/bot***/sendMessage")
+    assert a is b
+    assert a is not c
+    http_client.close_http_sessions()
+
+
+def test_shared_session_does_not_keep_cookies(local_server):
+    http_client.http_get(f"{local_server}/login", calling_module="test")
+    assert len(http_client._get_session(local_server).cookies) == 0
+
+
+def test_async_session_is_long_lived(local_server):
+    async def run():
+        first = await http_client.async_http_get(f"{local_server}/x", calling_module="test")
+        session = await http_client._get_async_session()
+        second = await http_client.async_http_get(f"{local_server}/y", calling_module="test")
+        same = session is await http_client._get_async_session()
+        await http_client.close_async_http_session()
+        return first, second, same
+
+    first, second, same = asyncio.run(run())
+    assert first == (200, {"ok": True, "path": "/x"})
+    assert second[0] == 200
+    assert same
+
+
+def test_dns_lookup_is_cached():
+    egress_guard.clear_dns_cache()
+    with patch.object(egress_guard.socket, "gethostbyname", return_value="1.2.3.4") as lookup:
+        for _ in range(5):
+            _, ip = egress_guard.validate_outbound_url("https://api.crypto.com/v1", calling_module="test")
+            assert ip == "1.2.3.4"
+    assert lookup.call_count == 1
+    stats = egress_guard.get_dns_cache_stats()
+    assert stats["hits"] == 4 and stats["misses"] == 1
+    egress_guard.clear_dns_cache()
+
+
+def test_dns_cache_expires_and_caches_failures(monkeypatch):
+    egress_guard.clear_dns_cache()
+    monkeypatch.setattr(egress_guard, "DNS_NEGATIVE_CACHE_TTL_SECONDS", 0.0)
+    with patch.object(egress_guard.socket, "gethostbyname", side_effect=socket.gaierror) as lookup:
+        assert egress_guard.resolve_host_cached("api.telegram.org") is None
+        assert egress_guard.resolve_host_cached("api.telegram.org") is None
+    assert lookup.call_count == 2
+    assert egress_guard.get_dns_cache_stats()["failures"] == 2
+    egress_guard.clear_dns_cache()
+
+
+def test_blocked_domain_is_never_resolved():
+    egress_guard.clear_dns_cache()
+    with patch.object(egress_guard.socket, "gethostbyname") as lookup:
+        with pytest.raises(egress_guard.EgressGuardError):
+            egress_guard.validate_outbound_url("https://evil.com/x", calling_module="test")
+    lookup.assert_not_called()
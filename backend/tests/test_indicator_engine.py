@@ -0,0 +1,185 @@
+"""Streaming indicator engine: parity with routes_signals.calculate_* and O(1) updates."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.api.routes_signals import (
+    calculate_atr,
+    calculate_ema,
+    calculate_ma,
+    calculate_rsi,
+)
+from app.services.indicator_engine import IndicatorRegistry, StreamingIndicators
+from app.utils.volume_index import calculate_volume_index
+
+
+def _candles(n, seed=7, start=100.0):
+    rng = random.Random(seed)
+    out, price = [], start
+    for i in range(n):
+        o = price
+        c = max(0.01, o * (1 + rng.uniform(-0.02, 0.02)))
+        h = max(o, c) * (1 + rng.uniform(0, 0.01))
+        low = min(o, c) * (1 - rng.uniform(0, 0.01))
+        out.append({"t": i * 3_600_000, "o": o, "h": h, "l": low, "c": c, "v": rng.uniform(10, 1000)})
+        price = c
+    return out
+
+
+def _legacy(candles, current_price):
+    closes = [c["c"] for c in candles]
+    closes[-1] = current_price
+    highs = [c["h"] for c in candles]
+    lows = [c["l"] for c in candles]
+    vols = [c["v"] for c in candles]
+    return {
+        "rsi": calculate_rsi(closes, 14),
+        "ma50": calculate_ma(closes, 50),
+        "ma200": calculate_ma(closes, 200),
+        "ema10": calculate_ema(closes, 10),
+        "atr": calculate_atr(highs, lows, closes, 14),
+        "volume": calculate_volume_index(vols, 5),
+    }
+
+
+def _wilder_rsi_reference(closes, period=14):
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    ag, al = gains[:period].mean(), losses[:period].mean()
+    for g, loss in zip(gains[period:], losses[period:]):
+        ag = (ag * (period - 1) + g) / period
+        al = (al * (period - 1) + loss) / period
+    return 100.0 if al == 0 else 100 - 100 / (1 + ag / al)
+
+
+# Legacy helpers round to 2 decimals at these price levels
+ROUNDING = 0.0051
+
+
+def _assert_parity(snap, legacy):
+    assert snap["rsi_simple"] == pytest.approx(legacy["rsi"], abs=ROUNDING)
+    assert snap["ma50"] == pytest.approx(legacy["ma50"], abs=ROUNDING)
+    assert snap["ma200"] == pytest.approx(legacy["ma200"], abs=ROUNDING)
+    assert snap["ema10"] == pytest.approx(legacy["ema10"], abs=ROUNDING)
+    assert snap["atr"] == pytest.approx(legacy["atr"], abs=ROUNDING)
+    assert snap["volume_ratio"] == pytest.approx(legacy["volume"]["volume_ratio"], abs=0.01)
+    assert snap["avg_volume"] == pytest.approx(legacy["volume"]["average_volume"], abs=0.01)
+
+
+@pytest.mark.parametrize("n", [16, 60, 200, 260])
+def test_seeded_snapshot_matches_legacy(n):
+    candles = _candles(n)
+    state = StreamingIndicators.from_candles(candles)
+    _assert_parity(state.snapshot(), _legacy(candles, candles[-1]["c"]))
+
+
+def test_streaming_updates_match_legacy_and_wilder_reference():
+    candles = _candles(260, seed=3)
+    state = StreamingIndicators.from_candles(candles[:30])
+    for i in range(30, 260):
+        # forming candle 29..; close it, then tick the next one
+        state.on_candle_close(candles[i - 1])
+        state.on_tick(candles[i]["o"])
+        state.on_tick(candles[i]["c"], high=candles[i]["h"], low=candles[i]["l"], volume=candles[i]["v"])
+        if i % 25 == 0 or i == 259:
+            snap = state.snapshot()
+            legacy = _legacy(candles[: i + 1], candles[i]["c"])
+            _assert_parity(snap, legacy)
+            closes = [c["c"] for c in candles[: i + 1]]
+            assert snap["rsi"] == pytest.approx(_wilder_rsi_reference(closes), abs=1e-6)
+
+
+def test_live_tick_replaces_forming_close():
+    candles = _candles(120, seed=11)
+    state = StreamingIndicators.from_candles(candles)
+    live = candles[-1]["c"] * 1.05
+    state.on_tick(live)
+    snap = state.snapshot()
+    legacy = _legacy(candles, live)
+    assert snap["price"] == live
+    assert snap["ma50"] == pytest.approx(legacy["ma50"], abs=ROUNDING)
+    assert snap["rsi_simple"] == pytest.approx(legacy["rsi"], abs=ROUNDING)
+
+
+def test_short_history_defaults():
+    state = StreamingIndicators.from_candles(_candles(5))
+    snap = state.snapshot()
+    assert snap["rsi"] == 50.0
+    assert snap["atr"] == 0.0
+    assert snap["ma50"] == snap["price"]
+
+
+def test_registry_applies_only_new_candles():
+    candles = _candles(220, seed=5)
+    registry = IndicatorRegistry()
+    state = registry.sync_candles("BTC_USDT", "1h", candles[:200])
+    assert state.closed_count == 199
+    state = registry.sync_candles("BTC_USDT", "1h", candles[2:203])
+    assert state.closed_count == 202
+    expected = StreamingIndicators.from_candles(candles[:203]).snapshot()
+    got = state.snapshot()
+    assert got["ma50"] == pytest.approx(expected["ma50"])
+    assert got["rsi"] == pytest.approx(expected["rsi"])
+    assert registry.on_price("BTC_USDT", "1h", 1.0)["price"] == 1.0
+    assert registry.on_price("ETH_USDT", "1h", 1.0) is None
+
+
+def test_batch_matches_streaming_per_symbol_with_nan_masks():
+    from app.services.indicator_engine import compute_indicators_batch, stack_candle_series
+
+    series = [_candles(n, seed=n) for n in (260, 200, 120, 30, 8, 14, 15)]
+    stacked = stack_candle_series(series, width=220)
+    out = compute_indicators_batch(stacked["c"], stacked["h"], stacked["l"], stacked["v"])
+
+    for row, candles in enumerate(series):
+        window = candles[-220:]
+        snap = StreamingIndicators.from_candles(window).snapshot()
+        n = len(window)
+        for key in ("rsi", "rsi_simple", "atr"):
+            if n < 15:
+                assert np.isnan(out[key][row]), (key, n)
+            else:
+                assert out[key][row] == pytest.approx(snap[key], rel=1e-9, abs=1e-9), (key, n)
+        # calculate_volume_index rounds its outputs to 2 decimals
+        for key in ("volume_ratio", "avg_volume"):
+            assert out[key][row] == pytest.approx(snap[key], abs=ROUNDING), (key, n)
+        for key, period in (("ma50", 50), ("ma200", 200), ("ema10", 10)):
+            if n < period:
+                assert np.isnan(out[key][row]), (key, n)
+            else:
+                assert out[key][row] == pytest.approx(snap[key], rel=1e-9), (key, n)
+
+
+def test_market_updater_refresh_uses_streaming_state_with_legacy_values():
+    from market_updater import calculate_technical_indicators
+    from app.services.indicator_engine import indicator_registry
+
+    candles = _candles(203, seed=11)
+    keys = ("rsi", "ma50", "ma200", "ema10", "atr")
+    for window in (candles[:200], candles[3:203]):
+        price = (window[-1]["h"] + window[-1]["l"]) / 2
+        streamed = calculate_technical_indicators(window, price, symbol="PARITY_USDT")
+        legacy = calculate_technical_indicators(window, price)
+        for key in keys:
+            assert streamed[key] == pytest.approx(legacy[key], abs=ROUNDING), key
+        assert streamed["volume_ratio"] == legacy["volume_ratio"]
+    # The second cycle applied the three newly closed candles to the existing state
+    assert indicator_registry.get("PARITY_USDT").closed_count == 202
+
+
+def test_refresh_price_outside_candle_range_keeps_atr_parity():
+    from market_updater import calculate_technical_indicators
+
+    candles = _candles(204, seed=5)
+    keys = ("rsi", "ma50", "ma200", "ema10", "atr")
+    # Live prices well outside the forming candle's high/low, twice on the same candle
+    for window, factor in ((candles[:200], 1.05), (candles[:200], 0.94), (candles[4:204], 1.08)):
+        price = window[-1]["h"] * factor if factor > 1 else window[-1]["l"] * factor
+        streamed = calculate_technical_indicators(window, price, symbol="WIDE_USDT")
+        legacy = calculate_technical_indicators(window, price)
+        for key in keys:
+            assert streamed[key] == pytest.approx(legacy[key], abs=ROUNDING), key
+
@@ -0,0 +1,97 @@
+"""Bulk market_prices / market_data upsert used by market_updater."""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.market_price import MarketData, MarketPrice
+from app.services import market_data_writer
+from app.services.market_data_writer import bulk_upsert_market_rows, market_rows_for_coin
+
+
+def _coin(symbol, price, rsi=55.0):
+    return {
+        "instrument_name": symbol,
+        "current_price": price,
+        "volume_24h": 1000.0,
+        "rsi": rsi,
+        "atr": 1.5,
+        "ma50": price,
+        "ma200": price,
+        "ema10": price,
+        "ma10w": price,
+        "current_volume": 10.0,
+        "avg_volume": 8.0,
+        "volume_ratio": 1.25,
+    }
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[MarketPrice.__table__, MarketData.__table__])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    session.info["statements"] = statements
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _write(db, coins, source="crypto_com"):
+    rows = [market_rows_for_coin(coin, source) for coin in coins]
+    result = bulk_upsert_market_rows(db, [r[0] for r in rows], [r[1] for r in rows])
+    db.commit()
+    return result
+
+
+def test_inserts_then_updates_in_one_statement_per_table(db, monkeypatch):
+    result = _write(db, [_coin("BTC_USDT", 60000.0), _coin("ETH_USDT", 3000.0)])
+    assert result["method"] == "sqlite"
+    assert result["market_prices"] == 2 and result["market_data"] == 2 and result["batches"] == 2
+    assert result["write_ms"] >= 0
+
+    db.info["statements"].clear()
+    monkeypatch.setattr(market_data_writer, "MARKET_WRITE_BATCH_SIZE", 2)
+    # ETH twice in one cycle: last one wins
+    result = _write(
+        db,
+        [_coin("BTC_USDT", 61000.0, rsi=70.0), _coin("ETH_USDT", 3100.0), _coin("ETH_USDT", 3200.0), _coin("SOL_USDT", 150.0)],
+        source="binance",
+    )
+    assert result["market_prices"] == 3 and result["batches"] == 4
+    writes = [s for s in db.info["statements"] if s.lstrip().upper().startswith("INSERT")]
+    assert len(writes) == 4 and all("ON CONFLICT" in s.upper() for s in writes)
+    assert not [s for s in db.info["statements"] if s.lstrip().upper().startswith("SELECT")]
+
+    db.expire_all()
+    prices = {p.symbol: p for p in db.query(MarketPrice).all()}
+    assert prices["BTC_USDT"].price == 61000.0 and prices["BTC_USDT"].source == "binance"
+    assert prices["ETH_USDT"].price == 3200.0 and prices["ETH_USDT"].exchange == "CRYPTO_COM"
+    data = db.query(MarketData).filter(MarketData.symbol == "BTC_USDT").one()
+    assert data.rsi == 70.0 and data.res_up == pytest.approx(61000.0 * 1.02)
+    assert db.query(MarketData).count() == 3
+
+
+def test_postgres_statement_is_a_native_upsert():
+    stmt = market_data_writer._upsert_statement("postgresql", MarketData, market_data_writer.MARKET_DATA_FIELDS)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (symbol) DO UPDATE SET" in sql
+    assert "rsi = excluded.rsi" in sql and "updated_at = now()" in sql
+    assert "exchange = excluded.exchange" not in sql
+
+
+def test_other_dialects_fall_back_to_orm_merge(db, monkeypatch):
+    _write(db, [_coin("BTC_USDT", 60000.0)])
+    monkeypatch.setattr(db.get_bind().dialect, "name", "mysql")
+    result = _write(db, [_coin("BTC_USDT", 62000.0), _coin("ADA_USDT", 0.5)])
+    assert result["method"] == "orm" and result["market_prices"] == 2
+    db.expire_all()
+    assert db.query(MarketPrice).filter(MarketPrice.symbol == "BTC_USDT").one().price == 62000.0
+    assert db.query(MarketData).filter(MarketData.symbol == "ADA_USDT").one().exchange == "CRYPTO_COM"
@@ -0,0 +1,204 @@
+"""Market-data WebSocket client against a local stand-in of the Crypto.com market channel."""
+import asyncio
+import json
+import time
+
+import websockets
+
+from app.services.brokers.crypto_com_market_websocket import CryptoComMarketWebSocketClient
+from app.services.market_data_cache import MarketDataCache, PriceMoveWatch
+
+HOUR_MS = 3_600_000
+
+
+class StandInMarketServer:
+    """Accepts subscribe/unsubscribe, records heartbeat replies, pushes whatever the test sends."""
+
+    def __init__(self):
+        self.connections = []
+        self.requests = []
+        self.heartbeat_replies = []
+        self._server = None
+
+    async def _handler(self, ws):
+        self.connections.append(ws)
+        async for raw in ws:
+            msg = json.loads(raw)
+            method = msg.get("method")
+            if method in ("subscribe", "unsubscribe"):
+                self.requests.append((len(self.connections), method, msg["params"]["channels"]))
+                await ws.send(json.dumps({"id": msg["id"], "method": method, "code": 0}))
+            elif method == "public/respond-heartbeat":
+                self.heartbeat_replies.append(msg["id"])
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/exchange/v1/market"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def channels(self, connection: int, method: str = "subscribe"):
+        return sorted(c for n, m, chans in self.requests if n == connection and m == method for c in chans)
+
+    async def push(self, payload):
+        await self.connections[-1].send(json.dumps(payload))
+
+    async def drop(self):
+        await self.connections[-1].close()
+
+
+def ticker(symbol, price):
+    return {"id": -1, "method": "subscribe", "code": 0, "result": {
+        "channel": "ticker", "instrument_name": symbol, "subscription": f"ticker.{symbol}",
+        "data": [{"i": symbol, "a": str(price), "b": str(price - 1), "k": str(price + 1), "v": "10", "t": 1}],
+    }}
+
+
+def candle(symbol, open_ms, close):
+    return {"id": -1, "method": "subscribe", "code": 0, "result": {
+        "channel": "candlestick", "instrument_name": symbol, "interval": "1h",
+        "subscription": f"candlestick.1h.{symbol}",
+        "data": [{"t": open_ms, "o": "1", "h": "2", "l": "0.5", "c": str(close), "v": "3"}],
+    }}
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def make_client(url, cache, **kwargs):
+    return CryptoComMarketWebSocketClient(
+        url, cache=cache, timeframes=("1h",), connect_delay=0, reconnect_interval=0.05, **kwargs
+    )
+
+
+def test_ticker_and_candles_feed_cache_and_heartbeat_is_answered():
+    async def scenario():
+        cache = MarketDataCache()
+        async with StandInMarketServer() as server:
+            client = make_client(server.url, cache)
+            await client.update_symbols(["BTC_USDT", "ETH_USDT"])
+            task = asyncio.create_task(client.start())
+            await wait_until(lambda: client.connected)
+            assert server.channels(1) == [
+                "candlestick.1h.BTC_USDT", "candlestick.1h.ETH_USDT", "ticker.BTC_USDT", "ticker.ETH_USDT",
+            ]
+
+            sent = time.monotonic()
+            await server.push(ticker("BTC_USDT", 50000.5))
+            await wait_until(lambda: cache.last_price("BTC_USDT") is not None)
+            assert time.monotonic() - sent < 1.0
+            live = cache.last_price("BTC_USDT")
+            assert (live.price, live.bid, live.ask) == (50000.5, 49999.5, 50001.5)
+
+            await server.push(candle("BTC_USDT", 10 * HOUR_MS, 1.5))
+            await server.push(candle("BTC_USDT", 10 * HOUR_MS, 1.7))  # forming candle update
+            await wait_until(lambda: cache.stats()["candle_updates"] == 2)
+            assert [c["c"] for c in cache.candles("BTC_USDT", "1h")] == [1.7]
+
+            await server.push({"id": 42, "method": "public/heartbeat"})
+            await wait_until(lambda: server.heartbeat_replies == [42])
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_resubscribes_and_reports_candle_gap():
+    async def scenario():
+        cache = MarketDataCache()
+        gaps = []
+        async with StandInMarketServer() as server:
+            client = make_client(server.url, cache, on_gap=lambda *gap: gaps.append(gap))
+            await client.update_symbols(["BTC_USDT"])
+            task = asyncio.create_task(client.start())
+            await wait_until(lambda: client.connected)
+            await server.push(candle("BTC_USDT", 10 * HOUR_MS, 1.0))
+            await wait_until(lambda: cache.stats()["candle_updates"] == 1)
+
+            await server.drop()
+            await wait_until(lambda: len(server.connections) == 2 and client.connected)
+            assert server.channels(2) == server.channels(1)
+            assert client.stats["reconnects"] >= 1
+
+            # Updates missed while disconnected: the next candle skips two intervals
+            await server.push(candle("BTC_USDT", 13 * HOUR_MS, 1.2))
+            await wait_until(lambda: gaps)
+            assert gaps == [("BTC_USDT", "1h", 10 * HOUR_MS, 13 * HOUR_MS)]
+            assert client.stats["gaps"] == 1
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+
+
+def test_silent_connection_is_recycled():
+    async def scenario():
+        async with StandInMarketServer() as server:
+            client = make_client(server.url, MarketDataCache(), stale_after=0.2)
+            await client.update_symbols(["BTC_USDT"])
+            task = asyncio.create_task(client.start())
+            # Subscribe acks count as traffic; nothing after them -> stale -> reconnect
+            await wait_until(lambda: len(server.connections) >= 2)
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+
+
+def test_symbol_changes_only_send_the_difference():
+    async def scenario():
+        async with StandInMarketServer() as server:
+            client = make_client(server.url, MarketDataCache())
+            await client.update_symbols(["BTC_USDT", "ETH_USDT"])
+            task = asyncio.create_task(client.start())
+            await wait_until(lambda: client.connected)
+            await client.update_symbols(["BTC_USDT", "SOL_USDT"])
+            await wait_until(lambda: server.channels(1, "unsubscribe"))
+            assert server.channels(1, "unsubscribe") == ["candlestick.1h.ETH_USDT", "ticker.ETH_USDT"]
+            await wait_until(lambda: "ticker.SOL_USDT" in server.channels(1))
+            assert server.channels(1).count("ticker.BTC_USDT") == 1
+            await client.stop()
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+
+
+def test_cache_freshness_and_rest_candle_merge():
+    cache = MarketDataCache(candle_depth=3)
+    cache.update_ticker("BTC_USDT", 100.0)
+    assert cache.last_price("BTC_USDT", max_age=5).price == 100.0
+    assert cache.last_price("BTC_USDT", max_age=-1) is None
+    assert cache.prices(max_age=-1) == {}
+
+    rest = [{"t": t * HOUR_MS, "c": float(t)} for t in range(1, 5)]
+    cache.update_candle("BTC_USDT", "1h", {"t": 4 * HOUR_MS, "c": 4.5})
+    cache.update_candle("BTC_USDT", "1h", {"t": 5 * HOUR_MS, "c": 5.0})
+    merged = cache.merge_candles("BTC_USDT", "1h", rest)
+    assert [c["c"] for c in merged] == [2.0, 3.0, 4.5, 5.0]
+    for t in range(6, 10):
+        cache.update_candle("BTC_USDT", "1h", {"t": t * HOUR_MS, "c": float(t)})
+    assert len(cache.candles("BTC_USDT", "1h")) == 3
+
+
+def test_price_move_watch_wakes_on_threshold():
+    async def scenario():
+        cache = MarketDataCache()
+        cache.update_ticker("BTC_USDT", 100.0)
+        watch = PriceMoveWatch(cache, min_move_pct=1.0)
+        watch.rebase()
+        cache.update_ticker("BTC_USDT", 100.5)
+        assert await watch.wait(0.05) is None
+        asyncio.get_running_loop().call_later(0.02, cache.update_ticker, "BTC_USDT", 101.2)
+        assert await watch.wait(1.0) == "BTC_USDT"
+        watch.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+"""Concurrent market_updater fetch stage + shared token-bucket rate limiter."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from app.utils import rate_limiter as rl
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = rl.TokenBucket("t", rate=100.0, capacity=2.0)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    waited = bucket.acquire()
+    assert waited > 0
+    assert bucket.stats()["waits"] == 1
+
+
+def test_bucket_routing_per_crypto_com_endpoint():
+    rl.reset_rate_limiters_for_tests()
+    public = rl.get_bucket("https://api.crypto.com/exchange/v1/public/get-candlestick")
+    history = rl.get_bucket("https://api.crypto.com/exchange/v1/private/get-order-history")
+    other = rl.get_bucket("https://api.crypto.com/exchange/v1/private/user-balance")
+    binance = rl.get_bucket("https://api.binance.com/api/v3/klines")
+    assert public.rate == 100.0
+    assert history.rate == 1.0
+    assert other.name.endswith(":private")
+    assert binance is rl.get_bucket("https://api.binance.com/api/v3/ticker")
+    assert len({id(b) for b in (public, history, other, binance)}) == 4
+
+
+def test_symbol_fetch_runs_timeframes_in_parallel():
+    import market_updater as mu
+    from simple_price_fetcher import PriceResult
+
+    candles = [{"t": i, "o": 1.0, "h": 1.1, "l": 0.9, "c": 1.0, "v": 5.0} for i in range(200)]
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_ohlcv(symbol, interval="1h", limit=200):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return candles
+
+    price = PriceResult(price=1.0, source="test", timestamp=time.time(), success=True)
+
+    async def run():
+        sem = asyncio.Semaphore(8)
+        return await asyncio.gather(
+            *(mu._fetch_symbol_market_data(s, sem) for s in ("A_USDT", "B_USDT", "C_USDT"))
+        )
+
+    with patch.object(mu.price_fetcher, "get_price", return_value=price), patch.object(
+        mu, "fetch_ohlcv_cached", side_effect=fake_ohlcv
+    ):
+        started = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - started
+
+    assert len(results) == 3
+    for price_result, indicators in results:
+        assert price_result is price
+        assert indicators["ma50"] == 1.0
+    # 9 fetches of 50ms each: sequential would take >= 450ms
+    assert peak > 1
+    assert elapsed < 0.4
+
+
+def test_symbol_fetch_skips_ohlcv_without_price():
+    import market_updater as mu
+    from simple_price_fetcher import PriceResult
+
+    failed = PriceResult(price=0.0, source="none", timestamp=time.time(), success=False)
+
+    async def run():
+        return await mu._fetch_symbol_market_data("X_USDT", asyncio.Semaphore(2))
+
+    with patch.object(mu.price_fetcher, "get_price", return_value=failed), patch.object(
+        mu, "fetch_ohlcv_cached"
+    ) as ohlcv:
+        price_result, indicators = asyncio.run(run())
+
+    ohlcv.assert_not_called()
+    assert price_result is failed
+    assert indicators["rsi"] == 50.0
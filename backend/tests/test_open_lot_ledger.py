@@ -0,0 +1,251 @@
+"""Open-lot ledger: reads match the FIFO replay, sync writes bump scope versions, verifier catches drift."""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusEnum
+from app.models.open_lot_ledger import OpenLotLedgerEntry, OpenLotLedgerScope
+from app.services import open_lot_ledger
+from app.services.expected_take_profit import rebuild_open_lots, replay_open_lots
+
+T0 = datetime(2026, 9, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _engine(with_ledger=True):
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [ExchangeOrder.__table__]
+    if with_ledger:
+        tables += [OpenLotLedgerEntry.__table__, OpenLotLedgerScope.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    return engine
+
+
+@pytest.fixture
+def db():
+    open_lot_ledger.reset_open_lot_ledger_for_tests()
+    engine = _engine()
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        open_lot_ledger.reset_open_lot_ledger_for_tests()
+
+
+def _order(db, oid, side, qty, price, minutes, symbol="BTC_USDT", **kw):
+    when = T0 + timedelta(minutes=minutes)
+    order = ExchangeOrder(
+        exchange_order_id=oid,
+        symbol=symbol,
+        side=side,
+        order_type=kw.pop("order_type", "MARKET"),
+        status=kw.pop("status", OrderStatusEnum.FILLED),
+        price=Decimal(price),
+        avg_price=Decimal(price),
+        quantity=Decimal(qty),
+        cumulative_quantity=Decimal(qty),
+        cumulative_value=Decimal(price) * Decimal(qty),
+        exchange_create_time=when,
+        exchange_update_time=when,
+        **kw,
+    )
+    db.add(order)
+    db.commit()
+    return order
+
+
+def _keys(lots):
+    return [(lot.symbol, lot.buy_order_id, Decimal(lot.buy_price), Decimal(lot.lot_qty)) for lot in lots]
+
+
+def _book(db):
+    _order(db, "b1", OrderSideEnum.BUY, "0.5", "60000", 0)
+    _order(db, "b2", OrderSideEnum.BUY, "0.3", "61000.5", 10)
+    _order(db, "b3", OrderSideEnum.BUY, "0.2", "59000", 20, symbol="BTC_USD")
+    # parent-linked TP fill closes b2 (not FIFO-first b1)
+    _order(db, "tp2", OrderSideEnum.SELL, "0.3", "63000", 30, parent_order_id="b2", order_role="TAKE_PROFIT")
+    # unlinked sell FIFO-nets against b1
+    _order(db, "s1", OrderSideEnum.SELL, "0.2", "62000", 40)
+
+
+def test_read_serves_ledger_after_refresh_and_matches_replay(db):
+    _book(db)
+    expected = _keys(replay_open_lots(db, "BTC"))
+    assert expected == [
+        ("BTC_USDT", "b1", Decimal("60000"), Decimal("0.3")),
+        ("BTC_USD", "b3", Decimal("59000"), Decimal("0.2")),
+    ]
+
+    assert _keys(rebuild_open_lots(db, "BTC")) == expected  # miss: replayed, queued
+    assert open_lot_ledger.get_open_lot_ledger_stats()["pending_scopes"] == 1
+    assert open_lot_ledger.refresh_touched_scopes(db) == 1
+
+    lots = rebuild_open_lots(db, "BTC")
+    assert _keys(lots) == expected
+    assert lots[0].buy_time == T0 and lots[0].parent_order_id is None
+    stats = open_lot_ledger.get_open_lot_ledger_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["pending_scopes"] == 0
+
+
+def test_sync_fill_and_cancel_refresh_built_scopes(db):
+    _book(db)
+    open_lot_ledger.refresh_touched_scopes(db, extra_symbols=["BTC"])  # nothing built yet
+    rebuild_open_lots(db, "BTC")
+    rebuild_open_lots(db, "BTC_USDT")
+    open_lot_ledger.refresh_touched_scopes(db)
+    db.info.pop(open_lot_ledger.TOUCHED_KEY, None)
+
+    # A fill recorded by sync marks BTC_USDT touched; until refreshed, reads replay
+    _order(db, "s2", OrderSideEnum.SELL, "0.1", "64000", 50)
+    assert db.info[open_lot_ledger.TOUCHED_KEY] == {"BTC_USDT"}
+    assert _keys(rebuild_open_lots(db, "BTC")) == _keys(replay_open_lots(db, "BTC"))
+    assert open_lot_ledger.get_open_lot_ledger_stats()["stale"] == 1
+
+    # Both scopes covering BTC_USDT are rebuilt; hits afterwards
+    assert open_lot_ledger.refresh_touched_scopes(db) == 2
+    hits = open_lot_ledger.get_open_lot_ledger_stats()["hits"]
+    assert _keys(rebuild_open_lots(db, "BTC"))[0][3] == Decimal("0.2")
+    assert open_lot_ledger.get_open_lot_ledger_stats()["hits"] == hits + 1
+
+    # Cancelling an active protection changes a short's netting: also tracked
+    _order(db, "short1", OrderSideEnum.SELL, "0.4", "65000", 60, symbol="ETH_USDT")
+    sl = _order(db, "sl1", OrderSideEnum.BUY, "0.4", "70000", 61, symbol="ETH_USDT", status=OrderStatusEnum.NEW,
+                parent_order_id="short1", order_role="STOP_LOSS", order_type="STOP_LIMIT")
+    rebuild_open_lots(db, "ETH")
+    open_lot_ledger.refresh_touched_scopes(db)
+    sl.status = OrderStatusEnum.CANCELLED
+    db.commit()
+    assert "ETH_USDT" in db.info[open_lot_ledger.TOUCHED_KEY]
+    open_lot_ledger.refresh_touched_scopes(db)
+    assert _keys(rebuild_open_lots(db, "ETH")) == _keys(replay_open_lots(db, "ETH"))
+    assert open_lot_ledger.verify_ledger(db)["ok"]
+
+
+def test_writes_outside_sync_bump_the_version(db):
+    _book(db)
+    rebuild_open_lots(db, "BTC")
+    open_lot_ledger.refresh_touched_scopes(db)
+    # Another process fills an order; this session never saw the write
+    other = sessionmaker(bind=db.get_bind())()
+    _order(other, "s3", OrderSideEnum.SELL, "0.3", "64000", 70)
+    other.close()
+    assert _keys(rebuild_open_lots(db, "BTC")) == _keys(replay_open_lots(db, "BTC"))
+    assert open_lot_ledger.verify_ledger(db)["scopes"]["BTC"]["fresh"] is False
+    # None of its changes are in this session: the scope is rebuilt, not patched
+    assert open_lot_ledger.refresh_touched_scopes(db) == 1
+    assert open_lot_ledger.get_open_lot_ledger_stats()["incremental_scopes"] == 0
+    assert open_lot_ledger.verify_ledger(db)["ok"]
+
+
+def test_entry_and_tp_fills_patch_the_ledger_in_place(db, monkeypatch):
+    _book(db)
+    rebuild_open_lots(db, "BTC")
+    rebuild_open_lots(db, "BTC_USDT")
+    open_lot_ledger.refresh_touched_scopes(db)
+
+    def no_replay(*args, **kwargs):
+        raise AssertionError("scope replayed instead of patched")
+
+    monkeypatch.setattr(open_lot_ledger, "replay_open_lots", no_replay)
+    # New entry with its OTOCO legs, then the TP fills half and the SL is cancelled
+    _order(db, "b4", OrderSideEnum.BUY, "0.4", "62500", 50)
+    tp = _order(db, "tp4", OrderSideEnum.SELL, "0.2", "64000", 51, status=OrderStatusEnum.NEW,
+                parent_order_id="b4", order_role="TAKE_PROFIT", order_type="TAKE_PROFIT_LIMIT")
+    sl = _order(db, "sl4", OrderSideEnum.SELL, "0.4", "60000", 51, status=OrderStatusEnum.NEW,
+                parent_order_id="b4", order_role="STOP_LOSS", order_type="STOP_LIMIT")
+    tp.status = OrderStatusEnum.FILLED
+    tp.exchange_create_time = T0 + timedelta(minutes=55)
+    sl.status = OrderStatusEnum.CANCELLED
+    db.commit()
+
+    assert open_lot_ledger.refresh_touched_scopes(db) == 2
+    assert open_lot_ledger.get_open_lot_ledger_stats()["incremental_scopes"] == 2
+    monkeypatch.undo()
+    assert open_lot_ledger.verify_ledger(db)["ok"]
+    assert _keys(rebuild_open_lots(db, "BTC_USDT"))[-1] == ("BTC_USDT", "b4", Decimal("62500"), Decimal("0.2"))
+
+
+def test_out_of_order_fill_rebuilds_the_scope(db):
+    _book(db)
+    rebuild_open_lots(db, "BTC")
+    open_lot_ledger.refresh_touched_scopes(db)
+    # A buy executed before the last sell changes FIFO netting retroactively
+    _order(db, "b0", OrderSideEnum.BUY, "0.1", "58000", 35)
+    assert open_lot_ledger.refresh_touched_scopes(db) == 1
+    assert open_lot_ledger.get_open_lot_ledger_stats()["incremental_scopes"] == 0
+    assert open_lot_ledger.verify_ledger(db)["ok"]
+
+
+def test_plain_order_cancel_keeps_the_scope_current(db):
+    _book(db)
+    rebuild_open_lots(db, "BTC")
+    open_lot_ledger.refresh_touched_scopes(db)
+    version = db.query(OpenLotLedgerScope.version).filter(OpenLotLedgerScope.scope == "BTC").scalar()
+
+    limit = _order(db, "l1", OrderSideEnum.BUY, "0.1", "50000", 80, status=OrderStatusEnum.NEW, order_type="LIMIT")
+    limit.status = OrderStatusEnum.CANCELLED
+    db.commit()
+
+    assert open_lot_ledger.TOUCHED_KEY not in db.info
+    assert db.query(OpenLotLedgerScope.version).filter(OpenLotLedgerScope.scope == "BTC").scalar() == version
+    assert open_lot_ledger.refresh_touched_scopes(db) == 0
+
+
+def test_current_scope_read_does_not_scan_order_history(db):
+    _book(db)
+    rebuild_open_lots(db, "BTC")
+    open_lot_ledger.refresh_touched_scopes(db)
+    statements = []
+    engine = db.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        lots = rebuild_open_lots(db, "BTC")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(lots) == 2
+    assert len(statements) == 2
+    assert not any("exchange_orders" in s for s in statements)
+
+
+def test_verifier_reports_drift(db):
+    _book(db)
+    rebuild_open_lots(db, "BTC")
+    open_lot_ledger.refresh_touched_scopes(db)
+    assert open_lot_ledger.verify_ledger(db) == {
+        "ok": True,
+        "scopes": {"BTC": {"ok": True, "built": True, "fresh": True, "ledger_lots": 2, "replayed_lots": 2,
+                           "missing": [], "extra": []}},
+    }
+    row = db.query(OpenLotLedgerEntry).filter(OpenLotLedgerEntry.entry_order_id == "b1").one()
+    row.lot_qty = "0.25"
+    db.commit()
+    report = open_lot_ledger.verify_ledger(db)
+    assert report["ok"] is False
+    assert report["scopes"]["BTC"]["missing"][0][1] == "b1"
+    assert report["scopes"]["BTC"]["extra"][0][4] == "0.25"
+
+
+def test_without_ledger_tables_reads_replay():
+    open_lot_ledger.reset_open_lot_ledger_for_tests()
+    engine = _engine(with_ledger=False)
+    db = sessionmaker(bind=engine)()
+    try:
+        _book(db)
+        assert _keys(rebuild_open_lots(db, "BTC")) == _keys(replay_open_lots(db, "BTC"))
+        assert open_lot_ledger.refresh_touched_scopes(db) == 0
+        assert open_lot_ledger.get_open_lot_ledger_stats()["misses"] == 0
+    finally:
+        db.close()
+        engine.dispose()
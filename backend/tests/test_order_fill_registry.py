@@ -0,0 +1,153 @@
+"""Fill confirmations pushed by the user-channel WebSocket (order_fill_registry)."""
+
+import asyncio
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.services import order_fill_registry as ofr
+from app.services.brokers.crypto_com_websocket import CryptoComWebSocketClient
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    ofr.reset_order_fill_registry_for_tests()
+    yield
+    ofr.reset_order_fill_registry_for_tests()
+
+
+def _go_live_elsewhere():
+    # The stream's loop runs on another thread than the waiter
+    t = threading.Thread(target=ofr.set_stream_live, args=(True,))
+    t.start()
+    t.join()
+
+
+def _publish_later(delay, *updates):
+    def run():
+        time.sleep(delay)
+        for update in updates:
+            ofr.publish_order_update(update)
+
+    t = threading.Thread(target=run)
+    t.start()
+    return t
+
+
+def test_push_before_wait_is_answered_without_waiting():
+    ofr.publish_order_update({"order_id": "1", "status": "FILLED", "cumulative_quantity": "0.5", "avg_price": "3000"})
+    result = ofr.wait_for_order_fill("1", timeout=5)
+    assert result["status"] == "FILLED"
+    assert result["cumulative_quantity"] == Decimal("0.5") and result["filled_price"] == 3000.0
+
+
+def test_not_live_returns_immediately():
+    started = time.perf_counter()
+    assert ofr.wait_for_order_fill("1", timeout=5) is None
+    assert asyncio.run(ofr.wait_for_order_fill_async("1", timeout=5)) is None
+    assert time.perf_counter() - started < 1
+    assert ofr.get_order_fill_stats()["not_live"] == 2
+
+
+def test_async_waiter_woken_by_push():
+    _go_live_elsewhere()
+    t = _publish_later(
+        0.05,
+        {"order_id": "42", "status": "ACTIVE", "cumulative_quantity": "0"},
+        {"order_id": "42", "status": "FILLED", "cumulative_quantity": "2", "avg_price": "10.5"},
+    )
+    started = time.perf_counter()
+    result = asyncio.run(ofr.wait_for_order_fill_async("42", timeout=5))
+    t.join()
+    assert time.perf_counter() - started < 2
+    assert result["cumulative_quantity"] == Decimal("2") and result["avg_price"] == 10.5
+    stats = ofr.get_order_fill_stats()
+    assert stats["waits"] == 1 and stats["ws_confirmed"] == 1 and stats["pending_waiters"] == 0
+
+
+def test_thread_waiter_woken_by_push_and_timeout():
+    _go_live_elsewhere()
+    t = _publish_later(0.05, {"order_id": "7", "status": "FILLED", "cumulative_quantity": "1", "avg_price": "5"})
+    assert ofr.wait_for_order_fill("7", timeout=5)["status"] == "FILLED"
+    t.join()
+
+    assert ofr.wait_for_order_fill("8", timeout=0.05) is None
+    stats = ofr.get_order_fill_stats()
+    assert stats["ws_confirmed"] == 1 and stats["timeouts"] == 1
+
+
+def test_unfilled_terminal_and_disconnect_release_waiters():
+    _go_live_elsewhere()
+    t = _publish_later(0.05, {"order_id": "9", "status": "CANCELED", "cumulative_quantity": "0"})
+    assert ofr.wait_for_order_fill("9", timeout=5) is None
+    t.join()
+    assert ofr.get_order_fill_stats()["unfilled_terminal"] == 1
+
+    threading.Timer(0.05, ofr.set_stream_live, args=(False,)).start()
+    started = time.perf_counter()
+    assert ofr.wait_for_order_fill("10", timeout=5) is None
+    assert time.perf_counter() - started < 2
+
+
+def test_stream_loop_thread_never_blocks():
+    ofr.set_stream_live(True)
+    started = time.perf_counter()
+    assert ofr.wait_for_order_fill("11", timeout=5) is None
+    assert time.perf_counter() - started < 1
+
+
+def test_trades_supply_quantity_and_average_price():
+    ofr.publish_trade({"order_id": "5", "trade_id": "a", "traded_quantity": "1", "traded_price": "100"})
+    ofr.publish_trade({"order_id": "5", "trade_id": "a", "traded_quantity": "1", "traded_price": "100"})
+    ofr.publish_trade({"order_id": "5", "trade_id": "b", "traded_quantity": "3", "traded_price": "104"})
+    ofr.publish_order_update({"order_id": "5", "status": "FILLED"})
+    result = ofr.wait_for_order_fill("5", timeout=0)
+    assert result["cumulative_quantity"] == Decimal("4")
+    assert result["avg_price"] == pytest.approx(103.0)
+
+
+def test_user_channel_pushes_are_published():
+    client = CryptoComWebSocketClient()
+    client.handle_message(
+        {
+            "method": "subscribe",
+            "result": {
+                "channel": "user.order.BTC_USDT",
+                "subscription": "user.order.BTC_USDT",
+                "data": [{"order_id": "77", "status": "FILLED", "cumulative_quantity": "0.01", "avg_price": "60000"}],
+            },
+        }
+    )
+    client.handle_message({"method": "user.trade", "data": {"order_id": "78", "traded_quantity": "1", "traded_price": "2"}})
+    assert ofr.get_order_update("77")["status"] == "FILLED"
+    stats = ofr.get_order_fill_stats()
+    assert stats["order_updates"] == 1 and stats["trade_updates"] == 1
+
+
+def test_signal_monitor_uses_push_before_rest_poll(monkeypatch):
+    from app.services.signal_monitor import SignalMonitorService
+
+    service = SignalMonitorService()
+
+    def no_poll(**kwargs):
+        raise AssertionError("REST poll should not run")
+
+    monkeypatch.setattr(service, "_poll_order_fill_confirmation", no_poll)
+    _go_live_elsewhere()
+    t = _publish_later(0.05, {"order_id": "99", "status": "FILLED", "cumulative_quantity": "0.2", "avg_price": "2500"})
+    result = asyncio.run(service._await_order_fill_confirmation("ETH_USDT", "99"))
+    t.join()
+    assert result["status"] == "FILLED" and result["cumulative_quantity"] == Decimal("0.2")
+
+
+def test_sync_wait_inside_event_loop_never_blocks():
+    _go_live_elsewhere()
+
+    async def run():
+        started = time.perf_counter()
+        assert ofr.wait_for_order_fill("12", timeout=5) is None
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 1
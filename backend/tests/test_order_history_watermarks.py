@@ -0,0 +1,255 @@
+"""Order-history watermarks: incremental windows, deep reconciliation, advance only after commit."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.exchange_order import ExchangeOrder, OrderSideEnum, OrderStatusEnum
+from app.models.order_history_watermark import OrderHistoryWatermark
+from app.services import exchange_sync, order_history_watermarks as ohw
+from app.services.exchange_sync import ExchangeSyncService
+
+NOW_MS = int(time.time() * 1000)
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class FakeTradeClient:
+    base_url = "https://api.crypto.com/exchange/v1"
+    ADVANCED_ORDER_HISTORY_ENDPOINT = "private/advanced/get-order-history"
+
+    def __init__(self, orders):
+        self.orders = orders  # instrument -> [order dicts]
+        self.calls = []
+        self.fail = set()
+        self.auth_fail = set()
+        self.advanced_fail = set()
+
+    def get_order_history(self, start_time, end_time, page, page_size, instrument_name, skip_empty_fallbacks):
+        self.calls.append(("spot", instrument_name, start_time, end_time))
+        if instrument_name in self.fail:
+            raise RuntimeError("exchange down")
+        if instrument_name in self.auth_fail:
+            # What the client returns on a 401 after the fallback failed
+            return {"data": [], "error": "authentication_failed", "code": 40101}
+        rows = [o for o in self.orders.get(instrument_name, []) if start_time <= o["update_time"] <= end_time]
+        return {"data": rows[:page_size]}
+
+    def get_advanced_order_history(self, instrument_name, limit, start_time, end_time):
+        self.calls.append(("advanced", instrument_name, start_time, end_time))
+        if instrument_name in self.advanced_fail:
+            raise RuntimeError("advanced history timeout")
+        return {"data": []}
+
+    def spot_calls(self, instrument):
+        return [c for c in self.calls if c[0] == "spot" and c[1] == instrument]
+
+
+@pytest.fixture
+def db():
+    ohw.reset_order_history_watermarks_for_tests()
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[OrderHistoryWatermark.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        ohw.reset_order_history_watermarks_for_tests()
+
+
+@pytest.fixture
+def env(monkeypatch):
+    client = FakeTradeClient({
+        "BTC_USDT": [{"order_id": "b1", "update_time": NOW_MS - 2 * DAY_MS, "status": "FILLED"}],
+        "ETH_USDT": [{"order_id": "e1", "update_time": NOW_MS - 20 * DAY_MS, "status": "FILLED"}],
+    })
+    limiter_urls = []
+    stored = []
+    failing_upserts = set()
+    service = ExchangeSyncService()
+
+    def fake_sync_order_history(db, page_size=200, max_pages=5, instrument_name=None, prefetched_orders=None):
+        stored.append((instrument_name, [o["order_id"] for o in prefetched_orders]))
+        if instrument_name in failing_upserts:
+            db.info[ohw.HISTORY_ERROR_KEY] = "commit failed"
+            return 0
+        return len(prefetched_orders)
+
+    monkeypatch.setattr(exchange_sync, "trade_client", client)
+    monkeypatch.setattr(ohw, "acquire_for_url", lambda url: limiter_urls.append(url) or 0.0)
+    monkeypatch.setattr(service, "sync_order_history", fake_sync_order_history)
+    return service, client, limiter_urls, stored, failing_upserts
+
+
+def test_first_cycle_scans_recent_then_cycles_are_incremental(db, env):
+    service, client, limiter_urls, stored, _ = env
+    assert service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"]) == 2
+    assert len(client.spot_calls("BTC_USDT")) > 1  # windowed recent scan
+    mark = db.get(OrderHistoryWatermark, "BTC_USDT")
+    assert mark.last_order_id == "b1" and mark.last_update_time_ms == NOW_MS - 2 * DAY_MS
+    assert mark.synced_through_ms >= NOW_MS and mark.last_mode == "recent" and mark.last_deep_sync_at is None
+    # Every request went through the shared limiter for its endpoint
+    assert len(limiter_urls) == len(client.calls)
+    assert limiter_urls.count("https://api.crypto.com/exchange/v1/private/get-order-history") == len(
+        [c for c in client.calls if c[0] == "spot"]
+    )
+
+    # Both now have watermarks; deep reconciliation is due for one of them per cycle
+    for mark in db.query(OrderHistoryWatermark):
+        mark.last_deep_sync_at = datetime.now(timezone.utc)
+    db.commit()
+    through = db.get(OrderHistoryWatermark, "BTC_USDT").synced_through_ms
+    client.calls.clear()
+    client.orders["BTC_USDT"].append({"order_id": "b2", "update_time": int(time.time() * 1000), "status": "FILLED"})
+    service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"])
+    # One spot + one advanced request per instrument, starting at the watermark minus the overlap
+    assert len(client.calls) == 4
+    (_, _, start, _), = client.spot_calls("BTC_USDT")
+    assert start == through - ohw.ORDER_HISTORY_WATERMARK_OVERLAP_MS
+    assert stored[-2:] == [("BTC_USDT", ["b2"]), ("ETH_USDT", [])]
+    assert db.get(OrderHistoryWatermark, "BTC_USDT").last_order_id == "b2"
+
+    stats = ohw.get_order_history_sync_stats()
+    assert stats["cycles"] == 2 and stats["incremental"] == 2 and stats["recent"] == 2
+    assert stats["last_cycle_requests"] == 4
+    assert stats["last_cycle"]["BTC_USDT"]["requests"] == 2
+
+
+def test_deep_reconciliation_rotates_oldest_first(db, env, monkeypatch):
+    service, client, _, _, _ = env
+    old = datetime.now(timezone.utc) - timedelta(days=3)
+    for instrument, deep_at in (("BTC_USDT", old), ("ETH_USDT", old - timedelta(days=1))):
+        db.add(OrderHistoryWatermark(instrument_name=instrument, synced_through_ms=NOW_MS, last_deep_sync_at=deep_at))
+    db.commit()
+
+    plans = ohw.plan_history_sync(db, ["BTC_USDT", "ETH_USDT", "SOL_USDT"])
+    assert [(p.instrument_name, p.mode) for p in plans] == [
+        ("BTC_USDT", "incremental"), ("ETH_USDT", "deep"), ("SOL_USDT", "recent"),
+    ]
+
+    service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"])
+    eth = client.spot_calls("ETH_USDT")
+    assert min(c[2] for c in eth) <= NOW_MS - 150 * DAY_MS  # deep lookback
+    assert db.get(OrderHistoryWatermark, "ETH_USDT").last_deep_sync_at.replace(tzinfo=timezone.utc) > old
+    # Next cycle it is BTC's turn
+    assert [p.mode for p in ohw.plan_history_sync(db, ["BTC_USDT", "ETH_USDT"])] == ["deep", "incremental"]
+
+
+def test_watermark_only_advances_after_a_committed_upsert(db, env):
+    service, client, _, stored, failing_upserts = env
+    db.add(OrderHistoryWatermark(instrument_name="BTC_USDT", synced_through_ms=NOW_MS - DAY_MS,
+                                 last_deep_sync_at=datetime.now(timezone.utc)))
+    db.add(OrderHistoryWatermark(instrument_name="ETH_USDT", synced_through_ms=NOW_MS - DAY_MS,
+                                 last_deep_sync_at=datetime.now(timezone.utc)))
+    db.commit()
+    failing_upserts.add("BTC_USDT")
+    client.fail.add("ETH_USDT")
+
+    assert service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"]) == 0
+    assert db.get(OrderHistoryWatermark, "BTC_USDT").synced_through_ms == NOW_MS - DAY_MS
+    assert db.get(OrderHistoryWatermark, "ETH_USDT").synced_through_ms == NOW_MS - DAY_MS
+    assert [s[0] for s in stored] == ["BTC_USDT"]  # the failed fetch never reached the upsert
+    last = ohw.get_order_history_sync_stats()["last_cycle"]
+    assert last["ETH_USDT"]["error"] == "exchange down" and last["BTC_USDT"]["stored"] == 0
+
+
+def test_watermark_stays_put_when_a_window_fetch_failed(db, env):
+    service, client, _, stored, _ = env
+    for instrument in ("BTC_USDT", "ETH_USDT"):
+        db.add(OrderHistoryWatermark(instrument_name=instrument, synced_through_ms=NOW_MS - DAY_MS,
+                                     last_deep_sync_at=datetime.now(timezone.utc)))
+    db.commit()
+    client.auth_fail.add("BTC_USDT")
+    client.advanced_fail.add("ETH_USDT")
+
+    service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"])
+
+    # Whatever was read is still upserted, but neither range counts as synced
+    assert [s[0] for s in stored] == ["BTC_USDT", "ETH_USDT"]
+    assert db.get(OrderHistoryWatermark, "BTC_USDT").synced_through_ms == NOW_MS - DAY_MS
+    assert db.get(OrderHistoryWatermark, "ETH_USDT").synced_through_ms == NOW_MS - DAY_MS
+    stats = ohw.get_order_history_sync_stats()
+    assert stats["partial_fetches"] == 2
+    assert "authentication_failed" in stats["last_cycle"]["BTC_USDT"]["partial"][0]
+    assert "advanced history timeout" in stats["last_cycle"]["ETH_USDT"]["partial"][0]
+
+    # The next cycle retries from the old watermark and advances once the fetch is clean
+    client.auth_fail.clear()
+    client.advanced_fail.clear()
+    client.calls.clear()
+    service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"])
+    (_, _, start, _), = client.spot_calls("BTC_USDT")
+    assert start == NOW_MS - DAY_MS - ohw.ORDER_HISTORY_WATERMARK_OVERLAP_MS
+    assert db.get(OrderHistoryWatermark, "BTC_USDT").synced_through_ms >= NOW_MS
+
+
+def test_watermark_stays_put_when_a_subdivided_window_is_still_full(db, env, monkeypatch):
+    service, client, _, _, _ = env
+    db.add(OrderHistoryWatermark(instrument_name="BTC_USDT", synced_through_ms=NOW_MS - 60_000,
+                                 last_deep_sync_at=datetime.now(timezone.utc)))
+    db.commit()
+    # A burst of more orders than one page holds inside a single minute
+    burst = [{"order_id": f"x{i}", "update_time": NOW_MS - 30_000, "status": "FILLED"} for i in range(3)]
+    client.orders["BTC_USDT"] = burst
+    monkeypatch.setattr(
+        service,
+        "_fetch_history_for_plan",
+        lambda tc, plan, limit=100: ExchangeSyncService._fetch_history_for_plan(service, tc, plan, limit=2),
+    )
+
+    service._sync_order_history_instruments(db, ["BTC_USDT"])
+
+    assert db.get(OrderHistoryWatermark, "BTC_USDT").synced_through_ms == NOW_MS - 60_000
+    assert "still full at 1m" in ohw.get_order_history_sync_stats()["last_cycle"]["BTC_USDT"]["partial"][-1]
+
+
+def test_instruments_with_open_orders_rescan_from_the_oldest_one(db, env):
+    service, client, _, stored, _ = env
+    ExchangeOrder.__table__.create(bind=db.get_bind())
+    ohw.reset_order_history_watermarks_for_tests()
+    for instrument in ("BTC_USDT", "ETH_USDT"):
+        db.add(OrderHistoryWatermark(instrument_name=instrument, synced_through_ms=NOW_MS - 60_000,
+                                     last_deep_sync_at=datetime.now(timezone.utc)))
+    # A TP resting for 40 days (older than the recent lookback), and a cancelled ETH order
+    placed = datetime.now(timezone.utc) - timedelta(days=40)
+    db.add(ExchangeOrder(exchange_order_id="tp1", symbol="BTC_USDT", side=OrderSideEnum.SELL, order_type="LIMIT",
+                         status=OrderStatusEnum.NEW, quantity=1, exchange_create_time=placed))
+    db.add(ExchangeOrder(exchange_order_id="c1", symbol="ETH_USDT", side=OrderSideEnum.BUY, order_type="LIMIT",
+                         status=OrderStatusEnum.CANCELLED, quantity=1, exchange_create_time=placed))
+    db.commit()
+    # Its fill is listed under the create time, far behind the watermark
+    placed_ms = int(placed.timestamp() * 1000)
+    client.orders["BTC_USDT"] = [{"order_id": "tp1", "update_time": placed_ms, "status": "FILLED"}]
+
+    plans = {p.instrument_name: p for p in ohw.plan_history_sync(db, ["BTC_USDT", "ETH_USDT"])}
+    overlap = ohw.ORDER_HISTORY_WATERMARK_OVERLAP_MS
+    assert plans["BTC_USDT"].open_orders and plans["BTC_USDT"].since_ms == placed_ms - overlap
+    assert not plans["ETH_USDT"].open_orders and plans["ETH_USDT"].since_ms == NOW_MS - 60_000 - overlap
+
+    service._sync_order_history_instruments(db, ["BTC_USDT", "ETH_USDT"])
+
+    # Every window back to the TP is read, empty ones included
+    assert min(c[2] for c in client.spot_calls("BTC_USDT")) == placed_ms - overlap
+    assert ("BTC_USDT", ["tp1"]) in stored
+    assert len(client.spot_calls("ETH_USDT")) == 1
+    stats = ohw.get_order_history_sync_stats()
+    assert stats["open_order_rescans"] == 1 and stats["last_cycle"]["BTC_USDT"]["open_orders"] is True
+
+
+def test_without_the_table_every_instrument_takes_the_recent_scan(env):
+    service, client, _, stored, _ = env
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    db = sessionmaker(bind=engine)()
+    try:
+        assert [p.mode for p in ohw.plan_history_sync(db, ["BTC_USDT"])] == ["recent"]
+        assert service._sync_order_history_instruments(db, ["BTC_USDT"]) == 1
+        assert stored == [("BTC_USDT", ["b1"])]
+    finally:
+        db.close()
+        engine.dispose()
@@ -0,0 +1,95 @@
+"""Trading pipeline stage and Crypto.com endpoint metrics."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import pipeline_metrics as pm
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    pm.reset_pipeline_metrics_for_tests()
+    yield
+    pm.reset_pipeline_metrics_for_tests()
+
+
+def test_stage_context_records_outcomes():
+    with pm.pipeline_stage("signal_calc", "BTC_USDT"):
+        pass
+    with pytest.raises(RuntimeError):
+        with pm.pipeline_stage("signal_calc", "BTC_USDT"):
+            raise RuntimeError("boom")
+    stats = pm.get_pipeline_stage_stats()["signal_calc"]
+    assert stats["count"] == 2
+    assert stats["outcomes"] == {"ok": 1, "error": 1}
+
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(ValueError):
+        pm.observe_stage("not_a_stage", 0.1)
+    with pytest.raises(ValueError):
+        pm.instrument_stage("not_a_stage")
+
+
+def test_decorator_reads_labels_and_classifies_results():
+    seen = []
+
+    class Client:
+        @pm.instrument_stage("order_placement")
+        def place(self, symbol, side, qty=None):
+            return {"error": "rejected"} if qty is None else {"order_id": "1"}
+
+        @pm.instrument_stage("fill_confirmation", side_arg=None)
+        async def confirm(self, symbol, order_id):
+            seen.append(symbol)
+            return None
+
+    client = Client()
+    client.place("eth_usdt", "buy", qty=1)
+    client.place(symbol="ETH_USDT", side="BUY")
+    asyncio.run(client.confirm("ETH_USDT", "9"))
+
+    stats = pm.get_pipeline_stage_stats()
+    assert stats["order_placement"]["outcomes"] == {"ok": 1, "error": 1}
+    assert stats["fill_confirmation"]["outcomes"] == {"empty": 1}
+    assert seen == ["ETH_USDT"]
+
+
+def test_symbol_labels_are_bounded(monkeypatch):
+    monkeypatch.setattr(pm, "_MAX_SYMBOLS", 2)
+    assert pm._symbol_label("btc_usdt") == "BTC_USDT"
+    assert pm._symbol_label("ETH_USDT") == "ETH_USDT"
+    assert pm._symbol_label("SOL_USDT") == pm.OTHER
+    assert pm._symbol_label("BTC_USDT") == "BTC_USDT"
+    assert pm._side_label("sell") == "SELL" and pm._side_label(None) == "none"
+
+
+def test_exchange_endpoint_from_url():
+    from app.services.brokers.crypto_com_trade import _exchange_endpoint
+
+    assert _exchange_endpoint("https://api.crypto.com/exchange/v1/private/get-open-orders") == "private/get-open-orders"
+    assert _exchange_endpoint("https://api.crypto.com/exchange/v1/public/get-instruments") == "public/get-instruments"
+    assert _exchange_endpoint("http://127.0.0.1:9000/proxy/private") is None
+    assert _exchange_endpoint("https://api.ipify.org") is None
+
+
+def test_exchange_request_metrics_exported(monkeypatch):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from app.services.brokers import crypto_com_trade as cct
+
+    responses = iter(
+        [
+            SimpleNamespace(status_code=200, json=lambda: {"code": 0}),
+            SimpleNamespace(status_code=400, json=lambda: {"code": 40101}),
+        ]
+    )
+    monkeypatch.setattr(cct, "_http_post", lambda url, *a, **k: next(responses))
+    url = "https://api.crypto.com/exchange/v1/private/get-order-detail"
+    cct.http_post(url, json={})
+    cct.http_post(url, json={})
+
+    registry = prometheus_client.REGISTRY
+    endpoint = "private/get-order-detail"
+    assert registry.get_sample_value("crypto_com_request_seconds_count", {"endpoint": endpoint}) >= 2
+    assert registry.get_sample_value("crypto_com_request_errors_total", {"endpoint": endpoint, "code": "40101"}) >= 1
@@ -0,0 +1,150 @@
+"""Preset sweep: search space, shared-memory pool parity, checkpoint resume, preset diff."""
+
+import json
+import random
+
+import pytest
+
+from app.services.backtest_engine import precompute_indicator_series
+from app.services.config_loader import validate_preset
+from app.services.preset_sweep import (
+    SearchSpace,
+    SharedSeries,
+    SweepResult,
+    apply_overrides,
+    build_preset_diff,
+    rank_results,
+    run_sweep,
+)
+from app.services.strategy_profiles import RiskApproach, StrategyType
+
+SCALP = (StrategyType.SCALP, RiskApproach.AGGRESSIVE)
+RULES = {
+    "rsi": {"buyBelow": 45, "sellAbove": 70},
+    "maChecks": {"ema10": False, "ma50": False, "ma200": False},
+    "sl": {"atrMult": 1.5},
+    "tp": {"rr": 2.0},
+    "volumeMinRatio": 0.0,
+    "minPriceChangePct": 1.0,
+}
+STRATEGY_RULES = {"scalp": {"notificationProfile": "scalp", "rules": {"Aggressive": RULES, "Conservative": RULES}}}
+
+
+def _candles(n, seed):
+    rng = random.Random(seed)
+    out, price = [], 100.0
+    for i in range(n):
+        o = price
+        c = max(0.01, o * (1 + rng.gauss(0, 0.012)))
+        out.append({"t": i * 3_600_000, "o": o, "h": max(o, c) * 1.003, "l": min(o, c) * 0.997, "c": c,
+                    "v": rng.uniform(10, 1000)})
+        price = c
+    return out
+
+
+DATA = {"AAA_USDT": _candles(700, 1), "BBB_USDT": _candles(700, 2)}
+SPACE = SearchSpace(grid={"rsi.buyBelow": [35, 45], "maChecks.ema10": [False, True]})
+
+
+def _sweep(**kw):
+    return run_sweep(DATA, [SCALP], SPACE, base_rules={SCALP: RULES}, **kw)
+
+
+def _by_key(results):
+    return {r.key: (r.trades, r.wins, round(r.pnl_usd, 8)) for r in results}
+
+
+def test_grid_and_random_candidates():
+    assert SPACE.candidates() == [
+        {"maChecks.ema10": False, "rsi.buyBelow": 35},
+        {"maChecks.ema10": False, "rsi.buyBelow": 45},
+        {"maChecks.ema10": True, "rsi.buyBelow": 35},
+        {"maChecks.ema10": True, "rsi.buyBelow": 45},
+    ]
+    space = SearchSpace(random={"rsi.buyBelow": {"min": 25, "max": 50, "step": 5}, "volumeMinRatio": [0.5, 1.0]},
+                        samples=8, seed=3)
+    drawn = space.candidates()
+    assert drawn == space.candidates()  # seeded
+    assert len({json.dumps(c, sort_keys=True) for c in drawn}) == len(drawn) == 8
+    assert all(c["rsi.buyBelow"] in (25, 30, 35, 40, 45, 50) and c["volumeMinRatio"] in (0.5, 1.0) for c in drawn)
+
+
+def test_apply_overrides_sets_nested_paths_without_mutating():
+    out = apply_overrides(RULES, {"rsi.buyBelow": 30, "trendFilters.require_price_above_ma200": True})
+    assert out["rsi"] == {"buyBelow": 30, "sellAbove": 70}
+    assert out["trendFilters"] == {"require_price_above_ma200": True}
+    assert RULES["rsi"]["buyBelow"] == 45 and "trendFilters" not in RULES
+
+
+def test_shared_series_round_trips_candles_and_indicators():
+    shared = SharedSeries.create(DATA)
+    try:
+        attached = SharedSeries.attach(shared.layout)
+        assert attached.candles("BBB_USDT") == DATA["BBB_USDT"]
+        expected = precompute_indicator_series(DATA["AAA_USDT"])
+        got = attached.series("AAA_USDT")
+        for key in ("rsi", "atr", "ma10w", "price"):
+            assert got[key].tolist() == pytest.approx(expected[key].tolist(), nan_ok=True)
+        attached.close()
+    finally:
+        shared.close()
+
+
+def test_process_pool_matches_in_process_sweep():
+    inline = _sweep(workers=1)
+    pooled = _sweep(workers=2)
+    assert len(inline) == 5  # baseline + 4 candidates
+    assert _by_key(inline) == _by_key(pooled)
+
+
+def test_checkpoint_resumes_and_rejects_other_datasets(tmp_path):
+    path = tmp_path / "sweep.jsonl"
+    calls = []
+    small = SearchSpace(grid={"rsi.buyBelow": [35]})
+    run_sweep(DATA, [SCALP], small, workers=1, checkpoint=path, base_rules={SCALP: RULES})
+    # crash mid-write leaves a truncated line behind
+    with path.open("a") as fh:
+        fh.write('{"preset": "sca')
+    resumed = _sweep(workers=1, checkpoint=path, progress=lambda done, total, r: calls.append(r.overrides))
+    assert len(resumed) == 5
+    # the baseline comes from the checkpoint, the grid's 4 candidates are new
+    assert len(calls) == 4 and {} not in calls
+    assert _by_key(resumed) == _by_key(_sweep(workers=1))
+
+    with pytest.raises(ValueError, match="different dataset"):
+        run_sweep({"AAA_USDT": DATA["AAA_USDT"]}, [SCALP], small, workers=1, checkpoint=path,
+                  base_rules={SCALP: RULES})
+
+
+def test_rank_and_preset_diff_is_valid():
+    results = _sweep(workers=1)
+    ranked = rank_results(results, min_trades=1)
+    assert [r.score for r in ranked] == sorted((r.score for r in ranked), reverse=True)
+    assert rank_results(results, min_trades=10_000) == []
+
+    best = next(r for r in ranked if r.overrides)
+    diff = build_preset_diff(best, results, strategy_rules=STRATEGY_RULES)
+    ok, msg = validate_preset(diff["candidate"])
+    assert ok, msg
+    assert diff["candidate"]["rules"]["Conservative"] == RULES
+    changed = diff["candidate"]["rules"]["Aggressive"]
+    for path, change in diff["changes"].items():
+        assert change["from"] != change["to"]
+        head, _, tail = path.partition(".")
+        assert (changed[head][tail] if tail else changed[head]) == change["to"]
+    assert diff["baseline_metrics"]["overrides"] == {}
+
+    bad = SweepResult(preset="scalp", risk_mode="Aggressive", overrides={"rsi.buyBelow": 150})
+    with pytest.raises(ValueError, match="0..100"):
+        build_preset_diff(bad, results, strategy_rules=STRATEGY_RULES)
+
+
+def test_validate_preset_accepts_rules_format_and_legacy():
+    assert validate_preset(STRATEGY_RULES["scalp"]) == (True, "")
+    assert validate_preset({"rules": {"Conservative": dict(RULES, rsi={"buyBelow": None})}}) == (True, "")
+    assert not validate_preset({"rules": {"Conservative": dict(RULES, volumeMinRatio=-1)}})[0]
+    assert not validate_preset({"rules": {"Conservative": dict(RULES, maChecks={"ma50": "yes"})}})[0]
+    assert not validate_preset({"rules": {}})[0]
+    legacy = {"RSI_PERIOD": 14, "RSI_BUY": 40, "RSI_SELL": 70, "MA50": 50, "EMA10": 10, "MA10W": 70, "ATR": 14, "VOL": 10}
+    assert validate_preset(legacy) == (True, "")
+    assert not validate_preset(dict(legacy, RSI_BUY=120))[0]
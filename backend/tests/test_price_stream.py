@@ -0,0 +1,129 @@
+"""Price stream: per-client subscriptions, deltas with keyframes, isolated slow clients."""
+
+import asyncio
+
+import pytest
+
+from app.api.routes_ws_prices import _handle_message
+from app.services import price_stream
+
+
+class FakeWS:
+    def __init__(self, delay=0.0):
+        self.sent = []
+        self.delay = delay
+        self.closed = False
+
+    async def send_json(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    price_stream.reset_price_stream_for_tests()
+    yield
+    price_stream.reset_price_stream_for_tests()
+
+
+def _push(prices):
+    changed, removed = price_stream._apply_prices(prices, {})
+    price_stream._cache_ts = 1.0
+    return price_stream._broadcast(changed, removed)
+
+
+async def _settle():
+    await asyncio.sleep(0.01)
+
+
+def test_clients_get_keyframe_then_only_their_changed_symbols():
+    async def run():
+        price_stream._apply_prices({"BTC": 100.0, "ETH": 10.0, "SOL": 1.0}, {})
+        everything, btc = FakeWS(), FakeWS()
+        await price_stream.subscribe(everything)
+        await price_stream.subscribe(btc, "btc_usdt")
+        await _settle()
+        assert everything.sent[0]["type"] == "snapshot" and len(everything.sent[0]["prices"]) == 3
+        assert btc.sent == [{"type": "snapshot", "prices": {"BTC": 100.0}, "ts": 0, "source": "crypto_com", "seq": 1}]
+
+        # ETH only: the BTC client is not touched
+        assert _push({"BTC": 100.0, "ETH": 11.0, "SOL": 1.0}) == 1
+        await _settle()
+        assert everything.sent[-1] == {"type": "delta", "changed": {"ETH": 11.0}, "removed": [], "ts": 1.0, "seq": 2}
+        assert len(btc.sent) == 1
+
+        # SOL delisted, BTC moved
+        assert _push({"BTC": 101.0, "ETH": 11.0}) == 2
+        await _settle()
+        assert everything.sent[-1]["changed"] == {"BTC": 101.0} and everything.sent[-1]["removed"] == ["SOL"]
+        assert btc.sent[-1] == {"type": "delta", "changed": {"BTC": 101.0}, "removed": [], "ts": 1.0, "seq": 2}
+
+        # Subscription changes answer with a keyframe for the new set
+        assert price_stream.set_symbols(btc, ["ETH"], mode="add") == {"BTC", "ETH"}
+        await _settle()
+        assert btc.sent[-1]["type"] == "snapshot" and btc.sent[-1]["prices"] == {"BTC": 101.0, "ETH": 11.0}
+
+        # Periodic keyframes
+        price_stream._clients[everything].last_keyframe -= price_stream.PRICE_STREAM_KEYFRAME_S + 1
+        price_stream._schedule_keyframes()
+        await _settle()
+        assert everything.sent[-1]["type"] == "snapshot"
+        assert price_stream.get_price_stream_stats()["keyframes"] == 4
+
+    asyncio.run(run())
+
+
+def test_slow_client_coalesces_and_is_dropped_without_blocking_others(monkeypatch):
+    monkeypatch.setattr(price_stream, "PRICE_STREAM_SEND_TIMEOUT_S", 0.2)
+
+    async def run():
+        price_stream._apply_prices({"BTC": 100.0}, {})
+        fast, slow = FakeWS(), FakeWS(delay=0.05)
+        await price_stream.subscribe(fast)
+        await price_stream.subscribe(slow)
+        await _settle()
+        for price in (101.0, 102.0, 103.0):
+            _push({"BTC": price})
+            await _settle()
+        # The fast client got every delta while the slow one is still on its keyframe
+        assert [m["changed"]["BTC"] for m in fast.sent[1:]] == [101.0, 102.0, 103.0]
+        await asyncio.sleep(0.2)
+        # The slow client received one coalesced delta with the latest price
+        assert [m["type"] for m in slow.sent] == ["snapshot", "delta"]
+        assert slow.sent[-1]["changed"] == {"BTC": 103.0}
+        assert price_stream.get_price_stream_stats()["coalesced"] >= 1
+
+        slow.delay = 1.0
+        _push({"BTC": 104.0})
+        await asyncio.sleep(0.3)
+        assert slow.closed and slow not in price_stream._clients
+        assert fast.sent[-1]["changed"] == {"BTC": 104.0}
+        assert price_stream.get_price_stream_stats()["clients_dropped"] == 1
+        await price_stream.unsubscribe(fast)
+        assert price_stream.get_price_stream_stats()["clients"] == 0
+
+    asyncio.run(run())
+
+
+def test_control_messages_are_bounded_and_routed_through_the_sender(monkeypatch):
+    monkeypatch.setattr(price_stream, "PRICE_STREAM_QUEUE_SIZE", 2)
+
+    async def run():
+        ws = FakeWS()
+        await price_stream.subscribe(ws, ["BTC"])
+        for _ in range(4):
+            _handle_message(ws, "ping")
+        _handle_message(ws, '{"action": "unsubscribe", "symbols": ["BTC"]}')
+        _handle_message(ws, '{"action": "bogus"}')
+        await _settle()
+        # Controls go ahead of price messages; only the newest two survived
+        assert [m["type"] for m in ws.sent] == ["subscribed", "error", "snapshot"]
+        assert ws.sent[0]["symbols"] == [] and ws.sent[2]["prices"] == {}
+        assert price_stream.get_price_stream_stats()["controls_dropped"] == 4
+        await price_stream.unsubscribe(ws)
+
+    asyncio.run(run())
@@ -2,77 +2,100 @@
 
 from __future__ import annotations
 
+import importlib
 import sys
 import types
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
-# Stub heavy service deps before importing exchange_sync (keeps unit tests light).
-def _ensure_stub(name: str, **attrs):
-    if name in sys.modules and not isinstance(sys.modules[name], MagicMock):
-        mod = sys.modules[name]
-        for k, v in attrs.items():
-            setattr(mod, k, v)
-        return mod
+import pytest
+
+import app.services
+# Import the real module (and its real dependencies) once; the fixture below
+# re-executes only exchange_sync itself against the stubs.
+import app.services.exchange_sync  # noqa: F401
+
+
+def _stub_module(monkeypatch, name: str, **attrs):
+    """Put a stub module in sys.modules for the current test only.
+
+    The stub starts as a copy of the real module when that is loaded, so names
+    the test does not override still resolve.
+    """
     mod = types.ModuleType(name)
+    real = sys.modules.get(name)
+    if real is not None:
+        mod.__dict__.update(vars(real))
     for k, v in attrs.items():
         setattr(mod, k, v)
-    sys.modules[name] = mod
+    monkeypatch.setitem(sys.modules, name, mod)
     return mod
 
 
-_ensure_stub("app.services.telegram_notifier", telegram_notifier=MagicMock())
-_ensure_stub("app.services.fill_dedup_postgres", get_fill_dedup=MagicMock())
-_ensure_stub("app.services.throttle_service", build_strategy_key=lambda *a, **k: "default:default")
-_ensure_stub(
-    "app.utils.pipeline_logging",
-    make_json_safe=lambda x: x,
-    log_critical_failure=MagicMock(),
-)
-_ensure_stub(
-    "app.services.sl_tp_protection",
-    GHOST_CANCEL_GRACE_SECONDS=3600,
-    get_active_protection_order=MagicMock(),
-    has_complete_sl_tp_protection=MagicMock(return_value=False),
-    release_sl_tp_creation_lock=MagicMock(),
-    should_mark_unresolved_order_cancelled=MagicMock(return_value=(False, "skip")),
-    try_acquire_sl_tp_creation_lock=MagicMock(return_value=True),
-)
-_ensure_stub("app.services.open_orders", merge_orders=MagicMock(), UnifiedOpenOrder=object)
-_ensure_stub(
-    "app.services.open_orders_cache",
-    store_unified_open_orders=MagicMock(),
-    update_open_orders_cache=MagicMock(),
-)
-_broker = _ensure_stub("app.services.brokers")
-_broker_mod = _ensure_stub(
-    "app.services.brokers.crypto_com_trade",
-    CryptoComTradeClient=MagicMock,
-    trade_client=MagicMock(),
-)
-
-import pytest
-
-from app.services.exchange_sync import (
-    ExchangeSyncService,
-    expand_symbols_with_quote_variants,
-    normalize_resolved_exchange_status,
-    parse_resolved_order_payload,
-    quote_instrument_variants,
-    should_notify_executed_fill,
-    RECENT_FILL_WINDOW_SECONDS,
-)
+@pytest.fixture
+def exchange_sync(monkeypatch):
+    """exchange_sync bound to stubbed heavy service deps (keeps unit tests light).
+
+    Stubs and the re-imported module are monkeypatched into sys.modules, so the
+    real modules are back for the next test and for later test modules.
+    """
+    _stub_module(monkeypatch, "app.services.telegram_notifier", telegram_notifier=MagicMock())
+    _stub_module(monkeypatch, "app.services.fill_dedup_postgres", get_fill_dedup=MagicMock())
+    _stub_module(monkeypatch, "app.services.throttle_service", build_strategy_key=lambda *a, **k: "default:default")
+    _stub_module(
+        monkeypatch,
+        "app.utils.pipeline_logging",
+        make_json_safe=lambda x: x,
+        log_critical_failure=MagicMock(),
+    )
+    _stub_module(
+        monkeypatch,
+        "app.services.sl_tp_protection",
+        GHOST_CANCEL_GRACE_SECONDS=3600,
+        get_active_protection_order=MagicMock(),
+        has_complete_sl_tp_protection=MagicMock(return_value=False),
+        release_sl_tp_creation_lock=MagicMock(),
+        should_mark_unresolved_order_cancelled=MagicMock(return_value=(False, "skip")),
+        try_acquire_sl_tp_creation_lock=MagicMock(return_value=True),
+    )
+    _stub_module(monkeypatch, "app.services.open_orders", merge_orders=MagicMock(), UnifiedOpenOrder=object)
+    _stub_module(
+        monkeypatch,
+        "app.services.open_orders_cache",
+        store_unified_open_orders=MagicMock(),
+        update_open_orders_cache=MagicMock(),
+    )
+    _stub_module(monkeypatch, "app.services.brokers")
+    _stub_module(
+        monkeypatch,
+        "app.services.brokers.crypto_com_trade",
+        CryptoComTradeClient=MagicMock,
+        trade_client=MagicMock(),
+    )
+    monkeypatch.delitem(sys.modules, "app.services.exchange_sync")
+    monkeypatch.setattr(app.services, "exchange_sync", None, raising=False)
+    return importlib.import_module("app.services.exchange_sync")
+
+
+def _db_without_intent():
+    """MagicMock db where OrderIntent / TradeSignal lookups return None."""
+    db = MagicMock()
+    empty = MagicMock()
+    empty.first.return_value = None
+    empty.order_by.return_value.first.return_value = None
+    db.query.return_value.filter.return_value = empty
+    return db
 
 
 class TestQuoteInstrumentVariants:
-    def test_usd_adds_usdt_twin(self):
-        assert quote_instrument_variants("BTC_USD") == ["BTC_USD", "BTC_USDT"]
+    def test_usd_adds_usdt_twin(self, exchange_sync):
+        assert exchange_sync.quote_instrument_variants("BTC_USD") == ["BTC_USD", "BTC_USDT"]
 
-    def test_usdt_adds_usd_twin(self):
-        assert quote_instrument_variants("eth_usdt") == ["ETH_USDT", "ETH_USD"]
+    def test_usdt_adds_usd_twin(self, exchange_sync):
+        assert exchange_sync.quote_instrument_variants("eth_usdt") == ["ETH_USDT", "ETH_USD"]
 
-    def test_expand_preserves_order_and_dedupes(self):
-        assert expand_symbols_with_quote_variants(["BTC_USD", "BTC_USDT", "ETH_USDT"]) == [
+    def test_expand_preserves_order_and_dedupes(self, exchange_sync):
+        assert exchange_sync.expand_symbols_with_quote_variants(["BTC_USD", "BTC_USDT", "ETH_USDT"]) == [
             "BTC_USD",
             "BTC_USDT",
             "ETH_USDT",
@@ -81,12 +104,12 @@ class TestQuoteInstrumentVariants:
 
 
 class TestNormalizeAndParse:
-    def test_executed_alias_becomes_filled(self):
-        assert normalize_resolved_exchange_status("EXECUTED") == "FILLED"
-        assert normalize_resolved_exchange_status("canceled") == "CANCELLED"
+    def test_executed_alias_becomes_filled(self, exchange_sync):
+        assert exchange_sync.normalize_resolved_exchange_status("EXECUTED") == "FILLED"
+        assert exchange_sync.normalize_resolved_exchange_status("canceled") == "CANCELLED"
 
-    def test_parse_detail_payload(self):
-        parsed = parse_resolved_order_payload(
+    def test_parse_detail_payload(self, exchange_sync):
+        parsed = exchange_sync.parse_resolved_order_payload(
             {
                 "order_id": "5755608491541413116",
                 "status": "FILLED",
@@ -101,8 +124,8 @@ class TestNormalizeAndParse:
         assert parsed["cumulative_quantity"] == pytest.approx(0.00016)
         assert parsed["price"] == pytest.approx(65199.57)
 
-    def test_parse_cancelled_with_fill_qty_becomes_filled(self):
-        parsed = parse_resolved_order_payload(
+    def test_parse_cancelled_with_fill_qty_becomes_filled(self, exchange_sync):
+        parsed = exchange_sync.parse_resolved_order_payload(
             {
                 "order_id": "73817490102011214",
                 "status": "CANCELLED",
@@ -119,9 +142,9 @@ class TestNormalizeAndParse:
         assert parsed["contingency_type"] == "TAKE_PROFIT"
         assert parsed["child_exchange_order_id"] == "5755600492041405464"
 
-    def test_parse_rejects_other_order_id(self):
+    def test_parse_rejects_other_order_id(self, exchange_sync):
         assert (
-            parse_resolved_order_payload(
+            exchange_sync.parse_resolved_order_payload(
                 {"order_id": "other", "status": "FILLED"},
                 "5755608491541413116",
             )
@@ -130,25 +153,21 @@ class TestNormalizeAndParse:
 
 
 class TestProtectionRoleFromOrderData:
-    def test_contingency_take_profit(self):
-        from app.services.exchange_sync import protection_role_from_order_data
-
+    def test_contingency_take_profit(self, exchange_sync):
         assert (
-            protection_role_from_order_data(
+            exchange_sync.protection_role_from_order_data(
                 {"order_type": "LIMIT", "contingency_type": "TAKE_PROFIT"}
             )
             == "TAKE_PROFIT"
         )
 
-    def test_order_type_stop_limit(self):
-        from app.services.exchange_sync import protection_role_from_order_data
-
-        assert protection_role_from_order_data({"order_type": "STOP_LIMIT"}) == "STOP_LOSS"
+    def test_order_type_stop_limit(self, exchange_sync):
+        assert exchange_sync.protection_role_from_order_data({"order_type": "STOP_LIMIT"}) == "STOP_LOSS"
 
 
 class TestResolveOrderStatusFromExchange:
-    def test_prefers_get_order_detail(self):
-        svc = ExchangeSyncService()
+    def test_prefers_get_order_detail(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         detail = {
             "code": 0,
             "result": {
@@ -175,8 +194,8 @@ class TestResolveOrderStatusFromExchange:
             mock_detail.assert_called_once_with("tp-1")
             mock_hist.assert_not_called()
 
-    def test_falls_back_to_advanced_detail_when_spot_empty(self):
-        svc = ExchangeSyncService()
+    def test_falls_back_to_advanced_detail_when_spot_empty(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         adv_detail = {
             "code": 0,
             "result": {
@@ -208,8 +227,8 @@ class TestResolveOrderStatusFromExchange:
             mock_adv.assert_called_once_with("73817490102011214")
             mock_hist.assert_not_called()
 
-    def test_falls_back_to_instrument_history_when_detail_empty(self):
-        svc = ExchangeSyncService()
+    def test_falls_back_to_instrument_history_when_detail_empty(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         history = {
             "data": [
                 {
@@ -251,8 +270,8 @@ class TestResolveOrderStatusFromExchange:
                 for call in mock_hist.call_args_list
             )
 
-    def test_unscoped_history_alone_is_not_required_when_instrument_hits(self):
-        svc = ExchangeSyncService()
+    def test_unscoped_history_alone_is_not_required_when_instrument_hits(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         calls = []
 
         def history_side_effect(**kwargs):
@@ -290,8 +309,8 @@ class TestResolveOrderStatusFromExchange:
             assert result["status"] == "FILLED"
             assert "BTC_USD" in calls
 
-    def test_advanced_resolve_uses_narrow_windows_not_create_to_now(self):
-        svc = ExchangeSyncService()
+    def test_advanced_resolve_uses_narrow_windows_not_create_to_now(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         create_at = datetime(2026, 7, 19, 10, 24, tzinfo=timezone.utc)
         calls = []
 
@@ -341,10 +360,10 @@ class TestResolveOrderStatusFromExchange:
 
 
 class TestReconcileMisclassifiedProtectionFills:
-    def test_upgrades_cancelled_zero_qty_tp_to_filled(self):
+    def test_upgrades_cancelled_zero_qty_tp_to_filled(self, exchange_sync, monkeypatch):
         from app.models.exchange_order import OrderStatusEnum
 
-        svc = ExchangeSyncService()
+        svc = exchange_sync.ExchangeSyncService()
         order = MagicMock()
         order.exchange_order_id = "73817490102011217"
         order.symbol = "BTC_USD"
@@ -371,15 +390,17 @@ class TestReconcileMisclassifiedProtectionFills:
         # Watchlist lookup inside _apply_protection_fill_from_resolve
         query.first.return_value = None
 
-        _ensure_stub(
+        _stub_module(
+            monkeypatch,
             "app.services.signal_monitor",
             _emit_lifecycle_event=MagicMock(),
         )
-        _ensure_stub(
+        _stub_module(
+            monkeypatch,
             "app.services.strategy_profiles",
             resolve_strategy_profile=lambda *a, **k: ("default", "default"),
         )
-        _ensure_stub("app.models.watchlist", WatchlistItem=MagicMock())
+        _stub_module(monkeypatch, "app.models.watchlist", WatchlistItem=MagicMock())
 
         with patch.object(
             svc,
@@ -407,10 +428,10 @@ class TestReconcileMisclassifiedProtectionFills:
         mock_tg.assert_called_once()
         mock_child.assert_called_once()
 
-    def test_skips_confirmed_cancelled_on_subsequent_passes(self):
+    def test_skips_confirmed_cancelled_on_subsequent_passes(self, exchange_sync):
         from app.models.exchange_order import OrderStatusEnum
 
-        svc = ExchangeSyncService()
+        svc = exchange_sync.ExchangeSyncService()
         order = MagicMock()
         order.exchange_order_id = "73817490102025222"
         order.symbol = "DGB_USD"
@@ -450,10 +471,10 @@ class TestReconcileMisclassifiedProtectionFills:
 
 
 class TestUpsertProtectionChildSpotFill:
-    def test_inserts_missing_child_and_suppresses_telegram(self):
+    def test_inserts_missing_child_and_suppresses_telegram(self, exchange_sync):
         from app.models.exchange_order import OrderSideEnum, OrderStatusEnum
 
-        svc = ExchangeSyncService()
+        svc = exchange_sync.ExchangeSyncService()
         parent = MagicMock()
         parent.exchange_order_id = "73817490102011214"
         parent.symbol = "BTC_USD"
@@ -495,10 +516,10 @@ class TestUpsertProtectionChildSpotFill:
 
 
 class TestResolvePrefersAdvancedForProtection:
-    def test_protection_row_tries_advanced_before_spot(self):
+    def test_protection_row_tries_advanced_before_spot(self, exchange_sync):
         from app.models.exchange_order import OrderStatusEnum
 
-        svc = ExchangeSyncService()
+        svc = exchange_sync.ExchangeSyncService()
         row = MagicMock()
         row.symbol = "BTC_USD"
         row.order_role = "TAKE_PROFIT"
@@ -557,8 +578,8 @@ class TestMaybeNotifyExecutedFillTelegram:
         order.exchange_create_time = datetime(2026, 7, 1, tzinfo=timezone.utc)
         return order
 
-    def test_sends_telegram_for_tp_fill(self):
-        svc = ExchangeSyncService()
+    def test_sends_telegram_for_tp_fill(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         order = self._tp_order()
         db = MagicMock()
         fill_dedup = MagicMock()
@@ -607,8 +628,8 @@ class TestMaybeNotifyExecutedFillTelegram:
         assert kwargs["symbol"] == "BTC_USD"
         assert order.execution_notified_at is not None
 
-    def test_skips_when_gate_blocks(self):
-        svc = ExchangeSyncService()
+    def test_skips_when_gate_blocks(self, exchange_sync):
+        svc = exchange_sync.ExchangeSyncService()
         order = self._tp_order()
         fill_dedup = MagicMock()
         notifier = MagicMock()
@@ -632,7 +653,7 @@ class TestMaybeNotifyExecutedFillTelegram:
 
 
 class TestProtectionFillGate:
-    def test_tp_role_allowed_even_if_old(self):
+    def test_tp_role_allowed_even_if_old(self, exchange_sync):
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
@@ -645,7 +666,7 @@ class TestProtectionFillGate:
         order.order_type = "TAKE_PROFIT_LIMIT"
         order.exchange_update_time = filled_at
         order.exchange_create_time = filled_at
-        allowed, reason = should_notify_executed_fill(
+        allowed, reason = exchange_sync.should_notify_executed_fill(
             db=MagicMock(),
             order=order,
             now_utc=now,
@@ -655,13 +676,11 @@ class TestProtectionFillGate:
         assert allowed is True
         assert "system" in reason.lower()
 
-    def test_old_manual_entry_blocked(self):
+    def test_old_manual_entry_blocked(self, exchange_sync):
         from datetime import timedelta
 
-        from tests.test_exchange_sync_executed_fill_gate import _db_without_intent
-
         now = datetime.now(timezone.utc)
-        filled_at = now - timedelta(seconds=RECENT_FILL_WINDOW_SECONDS + 60)
+        filled_at = now - timedelta(seconds=exchange_sync.RECENT_FILL_WINDOW_SECONDS + 60)
         order = MagicMock()
         order.execution_notified_at = None
         order.trade_signal_id = None
@@ -671,7 +690,7 @@ class TestProtectionFillGate:
         order.exchange_order_id = "manual-old"
         order.exchange_update_time = filled_at
         order.exchange_create_time = filled_at
-        allowed, reason = should_notify_executed_fill(
+        allowed, reason = exchange_sync.should_notify_executed_fill(
             db=_db_without_intent(),
             order=order,
             now_utc=now,
@@ -0,0 +1,142 @@
+"""Parallel per-symbol evaluation in SignalMonitorService.monitor_signals."""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import signal_cycle_executor as sce
+from app.services.signal_monitor import SignalMonitorService
+
+
+def _items(*symbols):
+    return [SimpleNamespace(symbol=s) for s in symbols]
+
+
+def test_cycle_time_follows_slowest_symbol():
+    delays = {"A": 0.05, "B": 0.05, "C": 0.25, "D": 0.05}
+
+    def evaluate(item):
+        time.sleep(delays[item.symbol])
+
+    result = asyncio.run(
+        sce.run_symbol_evaluations(_items(*delays), evaluate, concurrency=4, gate=sce.SymbolGate())
+    )
+    assert result.evaluated == 4
+    assert result.slowest_symbol == "C"
+    assert result.wall_seconds < sum(delays.values())
+    assert result.wall_seconds < 0.35
+
+
+def test_concurrency_is_bounded_and_failures_isolated():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def evaluate(item):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        if item.symbol == "BAD":
+            raise RuntimeError("boom")
+
+    result = asyncio.run(
+        sce.run_symbol_evaluations(
+            _items("A", "B", "BAD", "C", "D", "E"), evaluate, concurrency=2, gate=sce.SymbolGate()
+        )
+    )
+    assert peak == 2
+    assert result.evaluated == 5
+    assert result.failed == 1
+
+
+def test_busy_symbol_is_skipped_and_latency_recorded():
+    sce.reset_symbol_latency_stats()
+    gate = sce.SymbolGate()
+    assert gate.try_enter("A")  # evaluation from a previous (timed-out) cycle still running
+    seen = []
+    result = asyncio.run(
+        sce.run_symbol_evaluations(_items("A", "B"), lambda item: seen.append(item.symbol), concurrency=2, gate=gate)
+    )
+    assert seen == ["B"]
+    assert result.skipped_busy == 1
+    assert gate.busy() == ["A"]
+    stats = sce.get_symbol_latency_stats()
+    assert stats["B"]["count"] == 1 and "A" not in stats
+
+
+def test_items_sharing_a_gate_key_never_overlap():
+    in_flight = {}
+    overlapped = []
+    lock = threading.Lock()
+
+    def evaluate(item):
+        base = item.symbol.split("_")[0]
+        with lock:
+            if in_flight.get(base):
+                overlapped.append(item.symbol)
+            in_flight[base] = True
+        time.sleep(0.05)
+        with lock:
+            in_flight[base] = False
+
+    result = asyncio.run(
+        sce.run_symbol_evaluations(
+            _items("BTC_USD", "BTC_USDT", "ETH_USDT"),
+            evaluate,
+            concurrency=3,
+            gate=sce.SymbolGate(),
+            gate_key=lambda item: item.symbol.split("_")[0],
+        )
+    )
+    assert overlapped == []
+    assert result.evaluated == 3 and result.skipped_busy == 0
+    assert set(result.latencies) == {"BTC_USD", "BTC_USDT", "ETH_USDT"}
+
+
+def test_monitor_signals_uses_one_session_per_worker():
+    svc = SignalMonitorService()
+    svc._startup_config_logged = True
+    sessions = []
+
+    def open_session(db):
+        session = MagicMock(name=f"worker{len(sessions)}")
+        sessions.append(session)
+        return session
+
+    used = {}
+
+    def check(db, item, **kwargs):
+        used[item.symbol] = db
+        time.sleep(0.05)
+
+    items = _items("BTC_USDT", "ETH_USDT", "SOL_USDT")
+    cycle_db = MagicMock(name="cycle_db")
+    with patch.object(svc, "_get_telegram_runtime_config", return_value={"enabled": True}), \
+         patch.object(svc, "_fetch_watchlist_items_sync", return_value=items), \
+         patch.object(svc, "_cycle_concurrency", return_value=3), \
+         patch.object(svc, "_open_worker_session", side_effect=open_session), \
+         patch.object(svc, "_check_signal_for_coin_sync", side_effect=check):
+        asyncio.run(svc.monitor_signals(cycle_db))
+
+    assert len(sessions) == 3
+    assert set(map(id, used.values())) == set(map(id, sessions))
+    for session in sessions:
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
+    assert svc.last_cycle_stats["evaluated"] == 3
+    assert svc.last_cycle_stats["wall_seconds"] < 0.15
+
+
+@pytest.mark.parametrize("dialect,expected", [("postgresql", 4), ("sqlite", 1)])
+def test_cycle_concurrency_by_dialect(monkeypatch, dialect, expected):
+    monkeypatch.setenv("SIGNAL_MONITOR_CONCURRENCY", "4")
+    db = MagicMock()
+    db.get_bind.return_value = SimpleNamespace(dialect=SimpleNamespace(name=dialect))
+    assert SignalMonitorService._cycle_concurrency(db) == expected
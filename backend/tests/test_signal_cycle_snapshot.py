@@ -0,0 +1,127 @@
+"""Cycle snapshot: one bulk query per table, read-only rows, queries-per-cycle counter."""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.exchange_order import ExchangeOrder
+from app.models.market_price import MarketData, MarketPrice
+from app.models.signal_throttle import SignalThrottleState
+from app.models.trading_settings import TradingSettings
+from app.models.watchlist import WatchlistItem
+from app.services.signal_cycle_snapshot import build_cycle_snapshot, count_queries
+from app.services.signal_throttle import fetch_signal_states
+
+TABLES = [
+    WatchlistItem.__table__,
+    MarketPrice.__table__,
+    MarketData.__table__,
+    SignalThrottleState.__table__,
+    TradingSettings.__table__,
+    ExchangeOrder.__table__,
+]
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine, tables=TABLES)
+    session = session_local()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=TABLES)
+        engine.dispose()
+
+
+def _seed(db, symbols):
+    now = datetime.now(timezone.utc)
+    for i, symbol in enumerate(symbols):
+        db.add(WatchlistItem(symbol=symbol, exchange="CRYPTO_COM", alert_enabled=True,
+                             trade_enabled=False, trade_amount_usd=10.0 + i, is_deleted=False))
+        db.add(MarketPrice(symbol=symbol, price=100.0 + i, volume_24h=5.0))
+        db.add(MarketData(symbol=symbol, price=100.0 + i, rsi=40.0, ma50=99.0, ema10=101.0, atr=1.0))
+        for side in ("BUY", "SELL"):
+            db.add(SignalThrottleState(symbol=symbol, strategy_key="swing:conservative", side=side,
+                                       last_price=99.0, last_time=now))
+    db.commit()
+
+
+def test_snapshot_matches_per_symbol_reads(db_session):
+    symbols = ["BTC_USDT", "ETH_USDT", "SOL_USDT"]
+    _seed(db_session, symbols)
+    snap = build_cycle_snapshot(db_session, symbols)
+
+    assert snap.errors == ()
+    assert snap.kill_switch_on is False
+    assert snap.watchlist_row("ETH_USDT").trade_amount_usd == 11.0
+    assert snap.market_price("SOL_USDT").price == 102.0
+    assert snap.market_data_row("BTC_USDT").rsi == 40.0
+    live = fetch_signal_states(db_session, symbol="BTC_USDT", strategy_key="swing:conservative")
+    cached = snap.signal_states("BTC_USDT", "swing:conservative")
+    assert cached.keys() == live.keys() == {"BUY", "SELL"}
+    assert cached["BUY"].price == live["BUY"].price
+    assert snap.signal_states("BTC_USDT", "swing:conservative:PRICE_MOVE") == {}
+    assert snap.total_open_positions() == 0
+    assert snap.open_positions_for_base("BTC") == 0
+
+
+def test_query_count_does_not_grow_with_symbols(db_session):
+    few = ["A_USDT", "B_USDT", "C_USDT"]
+    many = [f"S{i}_USDT" for i in range(30)]
+    _seed(db_session, few + many)
+
+    with count_queries() as small:
+        build_cycle_snapshot(db_session, few)
+    with count_queries() as large:
+        build_cycle_snapshot(db_session, many)
+
+    assert small.count == large.count
+    assert large.count <= 8
+
+
+def test_snapshot_rows_are_read_only(db_session):
+    _seed(db_session, ["BTC_USDT"])
+    row = build_cycle_snapshot(db_session, ["BTC_USDT"]).watchlist_row("BTC_USDT")
+    with pytest.raises(AttributeError):
+        row.alert_enabled = False
+    assert hasattr(row, "trade_on_margin")
+    assert not hasattr(row, "no_such_column")
+
+
+def test_unreadable_section_is_left_to_per_symbol_query(db_session):
+    _seed(db_session, ["BTC_USDT"])
+    MarketData.__table__.drop(bind=db_session.get_bind())
+    snap = build_cycle_snapshot(db_session, ["BTC_USDT"])
+    assert snap.errors == ("market_data",)
+    assert not snap.has("market_data", "BTC_USDT")
+    assert snap.has("market_prices", "BTC_USDT")
+    assert not snap.has("market_prices", "ETH_USDT")  # not built for this symbol
+    MarketData.__table__.create(bind=db_session.get_bind())
+
+
+def test_orders_placed_this_cycle_count_towards_exposure(db_session):
+    from unittest.mock import patch
+
+    from app.services.signal_monitor import SignalMonitorService
+
+    _seed(db_session, ["BTC_USD", "BTC_USDT", "ETH_USDT"])
+    snap = build_cycle_snapshot(db_session, ["BTC_USD", "BTC_USDT", "ETH_USDT"])
+    svc = SignalMonitorService()
+    svc._cycle_placements = snap.placements
+
+    svc._record_cycle_placement("BTC_USD")  # exchange_sync has not recorded it yet
+
+    assert snap.open_positions_for_base("BTC") == 1
+    assert snap.open_positions_for_base("ETH") == 0
+    assert snap.total_open_positions() == 1
+    with patch("app.services.order_position_service.count_open_positions_for_symbol", return_value=0), \
+         patch("app.services.order_position_service.count_total_open_positions", return_value=2):
+        assert svc._count_open_positions_for_base(db_session, "BTC") == 1
+        assert svc._count_total_open_buy_orders(db_session) == 3
+        svc._cycle_placements = None  # between cycles the live counts stand alone
+        assert svc._count_open_positions_for_base(db_session, "BTC") == 0
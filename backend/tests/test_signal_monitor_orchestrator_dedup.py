@@ -79,7 +79,7 @@ class TestOrchestratorEntryDedup:
         with patch.object(svc, "_place_order_from_signal_impl", side_effect=_impl) as impl:
             r1 = asyncio.run(_place(svc))
             r2 = asyncio.run(_place(svc))  # within TTL -> suppressed before impl runs
-            svc.order_creation_locks["DOT_USD:SELL"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
+            svc.order_creation_locks["DOT:SELL"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
             r3 = asyncio.run(_place(svc))  # slot aged past TTL -> allowed
 
         assert r1 == {"order_id": "ok"}
@@ -114,7 +114,7 @@ class TestOrchestratorEntryDedup:
 
         assert r1["error"] == "system_core_max_open_trades"
         assert r2["error"] == "system_core_max_open_trades"
-        assert "DOT_USD:SELL" not in svc.order_creation_locks  # released, not retained
+        assert "DOT:SELL" not in svc.order_creation_locks  # released, not retained
 
     def test_exchange_rejection_releases_slot(self):
         # place_market_order rejection surfaces as an error dict (no order id) -> release.
@@ -126,7 +126,7 @@ class TestOrchestratorEntryDedup:
         with patch.object(svc, "_place_order_from_signal_impl", side_effect=_rejected):
             asyncio.run(_place(svc))
 
-        assert "DOT_USD:SELL" not in svc.order_creation_locks
+        assert "DOT:SELL" not in svc.order_creation_locks
 
     def test_exception_releases_slot_and_propagates(self):
         # A raised exception is a non-placement outcome: release the slot and let it propagate.
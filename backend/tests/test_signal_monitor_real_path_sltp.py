@@ -236,7 +236,7 @@ class TestOrderDedupSlot:
             # 2nd call within the TTL -> suppressed BEFORE impl runs (no 2nd real order).
             r2 = asyncio.run(svc._create_buy_order(_make_db(), _make_watchlist_item(), 2000.0, 0.0, 0.0))
             # Age the retained slot beyond the TTL -> the guard reclaims it and the 3rd proceeds.
-            svc.order_creation_locks["ETH_USDT:BUY"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
+            svc.order_creation_locks["ETH:BUY"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
             r3 = asyncio.run(svc._create_buy_order(_make_db(), _make_watchlist_item(), 2000.0, 0.0, 0.0))
 
         assert r1 == {"order_id": "ok"}
@@ -254,7 +254,7 @@ class TestOrderDedupSlot:
         with patch.object(svc, "_create_sell_order_impl", side_effect=_impl) as impl:
             r1 = asyncio.run(svc._create_sell_order(_make_db(), _make_watchlist_item(), 2000.0, 0.0, 0.0))
             r2 = asyncio.run(svc._create_sell_order(_make_db(), _make_watchlist_item(), 2000.0, 0.0, 0.0))
-            svc.order_creation_locks["ETH_USDT:SELL"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
+            svc.order_creation_locks["ETH:SELL"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
             r3 = asyncio.run(svc._create_sell_order(_make_db(), _make_watchlist_item(), 2000.0, 0.0, 0.0))
 
         assert r1 == {"order_id": "ok"}
@@ -291,11 +291,20 @@ class TestOrderDedupSlot:
         # Same (symbol, side) -> blocked.
         assert svc._try_claim_order_slot("ETH_USDT", "BUY") is False
 
+    def test_pairs_sharing_a_base_share_one_slot(self):
+        # The open-order cap counts per base currency, so ETH_USD and ETH_USDT must not
+        # both pass it while one of them is placing an order.
+        svc = SignalMonitorService()
+        assert svc._try_claim_order_slot("ETH_USDT", "BUY") is True
+        assert svc._try_claim_order_slot("ETH_USD", "BUY") is False
+        svc._release_order_slot("ETH_USDT", "BUY")
+        assert svc._try_claim_order_slot("eth/usd", "BUY") is True
+
     def test_stale_slot_is_reclaimed_after_ttl(self):
         svc = SignalMonitorService()
         assert svc._try_claim_order_slot("ETH_USDT", "BUY") is True
         # Age the claim beyond the TTL.
-        svc.order_creation_locks["ETH_USDT:BUY"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
+        svc.order_creation_locks["ETH:BUY"] -= (svc.ORDER_CREATION_LOCK_SECONDS + 1)
         assert svc._try_claim_order_slot("ETH_USDT", "BUY") is True
 
     def test_sell_wrapper_suppresses_duplicate(self):
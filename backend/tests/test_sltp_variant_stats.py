@@ -0,0 +1,157 @@
+"""Learned SL/TP payload-variant ordering for _create_order_try_variants."""
+import time
+
+import pytest
+
+from app.services.brokers import crypto_com_trade as cct
+from app.services.brokers import sltp_variant_stats as svs
+from app.services.brokers.sltp_variant_stats import SltpVariantStats, variant_stats_key
+
+_META = {
+    "instrument_name": "DOT_USDT",
+    "price_tick_size": "0.001",
+    "qty_tick_size": "0.01",
+    "min_quantity": "0.01",
+    "price_decimals": 3,
+    "quantity_decimals": 2,
+}
+
+
+def _variants(*ids):
+    return [{"variant_id": vid, "order_type": "STOP_LIMIT"} for vid in ids]
+
+
+def _ids(variants):
+    return [v["variant_id"] for v in variants]
+
+
+def test_known_good_first_then_success_rate(tmp_path):
+    stats = SltpVariantStats(path=str(tmp_path / "stats.json"))
+    key = variant_stats_key("dot_usdt", "STOP_LIMIT", "sell", True)
+    stats.record_failure(key, "a")
+    stats.record_success(key, "c", "private/advanced/create-order", 120)
+    stats.record_success(key, "d", "private/create-order-list", 80)
+
+    assert stats.known_good(key) == ("d", "private/create-order-list")
+    # d (known good), c (succeeded), b/e untried in grid order, a (rejected)
+    assert _ids(stats.order_variants(key, _variants("a", "b", "c", "d", "e"))) == ["d", "c", "b", "e", "a"]
+
+
+def test_rejection_clears_known_good_and_state_persists(tmp_path):
+    path = str(tmp_path / "stats.json")
+    key = variant_stats_key("DOT_USDT", "STOP_LIMIT", "SELL", False)
+    stats = SltpVariantStats(path=path)
+    stats.record_success(key, "a", "private/advanced/create-order")
+    stats.record_failure(key, "a")
+    stats.record_failure(key, "a")
+    assert stats.known_good(key) == (None, None)
+
+    reloaded = SltpVariantStats(path=path)
+    assert _ids(reloaded.order_variants(key, _variants("a", "b"))) == ["b", "a"]
+
+
+def test_counts_decay(tmp_path):
+    stats = SltpVariantStats(path=str(tmp_path / "stats.json"), half_life_s=10)
+    key = variant_stats_key("DOT_USDT", "STOP_LIMIT", "SELL", True)
+    stats.record_failure(key, "a")
+    rec = stats.snapshot()[key]["variants"]["a"]
+    ok, fail = stats._decayed(rec, time.time() + 10)
+    assert ok == 0 and abs(fail - 0.5) < 0.01
+
+
+@pytest.fixture(autouse=True)
+def _no_proxy_override():
+    # Other tests set trade_client.use_proxy in the main context; use the client default here.
+    token = cct._USE_CRYPTO_PROXY_OVERRIDE.set(None)
+    yield
+    cct._USE_CRYPTO_PROXY_OVERRIDE.reset(token)
+
+
+def _make_client(monkeypatch, responses, captured):
+    client = cct.CryptoComTradeClient.__new__(cct.CryptoComTradeClient)
+    client._use_proxy_default = True
+    client.base_url = "https://api.crypto.com/exchange/v1"
+    client.api_key = "test-key"
+    client.api_secret = "test-secret"
+    client.live_trading = True
+    client._instrument_cache = {}
+    monkeypatch.setattr(client, "_refresh_runtime_flags", lambda: None)
+    monkeypatch.setattr(client, "_get_instrument_metadata", lambda symbol: dict(_META))
+    monkeypatch.setattr(client, "_check_conditional_orders_circuit_breaker", lambda: True)
+
+    def _fake_call_proxy(method, params):
+        captured.append((method, dict(params)))
+        return responses(len(captured))
+
+    monkeypatch.setattr(client, "_call_proxy", _fake_call_proxy)
+    return client
+
+
+def _place(client, variants, tmp_path):
+    return client._create_order_try_variants(
+        instrument_name="DOT_USDT",
+        side="SELL",
+        order_type="STOP_LIMIT",
+        quantity=1.0,
+        ref_price=5.0,
+        trigger_price=4.5,
+        limit_price=4.5,
+        correlation_id="test",
+        variants=variants,
+        jsonl_path=str(tmp_path / "variants.jsonl"),
+    )
+
+
+def test_second_placement_uses_learned_variant_in_one_request(monkeypatch, tmp_path):
+    stats = SltpVariantStats(path=str(tmp_path / "stats.json"))
+    monkeypatch.setattr(cct, "get_sltp_variant_stats", lambda: stats)
+    grid = [v for v in cct.CryptoComTradeClient._build_sltp_variant_grid(None, max_variants=5) if v["order_type"] == "STOP_LIMIT"]
+
+    captured = []
+    # The first three formats are rejected, the fourth is accepted
+    client = _make_client(
+        monkeypatch,
+        lambda n: {"code": 0, "result": {"order_id": "OID-1"}}
+        if n >= 4
+        else {"code": 40004, "message": "MISSING_OR_INVALID_ARGUMENT"},
+        captured,
+    )
+    first = _place(client, grid, tmp_path)
+    assert first["ok"] and first["attempts"] == 4
+
+    captured.clear()
+    client = _make_client(monkeypatch, lambda n: {"code": 0, "result": {"order_id": "OID-2"}}, captured)
+    second = _place(client, grid, tmp_path)
+    assert second["ok"] and second["attempts"] == 1
+    assert second["variant_id"] == first["variant_id"]
+    assert len(captured) == 1
+
+
+def test_business_rejection_keeps_known_good(monkeypatch, tmp_path):
+    stats = SltpVariantStats(path=str(tmp_path / "stats.json"))
+    monkeypatch.setattr(cct, "get_sltp_variant_stats", lambda: stats)
+    grid = [v for v in cct.CryptoComTradeClient._build_sltp_variant_grid(None, max_variants=5) if v["order_type"] == "STOP_LIMIT"]
+    key = variant_stats_key("DOT_USDT", "STOP_LIMIT", "SELL", True)
+    known = grid[2]["variant_id"]
+    stats.record_success(key, known, "private/advanced/create-order")
+
+    captured = []
+    client = _make_client(monkeypatch, lambda n: {"code": 306, "message": "INSUFFICIENT_AVAILABLE_BALANCE"}, captured)
+    result = _place(client, grid, tmp_path)
+
+    assert not result["ok"]
+    assert stats.known_good(key) == (known, "private/advanced/create-order")
+    assert set(stats.snapshot()[key]["variants"]) == {known}
+
+
+def test_is_format_rejection():
+    assert svs.is_format_rejection(40004)
+    assert svs.is_format_rejection("218")
+    assert svs.is_format_rejection(None, "INVALID_ORDERTYPE")
+    assert not svs.is_format_rejection(306, "INSUFFICIENT_AVAILABLE_BALANCE")
+    assert not svs.is_format_rejection(308)
+    assert not svs.is_format_rejection(140001)
+
+
+def test_default_stats_singleton_is_shared():
+    assert svs.get_sltp_variant_stats() is svs.get_sltp_variant_stats()
@@ -0,0 +1,205 @@
+"""Lazy router registry and backend cold-start benchmark."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.router_registry import DEFAULT_LAZY_ROUTERS, LazyRouterRegistry, LazyRouterSpec, install_lazy_routers
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+LAZY_MODULES = tuple(spec.module for spec in DEFAULT_LAZY_ROUTERS)
+
+
+def _write_router(tmp_path: Path, name: str, paths: list[str]) -> None:
+    handlers = "\n".join(
+        f'@router.get("{p}")\ndef h{i}():\n    return {{"router": "{name}", "path": "{p}"}}\n' for i, p in enumerate(paths)
+    )
+    (tmp_path / f"{name}.py").write_text(
+        f"from fastapi import APIRouter\nrouter = APIRouter()\n{handlers}", encoding="utf-8"
+    )
+
+
+@pytest.fixture
+def router_modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    _write_router(tmp_path, "lazy_parent_router", ["/api/parent/{item}"])
+    _write_router(tmp_path, "lazy_child_router", ["/api/parent/child"])
+    yield tmp_path
+    for name in ("lazy_parent_router", "lazy_child_router"):
+        sys.modules.pop(name, None)
+
+
+def _app_with(specs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    registry = install_lazy_routers(app, specs)
+
+    @app.get("/api/{rest:path}")
+    def catch_all(rest: str):
+        return {"router": "catch_all"}
+
+    app.state.registry = registry
+    return app
+
+
+def test_router_is_imported_on_first_matching_request(router_modules):
+    app = _app_with((LazyRouterSpec("parent", "lazy_parent_router", ("/api/parent",)),))
+    client = TestClient(app)
+
+    assert client.get("/health").status_code == 200
+    assert "lazy_parent_router" not in sys.modules
+    assert app.state.registry.status()["pending"] == ["parent"]
+
+    r = client.get("/api/parent/x")
+    assert r.json() == {"router": "lazy_parent_router", "path": "/api/parent/{item}"}
+    assert "parent" in app.state.registry.status()["loaded"]
+
+
+def test_lazy_routes_keep_registry_order_and_precede_later_routes(router_modules):
+    # Child is registered first, as jarvis_control is ahead of jarvis in the factory.
+    app = _app_with((
+        LazyRouterSpec("child", "lazy_child_router", ("/api/parent/child",)),
+        LazyRouterSpec("parent", "lazy_parent_router", ("/api/parent",)),
+    ))
+    client = TestClient(app)
+
+    # The parent's wildcard loads first, but the child's route must still win.
+    assert client.get("/api/parent/x").json()["router"] == "lazy_parent_router"
+    assert client.get("/api/parent/child").json()["router"] == "lazy_child_router"
+    assert client.get("/api/other").json()["router"] == "catch_all"
+
+
+def test_marked_router_loads_ahead_of_later_eager_routes(router_modules):
+    # As admin/ai sit ahead of the risk_probe/metrics/settings includes in create_app.
+    app = FastAPI()
+    registry = LazyRouterRegistry(app, (LazyRouterSpec("parent", "lazy_parent_router", ("/api/parent",)),))
+    registry.mark_position("parent")
+
+    @app.get("/api/parent/{item}")
+    def eager_parent(item: str):
+        return {"router": "eager"}
+
+    install_lazy_routers(app, registry=registry)
+    client = TestClient(app)
+
+    assert client.get("/api/parent/x").json()["router"] == "lazy_parent_router"
+
+
+def test_routes_are_inserted_on_the_event_loop_not_the_import_thread(router_modules):
+    app = _app_with((LazyRouterSpec("parent", "lazy_parent_router", ("/api/parent",)),))
+    registry = app.state.registry
+    threads = {}
+    real_import, real_include = registry.import_router, registry.include
+
+    def import_router(spec):
+        threads["import"] = threading.current_thread()
+        return real_import(spec)
+
+    def include(spec, router):
+        threads["include"] = threading.current_thread()
+        real_include(spec, router)
+
+    registry.import_router, registry.include = import_router, include
+
+    @app.get("/loop_thread")
+    async def loop_thread():
+        threads["loop"] = threading.current_thread()
+        return {}
+
+    with TestClient(app) as client:  # one event loop for both requests
+        client.get("/loop_thread")
+        assert client.get("/api/parent/x").json()["router"] == "lazy_parent_router"
+    assert threads["include"] is threads["loop"]
+    assert threads["import"] is not threads["loop"]
+
+
+def test_disabled_router_is_never_imported(router_modules):
+    app = _app_with((LazyRouterSpec("parent", "lazy_parent_router", ("/api/parent",), enabled=lambda: False),))
+    client = TestClient(app)
+
+    assert client.get("/api/parent/x").json()["router"] == "catch_all"
+    assert "lazy_parent_router" not in sys.modules
+    assert app.state.registry.status()["disabled"] == ["parent"]
+
+
+def test_optional_router_import_error_leaves_it_out():
+    app = _app_with((LazyRouterSpec("gone", "no_such_router_module", ("/api/gone",), optional=True),))
+    client = TestClient(app)
+
+    assert client.get("/api/gone/x").json()["router"] == "catch_all"
+    assert "gone" in app.state.registry.status()["failed"]
+
+
+def test_eager_mode_loads_everything_in_create_app(router_modules, monkeypatch):
+    monkeypatch.setenv("ATP_EAGER_ROUTERS", "1")
+    app = _app_with((LazyRouterSpec("parent", "lazy_parent_router", ("/api/parent",)),))
+
+    assert "lazy_parent_router" in sys.modules
+    assert app.state.registry.status()["pending"] == []
+
+
+_BENCH = textwrap.dedent(
+    """
+    import json, sys, time
+    started = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from app.factory import create_app
+    client = TestClient(create_app())
+    status = client.get("/health").status_code
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "seconds": elapsed,
+        "status": status,
+        "lazy_imported": [m for m in %r if m in sys.modules],
+    }))
+    """
+)
+
+
+def _first_healthy_response(eager: bool) -> dict:
+    env = {**os.environ, "ATP_EAGER_ROUTERS": "1" if eager else "0"}
+    proc = subprocess.run(
+        [sys.executable, "-c", _BENCH % (LAZY_MODULES,)],
+        cwd=str(BACKEND_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_startup_benchmark_time_to_first_healthy_response():
+    """
+    Fresh interpreter: import app.factory, build the app, GET /health. The lazy
+    run must not have imported any optional router. Timings are printed (run
+    with -s); STARTUP_BENCH_MAX_RATIO (e.g. 0.5) turns them into an assertion.
+    """
+    eager = _first_healthy_response(eager=True)
+    lazy = _first_healthy_response(eager=False)
+
+    assert lazy["status"] == 200
+    assert eager["status"] == 200
+    assert lazy["lazy_imported"] == []
+    ratio = lazy["seconds"] / eager["seconds"]
+    print(f"\nstartup: eager {eager['seconds']:.2f}s, lazy {lazy['seconds']:.2f}s (ratio {ratio:.2f})")
+
+    max_ratio = os.getenv("STARTUP_BENCH_MAX_RATIO")
+    if max_ratio:
+        assert ratio <= float(max_ratio)
@@ -0,0 +1,280 @@
+"""Telegram outbound queue: non-blocking enqueue, rate limits, coalescing, retries, failure hooks, replay."""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.telegram_outbox import TelegramOutboxMessage
+from app.services.telegram_outbox import (
+    COALESCE_SEPARATOR,
+    OutboundMessage,
+    RetryLater,
+    SqlOutboxStore,
+    TelegramOutbox,
+)
+
+
+class RecordingDeliver:
+    def __init__(self, delay=0.0, ok=True):
+        self.delay = delay
+        self.ok = ok
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, item, parts):
+        self.release.wait(2)
+        if self.delay:
+            time.sleep(self.delay)
+        self.calls.append((time.monotonic(), item, list(parts)))
+        return self.ok
+
+
+def _sqlite_store():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine, tables=[TelegramOutboxMessage.__table__])
+    return SqlOutboxStore(sessionmaker(bind=engine))
+
+
+def test_enqueue_does_not_wait_for_delivery():
+    deliver = RecordingDeliver(delay=0.3)
+    outbox = TelegramOutbox(deliver, chat_rate=100, chat_burst=100, global_rate=100)
+    start = time.monotonic()
+    for i in range(5):
+        assert outbox.enqueue(OutboundMessage(f"m{i}", reply_markup={"k": i}))
+    assert time.monotonic() - start < 0.1
+    assert outbox.flush(5)
+    assert len(deliver.calls) == 5
+    outbox.stop()
+
+
+def test_per_chat_rate_limit_and_other_chat_not_starved():
+    deliver = RecordingDeliver()
+    outbox = TelegramOutbox(deliver, chat_rate=10, chat_burst=1, global_rate=1000, coalesce_max=1)
+    for i in range(4):
+        outbox.enqueue(OutboundMessage(f"t{i}", chat_destination="trading"))
+    outbox.enqueue(OutboundMessage("ops", chat_destination="ops"))
+    assert outbox.flush(5)
+    trading = [t for t, item, _ in deliver.calls if item.chat_destination == "trading"]
+    ops = [t for t, item, _ in deliver.calls if item.chat_destination == "ops"]
+    assert all(b - a >= 0.08 for a, b in zip(trading, trading[1:]))
+    # ops is served while trading is rate-limited, not after its backlog
+    assert ops[0] < trading[-1]
+    outbox.stop()
+
+
+def test_waiting_messages_are_coalesced_and_deduplicated():
+    deliver = RecordingDeliver()
+    deliver.release.clear()
+    outbox = TelegramOutbox(deliver, chat_rate=100, chat_burst=100, global_rate=100, coalesce_max=10)
+    outbox.enqueue(OutboundMessage("first", symbol="BTC_USDT"))
+    time.sleep(0.05)  # sender is now blocked inside deliver with "first"
+    outbox.enqueue(OutboundMessage("a", symbol="BTC_USDT"))
+    outbox.enqueue(OutboundMessage("b", symbol="ETH_USDT"))
+    outbox.enqueue(OutboundMessage("a", symbol="BTC_USDT"))
+    outbox.enqueue(OutboundMessage("button", reply_markup={"inline_keyboard": []}))
+    deliver.release.set()
+    assert outbox.flush(5)
+
+    texts = [item.message for _, item, _ in deliver.calls]
+    assert texts == ["first", COALESCE_SEPARATOR.join(["a", "b"]), "button"]
+    merged_parts = deliver.calls[1][2]
+    assert [p.symbol for p in merged_parts] == ["BTC_USDT", "ETH_USDT", "BTC_USDT"]
+    assert deliver.calls[1][1].symbol is None
+    stats = outbox.stats()
+    assert stats["coalesced"] == 2 and stats["sent"] == 5 and stats["api_calls"] == 3
+    outbox.stop()
+
+
+def test_failed_delivery_runs_on_failed_hook():
+    deliver = RecordingDeliver(ok=False)
+    outbox = TelegramOutbox(deliver, chat_rate=100, chat_burst=100, global_rate=100)
+    forgotten = []
+    outbox.enqueue(OutboundMessage("x", on_failed=lambda: forgotten.append("x")))
+    assert outbox.flush(5)
+    assert forgotten == ["x"]
+    assert outbox.stats()["failed"] == 1
+    outbox.stop()
+
+
+def test_full_queue_drops_and_stats_report_depth_and_latency():
+    deliver = RecordingDeliver()
+    deliver.release.clear()
+    outbox = TelegramOutbox(deliver, max_pending=2, coalesce_max=1)
+    outbox.enqueue(OutboundMessage("in flight"))
+    time.sleep(0.05)
+    assert outbox.enqueue(OutboundMessage("q1"))
+    assert outbox.enqueue(OutboundMessage("q2"))
+    assert not outbox.enqueue(OutboundMessage("q3"))
+    stats = outbox.stats()
+    assert stats["depth"] == 2 and stats["dropped"] == 1 and stats["in_flight"] == 1
+    deliver.release.set()
+    assert outbox.flush(5)
+    stats = outbox.stats()
+    assert stats["depth"] == 0
+    assert stats["latency_seconds"]["max"] >= stats["latency_seconds"]["p50"] > 0
+    outbox.stop()
+
+
+def _rows(store):
+    db = store.session_factory()
+    try:
+        return db.query(TelegramOutboxMessage).order_by(TelegramOutboxMessage.id).all()
+    finally:
+        db.close()
+
+
+def test_sender_persists_before_delivery_not_enqueue():
+    store = _sqlite_store()
+    writers = []
+    add = store.add
+    store.add = lambda batch, owner=None: (writers.append(threading.current_thread().name), add(batch, owner))
+    deliver = RecordingDeliver()
+    deliver.release.clear()
+    outbox = TelegramOutbox(deliver, store=store)
+    outbox.enqueue(OutboundMessage("durable"))
+    deadline = time.monotonic() + 2
+    while not _rows(store) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Written by the sender thread while delivery is still blocked
+    rows = _rows(store)
+    assert [(r.message, r.status, r.claimed_by) for r in rows] == [("durable", "pending", outbox.owner)]
+    assert writers and set(writers) == {"telegram-outbox"}
+    deliver.release.set()
+    assert outbox.flush(5)
+    assert [r.status for r in _rows(store)] == ["sent"]
+    outbox.stop()
+
+
+class FlakyDeliver(RecordingDeliver):
+    def __init__(self, failures, retry_after=0.0):
+        super().__init__()
+        self.failures = failures
+        self.retry_after = retry_after
+
+    def __call__(self, item, parts):
+        self.calls.append((time.monotonic(), item, list(parts)))
+        if len(self.calls) <= self.failures:
+            raise RetryLater(self.retry_after, "429 Too Many Requests")
+        return True
+
+
+def test_transient_failure_is_retried_after_retry_after():
+    store = _sqlite_store()
+    deliver = FlakyDeliver(failures=1, retry_after=0.3)
+    outbox = TelegramOutbox(deliver, store=store, retry_base=0.01, chat_rate=100, chat_burst=100)
+    forgotten = []
+    outbox.enqueue(OutboundMessage("a", on_failed=lambda: forgotten.append("a")))
+    assert outbox.flush(5)
+    (first, _, _), (second, item, _) = deliver.calls
+    assert second - first >= 0.3
+    assert item.message == "a" and forgotten == []
+    stats = outbox.stats()
+    assert stats["retried"] == 1 and stats["sent"] == 1 and stats["failed"] == 0
+    assert [(r.status, r.attempts) for r in _rows(store)] == [("sent", 2)]
+    outbox.stop()
+
+
+def test_retries_back_off_and_give_up_after_max_attempts():
+    deliver = FlakyDeliver(failures=10)
+    outbox = TelegramOutbox(deliver, max_attempts=3, retry_base=0.05, chat_rate=100, chat_burst=100)
+    forgotten = []
+    outbox.enqueue(OutboundMessage("x", on_failed=lambda: forgotten.append("x")))
+    assert outbox.flush(5)
+    times = [t for t, _, _ in deliver.calls]
+    assert len(times) == 3
+    assert times[1] - times[0] >= 0.05 and times[2] - times[1] >= 0.1
+    assert forgotten == ["x"]
+    assert outbox.stats()["failed"] == 1
+    outbox.stop()
+
+
+def test_rows_claimed_by_a_live_sender_are_not_replayed():
+    store = _sqlite_store()
+    db = store.session_factory()
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        TelegramOutboxMessage(
+            chat_destination="trading", message="held", status="pending", claimed_by="other:1:a", claimed_at=now
+        ),
+        TelegramOutboxMessage(
+            chat_destination="trading",
+            message="abandoned",
+            status="pending",
+            claimed_by="other:2:b",
+            claimed_at=now - timedelta(seconds=120),
+        ),
+    ])
+    db.commit()
+    db.close()
+
+    claimed = store.claim_pending(600, "me:1:c", claim_ttl=60)
+    assert [m.message for m in claimed] == ["abandoned"]
+    # Already claimed: a second sender gets nothing.
+    assert store.claim_pending(600, "me:2:d", claim_ttl=60) == []
+    assert [(r.message, r.claimed_by) for r in _rows(store)] == [("held", "other:1:a"), ("abandoned", "me:1:c")]
+
+
+def test_pending_rows_from_previous_run_are_replayed():
+    store = _sqlite_store()
+    blocked = RecordingDeliver()
+    blocked.release.clear()
+    first = TelegramOutbox(blocked, store=store, claim_ttl=0.2)
+    first.enqueue(OutboundMessage("survives restart", symbol="BTC_USDT", reply_markup={"k": 1}))
+    time.sleep(0.1)  # persisted as pending, delivery never completes ("crash")
+    first.store = None  # the crashed process stops renewing its claim
+
+    deliver = RecordingDeliver()
+    second = TelegramOutbox(deliver, store=store, claim_ttl=0.2)
+    second._ensure_thread()
+    deadline = time.monotonic() + 5
+    while not deliver.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert second.flush(5)
+    assert second.stats()["replayed"] == 1
+    assert [item.message for _, item, _ in deliver.calls] == ["survives restart"]
+    assert deliver.calls[0][1].reply_markup == {"k": 1}
+    db = store.session_factory()
+    try:
+        assert [r.status for r in db.query(TelegramOutboxMessage).all()] == ["sent"]
+    finally:
+        db.close()
+    second.stop()
+    blocked.release.set()
+
+
+def test_async_send_runs_guard_before_queueing_and_times_the_real_send(monkeypatch):
+    import importlib
+
+    from app.services import pipeline_metrics as pm
+
+    tn = importlib.import_module("app.services.telegram_notifier")
+
+    monkeypatch.setenv("TELEGRAM_ASYNC_SEND", "true")
+    queued = []
+    fake_outbox = type("FakeOutbox", (), {"enqueue": lambda self, item: queued.append(item) or True})()
+    monkeypatch.setattr(tn, "get_telegram_outbox", lambda deliver=None: fake_outbox)
+    notifier = object.__new__(tn.TelegramNotifier)
+    config = {"enabled": False, "block_reasons": ["kill_switch"]}
+    notifier.refresh_config = lambda: config
+    pm.reset_pipeline_metrics_for_tests()
+
+    # Blocked by the guard: rejected up front, nothing queued
+    assert notifier.send_message("BTC_USDT blocked") is False
+    assert queued == []
+
+    config.update(enabled=True, block_reasons=[])
+    assert notifier.send_message("BTC_USDT queued") is True
+    assert [item.message for item in queued] == ["BTC_USDT queued"]
+    assert "telegram_send" not in pm.get_pipeline_stage_stats()  # enqueue is not the send
+
+    config.update(enabled=False)  # the sender re-checks the guard when delivering
+    assert notifier._deliver_outbound(queued[0], queued) is False
+    assert pm.get_pipeline_stage_stats()["telegram_send"]["count"] == 1
+    pm.reset_pipeline_metrics_for_tests()
@@ -0,0 +1,116 @@
+"""Concurrent regular/advanced fetch and page prefetch in fetch_unified_open_orders."""
+import contextvars
+import threading
+import time
+
+import pytest
+
+from app.services import unified_open_orders_fetch as uof
+from app.services.crypto_com_sync_errors import build_private_api_error, build_private_api_success
+from app.utils.rate_limiter import reset_rate_limiters_for_tests
+
+_proxy_override = contextvars.ContextVar("proxy_override", default=None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    reset_rate_limiters_for_tests()
+    yield
+    reset_rate_limiters_for_tests()
+
+
+def _order(n):
+    return {
+        "order_id": f"o-{n}",
+        "instrument_name": "BTC_USD",
+        "side": "SELL",
+        "order_type": "LIMIT",
+        "status": "ACTIVE",
+        "price": "100000",
+        "quantity": "0.001",
+    }
+
+
+class _FakeClient:
+    base_url = "https://api.crypto.com/exchange/v1"
+
+    def __init__(self, full_pages=0, last_page_size=3, delay=0.0, fail_page=None):
+        self.full_pages = full_pages
+        self.last_page_size = last_page_size
+        self.delay = delay
+        self.fail_page = fail_page
+        self.pages = []
+        self.proxy_seen = []
+        self._lock = threading.Lock()
+
+    def get_open_orders(self, page=0, page_size=200):
+        time.sleep(self.delay)
+        with self._lock:
+            self.pages.append(page)
+            self.proxy_seen.append(_proxy_override.get())
+        if page == self.fail_page:
+            return build_private_api_error(sync_status="api_error", error_message="boom", error_code=50001)
+        if page < self.full_pages:
+            size = page_size
+        elif page == self.full_pages:
+            size = self.last_page_size
+        else:
+            size = 0
+        return build_private_api_success([_order(page * page_size + i) for i in range(size)])
+
+    def get_advanced_open_orders(self):
+        time.sleep(self.delay)
+        with self._lock:
+            self.proxy_seen.append(_proxy_override.get())
+        return build_private_api_success([])
+
+    def _map_incoming_order(self, raw, is_trigger=False):
+        from app.services.brokers.crypto_com_trade import CryptoComTradeClient
+
+        return CryptoComTradeClient.__new__(CryptoComTradeClient)._map_incoming_order(raw, is_trigger)
+
+
+def test_endpoints_fetched_concurrently_with_timings():
+    client = _FakeClient(delay=0.3)
+    started = time.perf_counter()
+    result = uof.fetch_unified_open_orders(client)
+    elapsed = time.perf_counter() - started
+
+    assert result["sync_status"] == "ok" and result["regular_count"] == 3
+    assert elapsed < 0.55
+    timings = result["endpoint_timings_ms"]
+    assert set(timings) == {uof.REGULAR_SOURCE_ENDPOINT, uof.ADVANCED_SOURCE_ENDPOINT}
+    assert all(ms >= 250 for ms in timings.values())
+    assert result["fetch_ms"] < sum(timings.values())
+
+
+def test_full_pages_prefetch_next_pages_in_order(monkeypatch):
+    monkeypatch.setattr(uof, "OPEN_ORDERS_PAGE_PREFETCH", 2)
+    client = _FakeClient(full_pages=3, last_page_size=5)
+    result = uof.fetch_unified_open_orders(client)
+
+    assert [raw["order_id"] for raw in result["regular_raw"]] == [f"o-{i}" for i in range(3 * uof.PAGE_SIZE + 5)]
+    # [0], then [1, 2], then [3, 4]; page 4 comes back empty and is discarded
+    assert sorted(client.pages) == [0, 1, 2, 3, 4]
+    assert result["regular_pages"] == 5
+
+
+def test_failed_prefetched_page_fails_the_sync(monkeypatch):
+    monkeypatch.setattr(uof, "OPEN_ORDERS_PAGE_PREFETCH", 2)
+    client = _FakeClient(full_pages=3, fail_page=2)
+    result = uof.fetch_unified_open_orders(client)
+
+    assert result["sync_status"] == "api_error"
+    assert result["error_code"] == 50001
+    assert result["data_verified"] is False
+    assert result["orders"] == []
+
+
+def test_worker_threads_see_caller_context():
+    client = _FakeClient(full_pages=1)
+    token = _proxy_override.set(False)
+    try:
+        uof.fetch_unified_open_orders(client)
+    finally:
+        _proxy_override.reset(token)
+    assert client.proxy_seen and all(seen is False for seen in client.proxy_seen)
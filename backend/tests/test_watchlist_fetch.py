@@ -0,0 +1,110 @@
+"""Monitor watchlist fetch: cached column capabilities, Core select, ORM-free records."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_table_columns_cached, invalidate_table_columns_cache
+from app.models.watchlist import WatchlistItem
+from app.services.signal_cycle_snapshot import count_queries
+from app.services.watchlist_fetch import (
+    LogSampler,
+    WatchlistRecord,
+    fetch_monitored_watchlist,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine, tables=[WatchlistItem.__table__])
+    invalidate_table_columns_cache()
+    session = session_local()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        invalidate_table_columns_cache()
+
+
+def _seed(db, n):
+    for i in range(n):
+        db.add(WatchlistItem(
+            symbol=f"C{i}_USDT", exchange="CRYPTO_COM",
+            alert_enabled=(i % 2 == 0), trade_enabled=(i % 3 == 0),
+            trade_amount_usd=float(i), is_deleted=(i % 10 == 4),
+        ))
+    db.commit()
+
+
+def test_fetch_returns_alert_enabled_records(db_session):
+    _seed(db_session, 20)
+    records, mode = fetch_monitored_watchlist(db_session)
+    assert mode == "alert_enabled"
+    assert sorted(r.symbol for r in records) == sorted(
+        f"C{i}_USDT" for i in range(20) if i % 2 == 0 and i % 10 != 4
+    )
+    record = records[0]
+    assert isinstance(record, WatchlistRecord)
+    assert record.alert_enabled is True
+    assert record.exchange == "CRYPTO_COM"
+    # Mutable like the transient WatchlistItem() it replaces
+    record.trade_amount_usd = 99.0
+    assert record.trade_amount_usd == 99.0
+
+
+def test_capabilities_inspected_once_then_one_query_per_fetch(db_session):
+    _seed(db_session, 50)
+    fetch_monitored_watchlist(db_session)
+    with count_queries() as counter:
+        for _ in range(5):
+            fetch_monitored_watchlist(db_session)
+    assert counter.count == 5
+
+
+def test_legacy_schema_without_alert_enabled():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE watchlist_items (id INTEGER PRIMARY KEY, symbol TEXT, exchange TEXT, "
+            "trade_enabled BOOLEAN, trade_amount_usd FLOAT)"
+        ))
+        conn.execute(text(
+            "INSERT INTO watchlist_items VALUES (1, 'BTC_USDT', 'CRYPTO_COM', 1, 10), "
+            "(2, 'ETH_USDT', 'CRYPTO_COM', 0, 5)"
+        ))
+    invalidate_table_columns_cache()
+    session = sessionmaker(bind=engine)()
+    try:
+        records, mode = fetch_monitored_watchlist(session)
+        assert mode == "trade_enabled"
+        assert [r.symbol for r in records] == ["BTC_USDT"]
+        assert records[0].alert_enabled is True
+        assert records[0].is_deleted is None  # column missing: attribute still present
+    finally:
+        session.close()
+        invalidate_table_columns_cache()
+
+
+def test_invalidation_picks_up_new_columns():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE watchlist_items (id INTEGER PRIMARY KEY, symbol TEXT)"))
+    invalidate_table_columns_cache()
+    assert "alert_enabled" not in get_table_columns_cached(engine, "watchlist_items")
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE watchlist_items ADD COLUMN alert_enabled BOOLEAN"))
+    assert "alert_enabled" not in get_table_columns_cached(engine, "watchlist_items")
+    invalidate_table_columns_cache("watchlist_items")
+    assert "alert_enabled" in get_table_columns_cached(engine, "watchlist_items")
+    invalidate_table_columns_cache()
+
+
+def test_log_sampler_logs_on_change_or_every_n():
+    sampler = LogSampler(every=3)
+    assert sampler.should_log([("A", True)])
+    assert not sampler.should_log([("A", True)])
+    assert not sampler.should_log([("A", True)])
+    assert sampler.should_log([("A", True)])  # 3rd unchanged call since last log
+    assert sampler.should_log([("A", False)])  # change
@@ -2,14 +2,23 @@
 """
 Crypto.com Signer Proxy Service
 Runs on trade_Bot instance and signs authenticated requests to Crypto.com Exchange API
+
+Upstream calls go through one long-lived httpx.AsyncClient (keep-alive pool), so
+concurrent bot requests are relayed in parallel instead of serializing on the
+event loop. At most PROXY_MAX_CONCURRENCY requests are upstream at once; the rest
+wait their turn. The egress IP is probed in the background and cached for
+EGRESS_IP_TTL_SECONDS. Counters and latencies are served at /proxy/metrics.
 """
 
+import asyncio
 import os
 import hmac
 import hashlib
 import time
-import requests
 import json
+from collections import deque
+
+import httpx
 from fastapi import FastAPI, HTTPException, Header
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -49,6 +58,107 @@ logger.info(f"[CRYPTO_KEY_DEBUG] crypto_proxy using api_key: {key_preview} (from
 
 logger.info("Crypto.com Signer Proxy initialized")
 
+# Per-request credential/signature diagnostics (very verbose): CRYPTO_AUTH_DIAG=true
+CRYPTO_AUTH_DIAG = os.getenv("CRYPTO_AUTH_DIAG", "false").lower() == "true"
+
+PROXY_MAX_CONCURRENCY = int(os.getenv("PROXY_MAX_CONCURRENCY", "64"))
+PROXY_UPSTREAM_MAX_CONNECTIONS = int(os.getenv("PROXY_UPSTREAM_MAX_CONNECTIONS", "50"))
+PROXY_UPSTREAM_MAX_KEEPALIVE = int(os.getenv("PROXY_UPSTREAM_MAX_KEEPALIVE", "20"))
+PROXY_UPSTREAM_TIMEOUT = float(os.getenv("PROXY_UPSTREAM_TIMEOUT", "15"))
+EGRESS_IP_TTL_SECONDS = float(os.getenv("EGRESS_IP_TTL_SECONDS", "600"))
+EGRESS_IP_URL = "https://api.ipify.org"
+
+_http_client: httpx.AsyncClient = None
+_upstream_slots: asyncio.Semaphore = None
+_egress = {"ip": None, "checked_at": 0.0, "refreshing": False}
+_metrics = {
+    "requests": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "queued": 0,
+    "max_queued": 0,
+    "upstream_errors": 0,
+    "upstream_timeouts": 0,
+    "queue_wait_ms_total": 0.0,
+}
+_upstream_latency_ms = deque(maxlen=500)
+_methods = {}
+
+
+def _http() -> httpx.AsyncClient:
+    """Shared upstream client; created lazily if the startup hook did not run."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=PROXY_UPSTREAM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=PROXY_UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=PROXY_UPSTREAM_MAX_KEEPALIVE,
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+    return _http_client
+
+
+def _slots() -> asyncio.Semaphore:
+    global _upstream_slots
+    if _upstream_slots is None:
+        _upstream_slots = asyncio.Semaphore(PROXY_MAX_CONCURRENCY)
+    return _upstream_slots
+
+
+@app.on_event("startup")
+async def _startup():
+    _http()
+    _slots()
+    await _refresh_egress_ip()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
+async def _refresh_egress_ip():
+    """Probe the outbound IP once per TTL; only changes are logged."""
+    _egress["refreshing"] = True
+    try:
+        response = await _http().get(EGRESS_IP_URL, timeout=5)
+        ip = response.text.strip()
+        if ip != _egress["ip"]:
+            logger.info(f"[CRYPTO_AUTH_DIAG] CRYPTO_COM_OUTBOUND_IP: {ip}")
+        _egress["ip"] = ip
+    except Exception as e:
+        logger.warning(f"[CRYPTO_AUTH_DIAG] Could not determine outbound IP: {e}")
+    finally:
+        _egress["checked_at"] = time.time()
+        _egress["refreshing"] = False
+
+
+def _egress_ip() -> str:
+    """Cached egress IP; a stale entry triggers a background refresh, never a wait."""
+    if not _egress["refreshing"] and time.time() - _egress["checked_at"] >= EGRESS_IP_TTL_SECONDS:
+        _egress["refreshing"] = True
+        asyncio.get_running_loop().create_task(_refresh_egress_ip())
+    return _egress["ip"]
+
+
+def _record_latency(method: str, elapsed_ms: float, ok: bool):
+    _upstream_latency_ms.append(elapsed_ms)
+    entry = _methods.setdefault(method, {"requests": 0, "errors": 0, "latency_ms_total": 0.0})
+    entry["requests"] += 1
+    entry["latency_ms_total"] += elapsed_ms
+    if not ok:
+        entry["errors"] += 1
+
+
+def _percentile(values, pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 1)
+
 class ProxyRequest(BaseModel):
     method: str
     params: dict = {}
@@ -97,11 +207,11 @@ def generate_signature(method: str, request_id: int, nonce: int, params: dict =
     # ORDER MATTERS: params must come BEFORE nonce
     string_to_sign = f"{method}{request_id}{CRYPTO_API_KEY}{params_str}{nonce}"
     
-    # [CRYPTO_AUTH_DIAG] Log signature components
-    logger.info(f"[CRYPTO_AUTH_DIAG] === SIGNATURE GENERATION ===")
-    logger.info(f"[CRYPTO_AUTH_DIAG] params_str_len={len(params_str)}, params_str_repr={repr(params_str)}")
-    logger.info(f"[CRYPTO_AUTH_DIAG] string_to_sign_length={len(string_to_sign)}")
-    logger.info(f"[CRYPTO_AUTH_DIAG] string_to_sign={string_to_sign}")
+    if CRYPTO_AUTH_DIAG:
+        # [CRYPTO_AUTH_DIAG] Log signature components
+        logger.info(f"[CRYPTO_AUTH_DIAG] === SIGNATURE GENERATION ===")
+        logger.info(f"[CRYPTO_AUTH_DIAG] params_str_len={len(params_str)}, params_str_repr={repr(params_str)}")
+        logger.info(f"[CRYPTO_AUTH_DIAG] string_to_sign_length={len(string_to_sign)}")
     
     signature = hmac.new(
         CRYPTO_API_SECRET.encode('utf-8'),
@@ -109,12 +219,41 @@ def generate_signature(method: str, request_id: int, nonce: int, params: dict =
         hashlib.sha256
     ).hexdigest()
     
-    # [CRYPTO_AUTH_DIAG] Log signature
-    logger.info(f"[CRYPTO_AUTH_DIAG] signature={signature}")
-    logger.info(f"[CRYPTO_AUTH_DIAG] ============================")
+    if CRYPTO_AUTH_DIAG:
+        logger.info(f"[CRYPTO_AUTH_DIAG] ============================")
     
     return signature
 
+async def _send_upstream(method: str, endpoint_url: str, crypto_body: dict) -> httpx.Response:
+    """POST to Crypto.com through the shared pool, within the concurrency limit."""
+    slots = _slots()
+    queued_at = time.perf_counter()
+    _metrics["queued"] += 1
+    _metrics["max_queued"] = max(_metrics["max_queued"], _metrics["queued"])
+    try:
+        await slots.acquire()
+    finally:
+        _metrics["queued"] -= 1
+    _metrics["queue_wait_ms_total"] += (time.perf_counter() - queued_at) * 1000
+    _metrics["in_flight"] += 1
+    _metrics["max_in_flight"] = max(_metrics["max_in_flight"], _metrics["in_flight"])
+    started = time.perf_counter()
+    ok = False
+    try:
+        response = await _http().post(endpoint_url, json=crypto_body)
+        ok = True
+        return response
+    except httpx.TimeoutException:
+        _metrics["upstream_timeouts"] += 1
+        raise
+    except httpx.HTTPError:
+        _metrics["upstream_errors"] += 1
+        raise
+    finally:
+        _metrics["in_flight"] -= 1
+        slots.release()
+        _record_latency(method, (time.perf_counter() - started) * 1000, ok)
+
 @app.post("/proxy/private")
 async def proxy_private(
     request: ProxyRequest,
@@ -128,39 +267,32 @@ async def proxy_private(
         logger.warning(f"Invalid proxy token from client")
         raise HTTPException(status_code=401, detail="Invalid proxy token")
     
+    # Per Crypto.com Exchange API v1: use request_id = 1 for consistency with working methods
+    request_id = 1
+    _metrics["requests"] += 1
     try:
-        # [CRYPTO_AUTH_DIAG] Log outbound IP (from proxy's perspective)
-        try:
-            egress_ip = requests.get("https://api.ipify.org", timeout=5).text.strip()
-            logger.info(f"[CRYPTO_AUTH_DIAG] CRYPTO_COM_OUTBOUND_IP: {egress_ip}")
-        except Exception as e:
-            logger.warning(f"[CRYPTO_AUTH_DIAG] Could not determine outbound IP: {e}")
+        egress_ip = _egress_ip()
         
-        # [CRYPTO_AUTH_DIAG] Log credentials used by proxy
-        logger.info(f"[CRYPTO_AUTH_DIAG] === PROXY CREDENTIALS ===")
-        logger.info(f"[CRYPTO_AUTH_DIAG] API_KEY repr: {repr(CRYPTO_API_KEY)}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] API_KEY length: {len(CRYPTO_API_KEY)}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] API_KEY preview: {CRYPTO_API_KEY[:4]}....{CRYPTO_API_KEY[-4:] if len(CRYPTO_API_KEY) >= 4 else ''}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] SECRET_KEY length: {len(CRYPTO_API_SECRET)}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] SECRET_KEY starts with: {CRYPTO_API_SECRET[:6] if len(CRYPTO_API_SECRET) >= 6 else 'N/A'}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] SECRET_KEY has whitespace: {any(c.isspace() for c in CRYPTO_API_SECRET) if CRYPTO_API_SECRET else False}")
+        if CRYPTO_AUTH_DIAG:
+            # [CRYPTO_AUTH_DIAG] Log outbound IP (cached) and credentials used by proxy
+            logger.info(f"[CRYPTO_AUTH_DIAG] CRYPTO_COM_OUTBOUND_IP: {egress_ip}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] === PROXY CREDENTIALS ===")
+            logger.info(f"[CRYPTO_AUTH_DIAG] API_KEY length: {len(CRYPTO_API_KEY)}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] API_KEY preview: {CRYPTO_API_KEY[:4]}....{CRYPTO_API_KEY[-4:] if len(CRYPTO_API_KEY) >= 4 else ''}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] SECRET_KEY length: {len(CRYPTO_API_SECRET)}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] SECRET_KEY has whitespace: {any(c.isspace() for c in CRYPTO_API_SECRET) if CRYPTO_API_SECRET else False}")
         
-        # Generate unique nonce and request ID
-        # Per Crypto.com Exchange API v1: use request_id = 1 for consistency with working methods
+        # Generate unique nonce
         nonce = int(time.time() * 1000)
-        request_id = 1  # Use 1 as per Crypto.com Exchange API v1 documentation
         
-        current_utc = time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
-        current_time = time.time()
-        
-        # [CRYPTO_AUTH_DIAG] Log request details
-        logger.info(f"[CRYPTO_AUTH_DIAG] === PROXY REQUEST START ===")
-        logger.info(f"[CRYPTO_AUTH_DIAG] method={request.method}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] params={request.params}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] server_time_utc={current_utc}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] server_time_epoch={current_time}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] nonce={nonce} (type={type(nonce).__name__})")
-        logger.info(f"[CRYPTO_AUTH_DIAG] request_id={request_id}")
+        if CRYPTO_AUTH_DIAG:
+            # [CRYPTO_AUTH_DIAG] Log request details
+            logger.info(f"[CRYPTO_AUTH_DIAG] === PROXY REQUEST START ===")
+            logger.info(f"[CRYPTO_AUTH_DIAG] method={request.method}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] params={request.params}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] server_time_utc={time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] nonce={nonce} (type={type(nonce).__name__})")
+            logger.info(f"[CRYPTO_AUTH_DIAG] request_id={request_id}")
         
         # Generate signature
         signature = generate_signature(request.method, request_id, nonce, request.params)
@@ -175,11 +307,12 @@ async def proxy_private(
             "params": request.params
         }
         
-        # [CRYPTO_AUTH_DEBUG] Log payload (without secret)
-        safe_body = dict(crypto_body)
-        safe_body["api_key"] = f"{CRYPTO_API_KEY[:3]}...{CRYPTO_API_KEY[-3:]}" if len(CRYPTO_API_KEY) >= 6 else "***"
-        safe_body["sig"] = f"{signature[:3]}...{signature[-3]}"
-        logger.info(f"[CRYPTO_AUTH_DEBUG] payload={json.dumps(safe_body, indent=2)}")
+        if CRYPTO_AUTH_DIAG:
+            # [CRYPTO_AUTH_DEBUG] Log payload (without secret)
+            safe_body = dict(crypto_body)
+            safe_body["api_key"] = f"{CRYPTO_API_KEY[:3]}...{CRYPTO_API_KEY[-3:]}" if len(CRYPTO_API_KEY) >= 6 else "***"
+            safe_body["sig"] = f"{signature[:3]}...{signature[-3]}"
+            logger.info(f"[CRYPTO_AUTH_DEBUG] payload={json.dumps(safe_body, indent=2)}")
         
         logger.info(f"Proxying request: {request.method}")
         
@@ -192,23 +325,17 @@ async def proxy_private(
         else:
             endpoint_url = f"{REST_BASE}/{request.method}"
         
-        logger.info(f"[CRYPTO_AUTH_DEBUG] endpoint_url={endpoint_url}")
+        response = await _send_upstream(request.method, endpoint_url, crypto_body)
         
-        response = requests.post(
-            endpoint_url,
-            json=crypto_body,
-            headers={"Content-Type": "application/json"},
-            timeout=15
-        )
-        
-        # [CRYPTO_AUTH_DIAG] Log response
-        logger.info(f"[CRYPTO_AUTH_DIAG] response_status={response.status_code}")
-        try:
-            response_json = response.json()
-            logger.info(f"[CRYPTO_AUTH_DIAG] response_body={json.dumps(response_json, indent=2)}")
-        except:
-            logger.info(f"[CRYPTO_AUTH_DIAG] response_body_text={response.text[:200]}")
-        logger.info(f"[CRYPTO_AUTH_DIAG] === PROXY REQUEST END ===")
+        if CRYPTO_AUTH_DIAG:
+            # [CRYPTO_AUTH_DIAG] Log response
+            logger.info(f"[CRYPTO_AUTH_DIAG] response_status={response.status_code}")
+            try:
+                response_json = response.json()
+                logger.info(f"[CRYPTO_AUTH_DIAG] response_body={json.dumps(response_json, indent=2)}")
+            except Exception:
+                logger.info(f"[CRYPTO_AUTH_DIAG] response_body_text={response.text[:200]}")
+            logger.info(f"[CRYPTO_AUTH_DIAG] === PROXY REQUEST END ===")
         
         # Return response to client
         return JSONResponse(
@@ -220,7 +347,7 @@ async def proxy_private(
             }
         )
         
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("Crypto.com API timeout")
         return JSONResponse(
             status_code=504,
@@ -230,7 +357,7 @@ async def proxy_private(
                 "rid": request_id
             }
         )
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Crypto.com API error: {e}")
         return JSONResponse(
             status_code=502,
@@ -251,6 +378,33 @@ async def proxy_private(
             }
         )
 
+@app.get("/proxy/metrics")
+async def proxy_metrics():
+    """Concurrency, queueing and upstream latency counters"""
+    latencies = list(_upstream_latency_ms)
+    requests_total = _metrics["requests"]
+    return {
+        **_metrics,
+        "queue_wait_ms_avg": round(_metrics["queue_wait_ms_total"] / requests_total, 2) if requests_total else None,
+        "max_concurrency": PROXY_MAX_CONCURRENCY,
+        "upstream_latency_ms": {
+            "samples": len(latencies),
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "max": round(max(latencies), 1) if latencies else None,
+        },
+        "methods": {
+            name: {
+                "requests": m["requests"],
+                "errors": m["errors"],
+                "latency_ms_avg": round(m["latency_ms_total"] / m["requests"], 1) if m["requests"] else None,
+            }
+            for name, m in _methods.items()
+        },
+        "egress_ip": _egress["ip"],
+        "egress_ip_checked_at": _egress["checked_at"] or None,
+    }
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
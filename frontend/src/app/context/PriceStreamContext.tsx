@@ -15,6 +15,8 @@ export interface PriceStreamSnapshot {
   prices: Record<string, number>;
   ts: number;
   source?: string;
+  type?: 'snapshot';
+  seq?: number;
 }
 
 export interface PriceStreamContextValue {
@@ -89,9 +91,18 @@ export function PriceStreamProvider({ children }: { children: ReactNode }) {
           if (data.prices && typeof data.prices === 'object' && data.ts != null) {
             setPrices(data.prices as Record<string, number>);
             setLastTs(typeof data.ts === 'number' ? data.ts : Number(data.ts));
+          } else if (data.type === 'delta' && data.changed && typeof data.changed === 'object') {
+            const changed = data.changed as Record<string, number>;
+            const removed = Array.isArray(data.removed) ? (data.removed as string[]) : [];
+            setPrices((prev) => {
+              const next = { ...prev, ...changed };
+              for (const symbol of removed) delete next[symbol];
+              return next;
+            });
+            setLastTs(typeof data.ts === 'number' ? data.ts : Number(data.ts));
           }
         } catch {
-          // ignore non-snapshot messages (e.g. { type: "keepalive" }, { type: "pong" })
+          // ignore control messages (e.g. { type: "keepalive" }, { type: "pong" })
         }
       };
 